@@ -1,18 +1,10 @@
 import os
 import pandas as pd
-import ta  # ✅ Install using: pip install ta
-import json
+from config_manager import get_config
 
 # ✅ Define Data Storage Folder
 DATA_STORAGE_FOLDER = "data_storage"
 
-# ✅ Load Configuration
-CONFIG_FILE = "config.json"
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-config = load_config()
-
 # ✅ Add Technical Indicators
 def add_technical_indicators(symbol):
     file_path = os.path.join(DATA_STORAGE_FOLDER, f"{symbol}.csv")
@@ -21,6 +13,8 @@ def add_technical_indicators(symbol):
         print(f"⚠ Data file missing for {symbol}! Skipping...")
         return
 
+    import ta  # ✅ Install using: pip install ta
+
     try:
         # ✅ Load the Cleaned CSV Data
         df = pd.read_csv(file_path)
@@ -52,5 +46,9 @@ def add_technical_indicators(symbol):
         print(f"⚠ Error processing indicators for {symbol}: {e}")
 
 # ✅ Process All Symbols
-for symbol in config["trading_pairs"]:
-    add_technical_indicators(symbol)
+def main():
+    for symbol in get_config()["trading_pairs"]:
+        add_technical_indicators(symbol)
+
+if __name__ == "__main__":
+    main()
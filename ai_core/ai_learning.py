@@ -1,62 +1,54 @@
 import os
 import json
+import time
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
+from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
-from sklearn.preprocessing import MinMaxScaler
+from tensorflow.keras.callbacks import EarlyStopping
 from data_feeds.news_sentiment import fetch_news_sentiment
 from data_feeds.order_flow_analysis import fetch_order_flow
 from trade_execution.trade_execution import execute_trade
 from ai_core.past_data_ai import integrate_past_data_with_main_ai
-from visualization.plot_results import plot_model_performance  # ✅ Ensured exists
 from logs.logger import log_message
-
-CONFIG_FILE = "config.json"
-TRADE_HISTORY_FILE = "logs/trade_history.json"
-MODEL_FILE = "ai_models/ai_model.keras"
-SCALER_FILE = "ai_models/scaler.npy"
-
-# ✅ Load Configurations
-def load_config():
-    """ Loads bot configurations from config.json """
-    try:
-        with open(CONFIG_FILE, "r") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        log_message("❌ ERROR: Invalid or missing config.json!", level="error")
-        exit()
-
-config = load_config()
+from logs.trade_journal import get_journal
+from logs.trade_records import RecordArray, TRADE_DTYPE
+from ai_core.scaler_store import GLOBAL_SYMBOL, STAGING_VERSION, fit_minmax, transform_inplace, save_scaler, load_scaler
+from ai_core.model_registry import get_registry, publish_model, latest_version, model_path
+from config_manager import get_config
+from monitoring.tracing import traced
+from monitoring.memory import start_memory_tracking, check_memory
+
+MODEL_KIND = "main"
+SCALER_KIND = "main"
+TRAINING_STATE_FILE = "ai_models/training_state.json"  # Journal offset of the last trade the model has consumed
+TRADE_FEATURES = ["lot_size", "stop_loss", "take_profit", "market_volatility"]  # + past-data insight as the last column
 
 # ✅ Load Trade History
 def load_trade_history():
-    """ Loads previous trade data to train AI. """
-    try:
-        with open(TRADE_HISTORY_FILE, "r", encoding="utf-8") as file:
-            trade_data = json.load(file)
-            if len(trade_data) >= 50:
-                return trade_data
-    except (FileNotFoundError, json.JSONDecodeError):
-        pass
+    """ Loads previous trade data to train AI (full history as a columnar RecordArray, only needed for full training runs). """
+    trade_data = get_journal().load_records()
+    if len(trade_data) >= 50:
+        return trade_data
     log_message("⚠ Warning: Not enough trade data available. AI training might be skipped.")
-    return []
+    return RecordArray(TRADE_DTYPE, capacity=1)
 
 # ✅ AI Trade Confidence Calculation
 def ai_trade_confidence(symbol):
     """ Predicts trade confidence based on AI model """
-    if not os.path.exists(MODEL_FILE):
+    model = get_registry().get_latest(GLOBAL_SYMBOL, MODEL_KIND)
+    if model is None:
         log_message("⚠ No AI model found! Training now...")
         train_ai()
+        model = get_registry().get_latest(GLOBAL_SYMBOL, MODEL_KIND)
 
-    model = load_model(MODEL_FILE)
     order_flow = fetch_order_flow(symbol)
     news_sentiment = fetch_news_sentiment(symbol)
 
     order_flow = float(order_flow) if isinstance(order_flow, (int, float)) else 0.0
     news_sentiment = float(news_sentiment) if isinstance(news_sentiment, (int, float)) else 0.0
 
-    past_insights_raw = integrate_past_data_with_main_ai()
+    past_insights_raw = integrate_past_data_with_main_ai(symbol)
     past_insights = float(np.array(past_insights_raw, dtype=np.float32).item())  # ✅ Fixed SymbolicTensor issue
 
     input_data = np.array([[order_flow, news_sentiment, past_insights, 1.0, 0.8]], dtype=np.float32)
@@ -71,7 +63,7 @@ def ai_trade_confidence(symbol):
 def ai_trade_decision(symbol):
     """ AI decides whether to trade based on confidence score """
     confidence = ai_trade_confidence(symbol)
-    base_lot_size = config["base_lot_size"]  # ✅ Used from config.json
+    base_lot_size = get_config()["base_lot_size"]  # ✅ Used from config.json
 
     if confidence > 0.6:
         log_message(f"✅ AI Confident: Executing BUY for {symbol}")
@@ -87,51 +79,129 @@ def ai_trade_decision(symbol):
         log_message(f"🔹 AI Neutral: No Trade for {symbol}")
         return "NEUTRAL"
 
+# ✅ Training State (journal offset & generation of the last consumed trade)
+def load_training_state():
+    try:
+        with open(TRAINING_STATE_FILE, "r") as file:
+            state = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"last_offset": 0, "generation": None}
+    # Pre-journal states counted array entries; the migration keeps trade N at offset N
+    state.setdefault("last_offset", state.get("consumed_trades", 0))
+    state.setdefault("generation", 0)
+    return state
+
+def save_training_state(state):
+    os.makedirs(os.path.dirname(TRAINING_STATE_FILE), exist_ok=True)
+    tmp_path = f"{TRAINING_STATE_FILE}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file, indent=4)
+    os.replace(tmp_path, TRAINING_STATE_FILE)
+
 # ✅ AI Model Training
-def train_ai():
-    """ Trains the AI model """
-    trades = load_trade_history()
+@traced()
+def train_ai(incremental=None):
+    """ Trains the AI model (warm-start fine-tuning on new trades unless incremental=False) """
+    config = get_config()
+    settings = config.get("incremental_training", {})
+    if incremental is None:
+        incremental = settings.get("enabled", True)
+
+    journal = get_journal()
+    state = load_training_state()
+    consumed = state["last_offset"]
+    generation = journal.generation()
+    rewritten = state["generation"] != generation or consumed > journal.last_offset()
+
+    model = get_registry().get_latest(GLOBAL_SYMBOL, MODEL_KIND)
+
+    # Journal was reset or there is no model yet -> fall back to a full training run
+    if not incremental or model is None or rewritten or load_scaler(GLOBAL_SYMBOL, SCALER_KIND, STAGING_VERSION) is None:
+        trades = load_trade_history()
+        if not train_ai_full(trades, model):
+            return
+    else:
+        trades = journal.trades_since(consumed)  # ✅ Only the new rows are read & parsed
+        if len(trades) < settings.get("min_new_trades", 1):
+            log_message(f"⏭ No new trades since last training (offset {consumed}). Retraining skipped.")
+            return
+        train_ai_incremental(model, journal, consumed, trades, settings)
+
+    save_training_state({"last_offset": trades[-1]["offset"], "generation": generation, "trained_at": time.time()})
+    model_file = model_path(GLOBAL_SYMBOL, MODEL_KIND, latest_version(GLOBAL_SYMBOL, MODEL_KIND))
+    log_message(f"💾 Model Trained & Published Successfully as {model_file}")
+
+def train_ai_full(trades, model=None):
+    """ Full training pass over the whole trade history """
+    config = get_config()
     X, y = prepare_data(trades)
 
     if len(y) < 50:
         log_message("⚠ Not enough real trade data. Training skipped.")
-        return
-
-    model = build_lstm_model() if not os.path.exists(MODEL_FILE) else load_model(MODEL_FILE)
-    model.fit(X, y, epochs=200, batch_size=32, verbose=1)
-    model.save(MODEL_FILE)
+        return False
 
-    plot_model_performance(MODEL_FILE)  # ✅ Ensuring visualization is implemented
-    log_message(f"💾 Model Trained & Saved Successfully as {MODEL_FILE}")
+    if model is None:
+        model = build_lstm_model()
+    else:
+        model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+    model.fit(X, y, epochs=config.get("training_epochs", 200), batch_size=config.get("batch_size", 32), verbose=1)
+    publish_model(model, GLOBAL_SYMBOL, MODEL_KIND)
+    return True
+
+def train_ai_incremental(model, journal, consumed, new_trades, settings):
+    """
+    Fine-tunes the existing model on new trades plus a bounded replay sample of the trades up to
+    offset `consumed`, so the cost of a retrain depends on how much is new rather than on the history size.
+    """
+    config = get_config()
+    replay_size = min(consumed, int(len(new_trades) * settings.get("replay_ratio", 2.0)),
+                      settings.get("max_replay", 500))
+    replay = journal.sample(replay_size, before=consumed) if replay_size else []
+    replay_size = len(replay)
+    batch = replay + new_trades  # Chronological: newest trades last
+
+    X, y = prepare_data(batch, fit_scaler=False)
+    log_message(f"🔄 Incremental Training: {len(new_trades)} new + {replay_size} replayed trades")
+
+    # ✅ Early stopping on the most recent (held-out) window of the batch
+    validation_split = settings.get("validation_split", 0.2) if len(y) >= 10 else 0.0
+    callbacks = [EarlyStopping(monitor="val_loss", patience=settings.get("patience", 3), restore_best_weights=True)] if validation_split else []
+
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=settings.get("learning_rate", 0.0005)),
+                  loss="binary_crossentropy", metrics=["accuracy"])
+    model.fit(X, y, epochs=settings.get("max_epochs", 20), batch_size=config.get("batch_size", 32),
+              validation_split=validation_split, shuffle=True, callbacks=callbacks, verbose=0)
+    publish_model(model, GLOBAL_SYMBOL, MODEL_KIND)
 
 # ✅ Prepare AI Training Data
-def prepare_data(trades):
-    """ Processes trade data for AI model """
-    X, y = [], []
-    scaler = MinMaxScaler()
-
+def prepare_data(trades, fit_scaler=True):
+    """
+    Processes trade data for AI model (fit_scaler=False reuses the saved scaler for fine-tuning).
+    trades is a RecordArray or a list of trade dicts (missing fields count as 0).
+    """
     past_insights_raw = integrate_past_data_with_main_ai()
     past_insights = float(np.array(past_insights_raw, dtype=np.float32).item())  # ✅ Fixed SymbolicTensor issue
 
-    for trade in trades:
-        features = [
-            trade.get("lot_size", 0),
-            trade.get("stop_loss", 0),
-            trade.get("take_profit", 0),
-            trade.get("market_volatility", 0),
-            past_insights
-        ]
-        X.append(features)
-        y.append(1 if trade.get("profit", 0) > 0 else 0)
-
-    if not X:
+    if not isinstance(trades, RecordArray):
+        trades = RecordArray.from_records(TRADE_DTYPE, trades)
+
+    if len(trades):
+        X = np.empty((len(trades), len(TRADE_FEATURES) + 1), dtype=np.float32)
+        for column, name in enumerate(TRADE_FEATURES):
+            X[:, column] = trades[name]
+        X[:, -1] = past_insights
+        y = (trades["profit"] > 0).astype(int)
+    else:
         log_message("⚠ No valid trade data found. Using dummy values...", level="warning")
-        X = [[0, 0, 0, 0, past_insights]]
-        y = [0]
+        X = np.array([[0, 0, 0, 0, past_insights]], dtype=np.float32)
+        y = np.array([0])
 
-    X_scaled = scaler.fit_transform(X)
-    np.save(SCALER_FILE, scaler)
-    return np.array(X_scaled).reshape(len(X_scaled), 1, -1), np.array(y)
+    scaler = None if fit_scaler else load_scaler(GLOBAL_SYMBOL, SCALER_KIND, STAGING_VERSION)
+    if scaler is None:
+        scaler = fit_minmax(X)
+        save_scaler(GLOBAL_SYMBOL, SCALER_KIND, *scaler, version=STAGING_VERSION)
+    transform_inplace(X, *scaler)
+    return X.reshape(len(X), 1, -1), y
 
 # ✅ Build AI Model
 def build_lstm_model():
@@ -149,13 +219,15 @@ def build_lstm_model():
 
 # ✅ AI Learning Loop
 def run_ai_learning():
-    """ AI continuously learns and retrains every 5 minutes """
+    """ AI continuously learns and retrains every 5 minutes (only when new trades arrived) """
     log_message("🤖 AI Learning Module Running...")
+    start_memory_tracking(get_config().get("memory_tracker"))
     while True:
         train_ai()
         log_message("🔄 AI Updated & Learning Complete!")
         tf.keras.backend.clear_session()
         np.random.seed()
+        check_memory()  # ✅ Shows whether clear_session() really released the previous iteration
         time.sleep(300)
 
 if __name__ == "__main__":
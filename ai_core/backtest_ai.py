@@ -1,24 +1,29 @@
 import sys
 import os
 import numpy as np
-import pandas as pd
-import tensorflow as tf
-import matplotlib.pyplot as plt
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from logs.logger import log_message
+from logs.logger import log_message, log_backtest_results
+from logs.trade_records import RecordArray, TRADE_DTYPE
+from backtesting.exits import load_backtest_settings, simulate_exits, non_overlapping, EXIT_REASONS
+from backtesting.metrics import compute_metrics, metrics_row, periods_per_year, equity_from_trades, position_from_trades
+from ai_core.scaler_store import GLOBAL_SYMBOL, load_scaler, transform_inplace
+from ai_core.model_registry import get_registry, latest_version, resolve_model_path
+from ai_core.prediction_cache import cached_predictions, load_prediction_cache_settings
+from monitoring.tracing import traced, add_trace_arguments, configure_tracing
 
 
 DATA_STORAGE = "data_storage"
-PAST_DATA_MODEL_FILE = "ai_models/past_data.keras"
-SCALER_FILE = "ai_models/scaler_past.npy"
+MODEL_KIND = "past_data"
+SCALER_KIND = "past_data"
 INITIAL_BALANCE = 10000  # 💰 Starting capital
 TRADE_RISK = 0.03  # 🔥 Risk per trade (3%)
 SIGNAL_THRESHOLD = 0.52  # 🔥 Signal threshold for AI predictions
 
 # ✅ Load Data from CSV
+@traced()
 def load_backtest_data(symbol):
+    import pandas as pd
+
     file_path = os.path.join(DATA_STORAGE, f"{symbol}.csv")
 
     if not os.path.exists(file_path):
@@ -35,72 +40,115 @@ def load_backtest_data(symbol):
         log_message(f"⚠ Warning: 'time' column missing for {symbol}. Creating manually...", level="warning")
         df.insert(0, "time", pd.date_range(start="1993-01-01", periods=len(df), freq="D"))
 
-    df["time"] = pd.to_datetime(df["time"]).astype(np.int64) // 10**9
+    df["time"] = pd.to_datetime(df["time"]).to_numpy().astype("datetime64[s]").astype(np.int64)
 
     log_message(f"✅ Loaded Backtest Data for {symbol}: {df.shape}")
     return df
 
-# ✅ Preprocess Data for Predictions
-def preprocess_backtest_data(df):
-    if not os.path.exists(SCALER_FILE):
-        log_message("⚠ Error: Missing scaler file for AI model!", level="error")
+# ✅ Model Symbol (same fallback as integrate_past_data_with_main_ai)
+def model_symbol(symbol, backend="keras"):
+    """ symbol if it has a past-data model of its own, else GLOBAL_SYMBOL (the shared, migrated legacy model) """
+    if resolve_model_path(symbol, MODEL_KIND, latest_version(symbol, MODEL_KIND), backend) is not None:
+        return symbol
+    return GLOBAL_SYMBOL
+
+# ✅ Model Features & Scaler
+def backtest_features(df, symbol, version=None):
+    """ (unscaled float32 feature matrix, (min_, scale_)) for the symbol's model version, or None """
+    version = latest_version(symbol, MODEL_KIND) if version is None else version
+    scaler = load_scaler(symbol, SCALER_KIND, version)
+    if scaler is None:
+        log_message(f"⚠ Error: Missing scaler file for {symbol} AI model!", level="error")
         return None
 
-    scaler = np.load(SCALER_FILE, allow_pickle=True).item()
+    min_, scale_ = scaler
     feature_cols = ["time", "open", "high", "low", "close", "volume", "rsi", "macd", "macd_signal", "boll_upper", "boll_lower"]
     
     if not all(col in df.columns for col in feature_cols):
         log_message("⚠ Warning: Missing required columns in dataset. Adjusting feature set.", level="warning")
         feature_cols = [col for col in feature_cols if col in df.columns]
 
-    df = df[feature_cols]
-    X = df.values
-    X_scaled = scaler.transform(X)
+    if len(feature_cols) != len(min_):
+        log_message(f"⚠ Error: Scaler for {symbol} expects {len(min_)} features, got {len(feature_cols)}.", level="error")
+        return None
+
+    return df[feature_cols].to_numpy(dtype=np.float32, copy=True), scaler  # Writable: callers scale it in place
+
+# ✅ Preprocess Data for Predictions
+def preprocess_backtest_data(df, symbol):
+    features = backtest_features(df, model_symbol(symbol))
+    if features is None:
+        return None
+
+    X, (min_, scale_) = features
+    transform_inplace(X, min_, scale_)
+
+    return X.reshape(len(X), 1, -1)
+
+# ✅ Model Outputs (cached on disk per model / scaler / data hash)
+@traced()
+def backtest_predictions(df, symbol):
+    registry = get_registry()
+    source = model_symbol(symbol, registry.backend)
+    version = latest_version(source, MODEL_KIND)
+    features = backtest_features(df, source, version)
+    if features is None:
+        return None
+
+    model_file = resolve_model_path(source, MODEL_KIND, version, registry.backend)
+    if model_file is None:
+        log_message(f"⚠ Error: Trained AI Model Not Found for {symbol}!", level="error")
+        return None
 
-    return np.array(X_scaled).reshape(len(X_scaled), 1, -1)
+    X, scaler = features
+    return cached_predictions(symbol, MODEL_KIND, model_file, X, scaler,
+                              lambda: registry.get(source, MODEL_KIND, version), load_prediction_cache_settings())
 
 # ✅ Run Backtest with Optimized Position Sizing
-def run_backtest(symbol):
+@traced()
+def run_backtest(symbol, threshold=SIGNAL_THRESHOLD):
     log_message(f"📊 Running Backtest for {symbol}...")
 
     df = load_backtest_data(symbol)
     if df is None:
         return
 
-    X = preprocess_backtest_data(df)
-    if X is None:
+    # ✅ Predict Buy/Sell Signals (only a new model or new data runs the model again)
+    predictions = backtest_predictions(df, symbol)
+    if predictions is None:
         return
-
-    if not os.path.exists(PAST_DATA_MODEL_FILE):
-        log_message(f"⚠ Error: Trained AI Model Not Found!", level="error")
-        return
-
-    model = load_model(PAST_DATA_MODEL_FILE)
-
-    # ✅ Predict Buy/Sell Signals
-    predictions = model.predict(X)
-    signals = (predictions > SIGNAL_THRESHOLD).astype(int).flatten()
+    signals = (predictions > threshold).astype(int)
 
     # ✅ Simulate Trading
+    settings = load_backtest_settings()
     balance = INITIAL_BALANCE
     position = 0
-    trade_log = []
+    trade_log = RecordArray(TRADE_DTYPE, capacity=len(df))
     trade_results = []
 
-    for i in range(1, len(df)):
-        trade_size = (balance * TRADE_RISK) / df["close"][i]  # 🔥 Dynamic Position Sizing  
-
-        if signals[i] == 1 and balance > df["close"][i]:  # Buy condition
-            position += trade_size
-            balance -= trade_size * df["close"][i]
-            trade_log.append((df["time"][i], symbol, "BUY", trade_size, df["close"][i]))
+    if settings["exit_mode"] == "sl_tp":
+        balance, equity, held, trade_pnl = simulate_sl_tp_trades(df, signals, symbol, trade_log, settings)
+    else:
+        equity, held, trade_pnl = np.full(len(df), float(INITIAL_BALANCE)), np.zeros(len(df)), None
+        for i in range(1, len(df)):
+            trade_size = (balance * TRADE_RISK) / df["close"][i]  # 🔥 Dynamic Position Sizing  
+
+            if signals[i] == 1 and balance > df["close"][i]:  # Buy condition
+                position += trade_size
+                balance -= trade_size * df["close"][i]
+                trade_log.append(time=df["time"][i], symbol=symbol, action="BUY", lot_size=trade_size, market_price=df["close"][i])
         
-        elif signals[i] == 0 and position > 0:  # Sell condition
-            balance += position * df["close"][i]
-            trade_log.append((df["time"][i], symbol, "SELL", position, df["close"][i]))
-            position = 0  # Reset position
+            elif signals[i] == 0 and position > 0:  # Sell condition
+                balance += position * df["close"][i]
+                trade_log.append(time=df["time"][i], symbol=symbol, action="SELL", lot_size=position, market_price=df["close"][i])
+                position = 0  # Reset position
+
+            equity[i] = balance + position * df["close"][i]
+            held[i] = position
 
     final_balance = balance + (position * df["close"].iloc[-1])
+    invested = held * df["close"].to_numpy() / equity  # Position as a fraction of equity (for turnover)
+    metrics = metrics_row(compute_metrics(equity, invested, trade_pnl, periods=periods_per_year(df["time"])))
 
     # ✅ Store trade results
     trade_results.append({
@@ -109,6 +157,8 @@ def run_backtest(symbol):
         "final_balance": final_balance,
         "profit": final_balance - INITIAL_BALANCE,
         "total_trades": len(trade_log),
+        "trades": trade_log,  # ✅ Columnar fills (trade_log.to_frame() for analysis)
+        "metrics": metrics,
     })
 
     # ✅ Log Results
@@ -116,6 +166,10 @@ def run_backtest(symbol):
     log_message(f"🏁 Final Balance: ${final_balance:.2f}")
     log_message(f"📈 Profit: ${final_balance - INITIAL_BALANCE:.2f}")
     log_message(f"📊 Total Trades: {len(trade_log)}")
+    log_message(f"📉 Sharpe {metrics['sharpe']:.2f} | Sortino {metrics['sortino']:.2f} | Max Drawdown {metrics['max_drawdown']:.2%} "
+                f"({metrics['max_drawdown_bars']} bars) | Profit Factor {metrics['profit_factor']:.2f} | Exposure {metrics['exposure']:.1%}")
+    log_backtest_results(symbol, round(final_balance - INITIAL_BALANCE, 2), round(metrics["win_rate"] * 100, 2),
+                         round(metrics["max_drawdown"] * 100, 2))
 
     # ✅ Show last 5 trades
     for trade in trade_log[-5:]:
@@ -123,12 +177,48 @@ def run_backtest(symbol):
 
     return trade_results
 
+# ✅ SL/TP Trading: one long position at a time, closed intrabar by the stop, target or trailing stop
+def simulate_sl_tp_trades(df, signals, symbol, trade_log, settings):
+    """
+    Opens at the close of BUY-signal bars while flat and appends BUY/SELL pairs to trade_log.
+    Returns (final balance, equity per bar, position per bar, P&L per trade).
+    """
+    candidates = np.nonzero(signals[1:-1] == 1)[0] + 1  # No entry on the last bar: nothing left to exit on
+    exits = simulate_exits(df, candidates, 1.0, settings)
+    taken = non_overlapping(exits["entry_index"], exits["exit_index"])
+
+    # Position size is TRADE_RISK of the running balance, so the balance compounds by 1 + TRADE_RISK * return
+    balances = INITIAL_BALANCE * np.cumprod(np.concatenate(([1.0], 1 + TRADE_RISK * exits["return"][taken])))
+    entry_price, exit_price = exits["entry_price"][taken], exits["exit_price"][taken]
+    sizes = balances[:-1] * TRADE_RISK / entry_price
+
+    # Interleaved BUY / SELL rows (2 per trade)
+    times = df["time"].to_numpy()
+    count = len(taken)
+    trade_log.extend({
+        "time": np.stack((times[exits["entry_index"][taken]], times[exits["exit_index"][taken]]), axis=1).ravel(),
+        "symbol": np.full(2 * count, symbol),
+        "action": np.tile(["BUY", "SELL"], count),
+        "lot_size": np.repeat(sizes, 2),
+        "market_price": np.stack((entry_price, exit_price), axis=1).ravel(),
+        "stop_loss": np.repeat(exits["stop_loss"][taken], 2),
+        "take_profit": np.repeat(exits["take_profit"][taken], 2),
+        "profit": np.stack((np.zeros(count), sizes * (exit_price - entry_price)), axis=1).ravel(),
+    })
+
+    reasons = np.bincount(exits["reason"][taken], minlength=len(EXIT_REASONS))
+    log_message(f"🎯 Exits for {symbol}: " + ", ".join(f"{name} {n}" for name, n in zip(EXIT_REASONS, reasons) if n))
+    pnl = sizes * (exit_price - entry_price)
+    equity = equity_from_trades(len(df), exits["exit_index"][taken], pnl, INITIAL_BALANCE)
+    held = position_from_trades(len(df), exits["entry_index"][taken], exits["exit_index"][taken], sizes)
+    return float(balances[-1]), equity, held, pnl
+
 # ✅ Run Backtest for All Trading Pairs
-def run_full_backtest():
+def run_full_backtest(threshold=SIGNAL_THRESHOLD):
     trading_pairs = ["EURUSDm", "USDJPYm", "GBPUSDm"]
     all_results = []
     for symbol in trading_pairs:
-        results = run_backtest(symbol)
+        results = run_backtest(symbol, threshold)
         if results:
             all_results.extend(results)
 
@@ -140,6 +230,8 @@ def plot_backtest_results(trade_results):
     """
     Plots the backtest results for analysis.
     """
+    import matplotlib.pyplot as plt
+
     if not trade_results:
         log_message("⚠ No trade results available for plotting.", level="warning")
         return
@@ -156,4 +248,9 @@ def plot_backtest_results(trade_results):
 
 # ✅ Run backtest on script execution
 if __name__ == "__main__":
-    run_full_backtest()
+    import argparse
+    parser = add_trace_arguments(argparse.ArgumentParser(description="Backtest the AI model on historical data"))
+    parser.add_argument("--threshold", type=float, default=SIGNAL_THRESHOLD, help="Model output above which a bar is a BUY signal")
+    args = parser.parse_args()
+    configure_tracing(args, always_on=True)  # No iteration loop: trace the whole run
+    run_full_backtest(args.threshold)
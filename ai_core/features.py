@@ -0,0 +1,8 @@
+import numpy as np
+
+# ✅ Input Row of the Main Model (same order as training; shared by the live bot and the pipeline)
+MODEL_FEATURES = ("order_flow", "news_sentiment", "past_insights", "market_volatility", "risk_factor")
+
+def model_input(order_flow, news_sentiment, past_insights, market_volatility, risk_factor):
+    """ (1, 1, features) float32 array for one decision; market_volatility is maths_engine.symbol_volatility (M1 ATR) """
+    return np.array([[[order_flow, news_sentiment, past_insights, market_volatility, risk_factor]]], dtype=np.float32)
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from ai_core.scaler_store import DEFAULT_MODEL_VERSION, GLOBAL_SYMBOL, STAGING_VERSION, load_scaler, save_scaler
+from ai_core.numpy_inference import export_model_weights, numpy_loader, numpy_model_path
+from monitoring.tracing import traced
+
+MODELS_DIR = "ai_models"
+MANIFEST_FILE = os.path.join(MODELS_DIR, "manifest.json")  # Latest published version per (kind, symbol)
+MANIFEST_CHECK_INTERVAL = 1.0  # Seconds between manifest mtime checks on the inference side
+DEFAULT_MEMORY_BUDGET_MB = 1024
+
+# ✅ Files written before per-symbol models existed (used when no versioned file is found)
+LEGACY_MODEL_FILES = {
+    (GLOBAL_SYMBOL, "main"): os.path.join(MODELS_DIR, "ai_model.keras"),
+    (GLOBAL_SYMBOL, "past_data"): os.path.join(MODELS_DIR, "past_data.keras"),
+}
+
+# ✅ Model File Location (one file per symbol, model kind & version)
+def model_path(symbol, kind, version=DEFAULT_MODEL_VERSION):
+    return os.path.join(MODELS_DIR, kind, f"{symbol}_v{version}.keras")
+
+def resolve_model_path(symbol, kind, version=DEFAULT_MODEL_VERSION, backend="keras"):
+    """ Returns the versioned model file, falling back to the legacy single-file layout """
+    candidates = [model_path(symbol, kind, version)]
+    legacy_path = LEGACY_MODEL_FILES.get((symbol, kind))
+    if version == DEFAULT_MODEL_VERSION and legacy_path:
+        candidates.append(legacy_path)
+
+    for path in candidates:
+        if backend == "numpy":
+            path = numpy_model_path(path)
+        if os.path.exists(path):
+            return path
+    return None
+
+# ✅ Version Manifest
+def manifest_key(symbol, kind):
+    return f"{kind}/{symbol}"
+
+def read_manifest():
+    try:
+        with open(MANIFEST_FILE, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"models": {}}
+
+def latest_version(symbol, kind, manifest=None):
+    """ Latest published version of a model (DEFAULT_MODEL_VERSION if it was never published) """
+    entry = (manifest or read_manifest())["models"].get(manifest_key(symbol, kind))
+    return entry["version"] if entry else DEFAULT_MODEL_VERSION
+
+def write_json_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(data, file, indent=4)
+    os.replace(tmp_path, path)
+
+def save_model_atomic(model, path):
+    """ Writes the model next to its final path and renames it into place """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path[:-len(".keras")] + f".{os.getpid()}.tmp.keras"
+    model.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+# ✅ Publish a New Model Version (used by the training worker)
+def publish_model(model, symbol, kind):
+    """
+    Saves the model as the next version (atomic rename) together with its NumPy weight export,
+    snapshots the staging scaler it was trained with under the same version (later training runs
+    only rewrite the staging file) and then atomically updates the manifest.
+    Inference processes pick it up from there.
+    Only the training worker should publish, so the manifest has a single writer.
+    """
+    manifest = read_manifest()
+    entry = manifest["models"].get(manifest_key(symbol, kind))
+    version = (entry["version"] if entry else 0) + 1
+
+    path = save_model_atomic(model, model_path(symbol, kind, version))
+    export_model_weights(model, numpy_model_path(path))  # ✅ Lets TensorFlow-free processes use the numpy backend
+    scaler = load_scaler(symbol, kind, STAGING_VERSION)
+    if scaler is not None:
+        save_scaler(symbol, kind, *scaler, version=version)
+
+    manifest["models"][manifest_key(symbol, kind)] = {"version": version, "path": path, "published_at": time.time()}
+    write_json_atomic(MANIFEST_FILE, manifest)
+    return version
+
+# ✅ Default Loaders (TensorFlow is only imported when a Keras model is actually needed)
+@traced()
+def keras_loader(path):
+    from tensorflow.keras.models import load_model
+    return load_model(path, compile=False)  # Inference only: skip optimizer state
+
+LOADERS = {"keras": keras_loader, "numpy": numpy_loader}
+
+# ✅ Approximate In-Memory Size of a Loaded Model
+def estimate_model_bytes(model, path=None):
+    try:
+        if hasattr(model, "layers") and not hasattr(model, "get_weights"):  # NumpyModel
+            return int(sum(w.nbytes for _, weights in model.layers for w in weights.values()))
+        return int(sum(weights.nbytes for weights in model.get_weights()))
+    except AttributeError:
+        return os.path.getsize(path) if path and os.path.exists(path) else 0
+
+# ✅ Lazy-Loading Model Registry with LRU Eviction
+class ModelRegistry:
+    """
+    Caches models keyed by (symbol, kind, version). Models are loaded on first use and the
+    least recently used ones are evicted once the memory budget is exceeded.
+    backend="numpy" serves the exported .npz weights through NumpyModel (no TensorFlow import).
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, loader=None, sizer=estimate_model_bytes, backend="keras"):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.backend = backend
+        self.loader = loader or LOADERS[backend]
+        self.sizer = sizer
+        self._models = OrderedDict()  # key -> (model, size_bytes)
+        self._bytes_in_use = 0
+        self._lock = threading.RLock()
+        self._active = {}  # (symbol, kind) -> version currently served by get_latest
+        self._swapping = set()
+        self._manifest = {"models": {}}
+        self._manifest_mtime = None
+        self._manifest_checked_at = float("-inf")
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0,
+                       "load_time_total": 0.0, "load_time_max": 0.0}
+
+    @traced()
+    def get(self, symbol, kind, version=DEFAULT_MODEL_VERSION):
+        """ Returns the cached model, loading it from disk on a miss (None if no model file exists) """
+        key = (symbol, kind, version)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._models[key][0]
+            self._stats["misses"] += 1
+
+        path = resolve_model_path(symbol, kind, version, self.backend)
+        if path is None:
+            return None
+
+        # Load outside the lock so lookups of other (cached) models never wait on disk/TensorFlow
+        start = time.perf_counter()
+        model = self.loader(path)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["loads"] += 1
+            self._stats["load_time_total"] += elapsed
+            self._stats["load_time_max"] = max(self._stats["load_time_max"], elapsed)
+            if key in self._models:  # Another thread loaded it meanwhile
+                return self._models[key][0]
+            self._insert(key, model, self.sizer(model, path))
+            return model
+
+    def get_latest(self, symbol, kind):
+        """
+        Returns the newest published version. When the manifest announces a new version, it is
+        loaded in a background thread and swapped in atomically; until then the previous version
+        keeps serving, so callers never wait on a model load after the first one.
+        """
+        key = (symbol, kind)
+        version = self._published_version(symbol, kind)
+        with self._lock:
+            active = self._active.get(key)
+            cached = active is not None and (symbol, kind, active) in self._models
+            if cached and version != active and key not in self._swapping:
+                self._swapping.add(key)
+                threading.Thread(target=self._swap_in, args=(symbol, kind, version), daemon=True).start()
+
+        if not cached:
+            model = self.get(symbol, kind, version)
+            if model is not None:
+                with self._lock:
+                    self._active[key] = version
+            return model
+        return self.get(symbol, kind, active)
+
+    def active_version(self, symbol, kind):
+        with self._lock:
+            return self._active.get((symbol, kind))
+
+    def save_model(self, model, symbol, kind, version=DEFAULT_MODEL_VERSION):
+        """ Saves a freshly trained model to its versioned file and replaces the cached copy """
+        path = save_model_atomic(model, model_path(symbol, kind, version))
+        with self._lock:
+            self._remove((symbol, kind, version))
+            self._insert((symbol, kind, version), model, self.sizer(model, path))
+        return path
+
+    def evict(self, key):
+        with self._lock:
+            if self._remove(key):
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._models):
+                self.evict(key)
+
+    def metrics(self):
+        """ Hit/miss counters, load times and current memory usage """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "load_time_avg": self._stats["load_time_total"] / self._stats["loads"] if self._stats["loads"] else 0.0,
+                "models_loaded": len(self._models),
+                "bytes_in_use": self._bytes_in_use,
+                "memory_budget": self.memory_budget,
+            }
+
+    def _published_version(self, symbol, kind):
+        now = time.monotonic()
+        if now - self._manifest_checked_at >= MANIFEST_CHECK_INTERVAL:
+            self._manifest_checked_at = now
+            try:
+                mtime = os.stat(MANIFEST_FILE).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._manifest_mtime:
+                self._manifest_mtime = mtime
+                self._manifest = read_manifest()
+        return latest_version(symbol, kind, self._manifest)
+
+    def _swap_in(self, symbol, kind, version):
+        try:
+            model = self.get(symbol, kind, version)
+            with self._lock:
+                if model is not None:
+                    previous = self._active.get((symbol, kind))
+                    self._active[(symbol, kind)] = version
+                    if previous is not None and previous != version:
+                        self._remove((symbol, kind, previous))
+        finally:
+            with self._lock:
+                self._swapping.discard((symbol, kind))
+
+    def _remove(self, key):
+        entry = self._models.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes_in_use -= entry[1]
+        return True
+
+    def _insert(self, key, model, size_bytes):
+        self._models[key] = (model, size_bytes)
+        self._bytes_in_use += size_bytes
+        # Always keep the model just inserted, even if it alone exceeds the budget
+        while self._bytes_in_use > self.memory_budget and len(self._models) > 1:
+            self.evict(next(iter(self._models)))
+
+# ✅ Shared Registry Instance
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """ Returns the process-wide registry, configured from config["model_registry"] (memory_budget_mb, backend) """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from config_manager import get_config
+            settings = get_config().get("model_registry", {})
+            _registry = ModelRegistry(settings.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB),
+                                      backend=settings.get("backend", "keras"))
+        return _registry
+
+if __name__ == "__main__":
+    registry = get_registry()
+    for symbol, kind in LEGACY_MODEL_FILES:
+        model = registry.get_latest(symbol, kind)
+        print(f"🔍 {kind}/{symbol}: {'v' + str(registry.active_version(symbol, kind)) if model is not None else 'missing'}")
+    print("📊 Registry Metrics:", registry.metrics())
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import numpy as np
+from monitoring.tracing import traced
+
+SPEC_KEY = "__spec__"
+
+# ✅ Activations used by the LSTM/Dense models
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+def relu(x):
+    return np.maximum(x, 0.0)
+
+def linear(x):
+    return x
+
+ACTIVATIONS = {"sigmoid": sigmoid, "hard_sigmoid": hard_sigmoid, "tanh": np.tanh, "relu": relu, "linear": linear}
+
+def _activation_name(activation):
+    """ Keras stores activations as strings or serialized dicts depending on the version """
+    if isinstance(activation, dict):
+        activation = activation.get("config", {}).get("name", activation.get("class_name"))
+    name = str(activation)
+    if name not in ACTIVATIONS:
+        raise ValueError(f"❌ ERROR: Unsupported activation '{name}' for NumPy inference")
+    return name
+
+# ✅ Flat Weight File Location (same name as the .keras model, .npz extension)
+def numpy_model_path(keras_path):
+    return os.path.splitext(keras_path)[0] + ".npz"
+
+# ✅ Export Keras Weights (LSTM, BatchNormalization, Dense; Dropout is a no-op at inference)
+def export_model_weights(model, path):
+    """
+    Writes the layer specs and weights of a trained Keras model into one .npz file.
+    Only needs the model object, TensorFlow is not imported here.
+    """
+    spec, arrays = [], {}
+    for index, layer in enumerate(model.layers):
+        layer_type = layer.__class__.__name__
+        config = layer.get_config()
+        weights = [np.asarray(w, dtype=np.float32) for w in layer.get_weights()]
+
+        if layer_type in ("Dropout", "InputLayer"):
+            continue
+        elif layer_type == "LSTM":
+            entry = {"type": "lstm", "units": config["units"], "return_sequences": config["return_sequences"],
+                     "activation": _activation_name(config["activation"]),
+                     "recurrent_activation": _activation_name(config["recurrent_activation"]),
+                     "use_bias": config.get("use_bias", True)}
+            names = ["kernel", "recurrent_kernel", "bias"][:len(weights)]
+        elif layer_type == "BatchNormalization":
+            entry = {"type": "batch_norm", "epsilon": config["epsilon"],
+                     "center": config.get("center", True), "scale": config.get("scale", True)}
+            names = (["gamma"] if entry["scale"] else []) + (["beta"] if entry["center"] else []) + ["moving_mean", "moving_variance"]
+        elif layer_type == "Dense":
+            entry = {"type": "dense", "activation": _activation_name(config["activation"]), "use_bias": config.get("use_bias", True)}
+            names = ["kernel", "bias"][:len(weights)]
+        else:
+            raise ValueError(f"❌ ERROR: Layer '{layer.name}' ({layer_type}) is not supported by the NumPy backend")
+
+        entry["weights"] = [f"{index}_{name}" for name in names]
+        arrays.update(zip(entry["weights"], weights))
+        spec.append(entry)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path[:-len(".npz")] + f".{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, **arrays, **{SPEC_KEY: np.frombuffer(json.dumps(spec).encode(), dtype=np.uint8)})
+    os.replace(tmp_path, path)
+    return path
+
+# ✅ NumPy Forward Pass
+class NumpyModel:
+    """
+    Inference-only re-implementation of the exported Keras Sequential models.
+    Accepts (batch, timesteps, features) or (batch, features) inputs and returns (batch, outputs).
+    """
+
+    def __init__(self, spec, arrays):
+        self.layers = []
+        for entry in spec:
+            weights = {name.split("_", 1)[1]: np.ascontiguousarray(arrays[name], dtype=np.float32) for name in entry["weights"]}
+            if entry["type"] == "batch_norm":
+                # Fold the normalization into one multiply-add
+                gamma = weights.get("gamma", 1.0)
+                beta = weights.get("beta", 0.0)
+                scale = gamma / np.sqrt(weights["moving_variance"] + entry["epsilon"])
+                weights = {"scale": scale.astype(np.float32),
+                           "shift": (beta - weights["moving_mean"] * scale).astype(np.float32)}
+            self.layers.append((entry, weights))
+
+    @classmethod
+    def from_file(cls, path):
+        with np.load(path) as data:
+            spec = json.loads(data[SPEC_KEY].tobytes().decode())
+            arrays = {name: data[name] for name in data.files if name != SPEC_KEY}
+        return cls(spec, arrays)
+
+    def __call__(self, X):
+        return self.predict(X)
+
+    def predict(self, X, batch_size=None, verbose=0):
+        """ Batch API: splits large inputs into chunks of batch_size rows to bound memory """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 2:
+            X = X[:, None, :]
+        if not batch_size or len(X) <= batch_size:
+            return self._forward(X)
+        return np.concatenate([self._forward(X[i:i + batch_size]) for i in range(0, len(X), batch_size)])
+
+    def _forward(self, x):
+        for entry, weights in self.layers:
+            kind = entry["type"]
+            if kind == "lstm":
+                x = self._lstm(x, entry, weights)
+            elif kind == "batch_norm":
+                x = x * weights["scale"] + weights["shift"]
+            elif kind == "dense":
+                x = x @ weights["kernel"]
+                if "bias" in weights:
+                    x = x + weights["bias"]
+                x = ACTIVATIONS[entry["activation"]](x)
+        return x
+
+    @staticmethod
+    def _lstm(x, entry, weights):
+        units = entry["units"]
+        activation = ACTIVATIONS[entry["activation"]]
+        recurrent_activation = ACTIVATIONS[entry["recurrent_activation"]]
+        batch, timesteps, _ = x.shape
+
+        # Input projection for every timestep in one matmul; gate order is i, f, c, o (Keras)
+        z_inputs = x @ weights["kernel"]
+        if "bias" in weights:
+            z_inputs = z_inputs + weights["bias"]
+
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = []
+        for t in range(timesteps):
+            z = z_inputs[:, t] if t == 0 else z_inputs[:, t] + h @ weights["recurrent_kernel"]  # h is zero at t=0
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if entry["return_sequences"]:
+                outputs.append(h)
+        return np.stack(outputs, axis=1) if entry["return_sequences"] else h
+
+# ✅ Registry Loader for the NumPy Backend
+@traced()
+def numpy_loader(path):
+    return NumpyModel.from_file(path)
+
+# ✅ Parity Check & Latency Benchmark against Keras
+def benchmark_against_keras(keras_model, numpy_model, n_single=200, batch_rows=4096, tolerance=1e-4):
+    """
+    Compares outputs on random inputs and times single-row and batched predictions for both backends.
+    """
+    input_shape = tuple(dim for dim in keras_model.input_shape[1:])
+    rng = np.random.default_rng(0)
+    X = rng.random((batch_rows,) + input_shape, dtype=np.float32)
+
+    keras_out = np.asarray(keras_model.predict(X, batch_size=1024, verbose=0))
+    numpy_out = numpy_model.predict(X)
+    max_abs_error = float(np.max(np.abs(keras_out - numpy_out)))
+
+    def time_single(predict):
+        start = time.perf_counter()
+        for i in range(n_single):
+            predict(X[i:i + 1])
+        return (time.perf_counter() - start) / n_single * 1e6
+
+    def time_batch(predict):
+        start = time.perf_counter()
+        predict(X)
+        return (time.perf_counter() - start) * 1e3
+
+    results = {
+        "max_abs_error": max_abs_error,
+        "within_tolerance": max_abs_error <= tolerance,
+        "keras_single_us": time_single(lambda x: np.asarray(keras_model(x, training=False))),
+        "numpy_single_us": time_single(numpy_model.predict),
+        "keras_batch_ms": time_batch(lambda x: keras_model.predict(x, batch_size=1024, verbose=0)),
+        "numpy_batch_ms": time_batch(numpy_model.predict),
+        "batch_rows": batch_rows,
+    }
+    return results
+
+if __name__ == "__main__":
+    from ai_core.model_registry import LEGACY_MODEL_FILES, latest_version, resolve_model_path, keras_loader
+
+    for symbol, kind in LEGACY_MODEL_FILES:
+        keras_path = resolve_model_path(symbol, kind, latest_version(symbol, kind))
+        if keras_path is None:
+            print(f"⚠ No {kind} model to export.")
+            continue
+        keras_model = keras_loader(keras_path)
+        npz_path = export_model_weights(keras_model, numpy_model_path(keras_path))
+        print(f"💾 Exported {keras_path} -> {npz_path}")
+        print(f"📊 {kind}: {benchmark_against_keras(keras_model, NumpyModel.from_file(npz_path))}")
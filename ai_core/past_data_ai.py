@@ -1,26 +1,19 @@
 import os
-import json
 import numpy as np
-import pandas as pd
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
-from sklearn.preprocessing import MinMaxScaler
-
-CONFIG_FILE = "config.json"
-PAST_DATA_MODEL_FILE = "ai_models/past_data.keras"
-SCALER_FILE = "ai_models/scaler_past.npy"
-DATA_STORAGE = "data_storage"  # Folder where CSV files are stored
-
-# ✅ Load Configuration
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
+from ai_core.scaler_store import GLOBAL_SYMBOL, STAGING_VERSION, fit_minmax, transform_inplace, save_scaler
+from ai_core.model_registry import get_registry, publish_model
+from config_manager import get_config
+from monitoring.tracing import traced
 
-config = load_config()
+MODEL_KIND = "past_data"
+SCALER_KIND = "past_data"
+DATA_STORAGE = "data_storage"  # Folder where CSV files are stored
 
 # ✅ Load Data from CSV Instead of Fetching Again
+@traced()
 def load_csv_data(symbol):
+    import pandas as pd
+
     file_path = os.path.join(DATA_STORAGE, f"{symbol}.csv")
 
     if not os.path.exists(file_path):
@@ -39,7 +32,7 @@ def load_csv_data(symbol):
             df.insert(0, "time", pd.date_range(start="1993-01-01", periods=len(df), freq="D"))
 
         # ✅ Convert Time to Unix Timestamp
-        df["time"] = pd.to_datetime(df["time"]).astype(np.int64) // 10**9
+        df["time"] = pd.to_datetime(df["time"]).to_numpy().astype("datetime64[s]").astype(np.int64)
 
         print(f"✅ Loaded & Processed Data for {symbol}: {df.shape}")
         return df
@@ -54,33 +47,40 @@ def generate_trade_labels(df):
     return df
 
 # ✅ Preprocess Data for AI Training
-def preprocess_data(df):
-    scaler = MinMaxScaler()
+def preprocess_data(df, symbol):
     feature_cols = ["time", "open", "high", "low", "close", "volume", "rsi", "macd", "macd_signal", "boll_upper", "boll_lower"]
 
     df = df[feature_cols + ["target"]]  # Ensure all required columns exist
 
-    X = df[feature_cols].values
+    X = df[feature_cols].to_numpy(dtype=np.float32, copy=True)  # Scaled in place (pandas may hand out read-only views)
     y = df["target"].values  # ✅ Now using real buy/sell signals
 
-    X_scaled = scaler.fit_transform(X)
-    np.save(SCALER_FILE, scaler)
+    # ✅ Per-symbol scaler, stored as plain min_/scale_ arrays
+    min_, scale_ = fit_minmax(X)
+    save_scaler(symbol, SCALER_KIND, min_, scale_, version=STAGING_VERSION)  # Snapshotted per version by publish_model
+    transform_inplace(X, min_, scale_)
 
-    return np.array(X_scaled).reshape(len(X_scaled), 1, -1), y  # Reshape for LSTM
+    return X.reshape(len(X), 1, -1), y  # Reshape for LSTM
 
 # ✅ Train AI Model
 def train_past_data_ai(symbol):
+    import tensorflow as tf
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
+
     df = load_csv_data(symbol)
     if df is None:
         print(f"⚠ No Data Available for {symbol}. Skipping Training...")
         return
 
     df = generate_trade_labels(df)  # ✅ Now using real trade signals
-    X, y = preprocess_data(df)
+    X, y = preprocess_data(df, symbol)
 
-    if os.path.exists(PAST_DATA_MODEL_FILE):
-        print("🔄 Loading Existing Past Data Model for Incremental Training...")
-        model = load_model(PAST_DATA_MODEL_FILE)
+    model = get_registry().get_latest(symbol, MODEL_KIND)
+    if model is not None:
+        print(f"🔄 Loading Existing Past Data Model for {symbol} for Incremental Training...")
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.0005),
+                      loss="binary_crossentropy", metrics=["accuracy"])
     else:
         print("✅ Training New Past Data Model from Scratch...")
         model = Sequential([
@@ -104,24 +104,28 @@ def train_past_data_ai(symbol):
                       loss="binary_crossentropy", metrics=["accuracy"])
 
     model.fit(X, y, epochs=150, batch_size=64, verbose=1)
-    model.save(PAST_DATA_MODEL_FILE)
-    print(f"💾 Past Data AI Model for {symbol} Trained & Saved!")
+    version = publish_model(model, symbol, MODEL_KIND)  # ✅ One model per symbol, no more overwriting
+    print(f"💾 Past Data AI Model for {symbol} Trained & Published as v{version}!")
 
 # ✅ Run AI Training Using Stored CSVs
 def run_past_data_ai():
-    trading_pairs = config["trading_pairs"]
+    trading_pairs = get_config()["trading_pairs"]
     for symbol in trading_pairs:
         train_past_data_ai(symbol)
     print("✅ AI Successfully Trained Using Past Market Data!")
-def integrate_past_data_with_main_ai():
+@traced()
+def integrate_past_data_with_main_ai(symbol=GLOBAL_SYMBOL):
     """
-    Loads past AI model and provides insights to the main AI model.
+    Loads past AI model (per symbol, falling back to the shared one) and provides insights to the main AI model.
     """
-    if not os.path.exists(PAST_DATA_MODEL_FILE):
+    registry = get_registry()
+    model = registry.get_latest(symbol, MODEL_KIND)
+    if model is None:
+        model = registry.get_latest(GLOBAL_SYMBOL, MODEL_KIND)
+    if model is None:
         print(f"⚠ Past Data Model Not Found! Training Now...")
         return 0.5  # Default neutral prediction
-    
-    model = load_model(PAST_DATA_MODEL_FILE)
+
     test_input = np.array([[0.5] * 11]).reshape(1, 1, -1)  # Ensure input shape matches model
     past_insights = model.predict(test_input)
     return past_insights[0][0]
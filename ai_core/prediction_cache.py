@@ -0,0 +1,114 @@
+import os
+import hashlib
+import numpy as np
+from ai_core.scaler_store import transform
+
+# ✅ On-disk Prediction Cache for backtests
+# Raw model outputs per symbol are stored as .npy files under a (model file, scaler, data) hash key
+# and handed back memory-mapped, so a backtest re-run with the same model and data (e.g. with a
+# different signal threshold) skips inference entirely. Misses are computed in explicit batches that
+# are scaled and predicted one at a time and streamed straight into the output file.
+DEFAULT_PREDICTION_CACHE_SETTINGS = {
+    "enabled": True,
+    "directory": "ai_models/predictions",
+    "batch_size": 65536,               # Rows scaled & predicted per step (memory: batch x features floats)
+    "max_entries_per_symbol": 8,       # Least recently used files beyond this are deleted
+}
+HASH_CHUNK_BYTES = 1 << 24
+DIGEST_SIZE = 16
+
+def load_prediction_cache_settings(settings=None):
+    from config_manager import get_config
+    return {**DEFAULT_PREDICTION_CACHE_SETTINGS, **(get_config().get("prediction_cache") or {}), **(settings or {})}
+
+# ✅ Content Hashes
+_file_digests = {}  # (path, size, mtime_ns) -> digest; a model file is only read again after it changed
+
+def file_digest(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _file_digests.get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(HASH_CHUNK_BYTES), b""):
+                hasher.update(block)
+        digest = _file_digests[key] = hasher.hexdigest()
+    return digest
+
+def array_digest(*arrays):
+    """ Hash of the dtype, shape and bytes of each array (contiguous arrays are hashed without a copy) """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        hasher.update(f"{array.dtype.str}{array.shape}".encode())
+        hasher.update(memoryview(array.reshape(-1)).cast("B"))
+    return hasher.hexdigest()
+
+def cache_key(model_file, scaler, X):
+    return f"{file_digest(model_file)}-{array_digest(*scaler)}-{array_digest(X)}"
+
+def prediction_path(symbol, kind, key, directory=DEFAULT_PREDICTION_CACHE_SETTINGS["directory"]):
+    return os.path.join(directory, kind, symbol, f"{key}.npy")
+
+# ✅ Streaming Batch Inference
+def predict_batch(model, batch):
+    """ One explicit batch through the model (predict_on_batch skips Keras' per-call data pipeline) """
+    predict = getattr(model, "predict_on_batch", None) or model.predict
+    return np.asarray(predict(batch), dtype=np.float32).reshape(len(batch), -1)[:, 0]
+
+def stream_predictions(model, X, scaler, out, batch_size=DEFAULT_PREDICTION_CACHE_SETTINGS["batch_size"]):
+    """ Scales and predicts X batch by batch into out, so only one scaled batch is in memory at a time """
+    for start in range(0, len(X), batch_size):
+        batch = transform(X[start:start + batch_size], *scaler)
+        out[start:start + len(batch)] = predict_batch(model, batch.reshape(len(batch), 1, -1))
+    return out
+
+# ✅ Cached Predictions
+def cached_predictions(symbol, kind, model_file, X, scaler, load_model, settings=None):
+    """
+    Model outputs (float32, one per row of the unscaled features X) for the model stored in model_file
+    and the (min_, scale_) scaler. load_model() is only called on a cache miss. Hits are returned as a
+    read-only memory map of the cached file. Returns None when load_model() returns None.
+    """
+    from logs.logger import log_message
+    from monitoring.metrics import increment
+
+    settings = {**DEFAULT_PREDICTION_CACHE_SETTINGS, **(settings or {})}
+    X = np.asarray(X)
+    if not settings["enabled"] or not len(X):
+        model = load_model()
+        return None if model is None else stream_predictions(model, X, scaler, np.empty(len(X), np.float32), settings["batch_size"])
+
+    path = prediction_path(symbol, kind, cache_key(model_file, scaler, X), settings["directory"])
+    if os.path.exists(path):
+        os.utime(path)  # Most recently used
+        increment("prediction_cache_hits", symbol)
+        return np.load(path, mmap_mode="r")
+
+    model = load_model()
+    if model is None:
+        return None
+    increment("prediction_cache_misses", symbol)
+    log_message(f"🧮 Predicting {len(X)} rows for {symbol} in batches of {settings['batch_size']} (cache miss)")
+
+    # Written to a temporary file and renamed, so readers never map a half-written array
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(len(X),))
+    stream_predictions(model, X, scaler, out, settings["batch_size"])
+    out.flush()
+    del out
+    os.replace(tmp_path, path)
+    prune_predictions(os.path.dirname(path), settings["max_entries_per_symbol"])
+    return np.load(path, mmap_mode="r")
+
+def prune_predictions(directory, max_entries):
+    """ Deletes the least recently used cache files beyond max_entries in one symbol's directory """
+    entries = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".npy")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[max(1, max_entries):]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Still mapped on Windows or removed concurrently
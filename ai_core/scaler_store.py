@@ -0,0 +1,113 @@
+import os
+import struct
+import numpy as np
+
+SCALER_DIR = "ai_models/scalers"
+SCALER_MAGIC = b"MMSC"
+SCALER_FORMAT_VERSION = 1
+DEFAULT_MODEL_VERSION = 1
+STAGING_VERSION = "staging"  # Working scaler of the next training run; publish_model snapshots it per version
+GLOBAL_SYMBOL = "GLOBAL"  # Key for models trained across all symbols (main AI model)
+
+# Header: magic, format version, number of features -> followed by min_ then scale_ as little-endian float64
+_HEADER = struct.Struct("<4sHI")
+
+# ✅ Scaler File Location (one file per symbol, model kind & model version, plus the staging file)
+def scaler_path(symbol, kind, version=DEFAULT_MODEL_VERSION):
+    suffix = version if version == STAGING_VERSION else f"v{version}"
+    return os.path.join(SCALER_DIR, f"{kind}_{symbol}_{suffix}.scl")
+
+# ✅ Fit Min-Max Scaling Arrays (same maths as sklearn MinMaxScaler, no sklearn import)
+def fit_minmax(X, feature_range=(0, 1)):
+    """
+    Returns (min_, scale_) so that X * scale_ + min_ maps every column into feature_range.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    data_min = np.nanmin(X, axis=0)
+    data_range = np.nanmax(X, axis=0) - data_min
+    data_range[data_range == 0.0] = 1.0  # Constant columns are left unscaled, like sklearn
+
+    low, high = feature_range
+    scale_ = (high - low) / data_range
+    min_ = low - data_min * scale_
+    return min_, scale_
+
+# ✅ Vectorized In-Place Transform
+def transform_inplace(X, min_, scale_):
+    """
+    Scales a float array in place (X *= scale_; X += min_) and returns it.
+    """
+    X *= scale_.astype(X.dtype, copy=False)
+    X += min_.astype(X.dtype, copy=False)
+    return X
+
+def transform(X, min_, scale_, dtype=np.float32):
+    """ Copies X into a float array once and scales it in place """
+    return transform_inplace(np.array(X, dtype=dtype), min_, scale_)
+
+# ✅ Save Scaler Arrays (atomic write so readers never see a half-written file)
+def save_scaler(symbol, kind, min_, scale_, version=DEFAULT_MODEL_VERSION):
+    min_ = np.ascontiguousarray(min_, dtype="<f8")
+    scale_ = np.ascontiguousarray(scale_, dtype="<f8")
+    if min_.shape != scale_.shape or min_.ndim != 1:
+        raise ValueError(f"❌ ERROR: min_ {min_.shape} and scale_ {scale_.shape} must be matching 1-D arrays")
+
+    path = scaler_path(symbol, kind, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(SCALER_MAGIC, SCALER_FORMAT_VERSION, len(min_)))
+        file.write(min_.tobytes())
+        file.write(scale_.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+# ✅ Load Scaler Arrays
+def load_scaler(symbol, kind, version=DEFAULT_MODEL_VERSION):
+    """
+    Returns (min_, scale_) for the given symbol/kind/version, or None if no scaler was saved.
+    """
+    path = scaler_path(symbol, kind, version)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as file:
+        raw = file.read()
+
+    magic, format_version, n_features = _HEADER.unpack_from(raw)
+    if magic != SCALER_MAGIC or format_version != SCALER_FORMAT_VERSION:
+        raise ValueError(f"❌ ERROR: {path} is not a valid scaler file")
+
+    arrays = np.frombuffer(raw, dtype="<f8", count=2 * n_features, offset=_HEADER.size)
+    return arrays[:n_features].copy(), arrays[n_features:].copy()
+
+# ✅ One-Off Migration of Old Pickled MinMaxScaler .npy Files
+# The legacy past-data scaler was shared by every symbol: it becomes the GLOBAL_SYMBOL one, which
+# backtest_ai and integrate_past_data_with_main_ai fall back to until a symbol publishes its own model.
+LEGACY_SCALER_FILES = {
+    "ai_models/scaler.npy": (GLOBAL_SYMBOL, "main"),
+    "ai_models/scaler_past.npy": (GLOBAL_SYMBOL, "past_data"),
+}
+
+def migrate_legacy_scaler(npy_path, symbol, kind, version=DEFAULT_MODEL_VERSION):
+    """
+    Converts a pickled sklearn MinMaxScaler (np.save) into the array-backed format.
+    """
+    scaler = np.load(npy_path, allow_pickle=True).item()
+    return save_scaler(symbol, kind, scaler.min_, scaler.scale_, version)
+
+def migrate_legacy_scalers(legacy_files=LEGACY_SCALER_FILES):
+    """
+    Migrates every legacy scaler that exists as version 1 (the legacy model's version) and as the
+    staging scaler, so the next training run continues from it. Returns the written paths.
+    """
+    written = []
+    for legacy_path, (symbol, kind) in legacy_files.items():
+        if os.path.exists(legacy_path):
+            written += [migrate_legacy_scaler(legacy_path, symbol, kind, version)
+                        for version in (DEFAULT_MODEL_VERSION, STAGING_VERSION)]
+    return written
+
+if __name__ == "__main__":
+    for path in migrate_legacy_scalers():
+        print(f"💾 Migrated legacy scaler -> {path}")
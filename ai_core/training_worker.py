@@ -0,0 +1,143 @@
+import os
+import time
+import multiprocessing as mp
+
+DEFAULT_WORKER_SETTINGS = {
+    "enabled": True,
+    "interval": 300,          # Seconds between training rounds
+    "cpu_affinity": None,     # e.g. [3] to pin training to the last core, away from the trading loop
+    "threads": 1,             # TensorFlow / BLAS thread pool size inside the worker
+    "nice": 10,               # Lower scheduling priority than the trading process
+    "train_past_data": False, # Also retrain the per-symbol past-data models every round
+    "restart_backoff": 30,    # Seconds before restarting a dead worker, doubled for every recent restart
+    "max_restarts": 5,        # Restarts within restart_window before the trading process gives up on training
+    "restart_window": 3600,
+}
+
+# ✅ Load Worker Settings
+def load_worker_settings():
+    """ Plain dict (not the frozen config snapshot) so it can be pickled into the spawned worker """
+    from config_manager import get_config, thaw
+    settings = thaw(get_config().get("training_worker", {}))
+    return {**DEFAULT_WORKER_SETTINGS, **settings}
+
+# ✅ Restrict the Worker to its Own CPUs & Thread Budget
+def limit_worker_resources(settings):
+    """ Must run before TensorFlow/NumPy are imported in the worker process """
+    threads = str(settings["threads"])
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[var] = threads
+
+    if settings.get("cpu_affinity") and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, set(settings["cpu_affinity"]))
+    if settings.get("nice") and hasattr(os, "nice"):
+        os.nice(settings["nice"])
+
+# ✅ Worker Process Entry Point
+def training_worker_main(settings, stop_event):
+    """
+    Runs the training rounds. New models are published through model_registry.publish_model
+    (atomic rename + manifest), which is how the trading process learns about them.
+    """
+    limit_worker_resources(settings)
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(settings["threads"])
+    tf.config.threading.set_inter_op_parallelism_threads(settings["threads"])
+
+    from logs.logger import log_message
+
+    log_message(f"🏋 Training Worker Started (PID {os.getpid()}, CPUs: {settings.get('cpu_affinity') or 'all'}, Threads: {settings['threads']})")
+    while not stop_event.is_set():
+        started = time.time()
+        try:
+            # Imported per round: a broken training module fails the round, not the worker
+            from ai_core.ai_learning import train_ai
+            from ai_core.past_data_ai import run_past_data_ai
+            train_ai()
+            if settings.get("train_past_data"):
+                run_past_data_ai()
+        except Exception as e:
+            log_message(f"❌ ERROR: Training round failed - {str(e)}", level="error")
+        finally:
+            tf.keras.backend.clear_session()
+
+        log_message(f"🏋 Training Round Finished in {time.time() - started:.1f}s")
+        stop_event.wait(settings["interval"])
+    log_message("🛑 Training Worker Stopped")
+
+# ✅ Start / Stop the Worker from the Trading Process
+def start_training_worker(settings=None):
+    """ Spawns the training worker (spawn start method: no forked TensorFlow state) """
+    settings = settings or load_worker_settings()
+    ctx = mp.get_context("spawn")
+    stop_event = ctx.Event()
+    process = ctx.Process(target=training_worker_main, args=(settings, stop_event), name="training-worker", daemon=True)
+    process.start()
+    return process, stop_event
+
+def stop_training_worker(worker, timeout=30):
+    process, stop_event = worker
+    stop_event.set()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+
+# ✅ Keep the Worker Running (restarts with a growing delay and a cap, so a crashing worker is not respawned on every bar)
+class TrainingSupervisor:
+    def __init__(self, settings, start=start_training_worker, stop=stop_training_worker):
+        self.settings = settings
+        self._start, self._stop = start, stop
+        self.worker = None
+        self.restarts = []        # Monotonic times of recent restarts
+        self.exited_at = None     # When the current dead worker was noticed
+        self.gave_up = False
+
+    def start(self):
+        self.worker = self._start(self.settings)
+        return self
+
+    def check(self, now=None):
+        """ Called once per tick: restarts a dead worker once its backoff has passed; returns True while a worker runs """
+        from logs.logger import log_message
+
+        if self.worker is None or self.gave_up:
+            return False
+        process = self.worker[0]
+        if process.is_alive():
+            return True
+
+        now = time.monotonic() if now is None else now
+        settings = self.settings
+        self.restarts = [t for t in self.restarts if now - t < settings["restart_window"]]
+        if len(self.restarts) >= settings["max_restarts"]:
+            log_message(f"❌ ERROR: Training worker failed {len(self.restarts)} times in {settings['restart_window']}s. "
+                        "Not restarting it; models stay at their last published version.", level="error")
+            self.gave_up = True
+            return False
+
+        delay = settings["restart_backoff"] * 2 ** (len(self.restarts) - 1) if self.restarts else 0
+        if self.exited_at is None:
+            self.exited_at = now
+            log_message(f"⚠ Training worker exited (code {process.exitcode}). Restarting in {delay:.0f}s...", level="warning")
+        if now - self.exited_at < delay:
+            return False
+
+        self.restarts.append(now)
+        self.exited_at = None
+        self.worker = self._start(settings)
+        return True
+
+    def stop(self):
+        if self.worker is not None:
+            self._stop(self.worker)
+            self.worker = None
+
+if __name__ == "__main__":
+    worker = start_training_worker()
+    try:
+        worker[0].join()
+    except KeyboardInterrupt:
+        stop_training_worker(worker)
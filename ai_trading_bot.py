@@ -1,121 +1,184 @@
 import time
-import os
-import json
+import argparse
 import numpy as np
-import tensorflow as tf
-import matplotlib.pyplot as plt  # ✅ Added visualization support
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from tensorflow.keras.callbacks import EarlyStopping
-from sklearn.preprocessing import MinMaxScaler
-
-# ✅ Import all necessary modules
+from config_manager import get_config, start_watching
+
+# ✅ Import all necessary modules (heavy libraries such as TensorFlow are only imported on first use)
 from ai_core.past_data_ai import integrate_past_data_with_main_ai
-from ai_core.backtest_ai import run_full_backtest  # ✅ Backtesting module
-from data_feeds.news_sentiment import fetch_news_sentiment
+from ai_core.model_registry import get_registry
+from ai_core.training_worker import TrainingSupervisor, load_worker_settings
+from ai_core.scaler_store import GLOBAL_SYMBOL
+from ai_core.numpy_inference import NumpyModel
+from ai_core.features import model_input
+from data_feeds.news_sentiment import fetch_news_sentiment, get_sentiment_analyzer
 from data_feeds.order_flow_analysis import fetch_order_flow
+from data_feeds.feed_cache import log_cache_stats
 from trade_execution.trade_execution import execute_trade
 from trade_execution.risk_management import calculate_lot_size
-from maths_engine.maths import calculate_volatility, adaptive_risk_factor
-from visualizations.pattern_recognition import plot_patterns
+from maths_engine.maths import symbol_volatility, adaptive_risk_factor
 from logs.logger import log_message
+from logs.trade_records import RecordArray, SIGNAL_DTYPE
+from monitoring.metrics import span, increment, start_metrics, dump_metrics
+from monitoring.tracing import add_trace_arguments, configure_tracing
+from monitoring.recorder import add_record_arguments, configure_recording, record_event
+from monitoring.memory import add_memory_arguments, configure_memory_tracking, start_memory_tracking, check_memory
+from trade_execution.scheduler import BarScheduler
+
+MODEL_KIND = "main"
+
+_model_predictor = None
+
+# ✅ Model Call compiled once (a tf.function created per call would be retraced on every decision)
+def get_model_predictor():
+    global _model_predictor
+    if _model_predictor is None:
+        import tensorflow as tf
+
+        @tf.function(reduce_retracing=True)
+        def ai_predict(model, input_data):
+            return model(input_data)
+        _model_predictor = ai_predict
+    return _model_predictor
+
+def predict_confidence(model, input_data):
+    """ First output for one input row; NumPy-backend models are called directly, so TensorFlow is never imported for them """
+    if isinstance(model, NumpyModel):
+        output = model.predict(input_data)
+    else:
+        output = get_model_predictor()(model, input_data).numpy()
+    return float(np.asarray(output).reshape(-1)[0])
 
-CONFIG_FILE = "config.json"
-TRADE_HISTORY_FILE = "logs/trade_history.json"
-MODEL_FILE = "ai_models/ai_model.keras"
-SCALER_FILE = "ai_models/scaler.npy"
-
-prev_confidence = 0.5  # Initial value for EMA smoothing
-
-# ✅ Load Configurations
-def load_config():
-    try:
-        with open(CONFIG_FILE, "r") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        log_message("❌ ERROR: Invalid or missing config.json!", level="error")
-        exit()
-
-config = load_config()
-
-# ✅ AI Training Function
+# ✅ AI Training Function (runs inline only when the training worker is disabled)
 def train_ai():
     log_message("🔄 Training AI Model...")
-    # Placeholder for AI training function
+    try:
+        from ai_core.ai_learning import train_ai as train_main_model
+        train_main_model()
+    except Exception as e:
+        log_message(f"❌ ERROR: AI Model Training failed - {type(e).__name__}: {e}", level="error")
+        return
     log_message("💾 AI Model Training Completed.")
 
 # ✅ AI Confidence Calculation with Market Volatility Integration
 def ai_trade_confidence(symbol):
-    if not os.path.exists(MODEL_FILE):
-        log_message("⚠ No AI model found! Training now...")
-        train_ai()
-    
-    model = load_model(MODEL_FILE)
-    order_flow = float(fetch_order_flow(symbol) or 0.0)
-    news_sentiment_list = fetch_news_sentiment(symbol)  # Get the list of news
-    if isinstance(news_sentiment_list, list) and len(news_sentiment_list) > 0:
-        news_sentiment = np.mean([SentimentIntensityAnalyzer().polarity_scores(headline)['compound'] for headline in news_sentiment_list])
-    else:
-        news_sentiment = 0.0  # Default sentiment score if no news available
-    past_insights = np.array(integrate_past_data_with_main_ai(), dtype=np.float32).item()
+    model = get_registry().get_latest(GLOBAL_SYMBOL, MODEL_KIND)  # ✅ Cached; new versions are swapped in by the registry
+    if model is None:
+        log_message("⚠ No AI model published yet! Waiting for the training worker...", level="warning")
+        return 0.0
+
+    with span("order_flow", symbol):
+        order_flow = float(fetch_order_flow(symbol) or 0.0)
+    with span("news_sentiment", symbol):
+        news_sentiment_list = fetch_news_sentiment(symbol)  # Get the list of news
+        if isinstance(news_sentiment_list, list) and len(news_sentiment_list) > 0:
+            analyzer = get_sentiment_analyzer()
+            news_sentiment = np.mean([analyzer.polarity_scores(headline)['compound'] for headline in news_sentiment_list])
+        else:
+            news_sentiment = 0.0  # Default sentiment score if no news available
+    with span("past_data_insights", symbol):
+        past_insights = np.array(integrate_past_data_with_main_ai(symbol), dtype=np.float32).item()
     
     # ✅ Market Volatility Integration
-    market_volatility = calculate_volatility(symbol)
-    risk_factor = adaptive_risk_factor(symbol)
+    with span("volatility", symbol):
+        market_volatility = symbol_volatility(symbol) or 0.0
+        risk_factor = adaptive_risk_factor(symbol)
 
-    log_message(f"📊 DEBUG: Order Flow = {order_flow}, News Sentiment = {news_sentiment}, Volatility = {market_volatility}")
+    log_message(f"📊 DEBUG: Order Flow = {order_flow}, News Sentiment = {news_sentiment}, Volatility = {market_volatility}", level="debug")
 
     if order_flow == 0.0 and news_sentiment == 0.0:
         log_message(f"⚠ No market data for {symbol}. Skipping trade decision.")
         return 0.0
 
-    input_data = np.array([[order_flow, news_sentiment, past_insights, market_volatility, risk_factor]], dtype=np.float32)
-    
-    # ✅ Reduce TensorFlow retracing warnings
-    @tf.function(reduce_retracing=True)
-    def ai_predict(model, input_data):
-        return model(input_data.reshape(1, 1, -1))
+    input_data = model_input(order_flow, news_sentiment, past_insights, market_volatility, risk_factor)
 
-    confidence = ai_predict(model, input_data)
-    log_message(f"🔍 DEBUG: AI Confidence for {symbol} = {confidence.numpy()[0][0]}")
-    return confidence.numpy()[0][0]
+    with span("model_predict", symbol):
+        confidence = predict_confidence(model, input_data)
+    log_message(f"🔍 DEBUG: AI Confidence for {symbol} = {confidence}", level="debug")
+    return confidence
 
-# ✅ AI Trading Decision with Dynamic Lot Sizing
-def ai_trade_decision(symbol):
-    confidence = ai_trade_confidence(symbol)
-    lot_size = calculate_lot_size(symbol)
+# ✅ AI Trade Signal with Dynamic Lot Sizing (no execution; shard workers send this to the coordinator)
+def decide_trade(symbol):
+    """ Returns (action or None, lot_size, confidence) """
+    with span("confidence_total", symbol):
+        confidence = float(ai_trade_confidence(symbol))
+    config = get_config()
+    with span("lot_size", symbol):
+        lot_size = calculate_lot_size(config["account_balance"], config["risk_percentage"])
 
     spread = fetch_order_flow(symbol)
-    log_message(f"🔍 DEBUG: Market Spread for {symbol} = {spread}")
+    log_message(f"🔍 DEBUG: Market Spread for {symbol} = {spread}", level="debug")
+    return ("BUY" if confidence > 0.5 else None), lot_size, confidence
 
-    if confidence > 0.5:
+# ✅ AI Trading Decision with Dynamic Lot Sizing
+def ai_trade_decision(symbol):
+    action, lot_size, _ = decide_trade(symbol)
+    if action == "BUY":
         log_message(f"✅ AI Confident: Executing BUY for {symbol}")
         execute_trade(symbol, "BUY", lot_size)
         return "BUY"
 
-# ✅ AI Learning & Visualization Loop
+# ✅ One Scheduled Decision for a Symbol (runs on a scheduler worker thread)
+def run_symbol_decision(symbol):
+    log_message(f"📈 DEBUG: Checking AI trade decision for {symbol}", level="debug")
+    with span("decision_total", symbol):
+        trade_action = ai_trade_decision(symbol)
+    increment("decisions", symbol, trade_action or "NONE")
+    record_event("decision", symbol, trade_action)  # ✅ Replay re-runs this decision from the recorded inputs
+    return trade_action
+
+# ✅ AI Learning & Visualization Loop (one decision per symbol at every bar close)
 def run_ai_learning():
     log_message("🤖 AI Learning Module Running...")
-    all_trades = []
+    start_watching()  # ✅ Pick up config.json edits without a restart
+    metrics_settings = start_metrics(get_config().get("metrics"))  # ✅ No-op spans unless metrics are enabled
+    start_memory_tracking(get_config().get("memory_tracker"))  # ✅ Opt-in; check_memory() is a no-op otherwise
+    scheduler = BarScheduler.from_config(get_config().get("scheduler"), name="decision")
+    all_trades = RecordArray(SIGNAL_DTYPE)
+
+    # ✅ Training runs in its own process; the scheduler below only makes decisions
+    worker_settings = load_worker_settings()
+    training = TrainingSupervisor(worker_settings).start() if worker_settings["enabled"] else None
+
+    def check_training():
+        if training is None:
+            train_ai()
+        else:
+            training.check()
+
+    def symbol_jobs():
+        return {symbol: (lambda symbol=symbol: run_symbol_decision(symbol))
+                for symbol in get_config().get("trading_pairs", [])}
+
+    def collect_results(results):
+        now = time.time()
+        all_trades.extend([{"time": now, "symbol": symbol, "action": action} for symbol, action in results.items() if action])
+
+        if metrics_settings["enabled"] and metrics_settings.get("dump_file"):
+            dump_metrics(metrics_settings["dump_file"])
+        check_memory()
 
-    while True:
-        log_message("🔄 DEBUG: AI training iteration started")
-        train_ai()
-        log_message("🔄 DEBUG: AI training iteration completed")
-
-        for symbol in config.get("trading_pairs", []):
-            log_message(f"📈 DEBUG: Checking AI trade decision for {symbol}")
-            trade_action = ai_trade_decision(symbol)
-
-            if trade_action:
-                all_trades.append((symbol, trade_action))
-
-        # ✅ Generate Trade Visualization Every 10 Iterations
-        if len(all_trades) % 10 == 0:
-            plot_trade_signals(all_trades)
-
-        time.sleep(300)
+    try:
+        scheduler.run(symbol_jobs, on_tick=check_training, after_tick=collect_results)
+    finally:
+        log_cache_stats()
+        if training is not None:
+            training.stop()
 
 if __name__ == "__main__":
-    run_ai_learning()
+    parser = add_memory_arguments(add_record_arguments(add_trace_arguments(argparse.ArgumentParser(description="AI trading bot decision loop"))))
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run as separate ingest / inference / execution processes (see pipeline/supervisor.py)")
+    parser.add_argument("--sharded", action="store_true",
+                        help="Spread trading_pairs over worker processes behind one risk gate (see pipeline/coordinator.py)")
+    args = parser.parse_args()
+    configure_tracing(args)
+    configure_recording(args)
+    configure_memory_tracking(args)
+    if args.pipeline:
+        from pipeline.supervisor import run_pipeline
+        run_pipeline()
+    elif args.sharded:
+        from pipeline.coordinator import run_cluster
+        run_cluster()
+    else:
+        run_ai_learning()
@@ -1,54 +1,54 @@
+import sys
 import os
 import json
 import numpy as np
-import pandas as pd
-import yfinance as yf
-import matplotlib.pyplot as plt
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
-from datetime import datetime, timedelta
 
-CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "config.json")
-BACKTEST_RESULTS_FILE = "../logs/backtest_results.json"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from config_manager import get_config, REPO_ROOT
+from ai_core.scaler_store import fit_minmax
+from data_feeds.history_cache import get_history, load_history_settings
+from ai_core.prediction_cache import cached_predictions, load_prediction_cache_settings
+from backtesting.exits import load_backtest_settings, simulate_exits, EXIT_REASONS
+from backtesting.metrics import compute_metrics, metrics_row, equity_from_trades, position_from_trades
+from logs.logger import log_backtest_results
 
-# ✅ Load Configurations
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
+BACKTEST_RESULTS_FILE = "../logs/backtest_results.json"
+MODEL_FILE = "../ai_models/ai_model.keras"
+PREDICTION_CACHE_DIR = "../ai_models/predictions"
 
-config = load_config()
+# ✅ Historical Data from the shared local store (only ranges not downloaded before are fetched)
+def history_settings():
+    """ config history_cache settings; relative store paths point into the repository, whatever the working directory """
+    settings = load_history_settings()
+    return load_history_settings({key: os.path.join(REPO_ROOT, settings[key])
+                                  for key in ("directory", "fixture_dir") if not os.path.isabs(settings[key])})
 
-# ✅ Automatically Fetch Historical Data
-def fetch_historical_data(symbol):
+def fetch_historical_data(symbol, years=5):
     print(f"📊 Fetching Historical Data for {symbol}...")
-    end_date = datetime.today().strftime('%Y-%m-%d')
-    start_date = (datetime.today() - timedelta(days=5*365)).strftime('%Y-%m-%d')  # Last 5 years
-    
     try:
-        df = yf.download(symbol, start=start_date, end=end_date)
+        df = get_history(symbol, interval="1d", years=years, settings=history_settings())
         if df.empty:
             print(f"⚠ No data found for {symbol}.")
             return None
-        df.reset_index(inplace=True)
-        df.to_csv(f"../data_feeds/historical_data/{symbol}.csv", index=False)
-        return df
+        return df.rename(columns={"time": "Date", "open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"})
     except Exception as e:
         print(f"⚠ Error fetching data: {e}")
         return None
 
-# ✅ AI Model Prediction
+# ✅ AI Model Prediction (cached per model file, scaler & data; the model is only loaded on a miss)
 def ai_predict(symbol, data):
-    model_path = f"../ai_models/ai_model.keras"
-    if not os.path.exists(model_path):
+    if not os.path.exists(MODEL_FILE):
         print(f"⚠ AI Model not found! Train AI before running backtest.")
         return None
 
-    model = load_model(model_path)
-    scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data)
-    predictions = model.predict(scaled_data.reshape(len(data), 1, -1))
+    def load_model():
+        from tensorflow.keras.models import load_model
+        return load_model(MODEL_FILE)
 
-    return predictions.flatten()
+    data = np.asarray(data, dtype=np.float32)
+    scaler = fit_minmax(data)  # Min-max over the backtested history (one NumPy pass, no sklearn object)
+    settings = load_prediction_cache_settings({"directory": PREDICTION_CACHE_DIR})
+    return cached_predictions(symbol, "backtest", MODEL_FILE, data, scaler, load_model, settings)
 
 # ✅ Automated Backtesting Function
 def run_backtest(symbol):
@@ -64,18 +64,41 @@ def run_backtest(symbol):
     df['Trade'] = np.where(df['AI_Signal'] > 0.7, 'BUY',
                            np.where(df['AI_Signal'] < 0.3, 'SELL', 'HOLD'))
 
-    df['PnL'] = np.where(df['Trade'] == 'BUY', df['Close'].shift(-1) - df['Close'],
-                         np.where(df['Trade'] == 'SELL', df['Close'] - df['Close'].shift(-1), 0))
+    settings = load_backtest_settings()
+    if settings["exit_mode"] == "sl_tp":
+        # ✅ Every signal opens a position that is closed intrabar by its SL / TP (or trailing stop)
+        entries = np.nonzero((df['Trade'] != 'HOLD').to_numpy())[0]
+        exits = simulate_exits(df, entries, np.where(df['Trade'].to_numpy()[entries] == 'BUY', 1.0, -1.0), settings)
+        pnl, exit_reason = np.zeros(len(df)), np.full(len(df), "", dtype=object)
+        pnl[entries] = exits["direction"] * (exits["exit_price"] - exits["entry_price"])
+        exit_reason[entries] = np.array(EXIT_REASONS, dtype=object)[exits["reason"]]
+        df['PnL'], df['Exit'] = pnl, exit_reason
+        trade_pnl = pnl[entries]
+        booked = equity_from_trades(len(df), exits["exit_index"], trade_pnl, 0.0)  # P&L counted when the trade closes
+        held = position_from_trades(len(df), entries, exits["exit_index"], exits["direction"])
+    else:
+        df['PnL'] = np.where(df['Trade'] == 'BUY', df['Close'].shift(-1) - df['Close'],
+                             np.where(df['Trade'] == 'SELL', df['Close'] - df['Close'].shift(-1), 0))
+        df['Exit'] = np.where(df['Trade'] != 'HOLD', "next_close", "")
+        trade_pnl = df['PnL'].to_numpy()[(df['Trade'] != 'HOLD').to_numpy()]
+        booked = np.concatenate(([0.0], np.nancumsum(df['PnL'].to_numpy())[:-1]))  # Realized on the next bar
+        held = np.concatenate(([0.0], np.where(df['Trade'] == 'BUY', 1.0, np.where(df['Trade'] == 'SELL', -1.0, 0.0))[:-1]))
 
-    df[['Date', 'Close', 'Trade', 'PnL']].to_csv(f"../logs/backtest_{symbol}.csv", index=False)
+    df[['Date', 'Close', 'Trade', 'PnL', 'Exit']].to_csv(f"../logs/backtest_{symbol}.csv", index=False)
 
+    # ✅ Equity of one unit traded per signal, starting from the first close
+    equity = df['Close'].iloc[0] + booked
+    metrics = metrics_row(compute_metrics(equity, held * df['Close'].to_numpy() / equity, trade_pnl))
     results = {
         "symbol": symbol,
         "total_trades": len(df[df['Trade'] != 'HOLD']),
         "total_profit": df['PnL'].sum(),
         "win_rate": (df['PnL'] > 0).sum() / max(1, len(df[df['Trade'] != 'HOLD'])),
-        "average_pnl": df['PnL'].mean()
+        "average_pnl": df['PnL'].mean(),
+        **{name: metrics[name] for name in ("sharpe", "sortino", "max_drawdown", "max_drawdown_bars",
+                                           "profit_factor", "exposure", "turnover")},
     }
+    log_backtest_results(symbol, results["total_profit"], round(results["win_rate"] * 100, 2), round(metrics["max_drawdown"] * 100, 2))
 
     with open(BACKTEST_RESULTS_FILE, "w") as file:
         json.dump(results, file, indent=4)
@@ -84,6 +107,6 @@ def run_backtest(symbol):
 
 # ✅ Self-Running Backtesting for All Trading Pairs
 if __name__ == "__main__":
-    trading_pairs = config["trading_pairs"]
+    trading_pairs = get_config()["trading_pairs"]
     for symbol in trading_pairs:
         run_backtest(symbol)
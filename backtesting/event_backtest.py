@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import time
+import tempfile
+from collections import Counter, deque
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from backtesting.simulated_broker import DEFAULT_BROKER_SETTINGS
+
+# ✅ Event-Driven Backtest through the Live Decision Path
+# Bars are replayed one at a time through ai_trading_bot.run_symbol_decision (feature assembly,
+# inference, calculate_lot_size, validate_trade_risk, send_trade_action) with a SimulatedBroker
+# installed as MetaTrader5. Inputs that only exist live (Binance order book, news headlines) are
+# served from the bars through the recorder's simulate mode. Every symbol runs in its own spawned
+# process (the broker, feed cache and recorder state are process-wide).
+DEFAULT_SIMULATION_SETTINGS = {
+    "source": "synthetic",           # "synthetic" (data_feeds/synthetic_market.py) or "csv" (data_storage/{symbol}.csv)
+    "timeframe": "M1",               # Synthetic bar size
+    "bars": 2000,                    # Bars replayed per symbol (the newest ones of a CSV)
+    "warmup_bars": 100,              # History fetch_price_data() sees before the first decision
+    "seed": 42,                      # Synthetic market & np.random (adaptive_risk_factor)
+    "speed": None,                   # None: as fast as possible; 1.0: bars paced in real time, 60: a minute of bars per second
+    "workers": None,                 # Symbol processes run in parallel (None: one per symbol, up to the CPU count)
+    "threads": 1,                    # TensorFlow / BLAS threads per process
+    "initial_balance": None,         # None: config account_balance
+    "log_file": "logs/simulation_log.txt",
+    "results_file": "logs/simulation_results.json",
+    **DEFAULT_BROKER_SETTINGS,
+}
+DATA_STORAGE = "data_storage"
+
+def load_simulation_settings(settings=None):
+    from config_manager import get_config, thaw
+    return {**DEFAULT_SIMULATION_SETTINGS, **thaw(get_config().get("simulation") or {}), **(settings or {})}
+
+# ✅ Bars
+def load_simulation_bars(symbol, settings):
+    """ BAR_DTYPE array of warmup_bars + bars bars """
+    from data_feeds.synthetic_market import SyntheticMarket, BAR_DTYPE, DEFAULT_SYNTHETIC_SETTINGS
+
+    total = settings["warmup_bars"] + settings["bars"]
+    if settings["source"] == "synthetic":
+        return SyntheticMarket([symbol], seed=settings["seed"], timeframe=settings["timeframe"]).bars(total)[symbol]
+
+    import pandas as pd
+    df = pd.read_csv(os.path.join(DATA_STORAGE, f"{symbol}.csv")).tail(total)
+    df.columns = [col.lower().strip() for col in df.columns]
+    bars = np.zeros(len(df), BAR_DTYPE)
+    bars["time"] = pd.to_datetime(df["time"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+    for field in ("open", "high", "low", "close"):
+        bars[field] = df[field].to_numpy(dtype=np.float64)
+    bars["tick_volume"] = df["volume"].to_numpy() if "volume" in df.columns else 0
+    bars["spread"] = df["spread"].to_numpy() if "spread" in df.columns else DEFAULT_SYNTHETIC_SETTINGS["spread_points"]
+    return bars
+
+# ✅ Simulated Inputs (recorder simulate mode)
+def simulated_inputs(broker, symbol):
+    def provide(source, key):
+        if source == "order_flow":
+            return broker.order_book(symbol)
+        if source == "news":
+            return []  # No historical headlines: the live code treats this as neutral sentiment
+        return NotImplemented  # Prices, rates, volatility, risk factor: the live code asks the broker
+    return provide
+
+# ✅ One Symbol's Event Loop (runs inside the symbol's process)
+def run_simulation(symbol, bars, settings):
+    from benchmarks.fake_mt5 import install, uninstall
+    from backtesting.simulated_broker import SimulatedBroker
+    from backtesting.metrics import compute_metrics, metrics_row, periods_per_year
+    from config_manager import get_config
+    from data_feeds.feed_cache import invalidate
+    from monitoring.recorder import start_simulation, stop_simulation
+    from ai_trading_bot import run_symbol_decision
+
+    balance = float(settings["initial_balance"] or get_config()["account_balance"])
+    broker = install(SimulatedBroker({symbol: bars}, balance, settings))
+    np.random.seed(settings["seed"])
+    start_simulation(simulated_inputs(broker, symbol))
+
+    first = min(settings["warmup_bars"], len(bars) - 1)
+    equity = np.full(len(bars) - first, balance)
+    invested = np.zeros(len(bars) - first)
+    closed, actions, counts, fills = [], Counter(), Counter(), Counter()
+    events, pending = deque(), []
+    spacing = float(np.median(np.diff(bars["time"]))) if len(bars) > 1 else 0.0
+    bar_seconds = spacing / settings["speed"] if settings["speed"] else 0.0
+
+    started = time.perf_counter()
+    try:
+        for index in range(first, len(bars)):
+            if bar_seconds:
+                delay = (index - first) * bar_seconds - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            events.append(("bar", index))
+            while events:
+                kind, payload = events.popleft()
+                counts[kind] += 1
+                if kind == "bar":
+                    broker.advance(symbol, payload)
+                    invalidate()  # Feed cache TTLs are wall-clock: every bar is a fresh tick
+                    events.extend(("order", instruction) for instruction in pending)  # Filled at this bar's open
+                    events.append(("market", payload))
+                    pending = []
+                elif kind == "order":
+                    events.append(("fill", broker.execute(payload)))
+                elif kind == "fill":
+                    fills["rejected" if payload is None else "filled"] += 1
+                elif kind == "market":
+                    events.extend(("exit", position) for position in broker.check_exits(symbol))
+                    events.append(("decision", payload))
+                elif kind == "exit":
+                    closed.append(payload)
+                elif kind == "decision":
+                    action = run_symbol_decision(symbol)
+                    actions[action or "NONE"] += 1
+                    events.extend(("instruction", instruction) for instruction in broker.take_instructions())
+                elif kind == "instruction":
+                    pending.append(payload)
+
+            equity[index - first] = broker.mark()
+            invested[index - first] = broker.exposure(symbol) / equity[index - first]
+    finally:
+        stop_simulation()
+        uninstall()
+    elapsed = time.perf_counter() - started
+
+    trade_pnl = np.array([position["profit"] for position in closed])
+    metrics = metrics_row(compute_metrics(equity, invested, trade_pnl, periods=periods_per_year(bars["time"][first:])))
+    processed = sum(counts.values())
+    return {
+        "symbol": symbol,
+        "bars": len(bars) - first,
+        "decisions": dict(actions),
+        "orders": counts["order"],
+        "filled": fills["filled"],
+        "rejected": fills["rejected"],
+        "closed_trades": len(closed),
+        "exit_reasons": dict(Counter(position["reason"] for position in closed)),
+        "open_positions": len(broker.positions),
+        "initial_balance": balance,
+        "final_equity": float(equity[-1]),
+        "profit": float(equity[-1] - balance),
+        "metrics": metrics,
+        "events": processed,
+        "event_counts": dict(counts),
+        "seconds": elapsed,
+        "events_per_second": processed / elapsed if elapsed else 0.0,
+        "bars_per_second": (len(bars) - first) / elapsed if elapsed else 0.0,
+        "equity": equity,
+        "trades": broker.trades.to_array(),
+    }
+
+# ✅ Symbol Process Entry Point (spawned: TensorFlow, the broker and the recorder state stay per process)
+def simulate_symbol(symbol, settings, config_file):
+    os.environ["TRADING_BOT_CONFIG"] = config_file  # Before anything imports config_manager
+    from ai_core.training_worker import limit_worker_resources
+    limit_worker_resources({"threads": settings["threads"]})
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(settings["threads"])
+    tf.config.threading.set_inter_op_parallelism_threads(settings["threads"])
+    tf.keras.utils.disable_interactive_logging()
+
+    return run_simulation(symbol, load_simulation_bars(symbol, settings), settings)
+
+def write_simulation_config(path, settings):
+    """ The live config with a quiet log of its own and placeholder MT5 credentials for the simulated terminal """
+    from config_manager import get_config, thaw
+
+    config = thaw(get_config())
+    for key, value in (("mt5_login", 0), ("mt5_server", "simulated"), ("mt5_password", "")):
+        config.setdefault(key, value)
+    config["logging"] = {**config.get("logging", {}), "console": False, "log_file": settings["log_file"]}
+    config["metrics"] = {**config.get("metrics", {}), "enabled": False}
+    with open(path, "w") as file:
+        json.dump(config, file, indent=4)
+    return path
+
+# ✅ Parallel Runs (one process per symbol)
+def run_simulations(symbols=None, settings=None):
+    """ Returns {symbol: result} for every symbol that finished, and a summary with the events per second """
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+    from config_manager import get_config
+    from logs.logger import log_message
+
+    settings = load_simulation_settings(settings)
+    symbols = list(symbols or get_config()["trading_pairs"])
+    workers = settings["workers"] or min(len(symbols), os.cpu_count() or 1)
+    log_message(f"🎬 Event-driven backtest of {len(symbols)} symbol(s), {settings['bars']} bars each, "
+                f"{workers} process(es), speed {settings['speed'] or 'max'}")
+
+    results = {}
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="tb-simulation-") as folder:
+        config_file = write_simulation_config(os.path.join(folder, "config.json"), settings)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            futures = {symbol: pool.submit(simulate_symbol, symbol, settings, config_file) for symbol in symbols}
+            for symbol, future in futures.items():
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    log_message(f"❌ ERROR: Simulation of {symbol} failed - {type(e).__name__}: {e}", level="error")
+    elapsed = time.perf_counter() - started
+
+    events = sum(result["events"] for result in results.values())
+    summary = {
+        "symbols": len(results),
+        "failed": len(symbols) - len(results),
+        "workers": workers,
+        "events": events,
+        "seconds": elapsed,
+        "events_per_second": events / elapsed if elapsed else 0.0,  # Wall clock incl. process start-up
+    }
+    for symbol, result in results.items():
+        metrics = result["metrics"]
+        log_message(f"📊 {symbol}: {result['bars']} bars, {result['orders']} orders ({result['rejected']} rejected), "
+                    f"{result['closed_trades']} closed trades, profit ${result['profit']:.2f}, Sharpe {metrics['sharpe']:.2f}, "
+                    f"max DD {metrics['max_drawdown']:.2%}, {result['events_per_second']:,.0f} events/s")
+    log_message(f"⚡ {events} events in {elapsed:.1f}s ({summary['events_per_second']:,.0f} events/s over {workers} process(es))")
+
+    if settings.get("results_file"):
+        os.makedirs(os.path.dirname(settings["results_file"]) or ".", exist_ok=True)
+        report = {symbol: {key: value for key, value in result.items() if key not in ("equity", "trades")}
+                  for symbol, result in results.items()}
+        with open(settings["results_file"], "w") as file:
+            json.dump({"summary": summary, "results": report}, file, indent=4)
+    return results, summary
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay bars through the live decision path against a simulated broker")
+    parser.add_argument("--symbols", nargs="+", default=None, help="Default: config trading_pairs")
+    parser.add_argument("--source", choices=["synthetic", "csv"], default=None)
+    parser.add_argument("--bars", type=int, default=None)
+    parser.add_argument("--speed", type=float, default=None, help="Bar pacing (1.0 = real time); default as fast as possible")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel symbol processes")
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in ("source", "bars", "speed", "workers") if getattr(args, name) is not None}
+    _, summary = run_simulations(args.symbols, overrides)
+    print(f"🎬 Simulation: {summary}")
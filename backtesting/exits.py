@@ -0,0 +1,165 @@
+import os
+import sys
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+DEFAULT_BACKTEST_SETTINGS = {
+    "exit_mode": "sl_tp",            # "sl_tp": intrabar stop / target / trailing exits, "signal": exit on the opposite signal
+    "atr_period": 14,
+    "stop_loss_factor": 1.0,         # Distances in ATRs (live SL/TP: volatility * risk factor, target at 1:2)
+    "take_profit_factor": 2.0,
+    "trailing_stop_factor": None,    # e.g. 1.5: stop follows the best price by 1.5 ATR (never loosens)
+    "max_holding_bars": None,        # Close at the bar close after this many bars
+    "same_bar_policy": "stop",       # Stop and target inside one bar: "stop" (conservative) or "target" first
+    "scan_bars": 16,                 # First look-ahead window per position; doubles for positions still open
+    "chunk_positions": 4096,         # Positions scanned together (memory: chunk x window floats)
+}
+
+MAX_SCAN_CELLS = 1 << 21             # Positions x bars compared per block (bounds the temporary arrays to ~16 MB each)
+
+# ✅ Exit Reasons
+EXIT_END, EXIT_STOP, EXIT_TARGET, EXIT_TRAILING, EXIT_TIME = range(5)
+EXIT_REASONS = ("end", "stop_loss", "take_profit", "trailing_stop", "time")
+
+def load_backtest_settings(settings=None):
+    from config_manager import get_config
+    return {**DEFAULT_BACKTEST_SETTINGS, **(get_config().get("backtest") or {}), **(settings or {})}
+
+def atr_array(high, low, close, period=14):
+    """ ATR for every bar (rolling mean of the true range, like calculate_volatility); NaN for the first period-1 bars """
+    high, low, close = (np.asarray(values, dtype=np.float64) for values in (high, low, close))
+    previous_close = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    sums = np.cumsum(np.concatenate(([0.0], true_range)))
+    atr = np.full(len(close), np.nan)
+    atr[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return atr
+
+def sl_tp_levels(entry_price, direction, atr, settings=None):
+    """ (stop_loss, take_profit, trailing distance or None) arrays for entries at entry_price, direction +1 long / -1 short """
+    settings = {**DEFAULT_BACKTEST_SETTINGS, **(settings or {})}
+    entry_price, direction, atr = (np.asarray(values, dtype=np.float64) for values in (entry_price, direction, atr))
+    stop_loss = entry_price - direction * settings["stop_loss_factor"] * atr
+    take_profit = entry_price + direction * settings["take_profit_factor"] * atr
+    trailing = atr * settings["trailing_stop_factor"] if settings["trailing_stop_factor"] else None
+    return stop_loss, take_profit, trailing
+
+# ✅ Vectorized Exit Scan
+def find_exits(open_, high, low, close, entry_index, direction, stop_loss, take_profit, trailing=None,
+               max_holding_bars=None, same_bar_policy="stop", scan_bars=16, chunk_positions=4096):
+    """
+    First bar after each entry whose high/low crosses the stop or the target, without a per-bar loop:
+    positions are scanned in blocks of bars, shorts are mirrored into longs by negating prices,
+    and the trailing stop is a cumulative max of the highs seen before each bar. Stops gapped through
+    fill at the bar open. Positions still open after max_holding_bars close at that bar's close,
+    positions open at the end of the data at the last close.
+    Returns (exit_index, exit_price, reason) arrays; reason indexes EXIT_REASONS.
+    """
+    open_, high, low, close = (np.asarray(values, dtype=np.float64) for values in (open_, high, low, close))
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    count, bars = len(entry_index), len(close)
+    direction = np.broadcast_to(np.asarray(direction, dtype=np.float64), (count,))
+    stop_loss = np.broadcast_to(np.asarray(stop_loss, dtype=np.float64), (count,))
+    take_profit = np.broadcast_to(np.asarray(take_profit, dtype=np.float64), (count,))
+    trailing = None if trailing is None else np.broadcast_to(np.asarray(trailing, dtype=np.float64), (count,))
+
+    # Default: still open at the end (or at the holding limit) -> close of that bar
+    last_bar = np.full(count, bars - 1, dtype=np.int64)
+    if max_holding_bars:
+        last_bar = np.minimum(last_bar, entry_index + int(max_holding_bars))
+    exit_index = last_bar.copy()
+    exit_price = close[last_bar]
+    reason = np.where(last_bar < bars - 1, EXIT_TIME, EXIT_END).astype(np.int8)
+
+    for start in range(0, count, chunk_positions):
+        chunk = np.arange(start, min(start + chunk_positions, count))
+        chunk = chunk[entry_index[chunk] < last_bar[chunk]]
+        offset, window = 0, scan_bars
+        # Mirrored levels: every position behaves like a long (stop below, target above)
+        peak = np.where(direction[chunk] > 0, close[entry_index[chunk]], -close[entry_index[chunk]])
+        while len(chunk):
+            sign = direction[chunk][:, None]
+            bar = entry_index[chunk][:, None] + 1 + offset + np.arange(window)
+            valid = bar <= last_bar[chunk][:, None]
+            bar = np.minimum(bar, bars - 1)
+            up = np.where(sign > 0, high[bar], -low[bar])
+            down = np.where(sign > 0, low[bar], -high[bar])
+            bar_open = np.where(sign > 0, open_[bar], -open_[bar])
+            stop = (sign * stop_loss[chunk][:, None]).repeat(window, axis=1)
+            target = sign * take_profit[chunk][:, None]
+
+            trailed = np.zeros(stop.shape, dtype=bool)
+            if trailing is not None:
+                # Best price before each bar (the stop moves once a bar has closed)
+                best = np.maximum.accumulate(np.concatenate((peak[:, None], np.where(valid, up, -np.inf)[:, :-1]), axis=1), axis=1)
+                trail_stop = best - trailing[chunk][:, None]
+                trailed = trail_stop > stop
+                stop = np.maximum(stop, trail_stop)
+                peak = np.maximum(peak, np.max(np.where(valid, up, -np.inf), axis=1))
+
+            stop_hit = valid & (down <= stop)
+            target_hit = valid & (up >= target)
+            hit = stop_hit | target_hit
+            any_hit = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            rows = np.nonzero(any_hit)[0]
+            if len(rows):
+                col = first[rows]
+                positions = chunk[rows]
+                stopped = stop_hit[rows, col]
+                if same_bar_policy == "target":
+                    stopped &= ~target_hit[rows, col]
+                level = np.where(stopped, np.minimum(stop[rows, col], bar_open[rows, col]),  # Gap through the stop -> open
+                                 np.maximum(target[rows, 0], bar_open[rows, col]))           # Gap through the target -> open
+                exit_index[positions] = bar[rows, col]
+                exit_price[positions] = np.where(direction[positions] > 0, level, -level)
+                reason[positions] = np.where(stopped, np.where(trailed[rows, col], EXIT_TRAILING, EXIT_STOP), EXIT_TARGET)
+
+            # Positions without a hit whose window did not reach their last bar: scan the next (twice as long) block
+            open_rows = ~any_hit & valid[:, -1]
+            chunk, peak = chunk[open_rows], peak[open_rows]
+            offset += window
+            window = max(scan_bars, min(window * 2, MAX_SCAN_CELLS // max(1, len(chunk))))
+    return exit_index, exit_price, reason
+
+def simulate_exits(df, entry_index, direction, settings=None):
+    """
+    find_exits() for a price DataFrame (open/high/low/close columns, any case) with SL/TP placed
+    from the ATR at the entry bar and the settings' factors. Returns a dict of arrays per position.
+    """
+    settings = {**DEFAULT_BACKTEST_SETTINGS, **(settings or {})}
+    columns = {name.lower(): name for name in df.columns}
+    open_, high, low, close = (df[columns[name]].to_numpy(dtype=np.float64) for name in ("open", "high", "low", "close"))
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    direction = np.broadcast_to(np.asarray(direction, dtype=np.float64), entry_index.shape)
+
+    atr = atr_array(high, low, close, settings["atr_period"])
+    atr = np.where(np.isnan(atr), np.nanmean(atr[:settings["atr_period"] * 4]) if len(atr) >= settings["atr_period"] else 0.0, atr)
+    entry_price = close[entry_index]
+    stop_loss, take_profit, trailing = sl_tp_levels(entry_price, direction, atr[entry_index], settings)
+    exit_index, exit_price, reason = find_exits(
+        open_, high, low, close, entry_index, direction, stop_loss, take_profit, trailing,
+        settings["max_holding_bars"], settings["same_bar_policy"], settings["scan_bars"], settings["chunk_positions"])
+    return {
+        "entry_index": entry_index,
+        "entry_price": entry_price,
+        "direction": direction,
+        "stop_loss": stop_loss,
+        "take_profit": take_profit,
+        "exit_index": exit_index,
+        "exit_price": exit_price,
+        "reason": reason,
+        "return": direction * (exit_price - entry_price) / entry_price,
+    }
+
+def non_overlapping(entry_index, exit_index):
+    """ Positions taken when only one may be open at a time: each entry must come after the previous exit """
+    order = np.argsort(entry_index, kind="stable")
+    entries, exits = np.asarray(entry_index)[order], np.asarray(exit_index)[order]
+    taken, position = [], 0
+    while position < len(entries):
+        taken.append(order[position])
+        position = np.searchsorted(entries, exits[position], side="right")  # Only the trades taken are visited
+    return np.array(taken, dtype=np.int64)
@@ -0,0 +1,149 @@
+import os
+import sys
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SECONDS_PER_YEAR = 252 * 86400   # Same trading year as the synthetic market
+DEFAULT_PERIODS_PER_YEAR = 252   # Daily bars
+
+# ✅ One Row per Run (sortable / rankable as a whole)
+METRICS_DTYPE = np.dtype([
+    ("total_return", "<f8"),
+    ("annual_return", "<f8"),
+    ("volatility", "<f8"),           # Annualized standard deviation of bar returns
+    ("sharpe", "<f8"),
+    ("sortino", "<f8"),
+    ("max_drawdown", "<f8"),         # Fraction of the running peak (0.25 = -25%)
+    ("max_drawdown_bars", "<i8"),    # Longest time below a previous peak
+    ("profit_factor", "<f8"),        # Gross profit / gross loss (inf without losses)
+    ("win_rate", "<f8"),
+    ("trades", "<i8"),
+    ("avg_trade", "<f8"),
+    ("exposure", "<f8"),             # Fraction of bars with an open position
+    ("turnover", "<f8"),             # Annualized sum of |position changes| (in multiples of equity)
+])
+
+def periods_per_year(times):
+    """ Bars per year from the median spacing of unix-second bar times """
+    times = np.asarray(times, dtype=np.float64)
+    spacing = np.median(np.diff(times)) if len(times) > 1 else 0.0
+    return SECONDS_PER_YEAR / spacing if spacing > 0 else DEFAULT_PERIODS_PER_YEAR
+
+# ✅ Curves from Trades
+def equity_from_trades(bars, exit_index, pnl, initial_balance=1.0):
+    """ Equity per bar with each trade's P&L booked at its exit bar """
+    return initial_balance + np.cumsum(np.bincount(np.asarray(exit_index, dtype=np.int64), weights=pnl, minlength=bars)[:bars])
+
+def position_from_trades(bars, entry_index, exit_index, size=1.0):
+    """ Position per bar: size is held on the bars after the entry up to and including the exit bar """
+    size = np.broadcast_to(np.asarray(size, dtype=np.float64), np.shape(entry_index))
+    delta = np.bincount(np.asarray(entry_index, dtype=np.int64) + 1, weights=size, minlength=bars + 2)
+    delta -= np.bincount(np.asarray(exit_index, dtype=np.int64) + 1, weights=size, minlength=bars + 2)
+    return np.cumsum(delta)[:bars]
+
+# ✅ Metrics for One or Many Runs
+def compute_metrics(equity, position=None, trade_pnl=None, periods=DEFAULT_PERIODS_PER_YEAR, risk_free_rate=0.0):
+    """
+    equity: (bars,) or (runs, bars); runs shorter than the others are padded with NaN at the end.
+    position: same shape (optional; exposure and turnover are 0 without it).
+    trade_pnl: (trades,) or (runs, trades) NaN-padded P&L per closed trade; without it, every bar
+    with a non-zero equity change counts as a trade for profit factor / win rate.
+    Every metric is computed along the bar axis at once, so thousands of stacked runs cost one pass.
+    Returns a METRICS_DTYPE array with one row per run.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    runs, bars = equity.shape
+    valid = ~np.isnan(equity)
+    lengths = valid.sum(axis=1)
+    rows = np.arange(runs)
+    metrics = np.zeros(runs, METRICS_DTYPE)
+
+    padded = not valid.all()
+    average, deviation = (np.nanmean, np.nanstd) if padded else (np.mean, np.std)  # NaN-aware only when needed
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Returns, volatility, Sharpe & Sortino
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        excess = returns - risk_free_rate / periods
+        mean = average(excess, axis=1) if bars > 1 else np.zeros(runs)
+        std = deviation(returns, axis=1, ddof=1) if bars > 2 else np.zeros(runs)
+        downside = np.sqrt(average(np.minimum(excess, 0.0) ** 2, axis=1)) if bars > 1 else np.zeros(runs)
+        metrics["volatility"] = np.nan_to_num(std * np.sqrt(periods))
+        metrics["sharpe"] = np.where(std > 0, mean / std * np.sqrt(periods), 0.0)
+        metrics["sortino"] = np.where(downside > 0, mean / downside * np.sqrt(periods), 0.0)
+
+        final = equity[rows, np.maximum(lengths - 1, 0)]
+        metrics["total_return"] = final / equity[:, 0] - 1
+        years = np.maximum(lengths - 1, 1) / periods
+        metrics["annual_return"] = np.sign(final / equity[:, 0]) * np.abs(final / equity[:, 0]) ** (1 / years) - 1
+
+        # Drawdown depth & duration (running peak via a cumulative max; NaN padding counts as "at peak")
+        peak = np.fmax.accumulate(equity, axis=1)
+        metrics["max_drawdown"] = np.nan_to_num((np.nanmax if padded else np.max)(1 - equity / peak, axis=1))
+        index = np.arange(bars)
+        last_peak = np.maximum.accumulate(np.where((equity >= peak) | ~valid, index, 0), axis=1)
+        metrics["max_drawdown_bars"] = (index - last_peak).max(axis=1)
+
+        # Trades: profit factor, win rate, average
+        pnl = np.diff(equity, axis=1) if trade_pnl is None else np.atleast_2d(np.asarray(trade_pnl, dtype=np.float64))
+        counted = (pnl != 0) & ~np.isnan(pnl) if trade_pnl is None else ~np.isnan(pnl)
+        wins = counted & (pnl > 0)
+        gains = np.where(wins, pnl, 0.0).sum(axis=1)
+        losses = -np.where(counted & (pnl < 0), pnl, 0.0).sum(axis=1)
+        trades = counted.sum(axis=1)
+        metrics["profit_factor"] = np.where(losses > 0, gains / losses, np.where(gains > 0, np.inf, 0.0))
+        metrics["trades"] = trades
+        metrics["win_rate"] = np.where(trades > 0, wins.sum(axis=1) / trades, 0.0)
+        metrics["avg_trade"] = np.where(trades > 0, (gains - losses) / trades, 0.0)
+
+        # Exposure & turnover
+        if position is not None:
+            position = np.atleast_2d(np.asarray(position, dtype=np.float64))
+            metrics["exposure"] = np.sum(valid & (np.nan_to_num(position) != 0), axis=1) / np.maximum(lengths, 1)
+            changes = np.nansum(np.abs(np.diff(position, axis=1, prepend=0.0)), axis=1)
+            metrics["turnover"] = changes / np.maximum(lengths, 1) * periods
+    return metrics
+
+# ✅ Ranking (argsort / lexsort over the metric columns, no Python loop over runs)
+def rank_runs(metrics, by=("sharpe",), ascending=(), top=None):
+    """
+    Run indices best-first: by lists metric names in priority order (higher is better unless
+    named in ascending, e.g. ascending=("max_drawdown",)). NaN ranks last.
+    """
+    by = (by,) if isinstance(by, str) else tuple(by)
+    keys = []
+    for name in reversed(by):  # np.lexsort sorts by the last key first
+        values = metrics[name].astype(np.float64)
+        values = values if name in ascending else -values
+        keys.append(np.where(np.isnan(values), np.inf, values))
+    order = np.lexsort(keys)
+    return order[:top] if top else order
+
+def metrics_row(metrics, index=0):
+    """ One run's metrics as a plain dict (JSON / logging) """
+    return {name: metrics[name][index].item() for name in METRICS_DTYPE.names}
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    parser = argparse.ArgumentParser(description="Time the metrics engine on random stacked equity curves")
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--bars", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    returns = rng.normal(rng.normal(0.0002, 0.0005, (args.runs, 1)), 0.01, (args.runs, args.bars))
+    positions = (rng.random((args.runs, args.bars)) < 0.5).astype(np.float64)
+    curves = 10000 * np.cumprod(1 + returns * positions, axis=1)
+
+    started = time.perf_counter()
+    results = compute_metrics(curves, positions)
+    ranking = rank_runs(results, by=("sharpe", "max_drawdown"), ascending=("max_drawdown",), top=5)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Metrics for {args.runs} runs x {args.bars} bars in {elapsed * 1000:.1f} ms")
+    for index in ranking:
+        row = metrics_row(results, index)
+        print(f"   #{index}: Sharpe {row['sharpe']:.2f}, Sortino {row['sortino']:.2f}, "
+              f"max DD {row['max_drawdown']:.1%} ({row['max_drawdown_bars']} bars), PF {row['profit_factor']:.2f}")
@@ -0,0 +1,210 @@
+import os
+import sys
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fake_mt5 import FakeMT5, Tick
+from logs.trade_records import RecordArray, TRADE_DTYPE
+
+CONTRACT_SIZE = 100000   # Units per lot (calculate_lot_size sizes standard forex lots)
+MARGIN_PER_LOT = 1000    # Same approximation validate_trade_risk uses for the required margin
+
+DEFAULT_BROKER_SETTINGS = {
+    "stop_loss_points": 50,          # mt5_ea.mq5 inputs, used when the bot sends no SL / TP
+    "take_profit_points": 100,
+    "spread_adjustment_points": 2,
+    "one_position_per_symbol": True, # The EA only opens while no position is open
+    "same_bar_policy": "stop",       # Stop and target inside one bar: "stop" (conservative) or "target" first
+}
+
+def point_size(symbol):
+    return 0.001 if "JPY" in symbol.upper() else 0.00001
+
+def account_rate(symbol, price):
+    """ Quote-currency P&L -> USD account currency (xxxUSD: 1, USDxxx: 1 / price) """
+    symbol = symbol.upper()
+    return 1.0 / price if symbol.startswith("USD") and symbol[3:6] != "USD" else 1.0
+
+# ✅ MT5 Stand-In Driven by a Bar Clock
+class SimulatedBroker(FakeMT5):
+    """
+    FakeMT5 whose quotes, rates and account follow the bar set with advance(): rates end at the
+    current bar (no look-ahead) and bar prices are mids quoted with the bar's spread. Trade
+    instructions written to the EA's global variables by send_trade_action() are collected with
+    take_instructions() and filled by execute() at the next bar's open the way mt5_ea.mq5 would;
+    open positions are closed intrabar by their stop or target in check_exits().
+    """
+
+    def __init__(self, history, balance=10000.0, settings=None):
+        super().__init__(balance=balance, margin=0.0)
+        self.settings = {**DEFAULT_BROKER_SETTINGS, **(settings or {})}
+        self.history = history          # symbol -> BAR_DTYPE array
+        self.index = {symbol: 0 for symbol in history}
+        self.instructions = []          # Trade_* variable sets written since the last take_instructions()
+        self.positions = {}             # ticket -> open position
+        self.trades = RecordArray(TRADE_DTYPE)
+        self.next_ticket = 1
+
+    # ✅ Bar Clock
+    def advance(self, symbol, index):
+        self.index[symbol] = index
+
+    def bar(self, symbol):
+        return self.history[symbol][self.index[symbol]]
+
+    def _bars(self, symbol, timeframe):
+        """ History up to the current bar, whatever the timeframe asked for (the data has one timeframe) """
+        return self.history[symbol][:self.index[symbol] + 1]
+
+    def quote(self, symbol, price=None):
+        """ (bid, ask) around price (default: the current close) with the bar's spread """
+        bar = self.bar(symbol)
+        price = float(bar["close"]) if price is None else price
+        half_spread = bar["spread"] * point_size(symbol) / 2
+        return price - half_spread, price + half_spread
+
+    def symbol_info_tick(self, symbol):
+        self._call("symbol_info_tick")
+        bar = self.bar(symbol)
+        bid, ask = self.quote(symbol)
+        return Tick(int(bar["time"]), bid, ask, 0.0, int(bar["tick_volume"]), int(bar["time"]) * 1000, 0, 0.0)
+
+    def order_book(self, symbol, limit=10):
+        """ fetch_binance_order_flow()'s result from the current bar: buy / sell volume split by where it closed in its range """
+        bar = self.bar(symbol)
+        bar_range = float(bar["high"] - bar["low"])
+        imbalance = float(np.clip((bar["close"] - bar["open"]) / bar_range, -1, 1)) if bar_range > 0 else 0.0
+        volume = float(bar["tick_volume"])
+        bid, ask = self.quote(symbol)
+        return {"best_bid": bid, "best_ask": ask,
+                "buy_volume": round(volume * (1 + imbalance) / 2, 2), "sell_volume": round(volume * (1 - imbalance) / 2, 2)}
+
+    # ✅ EA Communication
+    def global_variable_set(self, name, value):
+        if name == "Trade_Action":  # First variable of every send_trade_action()
+            self.instructions.append({})
+        if name.startswith("Trade_") and self.instructions:
+            self.instructions[-1][name[len("Trade_"):].lower()] = value
+        return super().global_variable_set(name, value)
+
+    def take_instructions(self):
+        instructions, self.instructions = self.instructions, []
+        return instructions
+
+    def positions_total(self):
+        return len(self.positions)
+
+    # ✅ Fills
+    def execute(self, instruction):
+        """ Fills one instruction at the current bar's open; returns the opened / closed position or None if rejected """
+        action, symbol = instruction.get("action"), instruction.get("symbol")
+        if action in ("BUY", "SELL"):
+            return self._open(symbol, 1.0 if action == "BUY" else -1.0, instruction)
+        position = self.positions.get(instruction.get("ticket"))
+        if position is None:
+            return None
+        if action == "CLOSE":
+            return self._close(position, self.bar(position["symbol"])["open"], "close")
+        if action in ("MODIFY", "TRAIL"):
+            entry = position["entry_price"]
+            if instruction.get("sl"):
+                position["stop_loss"] = entry - position["direction"] * abs(instruction["sl"])
+            if instruction.get("tp"):
+                position["take_profit"] = entry + position["direction"] * abs(instruction["tp"])
+            if instruction.get("trail"):
+                position["trailing"] = abs(entry - position["stop_loss"])
+            return position
+        return None
+
+    def _open(self, symbol, direction, instruction):
+        settings = self.settings
+        if symbol not in self.history or (settings["one_position_per_symbol"] and
+                                          any(position["symbol"] == symbol for position in self.positions.values())):
+            return None
+
+        bar = self.bar(symbol)
+        bid, ask = self.quote(symbol, float(bar["open"]))
+        price = ask if direction > 0 else bid
+        point = point_size(symbol)
+        # SL / TP sent by the bot are distances (risk_management.adjust_sl_tp); otherwise the EA's point inputs
+        stop_distance = abs(instruction.get("sl") or 0) or (settings["stop_loss_points"] + settings["spread_adjustment_points"]) * point
+        target_distance = abs(instruction.get("tp") or 0) or settings["take_profit_points"] * point
+        position = {
+            "ticket": self.next_ticket,
+            "symbol": symbol,
+            "direction": direction,
+            "lot_size": float(instruction.get("lot") or 0.0),
+            "entry_index": self.index[symbol],
+            "entry_price": price,
+            "stop_loss": price - direction * stop_distance,
+            "take_profit": price + direction * target_distance,
+            "trailing": stop_distance if instruction.get("trail") else None,
+        }
+        position["initial_stop"] = position["stop_loss"]
+        position["best"] = direction * price  # Best price so far, mirrored like in check_exits()
+        self.next_ticket += 1
+        self.positions[position["ticket"]] = position
+        self.trades.append(time=bar["time"], symbol=symbol, action="BUY" if direction > 0 else "SELL", lot_size=position["lot_size"],
+                           market_price=price, stop_loss=position["stop_loss"], take_profit=position["take_profit"])
+        self._update_account()
+        return position
+
+    def _close(self, position, price, reason):
+        symbol, direction = position["symbol"], position["direction"]
+        bid, ask = self.quote(symbol, float(price))
+        price = bid if direction > 0 else ask
+        profit = direction * (price - position["entry_price"]) * position["lot_size"] * CONTRACT_SIZE * account_rate(symbol, price)
+        del self.positions[position["ticket"]]
+        self.account["balance"] += profit
+        self.trades.append(time=self.bar(symbol)["time"], symbol=symbol, action="SELL" if direction > 0 else "BUY",
+                           lot_size=position["lot_size"], market_price=price, stop_loss=position["stop_loss"],
+                           take_profit=position["take_profit"], profit=profit)
+        self._update_account()
+        return {**position, "exit_index": self.index[symbol], "exit_price": price, "profit": profit, "reason": reason}
+
+    # ✅ Intrabar Stops & Targets (same rules as backtesting/exits.py: gaps fill at the open)
+    def check_exits(self, symbol):
+        bar = self.bar(symbol)
+        closed = []
+        for position in [position for position in self.positions.values() if position["symbol"] == symbol]:
+            direction = position["direction"]
+            # Mirrored prices: every position behaves like a long (stop below, target above)
+            up, down = (bar["high"], bar["low"]) if direction > 0 else (-bar["low"], -bar["high"])
+            bar_open = direction * bar["open"]
+            stop, target = direction * position["stop_loss"], direction * position["take_profit"]
+            stop_hit, target_hit = down <= stop, up >= target
+            if stop_hit and not (target_hit and self.settings["same_bar_policy"] == "target"):
+                reason = "trailing_stop" if position["stop_loss"] != position["initial_stop"] else "stop_loss"
+                closed.append(self._close(position, direction * min(stop, bar_open), reason))
+            elif target_hit:
+                closed.append(self._close(position, direction * max(target, bar_open), "take_profit"))
+            elif position["trailing"]:
+                # The stop moves once the bar has closed, never loosening
+                position["best"] = max(position["best"], up)
+                position["stop_loss"] = direction * max(stop, position["best"] - position["trailing"])
+        self._update_account()
+        return closed
+
+    # ✅ Account
+    def _update_account(self):
+        unrealized, margin = 0.0, 0.0
+        for position in self.positions.values():
+            symbol = position["symbol"]
+            bid, ask = self.quote(symbol)
+            price = bid if position["direction"] > 0 else ask
+            unrealized += position["direction"] * (price - position["entry_price"]) * position["lot_size"] * CONTRACT_SIZE * account_rate(symbol, price)
+            margin += position["lot_size"] * MARGIN_PER_LOT
+        self.account["equity"] = self.account["balance"] + unrealized
+        self.account["margin"] = margin
+
+    def exposure(self, symbol):
+        """ Signed notional of the open positions of symbol in account currency """
+        price = float(self.bar(symbol)["close"])
+        return sum(position["direction"] * position["lot_size"] * CONTRACT_SIZE * price * account_rate(symbol, price)
+                   for position in self.positions.values() if position["symbol"] == symbol)
+
+    def mark(self):
+        """ Revalues open positions at the current closes; returns the equity """
+        self._update_account()
+        return self.account["equity"]
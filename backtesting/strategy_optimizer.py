@@ -1,22 +1,15 @@
+import os
 import json
 import numpy as np
-import optuna
 import time
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
 
-CONFIG_FILE = "../config.json"
 OPTIMIZED_PARAMS_FILE = "../logs/optimized_params.json"
 
-# ✅ Load Configurations
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-
-config = load_config()
-
 # ✅ AI Model Prediction
 def ai_predict(data):
+    from tensorflow.keras.models import load_model
+    from sklearn.preprocessing import MinMaxScaler
+
     model_path = os.path.join(os.path.dirname(__file__), "..", "ai_models", "ai_model.keras")
     if not os.path.exists(model_path):
         print(f"⚠ AI Model not found! Train AI before running optimization.")
@@ -45,6 +38,8 @@ def objective(trial):
 
 # ✅ Run Optimization Automatically
 def optimize_strategy():
+    import optuna
+
     while True:
         print("🚀 Running AI Strategy Optimization...")
         study = optuna.create_study(direction="maximize")
@@ -0,0 +1,116 @@
+import sys
+import time
+import types
+from collections import namedtuple
+import numpy as np
+
+# ✅ Offline Stand-In for the MetaTrader5 Package
+# Serves synthetic history (data_feeds/synthetic_market.py) through the subset of the MT5 API
+# the bot uses, so benchmarks and backtests run without a terminal. install() puts it into
+# sys.modules["MetaTrader5"]; every "import MetaTrader5 as mt5" after that gets the fake.
+
+Tick = namedtuple("Tick", ["time", "bid", "ask", "last", "volume", "time_msc", "flags", "volume_real"])
+AccountInfo = namedtuple("AccountInfo", ["login", "balance", "equity", "margin", "margin_free", "margin_level",
+                                         "profit", "leverage", "currency"])
+
+TIMEFRAMES = {"TIMEFRAME_M1": 1, "TIMEFRAME_M5": 5, "TIMEFRAME_M15": 15, "TIMEFRAME_M30": 30,
+              "TIMEFRAME_H1": 16385, "TIMEFRAME_H4": 16388, "TIMEFRAME_D1": 16408}
+TIMEFRAME_MINUTES = {1: 1, 5: 5, 15: 15, 30: 30, 16385: 60, 16388: 240, 16408: 1440}
+
+class FakeMT5(types.ModuleType):
+    def __init__(self, symbols=(), history_bars=10000, seed=42, balance=10000.0, margin=100.0, latency=0.0):
+        super().__init__("MetaTrader5")
+        self.__dict__.update(TIMEFRAMES)
+        self.history_bars = history_bars
+        self.seed = seed
+        self.latency = latency          # Seconds added to every call (simulated terminal round trip)
+        self.account = {"balance": balance, "equity": balance, "margin": margin}
+        self.global_variables = {}
+        self.calls = {}
+        self._history = {}              # (symbol, timeframe) -> BAR_DTYPE array
+        self._cursor = {}               # symbol -> index of the bar served by symbol_info_tick
+        for symbol in symbols:
+            self._bars(symbol, self.TIMEFRAME_M1)
+
+    def _call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _bars(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self._history:
+            from data_feeds.synthetic_market import SyntheticMarket
+            minutes = TIMEFRAME_MINUTES.get(timeframe, 1)
+            market = SyntheticMarket([symbol], seed=self.seed, timeframe=minutes * 60)
+            self._history[key] = market.bars(self.history_bars)[symbol]
+        return self._history[key]
+
+    # ✅ Terminal
+    def initialize(self, *args, **kwargs):
+        self._call("initialize")
+        return True
+
+    def shutdown(self):
+        self._call("shutdown")
+
+    def last_error(self):
+        return (1, "Success")
+
+    def symbol_select(self, symbol, enable=True):
+        self._call("symbol_select")
+        return True
+
+    # ✅ Market Data
+    def symbol_info_tick(self, symbol):
+        """ Walks through the M1 history: every call returns the next bar's close as the quote """
+        self._call("symbol_info_tick")
+        bars = self._bars(symbol, self.TIMEFRAME_M1)
+        index = self._cursor.get(symbol, 0) % len(bars)
+        self._cursor[symbol] = index + 1
+        bar = bars[index]
+        half_spread = bar["spread"] * (0.001 if "JPY" in symbol.upper() else 0.00001) / 2
+        bid, ask = float(bar["close"] - half_spread), float(bar["close"] + half_spread)
+        return Tick(int(bar["time"]), bid, ask, 0.0, int(bar["tick_volume"]), int(bar["time"]) * 1000, 0, 0.0)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        """ Bars ending start_pos bars before the newest one (MT5 order: oldest first) """
+        self._call("copy_rates_from_pos")
+        bars = self._bars(symbol, timeframe)
+        end = len(bars) - start_pos
+        return bars[max(0, end - count):max(0, end)].copy()
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        self._call("copy_rates_range")
+        bars = self._bars(symbol, timeframe)
+        start, end = (int(value.timestamp()) if hasattr(value, "timestamp") else int(value) for value in (date_from, date_to))
+        lo, hi = np.searchsorted(bars["time"], [start, end], side="left")
+        return bars[lo:hi + int(hi < len(bars) and bars["time"][hi] == end)].copy()
+
+    # ✅ Account & EA Communication
+    def account_info(self):
+        self._call("account_info")
+        balance, equity, margin = self.account["balance"], self.account["equity"], self.account["margin"]
+        return AccountInfo(1, balance, equity, margin, equity - margin, equity / margin * 100 if margin else 0.0,
+                           equity - balance, 100, "USD")
+
+    def global_variable_set(self, name, value):
+        self._call("global_variable_set")
+        self.global_variables[name] = value
+        return True
+
+    def global_variable_get(self, name):
+        return self.global_variables.get(name, 0.0)
+
+    def positions_total(self):
+        return 0
+
+def install(fake=None, **kwargs):
+    """ Routes "import MetaTrader5" to a FakeMT5 (created from kwargs if not given); returns it """
+    fake = fake or FakeMT5(**kwargs)
+    sys.modules["MetaTrader5"] = fake
+    return fake
+
+def uninstall():
+    if isinstance(sys.modules.get("MetaTrader5"), FakeMT5):
+        del sys.modules["MetaTrader5"]
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# ✅ Modules a restarted execution/bridge process needs (must stay light)
+EXECUTION_PATH = [
+    "trade_execution.mt5_bridge",
+    "trade_execution.trade_execution",
+    "trade_execution.risk_management",
+    "data_feeds.market_data",
+]
+ENTRY_POINTS = ["ai_trading_bot", "ai_core.backtest_ai", "backtesting.backtest", "backtesting.strategy_optimizer"]
+
+# ✅ Libraries that must only be imported on first use
+HEAVY_MODULES = ["tensorflow", "keras", "matplotlib", "sklearn", "pandas", "MetaTrader5",
+                 "vaderSentiment", "yfinance", "optuna", "selenium", "undetected_chromedriver", "requests", "bs4"]
+
+DEFAULT_BUDGET_SECONDS = 0.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"import_seconds": elapsed, "heavy": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+# ✅ Measure One Module in a Fresh Interpreter
+def measure_import(module):
+    """ Returns import time, total process time (interpreter start included) and heavy modules pulled in """
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+    process_seconds = time.perf_counter() - start
+
+    if result.returncode != 0:
+        return {"module": module, "error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    return {"module": module, "process_seconds": process_seconds, **stats}
+
+# ✅ Heaviest Imports (python -X importtime) for a Module
+def slowest_imports(module, top=10):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+# ✅ Run the Benchmark (exit code 1 if the execution-only path is over budget)
+def run_import_benchmark(budget=DEFAULT_BUDGET_SECONDS, include_entry_points=True):
+    failures = []
+    for module in EXECUTION_PATH + (ENTRY_POINTS if include_entry_points else []):
+        stats = measure_import(module)
+        if "error" in stats:
+            print(f"❌ {module}: import failed - {stats['error']}")
+            failures.append(module)
+            continue
+
+        on_execution_path = module in EXECUTION_PATH
+        over_budget = on_execution_path and stats["process_seconds"] > budget
+        heavy = on_execution_path and stats["heavy"]
+        status = "❌" if over_budget or heavy else "✅"
+        print(f"{status} {module}: import {stats['import_seconds'] * 1000:.1f} ms, "
+              f"process {stats['process_seconds'] * 1000:.1f} ms, heavy: {stats['heavy'] or 'none'}")
+        if over_budget or heavy:
+            failures.append(module)
+            for cumulative_us, name in slowest_imports(module):
+                print(f"     {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if failures:
+        print(f"❌ Import budget of {budget * 1000:.0f} ms exceeded (or heavy imports found) for: {', '.join(failures)}")
+    return not failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the execution-only path")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="Max seconds per fresh process")
+    parser.add_argument("--execution-only", action="store_true", help="Skip the heavier CLI entry points")
+    args = parser.parse_args()
+    sys.exit(0 if run_import_benchmark(args.budget, not args.execution_only) else 1)
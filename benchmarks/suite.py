@@ -0,0 +1,432 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+BASELINE_DIR = os.path.join(REPO_ROOT, "benchmarks", "baselines")
+
+DEFAULT_SETTINGS = {
+    "symbols": 3,
+    "bars": 20000,          # Bars per symbol in the generated CSVs
+    "repeats": 3,           # Timed runs per benchmark (after one warm-up run); the median is reported
+    "seed": 42,
+    "batch_size": 4096,
+    "single_calls": 200,
+    "log_messages": 50000,
+}
+DEFAULT_THRESHOLD = 0.10    # A benchmark regressed when its throughput dropped by more than this fraction
+SCALING_SYMBOLS = [1, 2, 4, 8]
+SCALING_BARS = [5000, 20000, 80000]
+FEATURE_COLS = ["time", "open", "high", "low", "close", "volume", "rsi", "macd", "macd_signal", "boll_upper", "boll_lower"]
+
+_CONFIG_DIR = None          # config_manager reads TRADING_BOT_CONFIG once at import: one file for every workspace
+
+class SkipBenchmark(Exception):
+    """ Raised by a benchmark whose optional dependency is missing """
+
+# ✅ Machine Fingerprint (baselines are only comparable on the same machine & library versions)
+def machine_fingerprint():
+    import numpy as np
+
+    cpu_model = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as file:
+            cpu_model = next((line.split(":", 1)[1].strip() for line in file if line.startswith("model name")), cpu_model)
+    except OSError:
+        pass
+    try:
+        memory_gb = round(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3, 1)
+    except (ValueError, OSError, AttributeError):
+        memory_gb = None
+
+    info = {"cpu": cpu_model, "cpu_count": os.cpu_count(), "memory_gb": memory_gb, "machine": platform.machine(),
+            "platform": platform.platform(), "python": platform.python_version(), "numpy": np.__version__}
+    info["id"] = hashlib.sha1(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+    info["hostname"] = platform.node()
+    return info
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+# ✅ Isolated Workspace (data, models, scalers and logs never touch the real ones)
+class Workspace:
+    """
+    Temporary working directory with its own config.json (quiet, blocking logger), synthetic or
+    copied CSVs in data_storage/, one published model + scaler per symbol and the fake MT5.
+    The first workspace must be entered before config_manager is imported (the config path is read at import).
+    """
+
+    def __init__(self, symbols, bars, seed=42, data_dir=None):
+        self.symbols = symbols
+        self.bars = bars
+        self.seed = seed
+        self.data_dir = data_dir
+        self.root = tempfile.mkdtemp(prefix="tb-bench-")
+        self.frames = {}
+        self.has_models = False
+
+    def __enter__(self):
+        global _CONFIG_DIR
+        with open(os.path.join(REPO_ROOT, "config.json")) as file:
+            config = json.load(file)
+        config["trading_pairs"] = list(self.symbols)
+        config["logging"] = {**config.get("logging", {}), "console": False, "log_file": "logs/bench_log.txt",
+                             "drop_policy": "block", "max_bytes": 0}
+        config["metrics"] = {**config.get("metrics", {}), "enabled": False}
+        _CONFIG_DIR = _CONFIG_DIR or tempfile.mkdtemp(prefix="tb-bench-config-")
+        write_json(os.path.join(_CONFIG_DIR, "config.json"), config)
+
+        self._previous_cwd = os.getcwd()
+        os.environ["TRADING_BOT_CONFIG"] = os.path.join(_CONFIG_DIR, "config.json")
+        os.chdir(self.root)
+        for folder in ("data_storage", "ai_models", "logs"):
+            os.makedirs(folder, exist_ok=True)
+
+        from benchmarks.fake_mt5 import install
+        self.mt5 = install(symbols=self.symbols, history_bars=2000, seed=self.seed)
+        self._write_data()
+        self._publish_models()
+        return self
+
+    def __exit__(self, *exc_info):
+        from logs.logger import flush_logs
+        flush_logs()
+        os.chdir(self._previous_cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+        return False
+
+    def _write_data(self):
+        import pandas as pd
+
+        if self.data_dir:
+            for symbol in self.symbols:
+                shutil.copy(os.path.join(self.data_dir, f"{symbol}.csv"), os.path.join("data_storage", f"{symbol}.csv"))
+        else:
+            from data_feeds.synthetic_market import SyntheticMarket
+            market = SyntheticMarket(self.symbols, seed=self.seed)
+            for symbol, bars in market.bars(self.bars).items():
+                frame = pd.DataFrame({"time": bars["time"].astype("datetime64[s]"), "open": bars["open"], "high": bars["high"],
+                                      "low": bars["low"], "close": bars["close"], "volume": bars["tick_volume"]})
+                add_indicator_columns(frame).to_csv(os.path.join("data_storage", f"{symbol}.csv"), index=False)
+
+        from ai_core.past_data_ai import load_csv_data, generate_trade_labels
+        for symbol in self.symbols:
+            self.frames[symbol] = generate_trade_labels(load_csv_data(symbol))
+
+    def _publish_models(self):
+        """ Untrained models are enough to time inference (scalers are fitted on the real columns) """
+        try:
+            import tensorflow as tf
+        except ImportError:
+            return
+        from ai_core.past_data_ai import preprocess_data, MODEL_KIND
+        from ai_core.model_registry import publish_model, get_registry
+
+        tf.keras.utils.disable_interactive_logging()
+        tf.keras.utils.set_random_seed(self.seed)
+        get_registry().clear()  # Models cached from an earlier workspace
+        model = build_benchmark_model(len(FEATURE_COLS))
+        for symbol in self.symbols:
+            preprocess_data(self.frames[symbol], symbol)  # Saves the symbol's scaler, snapshotted by publish_model
+            publish_model(model, symbol, MODEL_KIND)
+        self.has_models = True
+
+def add_indicator_columns(frame):
+    """ rsi / macd / bollinger columns like add_indicators.py, in plain pandas (the "ta" package is optional) """
+    close = frame["close"]
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    frame["rsi"] = 100 - 100 / (1 + gain / loss.replace(0, float("nan")))
+    frame["macd"] = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    frame["macd_signal"] = frame["macd"].ewm(span=9, adjust=False).mean()
+    sma, std = close.rolling(20).mean(), close.rolling(20).std()
+    frame["boll_upper"] = sma + 2 * std
+    frame["boll_lower"] = sma - 2 * std
+    return frame.bfill()
+
+def build_benchmark_model(features):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout
+
+    return Sequential([
+        LSTM(64, return_sequences=True, input_shape=(1, features)),
+        Dropout(0.3),
+        LSTM(64, return_sequences=False),
+        Dense(32, activation="relu"),
+        Dense(1, activation="sigmoid"),
+    ])
+
+# ✅ Benchmarks: each takes the workspace and settings and returns (run, unit); run() returns the ops done
+def bench_csv_load(ws, settings):
+    from ai_core.past_data_ai import load_csv_data
+    return lambda: sum(len(load_csv_data(symbol)) for symbol in ws.symbols), "rows"
+
+def bench_add_indicators(ws, settings):
+    try:
+        import ta  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("the 'ta' package is not installed")
+    from add_indicators import add_technical_indicators
+
+    def run():
+        for symbol in ws.symbols:
+            add_technical_indicators(symbol)
+        return len(ws.symbols) * ws.bars
+    return run, "rows"
+
+def bench_preprocess_data(ws, settings):
+    from ai_core.past_data_ai import preprocess_data
+    return lambda: sum(len(preprocess_data(ws.frames[symbol], symbol)[0]) for symbol in ws.symbols), "rows"
+
+def _model_inputs(ws, backend):
+    if not ws.has_models and backend == "keras":
+        raise SkipBenchmark("TensorFlow is not installed")
+    from ai_core.model_registry import ModelRegistry
+    from ai_core.backtest_ai import preprocess_backtest_data
+
+    symbol = ws.symbols[0]
+    model = ModelRegistry(backend=backend).get_latest(symbol, "past_data")
+    if model is None:
+        raise SkipBenchmark(f"no published model for the {backend} backend")
+    return model, preprocess_backtest_data(ws.frames[symbol], symbol)
+
+def _bench_inference_single(backend):
+    def bench(ws, settings):
+        model, X = _model_inputs(ws, backend)
+        sample = X[:1]
+
+        def run():
+            for _ in range(settings["single_calls"]):
+                model(sample)
+            return settings["single_calls"]
+        return run, "calls"
+    return bench
+
+def _bench_inference_batched(backend):
+    def bench(ws, settings):
+        model, X = _model_inputs(ws, backend)
+
+        def run():
+            model.predict(X, batch_size=settings["batch_size"], verbose=0)
+            return len(X)
+        return run, "rows"
+    return bench
+
+def bench_run_backtest(ws, settings):
+    if not ws.has_models:
+        raise SkipBenchmark("TensorFlow is not installed")
+    from ai_core.backtest_ai import run_backtest
+
+    def run():
+        for symbol in ws.symbols:
+            run_backtest(symbol)
+        return len(ws.symbols) * ws.bars
+    return run, "bars"
+
+def bench_monte_carlo(ws, settings):
+    from maths_engine.reinforcement_math import monte_carlo_simulation
+    trials = 200
+
+    def run():
+        monte_carlo_simulation(trials=trials)
+        return trials * 100
+    return run, "simulated trades"
+
+def bench_calculate_volatility(ws, settings):
+    import pandas as pd
+    from maths_engine.maths import calculate_volatility
+    window = pd.DataFrame(ws.mt5.copy_rates_from_pos(ws.symbols[0], ws.mt5.TIMEFRAME_M1, 0, 1000))
+
+    def run():
+        for _ in range(100):
+            calculate_volatility(window)
+        return 100
+    return run, "calls"
+
+def bench_validate_trade_risk(ws, settings):
+    from trade_execution.risk_management import validate_trade_risk
+    calls = 2000
+
+    def run():
+        for _ in range(calls):
+            validate_trade_risk(ws.symbols[0], "BUY", 0.1)
+        return calls
+    return run, "calls"
+
+def bench_log_throughput(ws, settings):
+    from logs.logger import log_message, flush_logs
+
+    def run():
+        for index in range(settings["log_messages"]):
+            log_message(f"📊 Benchmark message {index}", symbol=ws.symbols[0])
+        flush_logs(timeout=120)
+        return settings["log_messages"]
+    return run, "messages"
+
+def bench_end_to_end(ws, settings):
+    """ Per symbol: load CSV -> labels -> preprocess -> batched inference -> volatility -> risk check """
+    import pandas as pd
+    from ai_core.past_data_ai import load_csv_data, generate_trade_labels, preprocess_data
+    from ai_core.model_registry import get_registry
+    from maths_engine.maths import calculate_volatility
+    from trade_execution.risk_management import validate_trade_risk
+
+    def run():
+        rows = 0
+        for symbol in ws.symbols:
+            frame = generate_trade_labels(load_csv_data(symbol))
+            X, _ = preprocess_data(frame, symbol)
+            model = get_registry().get_latest(symbol, "past_data")
+            if model is not None:
+                model.predict(X, batch_size=settings["batch_size"], verbose=0)
+            calculate_volatility(pd.DataFrame(frame.tail(1000)).reset_index(drop=True))
+            validate_trade_risk(symbol, "BUY", 0.1)
+            rows += len(frame)
+        return rows
+    return run, "rows"
+
+BENCHMARKS = {
+    "csv_load": bench_csv_load,
+    "add_technical_indicators": bench_add_indicators,
+    "preprocess_data": bench_preprocess_data,
+    "inference_single_keras": _bench_inference_single("keras"),
+    "inference_single_numpy": _bench_inference_single("numpy"),
+    "inference_batched_keras": _bench_inference_batched("keras"),
+    "inference_batched_numpy": _bench_inference_batched("numpy"),
+    "run_backtest": bench_run_backtest,
+    "monte_carlo_simulation": bench_monte_carlo,
+    "calculate_volatility": bench_calculate_volatility,
+    "validate_trade_risk": bench_validate_trade_risk,
+    "log_throughput": bench_log_throughput,
+    "end_to_end": bench_end_to_end,
+}
+
+# ✅ Timing
+def time_benchmark(run, repeats):
+    run()  # Warm-up: imports, model loading, file cache
+    samples, ops = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ops = run()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    return {"ops": ops, "median_s": median, "min_s": min(samples), "ops_per_s": ops / median if median else 0.0}
+
+def run_suite(settings, names=None, data_dir=None, symbols=None):
+    symbols = symbols or [f"SYN{index:03d}" for index in range(1, settings["symbols"] + 1)]
+    results = {}
+    with Workspace(symbols, settings["bars"], settings["seed"], data_dir) as ws:
+        for name in names or BENCHMARKS:
+            try:
+                run, unit = BENCHMARKS[name](ws, settings)
+                results[name] = {**time_benchmark(run, settings["repeats"]), "unit": unit, "status": "ok"}
+                print(f"✅ {name}: {results[name]['ops_per_s']:,.0f} {unit}/s (median {results[name]['median_s'] * 1000:.1f} ms)")
+            except SkipBenchmark as e:
+                results[name] = {"status": "skipped", "reason": str(e)}
+                print(f"⏭ {name}: skipped ({e})")
+            except Exception as e:
+                results[name] = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+                print(f"❌ {name}: {type(e).__name__}: {e}")
+    return results
+
+# ✅ Scaling Mode: end-to-end throughput while sweeping symbol count and data size
+def run_scaling(settings, symbol_counts=SCALING_SYMBOLS, bar_counts=SCALING_BARS):
+    rows = []
+    for bars in bar_counts:
+        for count in symbol_counts:
+            result = run_suite({**settings, "symbols": count, "bars": bars}, ["end_to_end"])["end_to_end"]
+            rows.append({"symbols": count, "bars": bars, **result})
+    for bars in bar_counts:
+        base = next((row for row in rows if row["bars"] == bars and row.get("status") == "ok"), None)
+        for row in rows:
+            if base and row["bars"] == bars and row.get("status") == "ok":
+                row["efficiency"] = round(row["ops_per_s"] / base["ops_per_s"], 3)  # 1.0 = throughput kept while scaling
+    print("📈 Scaling (end_to_end):")
+    for row in rows:
+        if row.get("status") == "ok":
+            print(f"   {row['symbols']:>3} symbols x {row['bars']:>7} bars: {row['median_s']:8.2f}s "
+                  f"{row['ops_per_s']:>12,.0f} rows/s  efficiency {row['efficiency']:.2f}")
+    return rows
+
+# ✅ Baselines
+def baseline_path(fingerprint):
+    return os.path.join(BASELINE_DIR, f"{fingerprint['id']}.json")
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """ Returns {name: change} for benchmarks slower than the baseline by more than threshold """
+    if baseline["fingerprint"]["id"] != report["fingerprint"]["id"]:
+        print("⚠ Baseline was recorded on a different machine / library versions; comparing anyway.")
+    regressions = {}
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if result.get("status") != "ok" or not reference or reference.get("status") != "ok":
+            continue
+        change = result["ops_per_s"] / reference["ops_per_s"] - 1
+        flag = "❌" if change < -threshold else "✅"
+        print(f"{flag} {name}: {change:+.1%} vs baseline ({reference['ops_per_s']:,.0f} -> {result['ops_per_s']:,.0f} {result['unit']}/s)")
+        if change < -threshold:
+            regressions[name] = change
+    return regressions
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline throughput benchmarks (synthetic or recorded data, fake MT5)")
+    parser.add_argument("--only", default=None, help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--symbols", type=int, default=DEFAULT_SETTINGS["symbols"])
+    parser.add_argument("--bars", type=int, default=DEFAULT_SETTINGS["bars"])
+    parser.add_argument("--repeats", type=int, default=DEFAULT_SETTINGS["repeats"])
+    parser.add_argument("--data-dir", default=None, help="Use {symbol}.csv files from this folder (e.g. data_storage) instead of synthetic data")
+    parser.add_argument("--scaling", action="store_true", help="Sweep symbol count and data size (end_to_end only)")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Baseline file (default: benchmarks/baselines/<fingerprint>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline for this machine")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed throughput drop before a regression is flagged")
+    args = parser.parse_args()
+
+    settings = {**DEFAULT_SETTINGS, "symbols": args.symbols, "bars": args.bars, "repeats": args.repeats}
+    symbols = None
+    if args.data_dir:
+        args.data_dir = os.path.abspath(args.data_dir)
+        symbols = sorted(name[:-4] for name in os.listdir(args.data_dir) if name.endswith(".csv"))[:args.symbols]
+
+    report = {"fingerprint": machine_fingerprint(), "commit": git_commit(), "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "settings": settings, "data": args.data_dir or "synthetic"}
+    if args.scaling:
+        report["scaling"] = run_scaling(settings)
+        report["results"] = {}
+    else:
+        report["results"] = run_suite(settings, args.only.split(",") if args.only else None, args.data_dir, symbols)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"💾 Results saved to {write_json(output, report)}")
+
+    if args.save_baseline:
+        print(f"💾 Baseline saved to {write_json(baseline_path(report['fingerprint']), report)}")
+        sys.exit(0)
+
+    baseline_file = args.baseline or baseline_path(report["fingerprint"])
+    if report["results"] and os.path.exists(baseline_file):
+        with open(baseline_file) as file:
+            regressions = compare_to_baseline(report, json.load(file), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    elif report["results"]:
+        print(f"ℹ No baseline at {baseline_file} (create one with --save-baseline)")
@@ -1,17 +1,10 @@
 import os
 import pandas as pd
-import json
+from config_manager import get_config
 
 # ✅ Define Data Storage Folder
 DATA_STORAGE_FOLDER = "data_storage"
 
-# ✅ Load Configuration
-CONFIG_FILE = "config.json"
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-config = load_config()
-
 # ✅ Fix Header Issues & Clean CSV Data
 def clean_and_save(symbol):
     file_path = os.path.join(DATA_STORAGE_FOLDER, f"{symbol}.csv")
@@ -21,6 +14,11 @@ def clean_and_save(symbol):
         return
 
     try:
+        # ✅ Files written from the history store already have the standard header
+        if pd.read_csv(file_path, nrows=0).columns[0] == "time":
+            print(f"✅ Already Clean: {file_path}")
+            return
+
         # ✅ Read CSV File (Skip First Two Rows to Fix Headers)
         df = pd.read_csv(file_path, skiprows=2)  # Skip first 2 rows (Remove 'Price' & 'Ticker' rows)
 
@@ -50,5 +48,9 @@ def clean_and_save(symbol):
         print(f"⚠ Error processing data for {symbol}: {e}")
 
 # ✅ Process All Symbols
-for symbol in config["trading_pairs"]:
-    clean_and_save(symbol)
+def main():
+    for symbol in get_config()["trading_pairs"]:
+        clean_and_save(symbol)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import threading
+from types import MappingProxyType
+
+# ✅ One config.json for every module, no matter which folder a script is started from
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.environ.get("TRADING_BOT_CONFIG", os.path.join(REPO_ROOT, "config.json"))
+DEFAULT_WATCH_INTERVAL = 1.0  # Seconds between mtime checks
+
+# ✅ Defaults for keys older modules each used to fill in themselves
+DEFAULTS = {
+    "account_balance": 10000,
+    "base_lot_size": 0.1,
+    "risk_percentage": 1.0,
+    "trading_interval": 60,
+    "max_risk_per_trade": 2,   # Default risk: 2% per trade
+    "min_lot_size": 0.01,
+    "max_lot_size": 5,
+    "min_margin_level": 100,   # Minimum margin level % before rejecting trades
+    "training_epochs": 200,
+    "batch_size": 32,
+    "trading_pairs": [],
+    "logging": {},
+}
+
+# key -> (accepted types, extra check, message)
+_NUMBER = (int, float)
+VALIDATION_RULES = {
+    "account_balance": (_NUMBER, lambda v: v > 0, "must be a positive number"),
+    "base_lot_size": (_NUMBER, lambda v: v > 0, "must be a positive number"),
+    "risk_percentage": (_NUMBER, lambda v: 0 < v <= 100, "must be between 0 and 100"),
+    "trading_interval": (_NUMBER, lambda v: v > 0, "must be a positive number of seconds"),
+    "max_risk_per_trade": (_NUMBER, lambda v: 0 < v <= 100, "must be between 0 and 100"),
+    "min_lot_size": (_NUMBER, lambda v: v > 0, "must be a positive number"),
+    "max_lot_size": (_NUMBER, lambda v: v > 0, "must be a positive number"),
+    "min_margin_level": (_NUMBER, lambda v: v >= 0, "must not be negative"),
+    "training_epochs": (int, lambda v: v > 0, "must be a positive integer"),
+    "batch_size": (int, lambda v: v > 0, "must be a positive integer"),
+    "trading_pairs": (list, lambda v: all(isinstance(s, str) and s for s in v), "must be a list of symbol names"),
+    "logging": (dict, None, "must be an object"),
+}
+
+class ConfigError(ValueError):
+    """ Raised when config.json cannot be parsed or fails validation """
+
+# ✅ Parse & Validate
+def parse_config(path=CONFIG_FILE):
+    try:
+        with open(path, "r") as file:
+            raw = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        raise ConfigError(f"Invalid or missing {path}: {e}") from e
+
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{path} must contain a JSON object")
+
+    config = {**DEFAULTS, **raw}
+    errors = []
+    for key, (types, check, message) in VALIDATION_RULES.items():
+        value = config[key]
+        if isinstance(value, bool) or not isinstance(value, types) or (check and not check(value)):
+            errors.append(f"'{key}' {message} (got {value!r})")
+    if config["min_lot_size"] > config["max_lot_size"]:
+        errors.append("'min_lot_size' must not be larger than 'max_lot_size'")
+    if errors:
+        raise ConfigError("; ".join(errors))
+    return config
+
+# ✅ Immutable Snapshots (dicts become read-only mappings, lists become tuples)
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """ Plain dict/list copy of a snapshot (e.g. to pickle it into another process) """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+_snapshot = None
+_mtime = None
+_lock = threading.RLock()  # Re-entrant: log_message under the lock may subscribe the logger on its first call
+_subscribers = []
+_watcher = None
+_watcher_stop = threading.Event()
+
+# ✅ Current Configuration (no filesystem access after the first call)
+def get_config():
+    if _snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _load_initial()
+    return _snapshot
+
+def current_config():
+    """ The loaded snapshot, or None if nothing has called get_config() yet (never reads the file) """
+    return _snapshot
+
+def _load_initial():
+    global _snapshot, _mtime
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        _snapshot = freeze(parse_config())
+        _mtime = mtime
+    except (ConfigError, OSError) as e:
+        from logs.logger import log_message
+        log_message(f"❌ ERROR: {e}", level="error")
+        sys.exit(1)
+
+# ✅ Reload (keeps the previous snapshot if the new file is invalid)
+def reload_config():
+    """ Re-reads config.json and notifies subscribers. Returns True if a new snapshot was installed. """
+    global _snapshot, _mtime
+    from logs.logger import log_message
+
+    with _lock:
+        mtime = None
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+            new_snapshot = freeze(parse_config())
+        except (ConfigError, OSError) as e:
+            if mtime is not None:
+                _mtime = mtime  # Don't retry the same broken file on every watcher tick
+            log_message(f"⚠ Config reload rejected, keeping previous settings: {e}", level="warning")
+            return False
+        old_snapshot, _snapshot, _mtime = _snapshot, new_snapshot, mtime
+        subscribers = list(_subscribers)
+
+    log_message("🔄 Configuration reloaded from config.json")
+    for callback in subscribers:
+        try:
+            callback(new_snapshot, old_snapshot)
+        except Exception as e:
+            log_message(f"❌ ERROR: Config subscriber {getattr(callback, '__name__', callback)} failed - {str(e)}", level="error")
+    return True
+
+# ✅ Change Notifications
+def subscribe(callback):
+    """ callback(new_config, old_config) is called after every successful reload """
+    with _lock:
+        _subscribers.append(callback)
+    return callback
+
+def unsubscribe(callback):
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+# ✅ File Watcher (polls mtime; portable across Windows/MT5 hosts where inotify is unavailable)
+def start_watching(interval=DEFAULT_WATCH_INTERVAL):
+    global _watcher
+    get_config()
+    with _lock:
+        if _watcher is not None and _watcher.is_alive():
+            return _watcher
+        _watcher_stop.clear()
+        _watcher = threading.Thread(target=_watch_loop, args=(interval,), name="config-watcher", daemon=True)
+        _watcher.start()
+        return _watcher
+
+def stop_watching():
+    _watcher_stop.set()
+
+def _watch_loop(interval):
+    while not _watcher_stop.wait(interval):
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        except OSError:
+            continue
+        if mtime != _mtime:
+            reload_config()
+
+if __name__ == "__main__":
+    print(json.dumps(thaw(get_config()), indent=4))
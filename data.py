@@ -1,50 +1,38 @@
 import os
-import yfinance as yf
-import json
-import pandas as pd
+from config_manager import get_config
+from data_feeds.history_cache import get_histories
 
 # ✅ Define Folder for Saving Raw Data
 RAW_DATA_FOLDER = "data_storage"
-os.makedirs(RAW_DATA_FOLDER, exist_ok=True)  # ✅ Ensure Folder Exists
 
-# ✅ Correct Symbol Mapping for Yahoo Finance
-YAHOO_SYMBOLS = {
-    "EURUSDm": "EURUSD=X",
-    "USDJPYm": "USDJPY=X",
-    "GBPUSDm": "GBPUSD=X"
-}
-
-# ✅ Load Configurations
-CONFIG_FILE = "config.json"
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-config = load_config()
-
-# ✅ Fetch & Save Historical Market Data (RAW)
-def fetch_and_save_raw_data(symbol, years=30):
+# ✅ Save Historical Market Data (served from the local history store; only missing ranges are downloaded)
+def save_raw_data(symbol, df):
     """
-    Fetches 10 years of historical data from Yahoo Finance and saves it as a raw CSV file.
+    Saves daily bars as a CSV file with the standard time, open, high, low, close, volume columns.
     """
-    print(f"📊 Fetching Raw Data for {symbol}...")
-
-    yahoo_symbol = YAHOO_SYMBOLS.get(symbol, symbol)
     file_path = os.path.join(RAW_DATA_FOLDER, f"{symbol}.csv")  # ✅ Save File Path
 
-    try:
-        df = yf.download(yahoo_symbol, period="30y", interval="1d")
+    if df.empty:
+        print(f"⚠ No data found for {symbol}! Check symbol name.")
+        return None
 
-        if df.empty:
-            print(f"⚠ No data found for {symbol}! Check symbol name.")
-            return None
+    df.to_csv(file_path, index=False)
+    print(f"💾 Raw Data for {symbol} Saved at: {file_path}")
+    return file_path
 
-        # ✅ Save Raw Data to CSV
-        df.to_csv(file_path)
-        print(f"💾 Raw Data for {symbol} Saved at: {file_path}")
+def fetch_and_save_raw_data(symbol, years=30):
+    """
+    Fetches `years` of daily data for one symbol and saves it as a CSV file.
+    """
+    print(f"📊 Fetching Raw Data for {symbol}...")
+    df = get_histories([symbol], interval="1d", years=years).get(symbol)
+    return None if df is None else save_raw_data(symbol, df)
 
-    except Exception as e:
-        print(f"⚠ Error fetching data for {symbol}: {e}")
+# ✅ Fetch & Save Data for All Symbols (downloads run concurrently across symbols)
+def main(years=30):
+    os.makedirs(RAW_DATA_FOLDER, exist_ok=True)  # ✅ Ensure Folder Exists
+    for symbol, df in get_histories(list(get_config()["trading_pairs"]), interval="1d", years=years).items():
+        save_raw_data(symbol, df)
 
-# ✅ Fetch & Save Data for All Symbols
-for symbol in config["trading_pairs"]:
-    fetch_and_save_raw_data(symbol)
+if __name__ == "__main__":
+    main()
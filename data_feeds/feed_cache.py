@@ -0,0 +1,167 @@
+import time
+import threading
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from config_manager import current_config
+from logs.logger import log_message
+from monitoring.metrics import increment
+from monitoring.recorder import recorded, recorder_mode
+
+# ✅ Per-Source TTLs (seconds). "stale" is how long past its TTL a value may still be served while
+# it is refreshed in the background (stale-while-revalidate); 0 means always wait for a fresh value.
+DEFAULT_FEED_CACHE_SETTINGS = {
+    "enabled": True,
+    "sources": {
+        "price": {"ttl": 1, "stale": 0},           # Never trade on an old quote
+        "order_flow": {"ttl": 5, "stale": 10},
+        "news": {"ttl": 300, "stale": 600},
+        "price_data": {"ttl": 30, "stale": 30},
+        "volatility": {"ttl": 30, "stale": 30},
+        "risk_factor": {"ttl": 60, "stale": 0},
+    },
+    "default": {"ttl": 5, "stale": 0},
+    "refresh_workers": 2,
+}
+
+_entries = {}        # (source, key) -> (value, fetched_at)
+_in_flight = {}      # (source, key) -> Future of the fetch that everyone else waits for
+_stats = {}          # source -> {"hits", "stale", "misses", "coalesced", "errors", "bypass"}
+_lock = threading.Lock()
+_refresher = None
+_resolved = (None, None)  # (config snapshot, merged settings): re-merged only after a reload
+
+def _settings():
+    global _resolved
+    config = current_config()  # Never triggers a config load (data feeds are imported by tools too)
+    if _resolved[1] is None or _resolved[0] is not config:
+        overrides = (config or {}).get("feed_cache") or {}
+        _resolved = (config, {**DEFAULT_FEED_CACHE_SETTINGS, **overrides,
+                              "sources": {**DEFAULT_FEED_CACHE_SETTINGS["sources"], **(overrides.get("sources") or {})}})
+    return _resolved[1]
+
+def _source_ttl(settings, source):
+    policy = {**settings["default"], **(settings["sources"].get(source) or {})}
+    return policy["ttl"], policy["stale"]
+
+def _count(source, outcome):
+    """ Must be called with _lock held """
+    stats = _stats.setdefault(source, {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "errors": 0, "bypass": 0})
+    stats[outcome] += 1
+    increment("feed_cache", source, outcome)
+
+def _refresh_pool(settings):
+    global _refresher
+    if _refresher is None:
+        _refresher = ThreadPoolExecutor(max_workers=settings["refresh_workers"], thread_name_prefix="feed-refresh")
+    return _refresher
+
+# ✅ Fetching (exactly one caller fetches a key at a time; the rest wait for its Future)
+def _fetch(source, cache_key, func, args, kwargs, future):
+    try:
+        value = func(*args, **kwargs)
+    except BaseException as e:
+        with _lock:
+            _in_flight.pop(cache_key, None)
+            _count(source, "errors")
+        future.set_exception(e)
+        return
+    with _lock:
+        if value is not None:  # Failed lookups (None) are retried on the next call instead of cached
+            _entries[cache_key] = (value, time.monotonic())
+        _in_flight.pop(cache_key, None)
+    future.set_result(value)
+
+def _background_refresh(source, cache_key, func, args, kwargs, future):
+    _fetch(source, cache_key, func, args, kwargs, future)
+    if future.exception() is not None:
+        log_message(f"⚠ Background refresh of {source} failed, serving the stale value - {future.exception()}", level="warning")
+
+# ✅ Caching Decorator
+def cached_feed(source, key=None):
+    """
+    Memoizes a data-feed call per (source, arguments) with the TTL configured for source.
+    Concurrent callers for the same key share one fetch; a value within its stale window is
+    returned immediately while one background refresh runs. key(*args, **kwargs) may map the
+    arguments to a hashable key; unhashable arguments bypass the cache.
+    While recording, every value returned to the caller is written to the input log; during a
+    replay the recorded value is returned instead (see monitoring/recorder.py).
+    The undecorated function stays available as .uncached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if recorder_mode() == "off":
+                return cached_call(*args, **kwargs)
+            input_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(input_key)
+            except TypeError:
+                input_key = repr(input_key)
+            return recorded(source, input_key, lambda: cached_call(*args, **kwargs))
+
+        def cached_call(*args, **kwargs):
+            settings = _settings()
+            if not settings["enabled"]:
+                return func(*args, **kwargs)
+            try:
+                cache_key = (source, key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items()))))
+                hash(cache_key)
+            except TypeError:
+                with _lock:
+                    _count(source, "bypass")
+                return func(*args, **kwargs)
+
+            ttl, stale = _source_ttl(settings, source)
+            now = time.monotonic()
+            with _lock:
+                entry = _entries.get(cache_key)
+                age = None if entry is None else now - entry[1]
+                if age is not None and age < ttl:
+                    _count(source, "hits")
+                    return entry[0]
+
+                future = _in_flight.get(cache_key)
+                if age is not None and age < ttl + stale:
+                    _count(source, "stale")
+                    if future is None:
+                        future = _in_flight[cache_key] = Future()
+                        _refresh_pool(settings).submit(_background_refresh, source, cache_key, func, args, kwargs, future)
+                    return entry[0]
+
+                if future is not None:
+                    _count(source, "coalesced")
+                    owner = False
+                else:
+                    _count(source, "misses")
+                    future = _in_flight[cache_key] = Future()
+                    owner = True
+
+            if owner:
+                _fetch(source, cache_key, func, args, kwargs, future)
+            return future.result()
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+# ✅ Maintenance & Reporting
+def invalidate(source=None):
+    """ Drops cached values (of one source, or all) so the next call fetches again """
+    with _lock:
+        for cache_key in [k for k in _entries if source is None or k[0] == source]:
+            del _entries[cache_key]
+
+def cache_stats():
+    """ {source: {"hits", "stale", "misses", "coalesced", "errors", "bypass", "hit_rate"}} """
+    with _lock:
+        report = {}
+        for source, stats in _stats.items():
+            served = stats["hits"] + stats["stale"] + stats["coalesced"]
+            total = served + stats["misses"]
+            report[source] = {**stats, "hit_rate": round(served / total, 4) if total else 0.0}
+        return report
+
+def log_cache_stats():
+    for source, stats in sorted(cache_stats().items()):
+        log_message(f"🗃 Feed Cache {source}: {stats['hits']} hits, {stats['stale']} stale, {stats['misses']} misses, "
+                    f"{stats['coalesced']} coalesced, {stats['errors']} errors (hit rate {stats['hit_rate']:.0%})")
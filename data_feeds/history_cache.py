@@ -0,0 +1,272 @@
+import os
+import sys
+import json
+import time
+import threading
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ✅ Local Historical Data Store with Incremental Range Downloads
+# Bars are kept per (interval, symbol) as a .npy file next to a .json list of the time ranges
+# already downloaded. A request only downloads the parts of [start, end) that are not covered yet
+# (across symbols in parallel), merges them into the store and is then served from disk. The
+# newest, still-forming bar is never marked as covered, so it is fetched again on the next request.
+DEFAULT_HISTORY_SETTINGS = {
+    "provider": "yahoo",                     # "yahoo", "mt5" or "fixture" (see PROVIDERS)
+    "directory": "data_storage/history",
+    "fixture_dir": "data_storage/fixtures",  # {symbol}.csv files served by the offline "fixture" provider
+    "max_workers": 4,                        # Symbols downloaded concurrently
+}
+HISTORY_DTYPE = np.dtype([
+    ("time", "<i8"),                         # Unix seconds (bar open)
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "4h": 14400, "1d": 86400, "1wk": 604800}
+MT5_TIMEFRAMES = {"1m": "TIMEFRAME_M1", "5m": "TIMEFRAME_M5", "15m": "TIMEFRAME_M15", "30m": "TIMEFRAME_M30",
+                  "1h": "TIMEFRAME_H1", "4h": "TIMEFRAME_H4", "1d": "TIMEFRAME_D1"}
+
+# ✅ Yahoo Finance Symbols for the MT5 names
+YAHOO_SYMBOLS = {
+    "EURUSDm": "EURUSD=X",
+    "USDJPYm": "USDJPY=X",
+    "GBPUSDm": "GBPUSD=X"
+}
+
+def load_history_settings(settings=None):
+    from config_manager import get_config
+    return {**DEFAULT_HISTORY_SETTINGS, **(get_config().get("history_cache") or {}), **(settings or {})}
+
+def to_timestamp(value):
+    """ Unix seconds from a number, date string, datetime or numpy / pandas timestamp """
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    if hasattr(value, "timestamp"):
+        return int(value.timestamp())
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+def bars_from_frame(df):
+    """ HISTORY_DTYPE array from a DataFrame with a time / date column (or index) and OHLC(V) columns in any case """
+    if "time" not in {str(col).lower() for col in df.columns}:
+        df = df.reset_index()
+    df = df.rename(columns={col: str(col).lower() for col in df.columns})
+    df = df.rename(columns={"date": "time", "datetime": "time"})
+    bars = np.zeros(len(df), HISTORY_DTYPE)
+    times = df["time"].to_numpy()
+    bars["time"] = times.astype(np.int64) if times.dtype.kind in "iuf" else \
+        np.array(times, dtype="datetime64[ns]").astype("datetime64[s]").astype(np.int64)
+    for field in ("open", "high", "low", "close"):
+        bars[field] = df[field].to_numpy(dtype=np.float64)
+    bars["volume"] = df["volume"].to_numpy(dtype=np.float64) if "volume" in df.columns else 0.0
+    return bars
+
+# ✅ Download Providers: fetch(symbol, interval, start, end) -> DataFrame or HISTORY_DTYPE array of the bars in [start, end)
+def yahoo_provider(symbol, interval, start, end):
+    import yfinance as yf
+
+    df = yf.download(YAHOO_SYMBOLS.get(symbol, symbol), start=np.datetime64(start, "s").item(), end=np.datetime64(end, "s").item(),
+                     interval=interval, progress=False, auto_adjust=False)
+    if df is None or df.empty:
+        return np.zeros(0, HISTORY_DTYPE)
+    if getattr(df.columns, "nlevels", 1) > 1:  # (Price, Ticker) columns of newer yfinance versions
+        df.columns = df.columns.get_level_values(0)
+    return bars_from_frame(df)
+
+def mt5_provider(symbol, interval, start, end):
+    import MetaTrader5 as mt5
+    from datetime import datetime, timezone
+
+    if not mt5.initialize():
+        raise ConnectionError("❌ ERROR: Failed to initialize MT5!")
+    mt5.symbol_select(symbol, True)
+    rates = mt5.copy_rates_range(symbol, getattr(mt5, MT5_TIMEFRAMES[interval]),
+                                 datetime.fromtimestamp(start, timezone.utc), datetime.fromtimestamp(end, timezone.utc))
+    if rates is None:  # Request failed (an empty array means the range has no bars)
+        raise ConnectionError(f"❌ ERROR: MT5 history request for {symbol} failed - {mt5.last_error()}")
+    if not len(rates):
+        return np.zeros(0, HISTORY_DTYPE)
+    bars = np.zeros(len(rates), HISTORY_DTYPE)
+    for field in ("time", "open", "high", "low", "close"):
+        bars[field] = rates[field]
+    bars["volume"] = rates["tick_volume"]
+    return bars[bars["time"] < end]
+
+def fixture_provider(symbol, interval, start, end, fixture_dir=DEFAULT_HISTORY_SETTINGS["fixture_dir"]):
+    """ Offline stand-in: slices {fixture_dir}/{symbol}.csv (data_storage layout) """
+    import pandas as pd
+
+    path = os.path.join(fixture_dir, f"{symbol}.csv")
+    if not os.path.exists(path):
+        return np.zeros(0, HISTORY_DTYPE)
+    bars = bars_from_frame(pd.read_csv(path))
+    return bars[(bars["time"] >= start) & (bars["time"] < end)]
+
+PROVIDERS = {"yahoo": yahoo_provider, "mt5": mt5_provider, "fixture": fixture_provider}
+
+def register_provider(name, fetch):
+    """ Adds a download source usable as settings["provider"] = name """
+    PROVIDERS[name] = fetch
+
+def resolve_provider(settings):
+    provider = settings["provider"]
+    if callable(provider):
+        return provider
+    if provider == "fixture":
+        return lambda symbol, interval, start, end: fixture_provider(symbol, interval, start, end, settings["fixture_dir"])
+    return PROVIDERS[provider]
+
+# ✅ Coverage Arithmetic (lists of [start, end) ranges in unix seconds)
+def merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def missing_ranges(covered, start, end, min_gap=0):
+    """ Parts of [start, end) not inside any covered range (gaps shorter than min_gap are ignored) """
+    gaps, cursor = [], start
+    for covered_start, covered_end in merge_ranges(covered):
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append([cursor, covered_start])
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        gaps.append([cursor, end])
+    return [gap for gap in gaps if gap[1] - gap[0] >= min_gap]
+
+# ✅ On-Disk Store
+_locks = {}
+_locks_guard = threading.Lock()
+
+def _lock(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+def store_paths(symbol, interval, directory=DEFAULT_HISTORY_SETTINGS["directory"]):
+    folder = os.path.join(directory, interval)
+    return os.path.join(folder, f"{symbol}.npy"), os.path.join(folder, f"{symbol}.json")
+
+def read_store(symbol, interval, directory=DEFAULT_HISTORY_SETTINGS["directory"]):
+    """ (bars, covered ranges) stored for symbol / interval """
+    bars_path, coverage_path = store_paths(symbol, interval, directory)
+    try:
+        with open(coverage_path, "r") as file:
+            covered = json.load(file)["ranges"]
+        return np.load(bars_path), covered
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+        return np.zeros(0, HISTORY_DTYPE), []
+
+def write_store(symbol, interval, bars, covered, directory=DEFAULT_HISTORY_SETTINGS["directory"]):
+    """ Bars first, then the coverage that describes them (both atomic), so coverage never claims unwritten bars """
+    bars_path, coverage_path = store_paths(symbol, interval, directory)
+    os.makedirs(os.path.dirname(bars_path), exist_ok=True)
+    tmp_path = f"{bars_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.save(file, bars)
+    os.replace(tmp_path, bars_path)
+    tmp_path = f"{coverage_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"symbol": symbol, "interval": interval, "ranges": covered, "updated_at": time.time()}, file)
+    os.replace(tmp_path, coverage_path)
+
+def merge_bars(stored, downloaded):
+    """ Time-sorted union; a downloaded bar replaces the stored one with the same time """
+    combined = np.concatenate([stored] + [np.asarray(bars, HISTORY_DTYPE) for bars in downloaded])
+    if len(combined) == 0:
+        return combined
+    combined = combined[np.argsort(combined["time"], kind="stable")]
+    keep = np.append(combined["time"][1:] != combined["time"][:-1], True)  # Last (newest) row of every time
+    return combined[keep]
+
+# ✅ Cached History
+def update_history(symbol, interval, start, end, settings):
+    """ Downloads the missing parts of [start, end) into the store; returns the bars of [start, end) """
+    from logs.logger import log_message
+
+    step = INTERVAL_SECONDS[interval]
+    directory = settings["directory"]
+    with _lock((directory, symbol, interval)):
+        stored, covered = read_store(symbol, interval, directory)
+        gaps = missing_ranges(covered, start, end, min_gap=step)
+        if gaps:
+            fetch = resolve_provider(settings)
+            log_message(f"⬇ Downloading {len(gaps)} missing {interval} range(s) for {symbol}: "
+                        + ", ".join(f"{np.datetime64(a, 's')} -> {np.datetime64(b, 's')}" for a, b in gaps))
+            downloaded = []
+            newest_complete = (int(time.time()) // step - 1) * step  # Open time of the last finished bar
+            for gap_start, gap_end in gaps:
+                bars = fetch(symbol, interval, gap_start, gap_end)
+                bars = bars if isinstance(bars, np.ndarray) else bars_from_frame(bars)
+                downloaded.append(bars)
+                # A provider call that returned (failures raise) answers the whole finished part of the gap,
+                # even with few or no bars: weekends, holidays and history that ends early stay on disk as
+                # "no data". The still-forming bar (and anything after it) stays uncovered, so it is fetched again.
+                covered_end = min(gap_end, newest_complete + step)
+                if covered_end > gap_start:
+                    covered.append([gap_start, covered_end])
+            stored = merge_bars(stored, downloaded)
+            covered = merge_ranges(covered)
+            write_store(symbol, interval, stored, covered, directory)
+    lo, hi = np.searchsorted(stored["time"], [start, end], side="left")
+    return stored[lo:hi]
+
+def get_history(symbol, interval="1d", start=None, end=None, years=5, settings=None):
+    """
+    DataFrame (time, open, high, low, close, volume) of the bars in [start, end); start defaults to
+    `years` before end, end to now. Only ranges not in the local store are downloaded.
+    """
+    import pandas as pd
+
+    settings = load_history_settings(settings)
+    end = to_timestamp(end) if end is not None else int(time.time())
+    start = to_timestamp(start) if start is not None else end - int(years * 365.25 * 86400)
+    bars = update_history(symbol, interval, start, end, settings)
+    df = pd.DataFrame(bars)
+    df["time"] = bars["time"].astype("datetime64[s]")
+    return df
+
+def get_histories(symbols, interval="1d", start=None, end=None, years=5, settings=None):
+    """ {symbol: DataFrame} for many symbols; the missing ranges are downloaded concurrently across symbols """
+    from concurrent.futures import ThreadPoolExecutor
+    from logs.logger import log_message
+
+    settings = load_history_settings(settings)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(settings["max_workers"], len(symbols)))) as pool:
+        futures = {symbol: pool.submit(get_history, symbol, interval, start, end, years, settings) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                log_message(f"⚠ Error fetching {interval} history for {symbol}: {e}", level="error")
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Fill the local historical data store (only missing ranges are downloaded)")
+    parser.add_argument("--symbols", nargs="+", default=None, help="Default: config trading_pairs")
+    parser.add_argument("--interval", default="1d", choices=sorted(INTERVAL_SECONDS))
+    parser.add_argument("--start", default=None, help="e.g. 2015-01-01 (default: --years before --end)")
+    parser.add_argument("--end", default=None, help="Default: now")
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--provider", default=None, choices=sorted(PROVIDERS))
+    args = parser.parse_args()
+
+    from config_manager import get_config
+    started = time.perf_counter()
+    frames = get_histories(args.symbols or list(get_config()["trading_pairs"]), args.interval, args.start, args.end, args.years,
+                           {"provider": args.provider} if args.provider else None)
+    for symbol, df in frames.items():
+        print(f"📦 {symbol}: {len(df)} {args.interval} bars" + (f" ({df['time'].iloc[0]} -> {df['time'].iloc[-1]})" if len(df) else ""))
+    print(f"✅ Done in {time.perf_counter() - started:.2f}s")
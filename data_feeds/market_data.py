@@ -1,31 +1,29 @@
-import MetaTrader5 as mt5
 import json
-import time
 from trade_execution.risk_management import validate_trade_risk, calculate_lot_size
 from logs.logger import log_message
-
-# ✅ Load Configuration
-def load_config():
-    try:
-        with open("config.json", "r") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        log_message("❌ ERROR: Invalid or missing config.json!", level="error")
-        exit()
-
-config = load_config()
+from config_manager import get_config, start_watching
+from monitoring.tracing import traced
+from data_feeds.feed_cache import cached_feed
 
 # ✅ Initialize MT5
+@traced()
 def initialize_mt5():
     """Connect to MetaTrader 5"""
+    import MetaTrader5 as mt5
+
+    config = get_config()
     if not mt5.initialize(login=config["mt5_login"], server=config["mt5_server"], password=config["mt5_password"]):
         log_message("❌ Failed to connect to MT5!", level="error")
         return False
     return True
 
-# ✅ Fetch Current Price for a Symbol
+# ✅ Fetch Current Price for a Symbol (cached for the "price" TTL, shared with send_trade_action)
+@cached_feed("price")
+@traced()
 def get_current_price(symbol):
     """ Fetches current price for the given symbol """
+    import MetaTrader5 as mt5
+
     if not initialize_mt5():
         return None
 
@@ -37,8 +35,12 @@ def get_current_price(symbol):
     return symbol_info.ask if symbol_info.ask else None
 
 # ✅ Send Trade Action to MT5 EA (No Direct Execution)
+@traced()
 def send_trade_action(action, symbol, sl=None, tp=None, trail=False, ticket=None):
     """ Sends trade instructions to MT5 EA via Global Variables """
+    import MetaTrader5 as mt5
+
+    config = get_config()
     if not initialize_mt5():
         return False
 
@@ -63,28 +65,33 @@ def send_trade_action(action, symbol, sl=None, tp=None, trail=False, ticket=None
     return True
 
 # ✅ Monitor AI Signals and Execute Trades
+def process_ai_signals():
+    """ One pass over ai_signals.json """
+    try:
+        with open("ai_signals.json", "r") as file:
+            signals = json.load(file)
+    except Exception as e:
+        log_message(f"❌ ERROR: Failed to read AI signals: {str(e)}", level="error")
+        return
+
+    for signal in signals:
+        send_trade_action(
+            action=signal["action"],
+            symbol=signal["symbol"],
+            sl=signal.get("sl"),
+            tp=signal.get("tp"),
+            trail=signal.get("trail", False),
+            ticket=signal.get("ticket")
+        )
+
 def monitor_ai_signals():
     """ Monitors AI trading signals and sends them to MT5 """
-    while True:
-        try:
-            with open("ai_signals.json", "r") as file:
-                signals = json.load(file)
-        except Exception as e:
-            log_message(f"❌ ERROR: Failed to read AI signals: {str(e)}", level="error")
-            time.sleep(config["trading_interval"])
-            continue
-
-        for signal in signals:
-            send_trade_action(
-                action=signal["action"],
-                symbol=signal["symbol"],
-                sl=signal.get("sl"),
-                tp=signal.get("tp"),
-                trail=signal.get("trail", False),
-                ticket=signal.get("ticket")
-            )
-
-        time.sleep(config["trading_interval"])  # Wait before checking again
+    from trade_execution.scheduler import BarScheduler
+
+    start_watching()  # ✅ Pick up config.json edits without a restart
+    # ✅ Runs on trading_interval boundaries (re-read every tick): no drift, no overlapping passes
+    scheduler = BarScheduler(lambda: get_config()["trading_interval"], close_delay=0.0, max_workers=1, name="ai_signals")
+    scheduler.run(lambda: {"ai_signals": process_ai_signals})
 
 if __name__ == "__main__":
     monitor_ai_signals()
@@ -1,20 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
 import time
 from logs.logger import log_message
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from config_manager import get_config
+from monitoring.tracing import traced
+from data_feeds.feed_cache import cached_feed
+
+_sentiment_analyzer = None
 
 # ✅ Initialize Chrome Driver
+@traced()
 def get_chrome_driver():
+    import undetected_chromedriver as uc
     return uc.Chrome(version_main=133)
 
 # ✅ Fetch News for All Pairs in config.json
+@cached_feed("news")
+@traced()
 def fetch_news_sentiment():
-    with open("config.json", "r") as file:
-        config = json.load(file)
-
+    config = get_config()
     sentiment_results = {}
     for symbol in config["trading_pairs"]:
         news_list = fetch_yahoo_news(symbol) or fetch_forexfactory_news()
@@ -24,7 +26,12 @@ def fetch_news_sentiment():
     return sentiment_results
 
 # ✅ Yahoo Finance News Scraper
+@cached_feed("news")
+@traced()
 def fetch_yahoo_news(symbol):
+    import requests
+    from bs4 import BeautifulSoup
+
     url = f"https://finance.yahoo.com/quote/{symbol}/news"
     headers = {"User-Agent": "Mozilla/5.0"}
 
@@ -37,7 +44,11 @@ def fetch_yahoo_news(symbol):
         return None
 
 # ✅ ForexFactory Scraper (Fallback)
+@cached_feed("news")
+@traced()
 def fetch_forexfactory_news():
+    from selenium.webdriver.common.by import By
+
     driver = get_chrome_driver()
     driver.get("https://www.forexfactory.com/news")
     time.sleep(10)
@@ -51,9 +62,18 @@ def fetch_forexfactory_news():
         driver.quit()
         return None
 
+# ✅ Sentiment Analyzer (VADER lexicon is loaded once, on first use)
+def get_sentiment_analyzer():
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _sentiment_analyzer = SentimentIntensityAnalyzer()
+    return _sentiment_analyzer
+
 # ✅ Sentiment Analysis
+@traced()
 def analyze_sentiment(news_list):
-    analyzer = SentimentIntensityAnalyzer()
+    analyzer = get_sentiment_analyzer()
     scores = [analyzer.polarity_scores(news)["compound"] for news in news_list]
     return round(sum(scores) / len(scores), 2) if scores else 0
 
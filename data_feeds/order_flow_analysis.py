@@ -1,5 +1,11 @@
-import requests
 import time
+import os
+import sys
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from monitoring.tracing import traced
+from data_feeds.feed_cache import cached_feed
 
 # ✅ Binance API Endpoint for Order Book Data
 BINANCE_API_URL = "https://api.binance.com/api/v3/depth"
@@ -15,8 +21,12 @@ SYMBOL_MAP = {
     "NZDUSDm": "NZDUSDT",
 }
 
-# ✅ Function to Fetch Order Flow from Binance
+# ✅ Function to Fetch Order Flow from Binance (cached and recorded as the "order_flow" source)
+@cached_feed("order_flow")
+@traced()
 def fetch_binance_order_flow(mt5_symbol, limit=10):
+    import requests
+
     binance_symbol = SYMBOL_MAP.get(mt5_symbol)
     if not binance_symbol:
         print(f"⚠ Invalid Symbol Mapping for {mt5_symbol}")
@@ -54,6 +64,18 @@ def fetch_binance_order_flow(mt5_symbol, limit=10):
         print(f"⚠ Binance API error: {e}")
         return None
 
+# ✅ Order Flow Imbalance (-1 = all selling, +1 = all buying) used as an AI input
+@traced()
+def fetch_order_flow(mt5_symbol, limit=10):
+    order_flow = fetch_binance_order_flow(mt5_symbol, limit)
+    if not order_flow:
+        return 0.0
+
+    total_volume = order_flow["buy_volume"] + order_flow["sell_volume"]
+    if total_volume == 0:
+        return 0.0
+    return round((order_flow["buy_volume"] - order_flow["sell_volume"]) / total_volume, 4)
+
 # ✅ Function to Test Order Flow for All Symbols
 def test_binance_order_flow():
     for mt5_symbol in SYMBOL_MAP.keys():
@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+import zlib
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from trade_execution.scheduler import timeframe_seconds
+from pipeline.ring_buffer import TICK_DTYPE
+
+# ✅ Same layout as MT5 copy_rates_* (fetch_price_data wraps it in a DataFrame)
+BAR_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+SECONDS_PER_YEAR = 252 * 86400
+
+DEFAULT_SYNTHETIC_SETTINGS = {
+    "seed": 42,
+    "timeframe": "M1",               # Bar size (or tick interval for ticks()); plain numbers are seconds
+    "start": "2020-01-01",
+    "annual_volatility": 0.08,       # Base GBM volatility (each symbol gets 0.7x-1.4x of it)
+    "regimes": [                     # Markov regimes: annual drift and volatility multiplier
+        {"drift": 0.02, "vol_mult": 0.7},
+        {"drift": -0.05, "vol_mult": 1.8},
+    ],
+    "regime_switch_prob": 0.0005,    # Per bar
+    "vol_persistence": 0.995,        # AR(1) coefficient of log-volatility (volatility clustering)
+    "vol_of_vol": 0.05,
+    "spread_points": 12,             # Typical spread; widens with volatility
+    "order_flow_persistence": 0.9,
+    "chunk_bars": 65536,             # Bars per symbol per streamed chunk
+}
+
+# ✅ One Symbol's Process State (carried across chunks so streaming matches one long run)
+class SyntheticSymbol:
+    STREAMS = ("returns", "vol", "regime", "range", "volume", "flow", "arrival")
+
+    def __init__(self, symbol, seed, settings):
+        self.symbol = symbol
+        self.settings = settings
+        # Seeded from (seed, symbol name): a symbol's path does not depend on which other symbols are generated
+        children = np.random.SeedSequence([seed, zlib.crc32(symbol.encode())]).spawn(len(self.STREAMS) + 1)
+        self.rng = {name: np.random.default_rng(child) for name, child in zip(self.STREAMS, children)}
+        setup = np.random.default_rng(children[-1])
+
+        jpy = "JPY" in symbol.upper()
+        self.point = 0.001 if jpy else 0.00001
+        self.log_price = float(np.log(setup.uniform(100, 150) if jpy else setup.uniform(0.6, 1.6)))
+        self.volatility = settings["annual_volatility"] * setup.uniform(0.7, 1.4)
+        self.drifts = np.array([regime["drift"] for regime in settings["regimes"]])
+        self.vol_mults = np.array([regime["vol_mult"] for regime in settings["regimes"]])
+        self.regime = int(setup.integers(len(self.drifts)))
+        self.log_vol = 0.0
+        self.flow = 0.0
+
+    def step(self, n, period):
+        """ Next n bars of period seconds as arrays: log open/close, wick sizes, volatility ratio, order flow """
+        from scipy.signal import lfilter
+
+        settings = self.settings
+        dt = period / SECONDS_PER_YEAR
+
+        # Regimes: every bar switches with regime_switch_prob, cycling through the configured regimes
+        switches = self.rng["regime"].random(n) < settings["regime_switch_prob"]
+        regimes = (self.regime + np.cumsum(switches)) % len(self.drifts)
+        self.regime = int(regimes[-1])
+
+        # Volatility clustering: log-volatility is an AR(1) process (lfilter carries the state across chunks)
+        phi = settings["vol_persistence"]
+        log_vol, _ = lfilter([1.0], [1.0, -phi], self.rng["vol"].normal(0.0, settings["vol_of_vol"], n), zi=[phi * self.log_vol])
+        self.log_vol = float(log_vol[-1])
+        ratio = self.vol_mults[regimes] * np.exp(log_vol)
+
+        # GBM log returns
+        sigma = self.volatility * ratio * np.sqrt(dt)
+        returns = self.drifts[regimes] * dt - 0.5 * sigma ** 2 + sigma * self.rng["returns"].standard_normal(n)
+        log_close = self.log_price + np.cumsum(returns)
+        log_open = np.empty(n)
+        log_open[0] = self.log_price
+        log_open[1:] = log_close[:-1]
+        self.log_price = float(log_close[-1])
+
+        rho = settings["order_flow_persistence"]
+        flow, _ = lfilter([1.0], [1.0, -rho], self.rng["flow"].normal(0.0, 0.5, n), zi=[rho * self.flow])
+        self.flow = float(flow[-1])
+
+        wicks = np.abs(self.rng["range"].standard_normal((n, 2))).T * sigma * 0.5  # (n, 2): same draws whatever the chunking
+        return {"log_open": log_open, "log_close": log_close, "wicks": wicks, "ratio": ratio, "order_flow": np.tanh(flow)}
+
+# ✅ Market of Many Symbols
+class SyntheticMarket:
+    """
+    Reproducible synthetic OHLCV bars and ticks: GBM with Markov regime switching, clustered
+    (AR(1) log) volatility and a volatility-dependent spread. Every call continues where the
+    previous one stopped, so bars(n) twice matches one longer run with the same seed (up to float
+    rounding in the cumulative sums), whatever other symbols are generated alongside.
+    """
+
+    def __init__(self, symbols, seed=None, **settings):
+        self.settings = {**DEFAULT_SYNTHETIC_SETTINGS, **settings}
+        seed = self.settings["seed"] if seed is None else seed
+        self.period = timeframe_seconds(self.settings["timeframe"])
+        self.states = {symbol: SyntheticSymbol(symbol, seed, self.settings) for symbol in symbols}
+        self.time = float(np.datetime64(self.settings["start"], "s").astype(np.int64))
+        self.seq = 0
+
+    @property
+    def symbols(self):
+        return list(self.states)
+
+    def bars(self, n):
+        """ Next n bars for every symbol: {symbol: BAR_DTYPE array} """
+        times = (self.time + np.arange(n) * self.period).astype(np.int64)
+        self.time += n * self.period
+        chunk = {}
+        for symbol, state in self.states.items():
+            step = state.step(n, self.period)
+            bars = np.empty(n, BAR_DTYPE)
+            bars["time"] = times
+            bars["open"] = np.exp(step["log_open"])
+            bars["close"] = np.exp(step["log_close"])
+            bars["high"] = np.exp(np.maximum(step["log_open"], step["log_close"]) + step["wicks"][0])
+            bars["low"] = np.exp(np.minimum(step["log_open"], step["log_close"]) - step["wicks"][1])
+            bars["tick_volume"] = state.rng["volume"].poisson(max(1.0, self.period / 2) * step["ratio"])
+            bars["spread"] = self._spread_points(step["ratio"])
+            bars["real_volume"] = 0
+            chunk[symbol] = bars
+        return chunk
+
+    def iter_bars(self, total_bars, chunk_bars=None):
+        """ Streams total_bars per symbol in chunks of chunk_bars """
+        chunk_bars = chunk_bars or self.settings["chunk_bars"]
+        remaining = total_bars
+        while remaining > 0:
+            n = min(chunk_bars, remaining)
+            yield self.bars(n)
+            remaining -= n
+
+    def ticks(self, n):
+        """ Next n ticks per symbol (one per timeframe interval, random arrival inside it), merged in time order """
+        records = []
+        for symbol, state in self.states.items():
+            step = state.step(n, self.period)
+            mid = np.exp(step["log_close"])
+            half_spread = self._spread_points(step["ratio"]) * state.point / 2
+            ticks = np.empty(n, TICK_DTYPE)
+            ticks["symbol"] = symbol.encode()
+            ticks["bid"] = mid - half_spread
+            ticks["ask"] = mid + half_spread
+            ticks["order_flow"] = step["order_flow"]
+            ticks["news_sentiment"] = 0.0
+            ticks["market_volatility"] = 0.0  # Filled in by the consumer (pipeline ingest: ATR of the M1 bars)
+            ticks["tick_ns"] = ((self.time + (np.arange(n) + state.rng["arrival"].random(n)) * self.period) * 1e9).astype(np.int64)
+            records.append(ticks)
+        self.time += n * self.period
+
+        merged = np.concatenate(records)
+        merged = merged[np.argsort(merged["tick_ns"], kind="stable")]
+        merged["seq"] = self.seq + 1 + np.arange(len(merged), dtype=np.uint64)
+        self.seq += len(merged)
+        return merged
+
+    def _spread_points(self, ratio):
+        return np.maximum(1, np.rint(self.settings["spread_points"] * (0.6 + 0.4 * ratio))).astype(np.int32)
+
+# ✅ Output in the formats the loaders consume
+def bars_to_frame(bars):
+    """ DataFrame like fetch_price_data() returns for MT5 rates """
+    import pandas as pd
+    return pd.DataFrame(bars)
+
+def write_csv(market, folder, total_bars, chunk_bars=None):
+    """
+    Streams bars to folder/{symbol}.csv in the data_storage layout (time, open, high, low, close, volume)
+    read by past_data_ai / backtest_ai. Returns the written file paths.
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = {symbol: os.path.join(folder, f"{symbol}.csv") for symbol in market.symbols}
+    files = {symbol: open(path, "w", newline="") for symbol, path in paths.items()}
+    try:
+        for file in files.values():
+            file.write("time,open,high,low,close,volume\n")
+        for chunk in market.iter_bars(total_bars, chunk_bars):
+            for symbol, bars in chunk.items():
+                # Plain f-strings over tolist() columns are ~2.5x faster than DataFrame.to_csv here
+                times = np.datetime_as_string(bars["time"].astype("datetime64[s]")).tolist()
+                columns = [bars[field].tolist() for field in ("open", "high", "low", "close", "tick_volume")]
+                files[symbol].write("".join(f"{t},{o:.6f},{h:.6f},{l:.6f},{c:.6f},{v}\n"
+                                            for t, o, h, l, c, v in zip(times, *columns)))
+    finally:
+        for file in files.values():
+            file.close()
+    return list(paths.values())
+
+def synthetic_symbols(count):
+    return [f"SYN{index:03d}" for index in range(1, count + 1)]
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate synthetic OHLCV bars for load tests and backtests")
+    parser.add_argument("--symbols", type=int, default=None, help="Generate SYN001..SYNnnn instead of config trading_pairs")
+    parser.add_argument("--bars", type=int, default=100000, help="Bars per symbol")
+    parser.add_argument("--timeframe", default=DEFAULT_SYNTHETIC_SETTINGS["timeframe"])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SYNTHETIC_SETTINGS["seed"])
+    parser.add_argument("--out", default="data_storage/synthetic", help="Folder for the {symbol}.csv files")
+    parser.add_argument("--benchmark", action="store_true", help="Only generate (no files) and report bars per second")
+    args = parser.parse_args()
+
+    if args.symbols:
+        symbols = synthetic_symbols(args.symbols)
+    else:
+        from config_manager import get_config
+        symbols = list(get_config()["trading_pairs"])
+    timeframe = float(args.timeframe) if args.timeframe.replace(".", "", 1).isdigit() else args.timeframe
+    market = SyntheticMarket(symbols, seed=args.seed, timeframe=timeframe)
+
+    started = time.perf_counter()
+    if args.benchmark:
+        for _ in market.iter_bars(args.bars):
+            pass
+    else:
+        write_csv(market, args.out, args.bars)
+    elapsed = time.perf_counter() - started
+    total = args.bars * len(symbols)
+    print(f"✅ Generated {total:,} bars for {len(symbols)} symbols in {elapsed:.2f}s ({total / elapsed:,.0f} bars/s)"
+          + ("" if args.benchmark else f" -> {args.out}"))
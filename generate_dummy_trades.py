@@ -1,10 +1,8 @@
-import json
-import os
 import random
+from logs.trade_journal import get_journal
 
-TRADE_HISTORY_FILE = "logs/trade_history.json"
-
-def generate_dummy_trades():
+def generate_dummy_trades(reset=True):
+    """ Fills the trade journal with random trades (reset=False appends to the existing history) """
     dummy_trades = []
     for _ in range(1000):  # Increased from 100 to 1000
         dummy_trades.append({
@@ -16,9 +14,10 @@ def generate_dummy_trades():
             "profit": round(random.uniform(-50, 100), 2)  # Mixed profits and losses
         })
     
-    os.makedirs("logs", exist_ok=True)
-    with open(TRADE_HISTORY_FILE, "w", encoding="utf-8") as file:
-        json.dump(dummy_trades, file, indent=4)
+    journal = get_journal()
+    if reset:
+        journal.reset()
+    journal.append_many(dummy_trades)
     
     print(f"✅ Generated {len(dummy_trades)} Dummy Trades for AI Learning!")
 
@@ -1,30 +1,62 @@
 import logging
 import os
+import sys
+import json
+import time
+import queue
+import atexit
 import datetime
+import threading
 
 LOG_FILE = "logs/ai_logs.txt"
 
 LOGS_DIR = "logs"
-if not os.path.exists(LOGS_DIR):
-    os.makedirs(LOGS_DIR)
-
 AI_LOG_FILE = os.path.join(LOGS_DIR, "ai_logs.txt")
 TRADE_LOG_FILE = os.path.join(LOGS_DIR, "trade_history.json")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(AI_LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+
+# ✅ Defaults for config["logging"]
+DEFAULT_LOG_SETTINGS = {
+    "enable_debug": True,
+    "log_to_file": True,
+    "log_file": LOG_FILE,
+    "console": True,
+    "format": "text",              # "text" or "jsonl"
+    "max_bytes": 10 * 1024 * 1024, # Rotate once the file grows past this size (0 = never)
+    "rotate_interval": 0,          # Also rotate every N seconds (0 = never)
+    "backup_count": 5,
+    "queue_size": 10000,
+    "drop_policy": "drop_newest",  # "drop_newest", "drop_oldest" or "block"
+    "batch_size": 256,
+    "flush_interval": 0.2,         # Seconds the writer waits to fill a batch
+}
+
+_logging_ready = False
+
+# ✅ Set Up Logging on First Use (no directories or file handlers created at import)
+def setup_logging():
+    global _logging_ready
+    if _logging_ready:
+        return
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler(AI_LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+    _logging_ready = True
 
 def log_ai_decision(symbol, confidence, action):
+    setup_logging()
     log_message = f"AI Decision - {symbol} | Confidence: {confidence:.2f} | Action: {action}"
     logging.info(log_message)
 
 def log_trade_execution(symbol, trade_type, lot_size, price, stop_loss, take_profit):
+    setup_logging()
     log_message = (
         f"Trade Executed - {symbol} | Type: {trade_type} | Lot: {lot_size} | "
         f"Price: {price} | SL: {stop_loss} | TP: {take_profit}"
@@ -32,15 +64,14 @@ def log_trade_execution(symbol, trade_type, lot_size, price, stop_loss, take_pro
     logging.info(log_message)
 
 def log_risk_evaluation(symbol, risk_score):
-    log_entry = f"{datetime.datetime.now()} - RISK EVALUATION: {symbol} | Risk Score: {risk_score}\n"
-    with open(AI_LOG_FILE, "a") as log_file:
-        log_file.write(log_entry)
-    print(log_entry)
+    log_message(f"RISK EVALUATION: {symbol} | Risk Score: {risk_score}", symbol=symbol)
 
 def log_error(error_message):
+    setup_logging()
     logging.error(f"ERROR: {error_message}")
 
 def log_backtest_results(strategy_name, profit, win_rate, drawdown):
+    setup_logging()
     log_message = (
         f"Backtest Result - Strategy: {strategy_name} | Profit: {profit} | "
         f"Win Rate: {win_rate}% | Max Drawdown: {drawdown}%"
@@ -48,6 +79,7 @@ def log_backtest_results(strategy_name, profit, win_rate, drawdown):
     logging.info(log_message)
 
 def get_last_logs(n=10):
+    flush_logs()
     try:
         with open(AI_LOG_FILE, "r") as file:
             lines = file.readlines()
@@ -55,11 +87,212 @@ def get_last_logs(n=10):
     except FileNotFoundError:
         return "No logs found."
 
-def log_message(message, level="info"):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] [{level.upper()}] {message}\n"
+# ✅ Background Log Writer (batches queued records into one write per flush)
+class AsyncLogWriter:
+    """
+    Owns the log file: records are queued by log_message and written by a daemon thread in
+    batches, with size/time based rotation. The queue is bounded; when it is full the
+    drop policy decides whether the new record, the oldest record or the caller gives way.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = {**DEFAULT_LOG_SETTINGS, **(settings or {})}
+        self.queue = queue.Queue(maxsize=self.settings["queue_size"])
+        self.dropped = 0
+        self._file = None
+        self._opened_at = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        policy = self.settings["drop_policy"]
+        if policy == "block":
+            self.queue.put(record)
+        elif policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.dropped += 1
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+        else:
+            self.dropped += 1
+
+    def flush(self, timeout=5.0):
+        """ Blocks until every record queued so far has been written; returns False on timeout """
+        done = threading.Event()
+        started = time.monotonic()
+        try:
+            self.queue.put(done, timeout=timeout)  # Control marker: never subject to the drop policy
+        except queue.Full:
+            pass
+        else:
+            if done.wait(max(0.0, timeout - (time.monotonic() - started))):
+                return True
+        sys.stderr.write(f"⚠ Log flush timed out after {timeout:.1f}s ({self.queue.qsize()} records still queued)\n")
+        return False
+
+    def close(self, timeout=5.0):
+        self._stop.set()
+        self.flush(timeout)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            markers = [item for item in batch if isinstance(item, threading.Event)]
+            records = [item for item in batch if not isinstance(item, threading.Event)]
+            try:
+                if records:
+                    self._write(records)
+            except Exception as e:
+                sys.stderr.write(f"❌ ERROR: Log writer failed - {str(e)}\n")
+            for marker in markers:
+                marker.set()
+            if self._stop.is_set() and self.queue.empty():
+                self._close_file()
+                return
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.settings["flush_interval"]
+        while len(batch) < self.settings["batch_size"]:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+            if isinstance(batch[-1], threading.Event):
+                break
+        return batch
+
+    def _write(self, records):
+        _apply_config_updates(self)
+        settings = self.settings
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            records.append((time.time(), "warning", f"⚠ Log queue full, dropped {dropped} records", {}))
+
+        text_lines = [_format_text(record) for record in records]
+        if settings["console"]:
+            sys.stdout.write("".join(f"📝 {line}" for line in text_lines))
+            sys.stdout.flush()
+        if settings["log_to_file"]:
+            lines = [_format_json(record) for record in records] if settings["format"] == "jsonl" else text_lines
+            log_file = self._open_file()
+            log_file.write("".join(lines))
+            log_file.flush()
+
+    def _open_file(self):
+        settings = self.settings
+        if self._file is not None:
+            too_big = settings["max_bytes"] and self._file.tell() >= settings["max_bytes"]
+            too_old = settings["rotate_interval"] and time.time() - self._opened_at >= settings["rotate_interval"]
+            if too_big or too_old:
+                self._close_file()
+                self._rotate()
+        if self._file is None:
+            os.makedirs(os.path.dirname(settings["log_file"]) or ".", exist_ok=True)
+            self._file = open(settings["log_file"], "a", encoding="utf-8")
+            self._opened_at = time.time()
+        return self._file
+
+    def _rotate(self):
+        path, backups = self.settings["log_file"], self.settings["backup_count"]
+        if backups <= 0:
+            open(path, "w").close()
+            return
+        for index in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        if os.path.exists(path):
+            os.replace(path, f"{path}.1")
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def _format_text(record):
+    created, level, message, _ = record
+    timestamp = datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+    return f"[{timestamp}] [{level.upper()}] {message}\n"
+
+def _format_json(record):
+    created, level, message, fields = record
+    return json.dumps({"ts": created, "level": level, "msg": message, **fields}, default=str, ensure_ascii=False) + "\n"
+
+_writer = None
+_writer_lock = threading.Lock()
+_min_level = LEVELS["debug"]  # Set from config["logging"] when the writer is created
+_applied_config = None
+
+def _logging_settings():
+    """
+    config["logging"] from the config service, or read straight from the config file when nothing has
+    loaded it yet (get_config() itself logs its errors, so it cannot be called from here)
+    """
+    from config_manager import current_config, CONFIG_FILE
+    config = current_config()
+    if config is None:
+        try:
+            with open(CONFIG_FILE, "r") as file:
+                config = json.load(file)
+        except (OSError, ValueError):
+            config = {}
+    return {**DEFAULT_LOG_SETTINGS, **((config.get("logging") if hasattr(config, "get") else None) or {})}
+
+def _set_min_level(settings):
+    global _min_level
+    _min_level = LEVELS["debug"] if settings["enable_debug"] else LEVELS["info"]
+
+def _on_config_reload(new_config, old_config):
+    """ Level changes apply to the next log_message call, not only after the writer's next batch """
+    _set_min_level({**DEFAULT_LOG_SETTINGS, **new_config.get("logging", {})})
+
+def _apply_config_updates(writer):
+    """ Runs on the writer thread: picks up config reloads without touching the hot path """
+    global _min_level, _applied_config
+    from config_manager import current_config
+    config = current_config()
+    if config is None or config is _applied_config:
+        return
+    _applied_config = config
+    settings = {**DEFAULT_LOG_SETTINGS, **config.get("logging", {})}
+    if settings["log_file"] != writer.settings["log_file"]:
+        writer._close_file()
+    writer.settings.update({key: value for key, value in settings.items() if key != "queue_size"})
+    _set_min_level(settings)
+
+def _get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            from config_manager import subscribe
+            settings = _logging_settings()
+            _set_min_level(settings)
+            subscribe(_on_config_reload)
+            _writer = AsyncLogWriter(settings)
+            atexit.register(_writer.close)
+        return _writer
 
-    with open(LOG_FILE, "a", encoding="utf-8") as log_file:
-        log_file.write(log_entry)
+def flush_logs(timeout=5.0):
+    """ Waits until queued log records are on disk (e.g. before a script exits or reads the log); False on timeout """
+    return _writer.flush(timeout) if _writer is not None else True
 
-    print(f"📝 {log_entry.strip()}")
+# ✅ Log a Message (enqueue only; formatting & file I/O happen on the writer thread)
+def log_message(message, level="info", **fields):
+    writer = _writer or _get_writer()  # First call also sets _min_level from the config
+    if LEVELS.get(level, LEVELS["info"]) < _min_level:
+        return
+    writer.submit((time.time(), level, message, fields))
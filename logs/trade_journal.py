@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import sqlite3
+import datetime
+import threading
+
+JOURNAL_FILE = "logs/trade_journal.db"
+LEGACY_HISTORY_FILE = "logs/trade_history.json"  # Single JSON array used before the journal
+PAGE_SIZE = 1000  # Rows fetched per query while streaming
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT,
+    time REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_symbol_time ON trades (symbol, time);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def _trade_time(value, default=None):
+    """ Unix seconds from a number or an ISO date string; default when the trade has no usable time """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            created = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return default
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=datetime.timezone.utc)
+        return created.timestamp()
+    return default
+
+# ✅ Append-Only Trade Journal (embedded SQLite, indexed by symbol & time)
+class TradeJournal:
+    """
+    Every trade is one INSERT, so writes cost the same no matter how long the history is.
+    Each trade gets an increasing id ("offset"); readers stream pages of rows or ask only for
+    trades after the last offset they have seen. WAL mode lets the training worker read
+    while the trading process writes.
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    # ✅ Writes
+    def append(self, trade):
+        """ Appends one trade and returns its offset (a trade without a time is stamped with the current time) """
+        with self._lock:
+            return self._conn.execute("INSERT INTO trades (symbol, time, data) VALUES (?, ?, ?)",
+                                      self._row(trade, time.time())).lastrowid
+
+    def append_many(self, trades):
+        now = time.time()
+        rows = [self._row(trade, now) for trade in trades]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT INTO trades (symbol, time, data) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def reset(self):
+        """ Drops every trade (offsets restart at 1, so readers can detect the rewrite) """
+        with self._lock:
+            # IMMEDIATE: the generation is read and bumped in one write transaction, also across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+                generation = int(row[0] if row else 0) + 1
+                self._conn.execute("DELETE FROM trades")
+                self._conn.execute("DELETE FROM sqlite_sequence WHERE name = 'trades'")
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (str(generation),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return generation
+
+    @staticmethod
+    def _row(trade, default_time=None):
+        """ (symbol, time, data); the time column is NULL for trades with no known time (e.g. legacy history) """
+        return trade.get("symbol"), _trade_time(trade.get("time"), default_time), json.dumps(trade)
+
+    # ✅ Reads
+    def iter_trades(self, since=0, symbol=None, start=None, end=None, page_size=PAGE_SIZE):
+        """
+        Streams trades with offset > since (optionally filtered by symbol and time range) in offset order.
+        Trades without a known time (NULL) are never inside a time range, only in unfiltered reads.
+        """
+        conditions, params = ["id > ?"], []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if start is not None or end is not None:
+            conditions.append("time IS NOT NULL")
+        if start is not None:
+            conditions.append("time >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("time < ?")
+            params.append(end)
+        query = f"SELECT id, data FROM trades WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ?"
+
+        last_id = since
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, [last_id, *params, page_size]).fetchall()
+            for last_id, data in rows:
+                yield {**json.loads(data), "offset": last_id}
+            if len(rows) < page_size:
+                return
+
+    def load_records(self, since=0, symbol=None, start=None, end=None, page_size=PAGE_SIZE):
+        """ Like iter_trades(), collected into a columnar RecordArray (TRADE_DTYPE) page by page """
+        from logs.trade_records import RecordArray, TRADE_DTYPE
+
+        records, page = RecordArray(TRADE_DTYPE, capacity=max(page_size, self.count(since))), []
+        for trade in self.iter_trades(since, symbol, start, end, page_size):
+            page.append(trade)
+            if len(page) >= page_size:
+                records.extend(page)
+                page = []
+        return records.extend(page)
+
+    def trades_since(self, offset, symbol=None):
+        return list(self.iter_trades(since=offset, symbol=symbol))
+
+    def sample(self, size, before=None):
+        """ Random sample of trades with offset <= before, returned in offset order (replay buffers) """
+        before = self.last_offset() if before is None else before
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM (SELECT id, data FROM trades WHERE id <= ? ORDER BY RANDOM() LIMIT ?) ORDER BY id",
+                (before, size)).fetchall()
+        return [{**json.loads(data), "offset": offset} for offset, data in rows]
+
+    def count(self, since=0):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trades WHERE id > ?", (since,)).fetchone()[0]
+
+    def last_offset(self):
+        """ Offset of the newest trade (0 for an empty journal) """
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM trades").fetchone()
+        return row[0] or 0
+
+    def generation(self):
+        """ Bumped by reset(); offsets are only comparable within one generation """
+        return int(self._meta("generation") or 0)
+
+    # ✅ Migration from logs/trade_history.json
+    def migrate_legacy_history(self, json_path=LEGACY_HISTORY_FILE):
+        """
+        Imports the old JSON array once, keeping its order (trade N becomes offset N). Trades without
+        a time keep a NULL time instead of the migration time, so they only sort by offset.
+        The JSON file is left in place; returns the number of trades imported.
+        """
+        if self._meta("migrated_from") or not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r", encoding="utf-8") as file:
+            rows = [self._row(trade) for trade in json.load(file)]
+
+        # One IMMEDIATE transaction, so two processes starting together cannot both import
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                imported = 0
+                if self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone() is None:
+                    if self._conn.execute("SELECT MAX(id) FROM trades").fetchone()[0] is None:
+                        self._conn.executemany("INSERT INTO trades (symbol, time, data) VALUES (?, ?, ?)", rows)
+                        imported = len(rows)
+                    self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (json_path,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return imported
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# ✅ Shared Journal Instance (migrates the legacy JSON history on first use)
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = TradeJournal()
+            imported = _journal.migrate_legacy_history()
+            if imported:
+                from logs.logger import log_message
+                log_message(f"📦 Migrated {imported} trades from {LEGACY_HISTORY_FILE} into {JOURNAL_FILE}")
+        return _journal
+
+if __name__ == "__main__":
+    journal = get_journal()
+    print(f"📒 {journal.count()} trades in {JOURNAL_FILE} (last offset {journal.last_offset()})")
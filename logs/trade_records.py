@@ -0,0 +1,246 @@
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+# ✅ Shared Record Types (text fields are stored as category codes, see RecordArray)
+SYMBOL_DTYPE = "S16"  # Fixed-width symbol field, also used by the pipeline's ring buffer records
+TRADE_DTYPE = np.dtype([
+    ("offset", "<i8"),               # Journal offset (0 for trades that never went through the journal)
+    ("time", "<f8"),                 # Unix seconds
+    ("symbol", SYMBOL_DTYPE),
+    ("action", "S8"),
+    ("lot_size", "<f8"),
+    ("market_price", "<f8"),
+    ("stop_loss", "<f8"),
+    ("take_profit", "<f8"),
+    ("market_volatility", "<f8"),
+    ("profit", "<f8"),
+])
+SIGNAL_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("symbol", SYMBOL_DTYPE),
+    ("action", "S8"),
+    ("confidence", "<f8"),
+    ("lot_size", "<f8"),
+])
+# Orders use pipeline.ring_buffer.ORDER_DTYPE, which RecordArray accepts like any structured dtype
+
+def _is_text(field_dtype):
+    return field_dtype.kind in "SU"
+
+def _as_str(value):
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+# ✅ Columnar, Appendable Record Container
+class RecordArray:
+    """
+    Records of a structured dtype kept as one contiguous NumPy column per field. Text fields
+    (symbol, action) are stored as int32 codes into a shared category list, so a trade costs
+    72 bytes instead of the ~360 bytes of a dict. Columns grow by doubling (amortized O(1) append);
+    a column or slice taken before a growth keeps pointing at the old buffer. to_frame() hands
+    the numeric columns and text codes to pandas without copying them, and from_frame() wraps a
+    DataFrame's numeric columns the same way (the first append then copies them into buffers of
+    its own). append() / extend() always copy the new rows into the array's columns.
+    """
+
+    def __init__(self, dtype, capacity=DEFAULT_CAPACITY):
+        self.dtype = np.dtype(dtype)
+        self._size = 0
+        self._columns = {name: np.zeros(max(1, capacity), np.int32 if _is_text(self.dtype[name]) else self.dtype[name])
+                         for name in self.dtype.names}
+        self._categories = {name: [] for name in self.dtype.names if _is_text(self.dtype[name])}
+        self._lookup = {name: {} for name in self._categories}
+        self._borrowed = False  # Columns are views of another object's memory (from_frame)
+
+    @classmethod
+    def _from_columns(cls, parent, columns, size):
+        records = cls.__new__(cls)
+        records.dtype, records._size, records._columns = parent.dtype, size, columns
+        records._categories, records._lookup = parent._categories, parent._lookup
+        records._borrowed = False
+        return records
+
+    # ✅ Size & Growth
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(next(iter(self._columns.values())))
+
+    @property
+    def nbytes(self):
+        """ Bytes held by the filled part of the columns (category lists not included) """
+        return sum(column[:self._size].nbytes for column in self._columns.values())
+
+    def reserve(self, capacity):
+        if capacity > self.capacity or self._borrowed:
+            for name, column in self._columns.items():
+                grown = np.zeros(max(capacity, self.capacity), column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[name] = grown
+            self._borrowed = False
+
+    def _grow_for(self, extra):
+        needed = self._size + extra
+        if needed > self.capacity or self._borrowed:
+            self.reserve(max(needed, 2 * self.capacity))
+
+    # ✅ Category Codes
+    def _code(self, name, value):
+        value = _as_str(value)
+        code = self._lookup[name].get(value)
+        if code is None:
+            code = self._lookup[name][value] = len(self._categories[name])
+            self._categories[name].append(value)
+        return code
+
+    def _codes(self, name, values):
+        """ Vectorized: one dict lookup per distinct value """
+        uniques, inverse = np.unique(np.asarray(values).astype(str), return_inverse=True)
+        mapping = np.array([self._code(name, value) for value in uniques.tolist()], dtype=np.int32)
+        return mapping[inverse.reshape(-1)] if len(mapping) else np.zeros(0, np.int32)
+
+    # ✅ Writes
+    def append(self, record=None, **fields):
+        """ append({"symbol": "EURUSDm", ...}), append(("EURUSDm", ...)) in dtype order, or append(symbol=..., ...) """
+        if record is not None and not isinstance(record, dict):
+            fields = dict(zip(self.dtype.names, record))
+        elif record is not None:
+            fields = {**record, **fields}
+        self._grow_for(1)
+        index = self._size
+        for name, column in self._columns.items():
+            value = fields.get(name)
+            if name in self._categories:
+                column[index] = self._code(name, "" if value is None else value)
+            else:
+                column[index] = 0 if value is None else value
+        self._size += 1
+        return index
+
+    def extend(self, records):
+        """
+        Appends another RecordArray, a structured array, a DataFrame, a dict of columns or a list of
+        records. The rows are copied once, straight from the source columns into the array's own.
+        """
+        if isinstance(records, (RecordArray, np.ndarray)):
+            columns = {name: records[name] for name in records.dtype.names}
+        elif hasattr(records, "columns") and hasattr(records, "to_numpy"):  # DataFrame (column views, no intermediate copy)
+            columns = {name: records[name].to_numpy(copy=False) for name in records.columns}
+        elif isinstance(records, dict):
+            columns = records
+        else:
+            records = [record if isinstance(record, dict) else dict(zip(self.dtype.names, record)) for record in records]
+            columns = {name: [record.get(name) for record in records] for name in self.dtype.names}
+            columns = {name: ["" if value is None else value for value in values] if name in self._categories
+                       else [0 if value is None else value for value in values] for name, values in columns.items()}
+        count = len(next(iter(columns.values()), ()))
+        self._grow_for(count)
+        start, end = self._size, self._size + count
+        for name, column in self._columns.items():
+            values = columns.get(name)
+            if name in self._categories:
+                column[start:end] = self._code(name, "") if values is None else self._codes(name, values)
+            else:
+                column[start:end] = 0 if values is None else values  # Missing fields are 0 / "" like append()
+        self._size = end
+        return self
+
+    def clear(self):
+        self._size = 0
+        if self._borrowed:
+            self.reserve(self.capacity)  # Own (empty) buffers before the next write
+
+    # ✅ Reads
+    def __getitem__(self, key):
+        """
+        records["profit"] -> column view (text fields come back decoded as a str array),
+        records[i] -> dict, records[a:b] / records[mask] -> RecordArray (slices share the columns)
+        """
+        if isinstance(key, str):
+            if key in self._categories:
+                return np.asarray(self._categories[key], dtype=object)[self._columns[key][:self._size]].astype(str)
+            return self._columns[key][:self._size]
+        if isinstance(key, (int, np.integer)):
+            index = key + self._size if key < 0 else key
+            if not 0 <= index < self._size:
+                raise IndexError(f"❌ ERROR: Record index {key} out of range for {self._size} records")
+            return {name: (self._categories[name][column[index]] if name in self._categories else column[index].item())
+                    for name, column in self._columns.items()}
+        columns = {name: column[:self._size][key] for name, column in self._columns.items()}
+        return self._from_columns(self, columns, len(next(iter(columns.values()))))
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def codes(self, name):
+        """ Raw int32 codes of a text field (index into categories(name)) """
+        return self._columns[name][:self._size]
+
+    def categories(self, name):
+        return list(self._categories[name])
+
+    # ✅ Conversions
+    def to_frame(self):
+        """ DataFrame over the column buffers: numeric columns are not copied, text fields become categoricals """
+        import pandas as pd
+
+        data = {}
+        for name, column in self._columns.items():
+            if name in self._categories:
+                data[name] = pd.Categorical.from_codes(column[:self._size], categories=pd.Index(self._categories[name], dtype=object))
+            else:
+                data[name] = column[:self._size]
+        return pd.DataFrame(data, copy=False)
+
+    @classmethod
+    def from_frame(cls, dtype, frame):
+        """
+        RecordArray over a DataFrame's columns: numeric columns whose dtype matches the field are wrapped
+        without copying, Categorical text columns reuse their codes; other columns are converted (a copy).
+        """
+        records = cls(dtype, capacity=1)
+        size = len(frame)
+        for name in records.dtype.names:
+            if name not in frame.columns:
+                records._columns[name] = np.zeros(size, records._columns[name].dtype)
+                if name in records._categories:
+                    records._columns[name][:] = records._code(name, "")
+                continue
+            series = frame[name]
+            if name in records._categories:
+                if hasattr(series, "cat"):
+                    categories = [records._code(name, value) for value in series.cat.categories.tolist()]
+                    records._columns[name] = np.asarray(categories, dtype=np.int32)[series.cat.codes.to_numpy()]
+                else:
+                    records._columns[name] = records._codes(name, series.to_numpy())
+            else:
+                values = series.to_numpy(copy=False)
+                records._columns[name] = values if values.dtype == records.dtype[name] else values.astype(records.dtype[name])
+        records._size = size
+        records._borrowed = True
+        return records
+
+    def to_array(self):
+        """ Packed structured array (one copy; for np.save, ring buffers or shared memory) """
+        array = np.zeros(self._size, self.dtype)
+        for name, column in self._columns.items():
+            if name in self._categories:
+                array[name] = np.array(self._categories[name] or [""], dtype=self.dtype[name])[column[:self._size]]
+            else:
+                array[name] = column[:self._size]
+        return array
+
+    def to_dicts(self):
+        return list(self)
+
+    @classmethod
+    def from_records(cls, dtype, records, capacity=None):
+        """ Builds a RecordArray from any input extend() accepts """
+        size = len(records) if hasattr(records, "__len__") else 0
+        return cls(dtype, capacity or max(DEFAULT_CAPACITY, size)).extend(records)
+
+    def __repr__(self):
+        return f"RecordArray({len(self)} records, fields={list(self.dtype.names)}, {self.nbytes} bytes)"
@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
-import pandas as pd
-import MetaTrader5 as mt5
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from monitoring.tracing import traced
+from data_feeds.feed_cache import cached_feed
+from monitoring.recorder import recorded
 
 
 # ✅ Fibonacci Retracement Calculation
@@ -13,6 +19,7 @@ def fibonacci_levels(price_high, price_low, levels=[0.236, 0.382, 0.5, 0.618, 0.
 
 
 # ✅ Volatility Calculation using AI-enhanced ATR
+@traced()
 def calculate_volatility(price_data, period=14):
     """
     AI-enhanced volatility calculation using Adaptive ATR.
@@ -30,13 +37,25 @@ def calculate_volatility(price_data, period=14):
     return round(atr, 5)
 
 
+# ✅ Volatility of a Symbol (shared by the confidence model and SL/TP sizing within a tick)
+@cached_feed("volatility")
+def symbol_volatility(symbol, period=14):
+    """
+    ATR of the latest M1 bars of a symbol; None when not enough price data is available.
+    """
+    price_data = fetch_price_data(symbol)
+    if price_data is None or len(price_data) < period:
+        return None
+    return calculate_volatility(price_data, period)
+
+
 # ✅ AI-Enhanced Risk Calculation
 def calculate_risk(balance, risk_percentage):
     """
     Calculates risk amount dynamically based on account balance and risk tolerance.
     """
     base_risk = balance * (risk_percentage / 100)
-    adaptive_risk = base_risk * np.random.uniform(0.95, 1.05)  # AI-based fluctuation
+    adaptive_risk = base_risk * recorded("random", "calculate_risk", lambda: np.random.uniform(0.95, 1.05))  # AI-based fluctuation
     return round(adaptive_risk, 2)
 
 
@@ -46,7 +65,7 @@ def adjust_sl_tp(entry_price, trade_direction, risk_reward_ratio):
     Adjusts Stop Loss (SL) and Take Profit (TP) dynamically based on market conditions.
     """
     risk_amount = abs(entry_price * 0.001)  # Example: 0.1% of entry price
-    ai_adjustment = np.random.uniform(0.95, 1.05)  # Adaptive SL/TP tuning
+    ai_adjustment = recorded("random", "adjust_sl_tp", lambda: np.random.uniform(0.95, 1.05))  # Adaptive SL/TP tuning
     risk_amount *= ai_adjustment
 
     if trade_direction == "BUY":
@@ -78,7 +97,9 @@ def chaos_theory_trend(price_data, period=14):
     return ema_fast - ema_slow  # Positive -> Bullish, Negative -> Bearish
 
 
-# ✅ Reinforcement Learning Based Risk Factor Calculation
+# ✅ Reinforcement Learning Based Risk Factor Calculation (one value per symbol per tick)
+@cached_feed("risk_factor")
+@traced()
 def adaptive_risk_factor(symbol):
     """
     AI-driven adaptive risk factor calculation based on market behavior.
@@ -103,10 +124,15 @@ def bollinger_bands(price_data, period=20, std_dev=2):
 
 
 # ✅ Fetch Price Data from MetaTrader 5
+@cached_feed("price_data")
+@traced()
 def fetch_price_data(symbol, count=100):
     """
     Fetch historical price data from MetaTrader 5.
     """
+    import MetaTrader5 as mt5
+    import pandas as pd
+
     if not mt5.initialize():
         print("❌ ERROR: Failed to initialize MT5!")
         return None
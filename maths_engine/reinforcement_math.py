@@ -1,15 +1,6 @@
 import numpy as np
 import random
-import json
 
-CONFIG_FILE = "config.json"
-
-# ✅ Load Configurations
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-
-config = load_config()
 
 # ✅ Q-Learning Algorithm for AI Trade Optimization
 class QLearningAgent:
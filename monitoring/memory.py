@@ -0,0 +1,190 @@
+import gc
+import os
+import sys
+import json
+import time
+import tracemalloc
+from collections import Counter, deque
+
+# ✅ Opt-in Memory Growth Tracker for the long-running loops
+# Every `interval` iterations: RSS, tracemalloc totals and a diff of the top allocation sites
+# against the previous snapshot, plus live TensorFlow / Keras object counts. Once `warmup_iterations`
+# have passed, growth per iteration (averaged over `window` samples) above a threshold is logged
+# as a warning together with the sites and object types that grew.
+DEFAULT_MEMORY_SETTINGS = {
+    "enabled": False,
+    "interval": 1,                # Iterations between snapshots
+    "warmup_iterations": 5,       # Model loading, caches and tf.function tracing settle first
+    "window": 10,                 # Snapshots the growth rate is averaged over
+    "frames": 1,                  # tracemalloc traceback depth (>1 groups sites by call stack; slower)
+    "top": 10,                    # Allocation sites / object types shown per alert
+    "rss_growth_mb": 2.0,         # Alert thresholds, per iteration
+    "traced_growth_mb": 1.0,
+    "object_growth": 20,          # TensorFlow / Keras objects
+    "track_objects": True,        # gc walk per snapshot (~10-100 ms with TF loaded)
+    "report_file": "logs/memory.jsonl",
+}
+OBJECT_MODULES = ("tensorflow", "keras", "tf_keras")
+_IGNORED_FILES = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+def rss_bytes():
+    """ Current resident set size (peak RSS where /proc is not available) """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def tf_object_counts():
+    """ Live objects per TensorFlow / Keras type (empty until TensorFlow is imported) """
+    if not any(name in sys.modules for name in OBJECT_MODULES):
+        return Counter()
+    counts = Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        module = cls.__dict__.get("__module__")
+        if not isinstance(module, str):
+            continue
+        if module.startswith(OBJECT_MODULES):
+            counts[f"{module.split('.')[0]}.{cls.__name__}"] += 1
+    return counts
+
+class MemoryTracker:
+    def __init__(self, settings=None):
+        self.settings = {**DEFAULT_MEMORY_SETTINGS, **(settings or {})}
+        self.iteration = 0
+        self.samples = deque(maxlen=max(2, self.settings["window"]))
+        self.alerts = 0
+        self._previous = None
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(max(1, self.settings["frames"]))
+
+    def stop(self):
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous = None
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, name) for name in _IGNORED_FILES])
+
+    def _top_sites(self, snapshot):
+        if self._previous is None:
+            return []
+        key_type = "traceback" if self.settings["frames"] > 1 else "lineno"
+        sites = []
+        for stat in snapshot.compare_to(self._previous, key_type)[:self.settings["top"]]:
+            if stat.size_diff <= 0:
+                break
+            frames = " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback))
+            sites.append({"site": frames, "size_diff": stat.size_diff, "count_diff": stat.count_diff, "size": stat.size})
+        return sites
+
+    def check(self):
+        """ Call once per loop iteration; returns the sample when a snapshot was taken """
+        self.iteration += 1
+        if (self.iteration - 1) % max(1, self.settings["interval"]):
+            return None
+
+        gc.collect()  # Only uncollectable growth counts
+        snapshot = self._take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "time": time.time(),
+            "iteration": self.iteration,
+            "rss": rss_bytes(),
+            "traced": traced,
+            "traced_peak": peak,
+            "objects": tf_object_counts() if self.settings["track_objects"] else Counter(),
+            "top_sites": self._top_sites(snapshot),
+        }
+        self._previous = snapshot
+        self.samples.append(sample)
+        if self.iteration > self.settings["warmup_iterations"]:
+            self._check_growth(sample)
+        self._write_report(sample)
+        return sample
+
+    def growth(self):
+        """ Average growth per iteration over the window: (rss bytes, traced bytes, {object type: count}) """
+        first, last = self.samples[0], self.samples[-1]
+        iterations = last["iteration"] - first["iteration"]
+        if iterations <= 0:
+            return 0.0, 0.0, {}
+        objects = {name: (last["objects"][name] - first["objects"].get(name, 0)) / iterations for name in last["objects"]}
+        return (last["rss"] - first["rss"]) / iterations, (last["traced"] - first["traced"]) / iterations, objects
+
+    def _check_growth(self, sample):
+        # Only samples taken after the warm-up count towards the rate
+        while self.samples and self.samples[0]["iteration"] <= self.settings["warmup_iterations"]:
+            self.samples.popleft()
+        if len(self.samples) < self.samples.maxlen:
+            return
+        from logs.logger import log_message
+        from monitoring.metrics import increment
+
+        settings = self.settings
+        rss_rate, traced_rate, object_rates = self.growth()
+        growing = sorted(((rate, name) for name, rate in object_rates.items() if rate >= settings["object_growth"]), reverse=True)
+        problems = []
+        if rss_rate >= settings["rss_growth_mb"] * 1024 ** 2:
+            problems.append(f"RSS +{rss_rate / 1024 ** 2:.2f} MB")
+        if traced_rate >= settings["traced_growth_mb"] * 1024 ** 2:
+            problems.append(f"Python heap +{traced_rate / 1024 ** 2:.2f} MB")
+        if growing:
+            problems.append(", ".join(f"{name} +{rate:.0f}" for rate, name in growing[:settings["top"]]))
+        if not problems:
+            return
+
+        self.alerts += 1
+        increment("memory_alerts")
+        log_message(f"⚠ Memory growth per iteration over the last {len(self.samples)} snapshots "
+                    f"(iteration {sample['iteration']}): {'; '.join(problems)}", level="warning")
+        for site in sample["top_sites"]:
+            log_message(f"   📈 {site['site']}: +{site['size_diff'] / 1024:.1f} KiB (+{site['count_diff']} blocks)", level="warning")
+        self.samples.clear()  # One alert per window, not one per iteration
+
+    def _write_report(self, sample):
+        path = self.settings.get("report_file")
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps({**sample, "objects": dict(sample["objects"].most_common(self.settings["top"]))}) + "\n")
+
+# ✅ Process-wide Tracker (check_memory() is a no-op until tracking is started)
+_tracker = None
+
+def start_memory_tracking(settings=None):
+    """ Starts tracking if settings["enabled"] is set (or tracking already runs); returns the tracker or None """
+    global _tracker
+    settings = {**DEFAULT_MEMORY_SETTINGS, **(settings or {})}
+    if _tracker is None and settings["enabled"]:
+        _tracker = MemoryTracker(settings)
+        from logs.logger import log_message
+        log_message(f"🧠 Memory tracking every {settings['interval']} iteration(s) -> {settings['report_file']}")
+    return _tracker
+
+def stop_memory_tracking():
+    global _tracker
+    if _tracker is not None:
+        _tracker.stop()
+        _tracker = None
+
+def check_memory():
+    if _tracker is not None:
+        return _tracker.check()
+
+# ✅ CLI Flags shared by the entry points
+def add_memory_arguments(parser):
+    parser.add_argument("--track-memory", nargs="?", type=int, const=1, default=None, metavar="INTERVAL",
+                        help="Snapshot memory every INTERVAL iterations and warn about growth (see config memory_tracker)")
+    return parser
+
+def configure_memory_tracking(args):
+    if getattr(args, "track_memory", None):
+        from config_manager import get_config
+        settings = dict(get_config().get("memory_tracker") or {})
+        start_memory_tracking({**settings, "enabled": True, "interval": args.track_memory})
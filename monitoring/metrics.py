@@ -0,0 +1,226 @@
+import json
+import time
+import bisect
+import threading
+
+METRIC_PREFIX = "trading_bot"
+DEFAULT_METRICS_SETTINGS = {
+    "enabled": False,
+    "host": "127.0.0.1",   # Local only
+    "port": 9108,
+    "dump_file": "logs/metrics.json",
+}
+
+# ✅ Histogram Buckets (seconds): 50us .. ~105s, doubling
+BUCKETS = tuple(50e-6 * 2 ** i for i in range(22))
+
+# ✅ Latency Histogram (fixed buckets, so recording is O(log buckets) with no allocation)
+class LatencyHistogram:
+    __slots__ = ("counts", "total", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """ Estimated from the buckets (linear interpolation inside the matching bucket) """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self):
+        return {"count": self.count, "sum": self.total, "max": self.max,
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99)}
+
+# ✅ Metric Store
+_enabled = False
+_lock = threading.Lock()
+_histograms = {}  # (stage, symbol) -> LatencyHistogram
+_counters = {}    # (name, symbol, extra label value) -> int
+_server = None
+
+def observe(stage, seconds, symbol=""):
+    with _lock:
+        histogram = _histograms.get((stage, symbol))
+        if histogram is None:
+            histogram = _histograms[(stage, symbol)] = LatencyHistogram()
+        histogram.observe(seconds)
+
+def increment(name, symbol="", label="", value=1):
+    """ Per-symbol counter, e.g. increment("decisions", symbol, label="BUY") """
+    if not _enabled:
+        return
+    key = (name, symbol, label)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+# ✅ Timing Spans (a shared no-op object is returned while metrics are disabled)
+class _Span:
+    __slots__ = ("stage", "symbol", "start")
+
+    def __init__(self, stage, symbol):
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        observe(self.stage, time.perf_counter() - self.start, self.symbol)
+        if exc_type is not None:
+            increment("stage_errors", self.symbol, self.stage)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(stage, symbol=""):
+    """ with span("model_predict", symbol): ... """
+    return _Span(stage, symbol) if _enabled else _NULL_SPAN
+
+def timed(stage):
+    """ Decorator form of span(); the symbol is taken from a `symbol` argument if there is one """
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            symbol = kwargs.get("symbol", args[0] if args and isinstance(args[0], str) else "")
+            with _Span(stage, symbol or ""):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
+
+# ✅ Enable / Disable
+def enable_metrics(enabled=True):
+    global _enabled
+    _enabled = bool(enabled)
+
+def metrics_enabled():
+    return _enabled
+
+def reset_metrics():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+# ✅ Export: JSON snapshot & Prometheus text format
+def snapshot():
+    with _lock:
+        return {
+            "timestamp": time.time(),
+            "stages": [{"stage": stage, "symbol": symbol, **histogram.snapshot()}
+                       for (stage, symbol), histogram in sorted(_histograms.items())],
+            "counters": [{"name": name, "symbol": symbol, "label": label, "value": value}
+                         for (name, symbol, label), value in sorted(_counters.items())],
+        }
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items() if value != "") + "}"
+
+def render_prometheus():
+    name = f"{METRIC_PREFIX}_stage_latency_seconds"
+    lines = [f"# HELP {name} Latency of one decision-loop stage.", f"# TYPE {name} histogram"]
+    quantile_lines = [f"# HELP {name}_quantile Estimated latency quantiles per stage.",
+                      f"# TYPE {name}_quantile gauge"]
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+        for (stage, symbol), histogram in histograms:
+            cumulative = 0
+            for upper, bucket_count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if upper == float("inf") else f"{upper:.6g}"
+                lines.append(f"{name}_bucket{_labels(stage=stage, symbol=symbol, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(stage=stage, symbol=symbol)} {histogram.total:.9f}")
+            lines.append(f"{name}_count{_labels(stage=stage, symbol=symbol)} {histogram.count}")
+            for quantile in (0.5, 0.99):
+                quantile_lines.append(f"{name}_quantile{_labels(stage=stage, symbol=symbol, quantile=quantile)} "
+                                      f"{histogram.quantile(quantile):.9f}")
+
+    counter_lines = []
+    for counter_name in sorted({key[0] for key, _ in counters}):
+        counter_lines += [f"# TYPE {METRIC_PREFIX}_{counter_name}_total counter"]
+        counter_lines += [f"{METRIC_PREFIX}_{counter_name}_total{_labels(symbol=symbol, outcome=label)} {value}"
+                          for (name, symbol, label), value in counters if name == counter_name]
+    return "\n".join(lines + quantile_lines + counter_lines) + "\n"
+
+def dump_metrics(path=DEFAULT_METRICS_SETTINGS["dump_file"]):
+    """ Writes the current metrics to a file (.prom -> Prometheus text, anything else -> JSON) """
+    content = render_prometheus() if path.endswith(".prom") else json.dumps(snapshot(), indent=4)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return path
+
+# ✅ Local HTTP Endpoint (GET /metrics; http.server is only imported when the endpoint is started)
+def _metrics_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # Silence per-request stderr lines
+            pass
+
+    return MetricsHandler
+
+def start_metrics_server(host=DEFAULT_METRICS_SETTINGS["host"], port=DEFAULT_METRICS_SETTINGS["port"]):
+    global _server
+    from http.server import ThreadingHTTPServer
+
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _metrics_handler())
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
+
+def stop_metrics_server():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+def start_metrics(settings=None):
+    """ Enables recording and serves /metrics if config["metrics"]["enabled"] is set """
+    settings = {**DEFAULT_METRICS_SETTINGS, **(settings or {})}
+    enable_metrics(settings["enabled"])
+    if settings["enabled"] and settings.get("port"):
+        start_metrics_server(settings["host"], settings["port"])
+    return settings
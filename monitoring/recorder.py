@@ -0,0 +1,326 @@
+import os
+import sys
+import time
+import json
+import zlib
+import atexit
+import struct
+import builtins
+import threading
+from collections import defaultdict, deque
+import numpy as np
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ✅ Binary Log Format
+# MAGIC, then blocks of: <u4 little-endian length><zlib(one JSON document per line)>
+# record = [time_ns, source, key, kind, value] with kind "value", "error" or "event". Values that JSON
+# has no type for (tuples, NumPy arrays & scalars, DataFrames, exceptions) are written as tagged
+# objects (see encode_value); reading only ever builds data, it never runs code from the log.
+MAGIC = b"TBREC2\n"
+LEGACY_MAGIC = b"TBREC1\n"  # Pickle blocks: refused, unpickling a log from elsewhere could run arbitrary code
+BLOCK_HEADER = struct.Struct("<I")
+DEFAULT_RECORD_FILE = "logs/recordings/session-{time}.tbr"
+DEFAULT_BLOCK_RECORDS = 256
+DEFAULT_FLUSH_INTERVAL = 1.0   # Seconds; at most this much input is lost if the process dies
+
+class ReplayError(RuntimeError):
+    """ Raised when the replayed code asks for an input that is not in the log """
+
+class RecordedError(RuntimeError):
+    """ Replayed stand-in for a recorded exception that is not a built-in exception type """
+
+# ✅ JSON Encoding of Recorded Values
+def encode_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode_value(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith("__") for key in value):
+            return {key: encode_value(item) for key, item in value.items()}
+        return {"__dict__": [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    if isinstance(value, np.ndarray):
+        if value.dtype.names:
+            return {"__records__": {name: encode_value(value[name]) for name in value.dtype.names},
+                    "dtype": [[name, value.dtype[name].str] for name in value.dtype.names]}
+        if value.dtype.kind in "Mm":
+            return {"__ndarray__": value.astype(np.int64).tolist(), "dtype": value.dtype.str}
+        if value.dtype.kind == "O":
+            return {"__ndarray__": [encode_value(item) for item in value.tolist()], "dtype": "O"}
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return {"__frame__": {str(column): encode_value(value[column].to_numpy()) for column in value.columns},
+                "index": encode_value(value.index.to_numpy())}
+    if pd is not None and isinstance(value, pd.Series):
+        return {"__series__": encode_value(value.to_numpy()), "index": encode_value(value.index.to_numpy()),
+                "name": encode_value(value.name)}
+    if isinstance(value, BaseException):
+        return {"__error__": type(value).__name__, "message": str(value)}
+    return {"__repr__": repr(value)}
+
+def _decode_object(obj):
+    """ json object_hook: turns the tagged objects written by encode_value back into values """
+    if "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    if "__dict__" in obj:
+        return {tuple(key) if isinstance(key, list) else key: item for key, item in obj["__dict__"]}
+    if "__ndarray__" in obj:
+        dtype = np.dtype(obj["dtype"])
+        if dtype.kind in "Mm":
+            return np.array(obj["__ndarray__"], dtype=np.int64).astype(dtype)
+        if dtype.kind == "O":
+            array = np.empty(len(obj["__ndarray__"]), dtype=object)
+            array[:] = obj["__ndarray__"]
+            return array
+        return np.array(obj["__ndarray__"], dtype=dtype)
+    if "__records__" in obj:
+        dtype = np.dtype([(name, code) for name, code in obj["dtype"]])
+        array = np.empty(len(next(iter(obj["__records__"].values()), [])), dtype=dtype)
+        for name, column in obj["__records__"].items():
+            array[name] = column
+        return array
+    if "__frame__" in obj:
+        import pandas as pd
+        return pd.DataFrame(obj["__frame__"], index=obj["index"])
+    if "__series__" in obj:
+        import pandas as pd
+        return pd.Series(obj["__series__"], index=obj["index"], name=obj["name"])
+    if "__error__" in obj:
+        error_type = getattr(builtins, obj["__error__"], None)
+        if isinstance(error_type, type) and issubclass(error_type, Exception):
+            return error_type(obj["message"])
+        return RecordedError(f"{obj['__error__']}: {obj['message']}")
+    if "__repr__" in obj:
+        return obj["__repr__"]
+    return obj
+
+def encode_record(record):
+    return json.dumps([encode_value(field) for field in record], ensure_ascii=False, separators=(",", ":"))
+
+def decode_record(line):
+    return tuple(json.loads(line, object_hook=_decode_object))
+
+# ✅ Writer
+class RecordWriter:
+    def __init__(self, path, block_records=DEFAULT_BLOCK_RECORDS, flush_interval=DEFAULT_FLUSH_INTERVAL, level=6):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.block_records = block_records
+        self.flush_interval = flush_interval
+        self.level = level
+        self.count = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def append(self, record):
+        with self._lock:
+            if self._file is None:
+                return
+            self._pending.append(record)
+            self.count += 1
+            if len(self._pending) >= self.block_records or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        """ Must be called with self._lock held """
+        if self._pending:
+            block = zlib.compress("\n".join(encode_record(record) for record in self._pending).encode("utf-8"), self.level)
+            self._file.write(BLOCK_HEADER.pack(len(block)) + block)
+            self._file.flush()
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+
+# ✅ Reader (a block cut short by a crash ends the log)
+def read_records(path):
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+        if magic == LEGACY_MAGIC:
+            raise ValueError(f"❌ ERROR: {path} uses the old pickle-based format, which is not loaded for safety. Record it again.")
+        if magic != MAGIC:
+            raise ValueError(f"❌ ERROR: {path} is not a trading bot recording")
+        while True:
+            header = file.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            block = file.read(BLOCK_HEADER.unpack(header)[0])
+            try:
+                lines = zlib.decompress(block).decode("utf-8").split("\n")
+            except (zlib.error, UnicodeDecodeError):
+                return
+            for line in lines:
+                yield decode_record(line)
+
+# ✅ Recorder State ("off", "record", "replay" or "simulate")
+_mode = "off"
+_writer = None
+_inputs = {}   # Replay: (source, key) -> deque of (kind, value) in recorded order
+_provider = None  # Simulate: provider(source, key) -> value, or NotImplemented to make the live call
+
+def recorder_mode():
+    return _mode
+
+def start_recording(path=DEFAULT_RECORD_FILE, block_records=DEFAULT_BLOCK_RECORDS, flush_interval=DEFAULT_FLUSH_INTERVAL):
+    global _mode, _writer
+    path = path.format(time=time.strftime("%Y%m%d-%H%M%S"))
+    _writer = RecordWriter(path, block_records, flush_interval)
+    _mode = "record"
+    atexit.register(stop_recording)
+    return path
+
+def stop_recording():
+    global _mode, _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+    if _mode == "record":
+        _mode = "off"
+
+def start_replay(path):
+    """ Serves every recorded input from path; returns the decision events in recorded order """
+    global _mode, _inputs
+    inputs, events = defaultdict(deque), []
+    for record in read_records(path):
+        _, source, key, kind, value = record
+        if kind == "event":
+            events.append(record)
+        else:
+            inputs[(source, key)].append((kind, value))
+    _inputs = dict(inputs)
+    _mode = "replay"
+    return events
+
+def stop_replay():
+    global _mode, _inputs
+    _mode, _inputs = "off", {}
+
+def start_simulation(provider):
+    """ Serves inputs from provider(source, key) (e.g. a backtest's simulated market) instead of the live sources """
+    global _mode, _provider
+    _mode, _provider = "simulate", provider
+
+def stop_simulation():
+    global _mode, _provider
+    _mode, _provider = "off", None
+
+# ✅ Recording Points
+def record_input(source, key, value=None, error=None):
+    if _writer is not None:
+        if error is not None:
+            _writer.append((time.time_ns(), source, key, "error", error))
+        else:
+            _writer.append((time.time_ns(), source, key, "value", value))
+
+def replay_input(source, key):
+    queue = _inputs.get((source, key))
+    if not queue:
+        raise ReplayError(f"❌ ERROR: No recorded {source} input left for {key!r}")
+    kind, value = queue.popleft()
+    if kind == "error":
+        raise value
+    return value
+
+def record_event(source, key, value=None):
+    """ Marks a point the replayer re-runs (e.g. one decision for a symbol) """
+    if _writer is not None:
+        _writer.append((time.time_ns(), source, key, "event", value))
+
+def recorded(source, key, func):
+    """ func() while live/recording; the recorded (or simulated) result of the same (source, key) call during replay """
+    if _mode == "replay":
+        return replay_input(source, key)
+    if _mode == "simulate":
+        value = _provider(source, key)
+        return func() if value is NotImplemented else value
+    if _mode == "off":
+        return func()
+    try:
+        value = func()
+    except Exception as e:
+        record_input(source, key, error=e)
+        raise
+    record_input(source, key, value)
+    return value
+
+# ✅ CLI Flags shared by the entry points
+def add_record_arguments(parser):
+    parser.add_argument("--record", nargs="?", const=DEFAULT_RECORD_FILE, default=None, metavar="FILE",
+                        help=f"Record every external input to a binary log (default: {DEFAULT_RECORD_FILE})")
+    return parser
+
+def configure_recording(args):
+    if getattr(args, "record", None):
+        from logs.logger import log_message
+        log_message(f"⏺ Recording live inputs to {start_recording(args.record)}")
+
+# ✅ Replay: re-run every recorded decision from the log (as fast as possible or in real time)
+def replay_session(path, speed=None):
+    """
+    speed=None replays as fast as possible; speed=1.0 keeps the recorded pacing (2.0 = twice as fast).
+    Returns stats including how many decisions reproduced the recorded action.
+    """
+    from ai_trading_bot import decide_trade
+
+    events = [event for event in start_replay(path) if event[1] == "decision"]
+    stats = {"decisions": 0, "matched": 0, "mismatched": 0, "errors": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    try:
+        for ts_ns, _, symbol, _, recorded_action in events:
+            if speed:
+                delay = (ts_ns - events[0][0]) / 1e9 / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            stats["decisions"] += 1
+            try:
+                action = decide_trade(symbol)[0]
+            except Exception:
+                stats["errors"] += 1
+                stats["mismatched"] += 1
+                continue
+            stats["matched" if action == recorded_action else "mismatched"] += 1
+    finally:
+        stop_replay()
+    stats["seconds"] = time.perf_counter() - started
+    stats["decisions_per_second"] = stats["decisions"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+def summarize(path):
+    """ Record counts per source, and the recorded time span """
+    counts, first, last = defaultdict(int), None, None
+    for ts_ns, source, _, kind, _ in read_records(path):
+        counts[f"{source} ({kind})"] += 1
+        first = ts_ns if first is None else first
+        last = ts_ns
+    return dict(counts), 0.0 if first is None else (last - first) / 1e9
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect or replay a recording of live bot inputs")
+    parser.add_argument("command", choices=["info", "replay"])
+    parser.add_argument("file")
+    parser.add_argument("--speed", type=float, default=None, help="Replay pacing (1.0 = real time); default as fast as possible")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        counts, span = summarize(args.file)
+        print(f"📼 {args.file}: {sum(counts.values())} records over {span:.1f}s ({os.path.getsize(args.file)} bytes)")
+        for source, count in sorted(counts.items()):
+            print(f"   {source}: {count}")
+    else:
+        print(f"📼 Replay: {replay_session(args.file, args.speed)}")
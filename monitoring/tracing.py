@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import random
+import atexit
+import threading
+import functools
+
+DEFAULT_TRACE_FILE = "logs/trace.json"
+DEFAULT_MAX_EVENTS = 200000  # Older events are dropped beyond this (bounded memory on long runs)
+
+# ✅ Tracer State
+_enabled = False
+_sampled = False          # True while the current iteration was picked by the sampler
+_sample_rate = 1.0
+_trace_file = DEFAULT_TRACE_FILE
+_max_events = DEFAULT_MAX_EVENTS
+_events = []
+_thread_names = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+_clock_origin = time.perf_counter()
+
+def _now_us():
+    return (time.perf_counter() - _clock_origin) * 1e6
+
+def _record(event):
+    tid = threading.get_ident()
+    event["pid"], event["tid"] = _pid, tid
+    with _lock:
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        if len(_events) >= _max_events:
+            del _events[:len(_events) // 10]
+        _events.append(event)
+
+# ✅ Spans (usable as a context manager or, through traced(), as a decorator)
+class TraceSpan:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        event = {"name": self.name, "cat": self.category, "ph": "X", "ts": self.start, "dur": _now_us() - self.start}
+        if self.args or exc_type is not None:
+            event["args"] = {**(self.args or {}), **({"error": exc_type.__name__} if exc_type else {})}
+        _record(event)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def trace_span(name, category="bot", **args):
+    """ with trace_span("mt5.order_send", "trade_execution", symbol=symbol): ... """
+    return TraceSpan(name, category, args) if _sampled else _NULL_SPAN
+
+def traced(name=None, category=None):
+    """ Decorator: records every call of the function as a span while the iteration is sampled """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        span_category = category or func.__module__.split(".")[0]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sampled:
+                return func(*args, **kwargs)
+            with TraceSpan(span_name, span_category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ✅ Iterations & Sampling
+class _Iteration:
+    """ Root span of one bot iteration; decides whether the nested spans of this iteration are kept """
+    __slots__ = ("span", "name", "args")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.span = None
+
+    def __enter__(self):
+        global _sampled
+        if _enabled and random.random() < _sample_rate:
+            _sampled = True  # Process-wide, so background threads started during the iteration are traced too
+            self.span = TraceSpan(self.name, "iteration", self.args)
+            self.span.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        global _sampled
+        if self.span is not None:
+            self.span.__exit__(exc_type, exc, traceback)
+            _sampled = False
+        return False
+
+def trace_iteration(name="iteration", **args):
+    return _Iteration(name, args)
+
+def trace_instant(name, category="bot", **args):
+    """ Zero-duration marker (e.g. "model swapped in") """
+    if _sampled:
+        _record({"name": name, "cat": category, "ph": "i", "s": "t", "ts": _now_us(), "args": args})
+
+# ✅ Enable & Write the Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev)
+def enable_tracing(trace_file=DEFAULT_TRACE_FILE, sample_rate=1.0, max_events=DEFAULT_MAX_EVENTS, always_on=False):
+    """
+    always_on=True records spans outside trace_iteration() as well (scripts without an iteration loop).
+    """
+    global _enabled, _sampled, _sample_rate, _trace_file, _max_events
+    _enabled = True
+    _sample_rate = max(0.0, min(1.0, float(sample_rate)))
+    _trace_file = trace_file
+    _max_events = max_events
+    _sampled = always_on
+    atexit.register(write_trace)
+
+def tracing_enabled():
+    return _enabled
+
+def write_trace(path=None):
+    path = path or _trace_file
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+    metadata = [{"name": "process_name", "ph": "M", "pid": _pid, "args": {"name": f"trading-bot ({_pid})"}}]
+    metadata += [{"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid, "args": {"name": thread_name}}
+                 for tid, thread_name in names.items()]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{_pid}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, file)
+    os.replace(tmp_path, path)
+    return path
+
+# ✅ CLI Flags shared by the entry points
+def add_trace_arguments(parser):
+    parser.add_argument("--trace", nargs="?", const=DEFAULT_TRACE_FILE, default=None, metavar="FILE",
+                        help=f"Record a Chrome trace-event timeline (default file: {DEFAULT_TRACE_FILE})")
+    parser.add_argument("--trace-sample-rate", type=float, default=1.0, metavar="RATE",
+                        help="Fraction of iterations to trace (0..1)")
+    return parser
+
+def configure_tracing(args, always_on=False):
+    if getattr(args, "trace", None):
+        enable_tracing(args.trace, args.trace_sample_rate, always_on=always_on)
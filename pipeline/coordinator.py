@@ -0,0 +1,404 @@
+import os
+import sys
+import time
+import bisect
+import random
+import socket
+import hashlib
+import threading
+from collections import deque
+import multiprocessing as mp
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from config_manager import get_config, thaw
+from logs.logger import log_message
+from monitoring.metrics import increment, start_metrics, dump_metrics
+from pipeline.transport import LocalTransport, TcpTransport, TcpConnection
+
+DEFAULT_SHARDING_SETTINGS = {
+    "transport": "local",          # "local" (worker processes on this machine) or "tcp" (workers on other nodes)
+    "host": "127.0.0.1",           # TCP listen address of the coordinator
+    "port": 9200,
+    "workers": 2,                  # Worker processes the coordinator starts itself (0 = only remote nodes)
+    "virtual_nodes": 64,           # Points per worker on the hash ring (smooths the symbol distribution)
+    "timeframe": None,             # Worker decision cadence; None uses the "scheduler" section
+    "decider": "ai",               # "ai" (ai_trading_bot.decide_trade) or "synthetic" (random signals for local testing)
+    "heartbeat_interval": 2.0,
+    "heartbeat_timeout": 10.0,     # A silent worker is removed from the ring and its symbols move
+    "max_decision_age": 30.0,      # Seconds; older decisions are rejected by the risk gate
+    "symbol_cooldown": 300,        # Minimum seconds between two orders for the same symbol (across all workers)
+    "max_orders_per_minute": 20,
+    "max_lots_per_minute": 5.0,
+    "dry_run": False,              # Log approved orders instead of sending them
+}
+CHECK_INTERVAL = 0.5  # Seconds between heartbeat checks when no message arrives
+
+def load_sharding_settings(overrides=None):
+    return {**DEFAULT_SHARDING_SETTINGS, **thaw(get_config().get("sharding", {})), **(overrides or {})}
+
+# ✅ Consistent Hashing
+class HashRing:
+    """
+    Every worker owns virtual_nodes points on a 64-bit ring; a symbol belongs to the first point
+    clockwise from its hash. Adding or removing a worker only moves the symbols between it and its
+    neighbours (about 1/N of the universe) instead of reshuffling everything.
+    """
+
+    def __init__(self, virtual_nodes=64):
+        self.virtual_nodes = virtual_nodes
+        self.nodes = set()
+        self._points = []   # Sorted hashes
+        self._owners = {}   # hash -> node
+
+    @staticmethod
+    def _hash(key):
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def add_node(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove_node(self, node):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._points = [point for point in self._points if self._owners[point] != node]
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+
+    def node_for(self, symbol):
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(symbol)) % len(self._points)
+        return self._owners[self._points[index]]
+
+    def assign(self, symbols):
+        """ {node: sorted symbols} for every node (nodes without symbols get an empty list) """
+        assignment = {node: [] for node in self.nodes}
+        for symbol in symbols:
+            node = self.node_for(symbol)
+            if node is not None:
+                assignment[node].append(symbol)
+        return {node: sorted(owned) for node, owned in assignment.items()}
+
+# ✅ Global Risk Gate (every order from every worker passes here before send_trade_action)
+class GlobalRiskGate:
+    def __init__(self, settings):
+        self.settings = settings
+        self.last_order = {}    # symbol -> time of the last approved order
+        self.recent = deque()   # (time, lot_size) of orders approved in the last minute
+
+    def check(self, decision, owner):
+        """ Returns (approved, reason) """
+        now = time.time()
+        symbol = decision["symbol"]
+        if decision["worker"] != owner:
+            return False, "not_owner"  # Signal from the previous owner of a symbol that just moved
+        if now - decision["ts"] > self.settings["max_decision_age"]:
+            return False, "stale"
+        if now - self.last_order.get(symbol, float("-inf")) < self.settings["symbol_cooldown"]:
+            return False, "cooldown"
+
+        while self.recent and now - self.recent[0][0] > 60:
+            self.recent.popleft()
+        if len(self.recent) >= self.settings["max_orders_per_minute"]:
+            return False, "order_rate"
+        if sum(lot for _, lot in self.recent) + decision["lot_size"] > self.settings["max_lots_per_minute"]:
+            return False, "lot_rate"
+
+        self.last_order[symbol] = now
+        self.recent.append((now, decision["lot_size"]))
+        return True, "approved"
+
+# ✅ Coordinator
+class ShardCoordinator:
+    """
+    Owns the hash ring and the global risk gate. Workers join over the transport, receive their
+    symbols in an {"type": "assign"} message, and send back {"type": "decision"} signals; nothing
+    is executed on the workers. Orders are sent one at a time from the coordinator loop, so the
+    risk gate sees a consistent view of everything in flight.
+    """
+
+    def __init__(self, transport, symbols=None, settings=None, execute=None):
+        self.settings = settings or load_sharding_settings()
+        self.transport = transport
+        self.symbols = list(symbols or get_config().get("trading_pairs", []))
+        self.ring = HashRing(self.settings["virtual_nodes"])
+        self.gate = GlobalRiskGate(self.settings)
+        self.execute = execute
+        self.last_seen = {}    # worker_id -> time of the last message
+        self.assignment = {}   # worker_id -> list of symbols
+        self.owner = {}        # symbol -> worker_id
+        self.stats = {"decisions": 0, "approved": 0, "rejected": 0, "sent": 0, "rebalances": 0, "moved": 0}
+
+    # ✅ Membership
+    def join(self, worker_id):
+        is_new = worker_id not in self.ring.nodes
+        self.last_seen[worker_id] = time.time()
+        if is_new:
+            self.ring.add_node(worker_id)
+            log_message(f"🤝 Worker {worker_id} joined ({len(self.ring.nodes)} workers)")
+        self.rebalance(force_worker=worker_id)
+
+    def leave(self, worker_id, reason="left"):
+        if worker_id not in self.ring.nodes:
+            return
+        self.ring.remove_node(worker_id)
+        self.last_seen.pop(worker_id, None)
+        self.assignment.pop(worker_id, None)
+        self.transport.disconnect(worker_id)
+        log_message(f"👋 Worker {worker_id} {reason} ({len(self.ring.nodes)} workers)", level="warning")
+        self.rebalance()
+
+    def rebalance(self, force_worker=None):
+        """ Sends a new assignment to every worker whose symbol set changed """
+        assignment = self.ring.assign(self.symbols)
+        owner = {symbol: worker for worker, owned in assignment.items() for symbol in owned}
+        moved = sum(1 for symbol, worker in owner.items() if self.owner.get(symbol) not in (None, worker))
+        for worker, owned in assignment.items():
+            if owned != self.assignment.get(worker) or worker == force_worker:
+                self.transport.send(worker, {"type": "assign", "symbols": owned})
+        self.assignment, self.owner = assignment, owner
+
+        self.stats["rebalances"] += 1
+        self.stats["moved"] += moved
+        increment("shard_rebalances")
+        if moved:
+            increment("shard_symbols_moved", value=moved)
+        unassigned = len(self.symbols) - len(owner)
+        log_message(f"🔀 Rebalanced {len(self.symbols)} symbols over {len(assignment)} workers ({moved} moved"
+                    f"{f', {unassigned} unassigned' if unassigned else ''})")
+
+    def check_heartbeats(self):
+        now = time.time()
+        for worker_id, seen in list(self.last_seen.items()):
+            if now - seen > self.settings["heartbeat_timeout"]:
+                self.leave(worker_id, "timed out")
+
+    # ✅ Messages
+    def handle(self, worker_id, message):
+        kind = message.get("type")
+        if kind == "join":
+            self.join(worker_id)
+        elif kind == "leave":
+            self.leave(worker_id, message.get("reason", "left"))
+        elif worker_id not in self.ring.nodes:
+            self.join(worker_id)  # Worker that outlived a coordinator restart or a timeout: re-admit it
+        else:
+            self.last_seen[worker_id] = time.time()
+            if kind == "decision":
+                self.on_decision(message)
+
+    def on_decision(self, decision):
+        symbol, action = decision["symbol"], decision["action"]
+        self.stats["decisions"] += 1
+        approved, reason = self.gate.check(decision, self.owner.get(symbol))
+        increment("shard_decisions", symbol, reason)
+        if not approved:
+            self.stats["rejected"] += 1
+            log_message(f"🚧 Risk Gate rejected {action} {symbol} from {decision['worker']} ({reason})", level="debug")
+            return False
+
+        self.stats["approved"] += 1
+        if self.settings["dry_run"]:
+            log_message(f"🧪 Dry Run: {action} {symbol} Lot: {decision['lot_size']} from {decision['worker']} "
+                        f"(confidence {decision['confidence']:.3f})")
+            sent = True
+        else:
+            sent = bool(self.execute(symbol, action, decision["lot_size"]))
+        self.stats["sent"] += int(sent)
+        return sent
+
+    # ✅ Main Loop
+    def run(self, duration=None, stop_event=None, poll=None):
+        """ poll() runs every iteration (the local cluster uses it to detect dead worker processes) """
+        if self.execute is None and not self.settings["dry_run"]:
+            from trade_execution.trade_execution import execute_trade
+            self.execute = execute_trade
+        stop_event = stop_event or threading.Event()
+        deadline = None if duration is None else time.monotonic() + duration
+        last_check = time.monotonic()
+        while not stop_event.is_set() and (deadline is None or time.monotonic() < deadline):
+            received = self.transport.recv(timeout=CHECK_INTERVAL)
+            if received is not None:
+                self.handle(*received)
+            if time.monotonic() - last_check >= CHECK_INTERVAL:
+                last_check = time.monotonic()
+                if poll:
+                    poll()
+                self.check_heartbeats()
+
+    def stop(self):
+        for worker_id in list(self.ring.nodes):
+            self.transport.send(worker_id, {"type": "stop"})
+        log_message(f"🛑 Coordinator Stopped ({self.stats['decisions']} decisions, {self.stats['approved']} approved, "
+                    f"{self.stats['rejected']} rejected, {self.stats['rebalances']} rebalances)")
+
+# ✅ Shard Worker (decides for its assigned symbols; never executes)
+def _synthetic_decider(symbol):
+    confidence = random.random()
+    return ("BUY" if confidence > 0.8 else None), 0.01, confidence
+
+def _load_decider(name):
+    if name == "synthetic":
+        return _synthetic_decider
+    from ai_trading_bot import decide_trade
+    return decide_trade
+
+def shard_worker(connection, settings):
+    from trade_execution.scheduler import BarScheduler
+
+    worker_id = connection.worker_id
+    decide = _load_decider(settings["decider"])
+    stop_event = threading.Event()
+    owned = []
+
+    def send(message):
+        try:
+            connection.send({**message, "worker": worker_id})
+        except OSError:
+            stop_event.set()  # Coordinator gone
+
+    def receive():
+        nonlocal owned
+        last_heartbeat = 0.0
+        while not stop_event.is_set():
+            message = connection.recv(timeout=settings["heartbeat_interval"])
+            if message is not None:
+                if message["type"] == "assign":
+                    owned = list(message["symbols"])
+                    log_message(f"📋 Worker {worker_id} owns {len(owned)} symbols: {', '.join(owned)}")
+                elif message["type"] == "stop":
+                    stop_event.set()
+            if time.monotonic() - last_heartbeat >= settings["heartbeat_interval"]:
+                last_heartbeat = time.monotonic()
+                send({"type": "heartbeat"})
+
+    def decide_for(symbol):
+        action, lot_size, confidence = decide(symbol)
+        if action:
+            send({"type": "decision", "symbol": symbol, "action": action, "lot_size": float(lot_size),
+                  "confidence": float(confidence), "ts": time.time()})
+        return action
+
+    send({"type": "join", "pid": os.getpid(), "host": socket.gethostname()})
+    threading.Thread(target=receive, name=f"{worker_id}-receiver", daemon=True).start()
+
+    overrides = {"name": worker_id}
+    if settings["timeframe"] is not None:
+        overrides["timeframe"] = settings["timeframe"]
+    scheduler = BarScheduler.from_config(get_config().get("scheduler"), **overrides)
+    log_message(f"🧮 Shard Worker {worker_id} Started (PID {os.getpid()}, {settings['decider']} decider)")
+    try:
+        scheduler.run(lambda: {symbol: (lambda symbol=symbol: decide_for(symbol)) for symbol in owned},
+                      stop_event=stop_event)
+    finally:
+        send({"type": "leave", "reason": "stopped"})
+        connection.close()
+
+def _run_shard_worker(connection, settings):
+    """ Child entry point (module level so the spawn start method can pickle it) """
+    if isinstance(connection, dict):  # TCP: sockets are opened in the child
+        connection = TcpConnection(connection["worker_id"], connection["host"], connection["port"])
+    shard_worker(connection, settings)
+
+# ✅ Local Cluster: coordinator + N worker processes on this machine
+class LocalCluster:
+    def __init__(self, settings=None, symbols=None):
+        self.settings = load_sharding_settings(settings)
+        self.ctx = mp.get_context("spawn")
+        if self.settings["transport"] == "tcp":
+            self.transport = TcpTransport(self.settings["host"], self.settings["port"])
+        else:
+            self.transport = LocalTransport(self.ctx)
+        self.coordinator = ShardCoordinator(self.transport, symbols, self.settings)
+        self.processes = {}
+        self._next_id = 0
+
+    def add_worker(self):
+        self._next_id += 1
+        worker_id = f"{socket.gethostname()}-{self._next_id}"
+        if self.settings["transport"] == "tcp":
+            host, port = self.transport.address[:2]
+            connection = {"worker_id": worker_id, "host": host, "port": port}
+        else:
+            connection = self.transport.connect(worker_id)
+        process = self.ctx.Process(target=_run_shard_worker, args=(connection, self.settings),
+                                   name=f"shard-{worker_id}", daemon=True)
+        process.start()
+        self.processes[worker_id] = process
+        return worker_id
+
+    def remove_worker(self, worker_id):
+        self.transport.send(worker_id, {"type": "stop"})
+
+    def reap(self):
+        """ A worker process that died without saying goodbye leaves the ring immediately """
+        for worker_id, process in list(self.processes.items()):
+            if not process.is_alive():
+                del self.processes[worker_id]
+                self.coordinator.leave(worker_id, f"exited (code {process.exitcode})")
+
+    def run(self, duration=None, stop_event=None):
+        for _ in range(self.settings["workers"]):
+            self.add_worker()
+        try:
+            self.coordinator.run(duration, stop_event, poll=self.reap)
+        finally:
+            self.stop()
+
+    def stop(self, timeout=10):
+        self.coordinator.stop()
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.transport.close()
+
+def run_cluster(duration=None, **settings):
+    metrics_settings = start_metrics(get_config().get("metrics"))
+    cluster = LocalCluster(settings)
+    try:
+        cluster.run(duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if metrics_settings["enabled"] and metrics_settings.get("dump_file"):
+            dump_metrics(metrics_settings["dump_file"])
+    return cluster
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Shard trading_pairs over worker processes / nodes")
+    parser.add_argument("--workers", type=int, default=None, help="Local worker processes to start")
+    parser.add_argument("--transport", choices=["local", "tcp"], default=None)
+    parser.add_argument("--port", type=int, default=None, help="TCP port of the coordinator")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="Run a single worker that joins a remote coordinator")
+    parser.add_argument("--worker-id", default=None, help="Worker name when using --connect")
+    parser.add_argument("--timeframe", default=None, help="Decision cadence (e.g. M1 or seconds)")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after N seconds")
+    parser.add_argument("--synthetic", action="store_true", help="Random signals instead of the AI model")
+    parser.add_argument("--dry-run", action="store_true", help="Log approved orders instead of sending them")
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in (("workers", args.workers), ("transport", args.transport),
+                                               ("port", args.port)) if value is not None}
+    if args.timeframe is not None:
+        overrides["timeframe"] = float(args.timeframe) if args.timeframe.replace(".", "", 1).isdigit() else args.timeframe
+    if args.synthetic:
+        overrides["decider"] = "synthetic"
+    if args.dry_run:
+        overrides["dry_run"] = True
+
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        shard_worker(TcpConnection(worker_id, host, int(port)), load_sharding_settings(overrides))
+    else:
+        run_cluster(args.duration, **overrides)
@@ -0,0 +1,118 @@
+import numpy as np
+from multiprocessing import shared_memory
+from logs.trade_records import SYMBOL_DTYPE
+
+HEADER_BYTES = 128       # Write index at byte 0, read index at byte 64 (separate cache lines)
+READ_INDEX_OFFSET = 64
+
+# ✅ Fixed-Size Records exchanged between the pipeline processes
+TICK_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("symbol", SYMBOL_DTYPE),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("order_flow", "<f8"),
+    ("news_sentiment", "<f8"),
+    ("market_volatility", "<f8"),  # maths_engine.symbol_volatility (M1 ATR), refreshed by the ingest worker
+    ("tick_ns", "<i8"),          # time.monotonic_ns() when the tick was ingested (system-wide clock)
+])
+ORDER_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("symbol", SYMBOL_DTYPE),
+    ("action", "S8"),
+    ("lot_size", "<f8"),
+    ("confidence", "<f8"),
+    ("tick_ns", "<i8"),
+    ("decision_ns", "<i8"),
+])
+REPORT_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("symbol", SYMBOL_DTYPE),
+    ("action", "S8"),
+    ("sent", "?"),
+    ("tick_ns", "<i8"),
+    ("decision_ns", "<i8"),
+    ("sent_ns", "<i8"),
+])
+
+# ✅ Single-Producer / Single-Consumer Ring Buffer in Shared Memory
+class RingBuffer:
+    """
+    Lock-free SPSC queue of fixed-size numpy records. The producer only ever writes the write
+    index and the consumer only the read index; a slot is filled before the write index that
+    publishes it is advanced, so neither side needs a lock. Indices grow monotonically and are
+    masked into the power-of-two slot array. When the buffer is full, push() returns False and
+    the producer decides what to drop.
+    """
+
+    def __init__(self, shm, dtype, capacity, owner):
+        if capacity & (capacity - 1):
+            raise ValueError(f"❌ ERROR: Ring buffer capacity must be a power of two (got {capacity})")
+        self.shm = shm
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.owner = owner
+        self._write = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=0)
+        self._read = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=READ_INDEX_OFFSET)
+        self._slots = np.ndarray((capacity,), dtype=self.dtype, buffer=shm.buf, offset=HEADER_BYTES)
+
+    @staticmethod
+    def size_bytes(dtype, capacity):
+        return HEADER_BYTES + np.dtype(dtype).itemsize * capacity
+
+    @classmethod
+    def create(cls, name, dtype, capacity):
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.size_bytes(dtype, capacity))
+        shm.buf[:HEADER_BYTES] = bytes(HEADER_BYTES)
+        return cls(shm, dtype, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name, dtype, capacity):
+        # Workers are spawned by the creating process and share its resource tracker, so only the
+        # owner's unlink() (in close) removes the segment
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, dtype, capacity, owner=False)
+
+    # ✅ Producer Side
+    def push(self, record):
+        write = int(self._write[0])
+        if write - int(self._read[0]) >= self.capacity:
+            return False
+        self._slots[write & self.mask] = record
+        self._write[0] = write + 1  # Publish only after the slot is complete
+        return True
+
+    # ✅ Consumer Side
+    def pop(self):
+        read = int(self._read[0])
+        if read == int(self._write[0]):
+            return None
+        record = self._slots[read & self.mask].copy()
+        self._read[0] = read + 1
+        return record
+
+    def pop_many(self, max_records=None):
+        """ Returns every available record (up to max_records) as one structured array """
+        read, write = int(self._read[0]), int(self._write[0])
+        count = write - read if max_records is None else min(write - read, max_records)
+        if count <= 0:
+            return self._slots[:0].copy()
+        start = read & self.mask
+        end = start + count
+        if end <= self.capacity:
+            records = self._slots[start:end].copy()
+        else:
+            records = np.concatenate([self._slots[start:], self._slots[:end - self.capacity]])
+        self._read[0] = read + count
+        return records
+
+    def __len__(self):
+        return int(self._write[0]) - int(self._read[0])
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        self._write = self._read = self._slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import multiprocessing as mp
+
+# ✅ Allow running this file directly as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from config_manager import get_config, thaw
+from logs.logger import log_message
+from monitoring.metrics import increment, observe, start_metrics, dump_metrics
+from pipeline.ring_buffer import RingBuffer, TICK_DTYPE, ORDER_DTYPE, REPORT_DTYPE
+from pipeline.workers import DEFAULT_PIPELINE_SETTINGS, WORKERS
+
+RING_DTYPES = {"ticks": TICK_DTYPE, "orders": ORDER_DTYPE, "reports": REPORT_DTYPE}
+CHECK_INTERVAL = 0.5  # Seconds between liveness checks / report draining
+
+def _run_worker(role, spec, stop_event):
+    """ Child entry point (module level so the spawn start method can pickle it) """
+    WORKERS[role](spec, stop_event)
+
+# ✅ Supervisor: owns the shared memory, starts the workers and restarts the ones that die
+class PipelineSupervisor:
+    """
+    ingest -> [ticks] -> inference -> [orders] -> execution -> [reports] -> supervisor
+    Every arrow is a shared-memory SPSC ring buffer created (and unlinked) by the supervisor, so
+    a restarted worker re-attaches to the same rings and continues where its predecessor stopped.
+    """
+
+    def __init__(self, settings=None, symbols=None):
+        config = get_config()
+        self.settings = {**DEFAULT_PIPELINE_SETTINGS, **thaw(config.get("pipeline", {})), **(settings or {})}
+        self.symbols = list(symbols or config.get("trading_pairs", []))
+        self.ctx = mp.get_context("spawn")
+        self.stop_event = self.ctx.Event()
+        self.rings = {}
+        self.processes = {}
+        self.restarts = {role: [] for role in WORKERS}
+        self.stats = {"reports": 0, "sent": 0, "failed": 0, "restarts": 0}
+
+    def start(self):
+        prefix = f"tb{os.getpid()}"
+        capacity = self.settings["ring_capacity"]
+        for ring, dtype in RING_DTYPES.items():
+            self.rings[ring] = RingBuffer.create(f"{prefix}_{ring}", dtype, capacity)
+        self.spec = {
+            "settings": self.settings,
+            "symbols": self.symbols,
+            "rings": {ring: (buffer.shm.name, capacity) for ring, buffer in self.rings.items()},
+        }
+        for role in WORKERS:
+            self._start_worker(role)
+        log_message(f"🧩 Pipeline Started: {', '.join(f'{role} (PID {p.pid})' for role, p in self.processes.items())}")
+
+    def _start_worker(self, role):
+        process = self.ctx.Process(target=_run_worker, args=(role, self.spec, self.stop_event),
+                                   name=f"pipeline-{role}", daemon=True)
+        process.start()
+        self.processes[role] = process
+
+    # ✅ Supervision Loop
+    def run(self, duration=None):
+        self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while not self.stop_event.is_set() and (deadline is None or time.monotonic() < deadline):
+                self.drain_reports()
+                if not self.check_workers():
+                    break
+                time.sleep(CHECK_INTERVAL)
+            self.drain_reports()
+        finally:
+            self.stop()
+
+    def check_workers(self):
+        """ Restarts dead workers; returns False once a worker exceeded its restart budget """
+        now = time.monotonic()
+        for role, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            recent = [t for t in self.restarts[role] if now - t < self.settings["restart_window"]]
+            if len(recent) >= self.settings["max_restarts"]:
+                log_message(f"❌ ERROR: {role} worker failed {len(recent)} times in {self.settings['restart_window']}s. Stopping pipeline.", level="error")
+                return False
+            self.restarts[role] = recent + [now]
+            self.stats["restarts"] += 1
+            increment("pipeline_restarts", role)
+            log_message(f"⚠ {role} worker exited (code {process.exitcode}). Restarting...", level="warning")
+            self._start_worker(role)
+        return True
+
+    def drain_reports(self):
+        """ Tick-to-order latency for every order the execution worker handled """
+        reports = self.rings["reports"].pop_many()
+        for report in reports:
+            symbol = report["symbol"].decode()
+            observe("tick_to_order", (report["sent_ns"] - report["tick_ns"]) / 1e9, symbol)
+            observe("tick_to_decision", (report["decision_ns"] - report["tick_ns"]) / 1e9, symbol)
+            observe("decision_to_order", (report["sent_ns"] - report["decision_ns"]) / 1e9, symbol)
+            increment("pipeline_orders", symbol, "sent" if report["sent"] else "failed")
+            self.stats["sent" if report["sent"] else "failed"] += 1
+        self.stats["reports"] += len(reports)
+        return reports
+
+    def stop(self, timeout=10):
+        self.stop_event.set()
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for ring in self.rings.values():
+            ring.close()
+        self.rings.clear()
+        log_message(f"🛑 Pipeline Stopped ({self.stats['sent']} orders sent, {self.stats['failed']} failed, {self.stats['restarts']} restarts)")
+
+def run_pipeline(duration=None, **settings):
+    metrics_settings = start_metrics(get_config().get("metrics"))
+    supervisor = PipelineSupervisor(settings)
+    try:
+        supervisor.run(duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if metrics_settings["enabled"] and metrics_settings.get("dump_file"):
+            dump_metrics(metrics_settings["dump_file"])
+    return supervisor
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the bot as ingest / inference / execution processes")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after N seconds")
+    parser.add_argument("--synthetic", action="store_true", help="Synthetic ticks instead of MT5")
+    parser.add_argument("--dry-run", action="store_true", help="Log orders instead of sending them")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.synthetic:
+        overrides["tick_source"] = "synthetic"
+    if args.dry_run:
+        overrides["dry_run"] = True
+    run_pipeline(args.duration, **overrides)
@@ -0,0 +1,173 @@
+import json
+import queue
+import socket
+import threading
+
+# ✅ Message Transport between the Coordinator and Shard Workers
+# Messages are small JSON-serialisable dicts ({"type": ..., ...}). Both transports expose the same API:
+#   coordinator side: send(worker_id, message), recv(timeout) -> (worker_id, message) or None, close()
+#   worker side:      send(message), recv(timeout) -> message or None, close()
+
+# ✅ Local Processes (multiprocessing queues)
+class LocalTransport:
+    """ Default transport: one inbox queue per worker plus one shared coordinator inbox """
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.inbox = ctx.Queue()
+        self.outboxes = {}
+
+    def connect(self, worker_id):
+        """ Creates the worker's queue pair; the returned connection is passed to the worker process """
+        outbox = self.ctx.Queue()
+        self.outboxes[worker_id] = outbox
+        return LocalConnection(worker_id, outbox, self.inbox)
+
+    def send(self, worker_id, message):
+        outbox = self.outboxes.get(worker_id)
+        if outbox is not None:
+            outbox.put(message)
+
+    def recv(self, timeout=None):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def disconnect(self, worker_id):
+        pass  # The queue outlives a timeout: a slow but live worker re-joins through the same inbox
+
+    def close(self):
+        pass
+
+class LocalConnection:
+    def __init__(self, worker_id, inbox, outbox):
+        self.worker_id = worker_id
+        self.inbox = inbox
+        self.outbox = outbox
+
+    def send(self, message):
+        self.outbox.put((self.worker_id, message))
+
+    def recv(self, timeout=None):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+# ✅ TCP between Nodes (newline-delimited JSON)
+def _send_line(sock, lock, message):
+    data = (json.dumps(message) + "\n").encode()
+    with lock:
+        sock.sendall(data)
+
+def _read_lines(sock, on_message, on_close):
+    buffer = b""
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line:
+                    on_message(json.loads(line))
+    except (OSError, ValueError):
+        pass
+    finally:
+        on_close()
+
+class TcpTransport:
+    """ Coordinator side: accepts worker connections; a worker's first message must be {"type": "join"} """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = socket.create_server((host, port))
+        self.address = self.server.getsockname()
+        self.inbox = queue.Queue()
+        self.sockets = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept_loop, name="tcp-accept", daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        state = {"worker_id": None}
+
+        def on_message(message):
+            if state["worker_id"] is None:
+                state["worker_id"] = message.get("worker")
+                with self._lock:
+                    self.sockets[state["worker_id"]] = (sock, threading.Lock())
+            self.inbox.put((state["worker_id"], message))
+
+        def on_close():
+            if state["worker_id"] is not None:
+                with self._lock:
+                    self.sockets.pop(state["worker_id"], None)
+                self.inbox.put((state["worker_id"], {"type": "leave", "reason": "disconnected"}))
+            sock.close()
+
+        _read_lines(sock, on_message, on_close)
+
+    def send(self, worker_id, message):
+        with self._lock:
+            entry = self.sockets.get(worker_id)
+        if entry is not None:
+            try:
+                _send_line(entry[0], entry[1], message)
+            except OSError:
+                pass
+
+    def recv(self, timeout=None):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def disconnect(self, worker_id):
+        with self._lock:
+            entry = self.sockets.pop(worker_id, None)
+        if entry is not None:
+            entry[0].close()
+
+    def close(self):
+        self.server.close()
+        with self._lock:
+            for sock, _ in self.sockets.values():
+                sock.close()
+            self.sockets.clear()
+
+class TcpConnection:
+    """ Worker side of the TCP transport """
+
+    def __init__(self, worker_id, host, port):
+        self.worker_id = worker_id
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.inbox = queue.Queue()
+        self._lock = threading.Lock()
+        threading.Thread(target=_read_lines, args=(self.sock, self.inbox.put, lambda: self.inbox.put({"type": "stop"})),
+                         name="tcp-reader", daemon=True).start()
+
+    def send(self, message):
+        _send_line(self.sock, self._lock, message)
+
+    def recv(self, timeout=None):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,193 @@
+import time
+import threading
+import numpy as np
+from pipeline.ring_buffer import RingBuffer, TICK_DTYPE, ORDER_DTYPE, REPORT_DTYPE
+
+DEFAULT_PIPELINE_SETTINGS = {
+    "tick_source": "mt5",        # "mt5" or "synthetic" (generated market, for dry runs without a terminal)
+    "poll_interval": 0.5,        # Seconds between tick snapshots per symbol
+    "ring_capacity": 4096,       # Records per ring buffer (power of two)
+    "news_interval": 300,        # Seconds between news sentiment refreshes (runs on its own thread)
+    "order_flow_interval": 5,    # Seconds between order flow refreshes
+    "volatility_interval": 30,   # Seconds between volatility (M1 ATR) refreshes
+    "insights_ttl": 60,          # Seconds a past-data insight is reused before it is recomputed
+    "buy_threshold": 0.5,
+    "order_cooldown": 300,       # Minimum seconds between two orders for the same symbol
+    "dry_run": False,            # Execution worker logs orders instead of sending them
+    "synthetic_seed": 42,        # Seed of the synthetic market (data_feeds/synthetic_market.py)
+    "max_restarts": 5,           # Per worker within restart_window seconds before the supervisor gives up
+    "restart_window": 300,
+}
+IDLE_SLEEP = 0.001  # Seconds a consumer sleeps when its ring is empty
+
+def attach_ring(spec, ring):
+    name, capacity = spec["rings"][ring]
+    dtype = {"ticks": TICK_DTYPE, "orders": ORDER_DTYPE, "reports": REPORT_DTYPE}[ring]
+    return RingBuffer.attach(name, dtype, capacity)
+
+def _symbol(record):
+    return record["symbol"].decode()
+
+# ✅ Ingestion Worker: ticks + slow feeds (news, order flow) refreshed on background threads
+def ingest_worker(spec, stop_event):
+    from logs.logger import log_message
+
+    settings, symbols = spec["settings"], spec["symbols"]
+    ticks = attach_ring(spec, "ticks")
+    latest = {symbol: {"order_flow": 0.0, "news_sentiment": 0.0, "market_volatility": 0.0} for symbol in symbols}
+    synthetic = settings["tick_source"] == "synthetic"
+
+    def refresh_news():
+        from data_feeds.news_sentiment import fetch_news_sentiment
+        while not stop_event.is_set():
+            try:
+                scores = fetch_news_sentiment()
+                for symbol in symbols:
+                    latest[symbol]["news_sentiment"] = float(scores.get(symbol) or 0.0)
+            except Exception as e:
+                log_message(f"⚠ News refresh failed - {str(e)}", level="warning")
+            stop_event.wait(settings["news_interval"])
+
+    def refresh_order_flow():
+        from data_feeds.order_flow_analysis import fetch_order_flow
+        while not stop_event.is_set():
+            for symbol in symbols:
+                try:
+                    latest[symbol]["order_flow"] = float(fetch_order_flow(symbol) or 0.0)
+                except Exception as e:
+                    log_message(f"⚠ Order flow refresh failed for {symbol} - {str(e)}", level="warning")
+            stop_event.wait(settings["order_flow_interval"])
+
+    def refresh_volatility():
+        # Same ATR of the M1 bars ai_trade_confidence feeds the model (this process owns the MT5 connection)
+        from maths_engine.maths import symbol_volatility
+        while not stop_event.is_set():
+            for symbol in symbols:
+                try:
+                    latest[symbol]["market_volatility"] = float(symbol_volatility(symbol) or 0.0)
+                except Exception as e:
+                    log_message(f"⚠ Volatility refresh failed for {symbol} - {str(e)}", level="warning")
+            stop_event.wait(settings["volatility_interval"])
+
+    if synthetic:
+        from benchmarks.fake_mt5 import FakeMT5, install
+        from data_feeds.synthetic_market import SyntheticMarket
+        market = SyntheticMarket(symbols, seed=settings["synthetic_seed"], timeframe=settings["poll_interval"])
+        install(FakeMT5(symbols, seed=settings["synthetic_seed"]))  # Synthetic M1 bars for the volatility feature
+        threads = (refresh_volatility,)
+    else:
+        import MetaTrader5 as mt5
+        from data_feeds.market_data import initialize_mt5
+        if not initialize_mt5():
+            raise RuntimeError("MT5 initialization failed in the ingest worker")
+        threads = (refresh_news, refresh_order_flow, refresh_volatility)
+    for target in threads:
+        threading.Thread(target=target, name=target.__name__, daemon=True).start()
+
+    log_message(f"📡 Ingest Worker Started ({settings['tick_source']} ticks, {len(symbols)} symbols)")
+    seq, dropped = 0, 0
+    while not stop_event.is_set():
+        if synthetic:
+            records = market.ticks(1)
+            records["tick_ns"] = time.monotonic_ns()  # Latency is measured from ingestion, not simulated time
+            for record in records:
+                record["market_volatility"] = latest[_symbol(record)]["market_volatility"]
+        else:
+            records = []
+            for symbol in symbols:
+                info = mt5.symbol_info_tick(symbol)
+                if info:
+                    seq += 1
+                    records.append((seq, symbol.encode(), info.bid, info.ask, latest[symbol]["order_flow"],
+                                    latest[symbol]["news_sentiment"], latest[symbol]["market_volatility"], time.monotonic_ns()))
+
+        for record in records:
+            if not ticks.push(record):
+                dropped += 1
+                if dropped % 1000 == 1:
+                    log_message(f"⚠ Tick ring full, {dropped} ticks dropped so far", level="warning")
+        stop_event.wait(settings["poll_interval"])
+    ticks.close()
+
+# ✅ Feature & Inference Worker
+def inference_worker(spec, stop_event):
+    from config_manager import get_config
+    from logs.logger import log_message
+    from ai_core.model_registry import get_registry
+    from ai_core.scaler_store import GLOBAL_SYMBOL
+    from ai_core.past_data_ai import integrate_past_data_with_main_ai
+    from ai_core.features import model_input
+    from maths_engine.maths import adaptive_risk_factor
+    from trade_execution.risk_management import calculate_lot_size
+
+    settings = spec["settings"]
+    ticks, orders = attach_ring(spec, "ticks"), attach_ring(spec, "orders")
+    registry = get_registry()
+    insights = {}      # symbol -> (value, computed_at)
+    last_order = {}    # symbol -> monotonic time of the last order
+
+    log_message(f"🧠 Inference Worker Started (backend: {registry.backend})")
+    while not stop_event.is_set():
+        batch = ticks.pop_many(256)
+        if not len(batch):
+            time.sleep(IDLE_SLEEP)
+            continue
+
+        model = registry.get_latest(GLOBAL_SYMBOL, "main")
+        for tick in batch:
+            symbol = _symbol(tick)
+            if model is None:
+                continue
+            if tick["order_flow"] == 0.0 and tick["news_sentiment"] == 0.0:
+                continue  # No market data yet (same rule as ai_trade_confidence)
+
+            now = time.monotonic()
+            if now - last_order.get(symbol, float("-inf")) < settings["order_cooldown"]:
+                continue
+
+            cached = insights.get(symbol)
+            if cached is None or now - cached[1] > settings["insights_ttl"]:
+                cached = insights[symbol] = (float(np.asarray(integrate_past_data_with_main_ai(symbol), dtype=np.float32).item()), now)
+
+            features = model_input(tick["order_flow"], tick["news_sentiment"], cached[0], tick["market_volatility"],
+                                   adaptive_risk_factor(symbol))
+            confidence = float(np.asarray(model(features)).reshape(-1)[0])
+            if confidence <= settings["buy_threshold"]:
+                continue
+
+            config = get_config()
+            lot_size = calculate_lot_size(config["account_balance"], config["risk_percentage"])
+            order = (tick["seq"], tick["symbol"], b"BUY", lot_size, confidence, tick["tick_ns"], time.monotonic_ns())
+            if orders.push(order):
+                last_order[symbol] = now
+            else:
+                log_message(f"⚠ Order ring full, dropped BUY for {symbol}", level="warning")
+    ticks.close()
+    orders.close()
+
+# ✅ Execution Worker (the mt5_bridge role)
+def execution_worker(spec, stop_event):
+    from logs.logger import log_message
+    from trade_execution.trade_execution import execute_trade
+
+    settings = spec["settings"]
+    orders, reports = attach_ring(spec, "orders"), attach_ring(spec, "reports")
+    log_message(f"📤 Execution Worker Started{' (dry run)' if settings['dry_run'] else ''}")
+    while not stop_event.is_set():
+        order = orders.pop()  # Consumed before sending: a crash mid-send can lose an order but never duplicates it
+        if order is None:
+            time.sleep(IDLE_SLEEP)
+            continue
+
+        symbol, action = _symbol(order), order["action"].decode()
+        if settings["dry_run"]:
+            log_message(f"🧪 Dry Run: {action} {symbol} Lot: {order['lot_size']} (confidence {order['confidence']:.3f})")
+            sent = True
+        else:
+            sent = bool(execute_trade(symbol, action, float(order["lot_size"])))
+        reports.push((order["seq"], order["symbol"], order["action"], sent,
+                      order["tick_ns"], order["decision_ns"], time.monotonic_ns()))
+    orders.close()
+    reports.close()
+
+WORKERS = {"ingest": ingest_worker, "inference": inference_worker, "execution": execution_worker}
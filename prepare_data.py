@@ -1,24 +1,12 @@
 import os
 import pandas as pd
 import numpy as np
-import json
-from sklearn.preprocessing import MinMaxScaler
+from config_manager import get_config
 
 # ✅ Define Data Storage Folder
 DATA_STORAGE_FOLDER = "data_storage"
 PROCESSED_DATA_FOLDER = "processed_data"  # Folder to store final AI-ready data
 
-# ✅ Load Configuration
-CONFIG_FILE = "config.json"
-def load_config():
-    with open(CONFIG_FILE, "r") as file:
-        return json.load(file)
-config = load_config()
-
-# ✅ Ensure Processed Data Folder Exists
-if not os.path.exists(PROCESSED_DATA_FOLDER):
-    os.makedirs(PROCESSED_DATA_FOLDER)
-
 # ✅ Prepare Data for AI Training
 def prepare_data_for_training(symbol):
     file_path = os.path.join(DATA_STORAGE_FOLDER, f"{symbol}.csv")
@@ -27,6 +15,8 @@ def prepare_data_for_training(symbol):
         print(f"⚠ Data file missing for {symbol}! Skipping...")
         return
 
+    from sklearn.preprocessing import MinMaxScaler
+
     try:
         # ✅ Load Data
         df = pd.read_csv(file_path)
@@ -57,5 +47,11 @@ def prepare_data_for_training(symbol):
         print(f"⚠ Error processing AI data for {symbol}: {e}")
 
 # ✅ Process All Symbols
-for symbol in config["trading_pairs"]:
-    prepare_data_for_training(symbol)
+def main():
+    # ✅ Ensure Processed Data Folder Exists
+    os.makedirs(PROCESSED_DATA_FOLDER, exist_ok=True)
+    for symbol in get_config()["trading_pairs"]:
+        prepare_data_for_training(symbol)
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,13 @@
-import MetaTrader5 as mt5
 import json
-import time
 from trade_execution.risk_management import calculate_lot_size
 from data_feeds.market_data import get_current_price
-
-# Load Configuration
-def load_config():
-    with open("config.json", "r") as file:
-        return json.load(file)
-
-config = load_config()
+from config_manager import get_config, start_watching
 
 def initialize_mt5():
     """ Connect to MetaTrader 5 """
+    import MetaTrader5 as mt5
+
+    config = get_config()
     if not mt5.initialize(login=config["mt5_login"], server=config["mt5_server"], password=config["mt5_password"]):
         print("❌ Failed to connect to MT5!")
         return False
@@ -20,6 +15,9 @@ def initialize_mt5():
 
 def send_trade_action(action, symbol, sl=None, tp=None, trail=False, ticket=None):
     """ Sends trade signals to MT5 """
+    import MetaTrader5 as mt5
+
+    config = get_config()
     if not initialize_mt5():
         return False
     
@@ -39,23 +37,29 @@ def send_trade_action(action, symbol, sl=None, tp=None, trail=False, ticket=None
     print(f"✅ Trade Sent: {action} {symbol}, Lot: {lot}, SL: {sl}, TP: {tp}, Trail: {trail}")
     return True
 
+def process_ai_signals():
+    """ One pass over ai_signals.json """
+    with open("ai_signals.json", "r") as file:
+        signals = json.load(file)
+
+    for signal in signals:
+        send_trade_action(
+            action=signal["action"],
+            symbol=signal["symbol"],
+            sl=signal.get("sl"),
+            tp=signal.get("tp"),
+            trail=signal.get("trail", False),
+            ticket=signal.get("ticket")
+        )
+
 def monitor_ai_signals():
     """ Monitors AI trading signals and executes trades """
-    while True:
-        with open("ai_signals.json", "r") as file:
-            signals = json.load(file)
-        
-        for signal in signals:
-            send_trade_action(
-                action=signal["action"],
-                symbol=signal["symbol"],
-                sl=signal.get("sl"),
-                tp=signal.get("tp"),
-                trail=signal.get("trail", False),
-                ticket=signal.get("ticket")
-            )
-        
-        time.sleep(config["trading_interval"])  # Wait before checking again
+    from trade_execution.scheduler import BarScheduler
+
+    start_watching()  # ✅ Pick up config.json edits without a restart
+    # ✅ Runs on trading_interval boundaries (re-read every tick): no drift, no overlapping passes
+    scheduler = BarScheduler(lambda: get_config()["trading_interval"], close_delay=0.0, max_workers=1, name="ai_signals")
+    scheduler.run(lambda: {"ai_signals": process_ai_signals})
 
 if __name__ == "__main__":
     monitor_ai_signals()
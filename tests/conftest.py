@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+import tempfile
+import pytest
+
+# ✅ Repo root importable & a throwaway config (quiet log, small training runs) before anything imports config_manager
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+TEST_DIR = tempfile.mkdtemp(prefix="tb-tests-")
+with open(os.path.join(REPO_ROOT, "config.json"), "r") as file:
+    TEST_CONFIG = json.load(file)
+TEST_CONFIG.update({"training_epochs": 2, "batch_size": 16})
+TEST_CONFIG["logging"] = {**TEST_CONFIG.get("logging", {}), "console": False, "enable_debug": False,
+                          "log_file": os.path.join(TEST_DIR, "test_log.txt")}
+TEST_CONFIG["metrics"] = {**TEST_CONFIG.get("metrics", {}), "enabled": False}
+TEST_CONFIG["incremental_training"] = {**TEST_CONFIG.get("incremental_training", {}), "max_epochs": 2}
+CONFIG_FILE = os.path.join(TEST_DIR, "config.json")
+with open(CONFIG_FILE, "w") as file:
+    json.dump(TEST_CONFIG, file, indent=4)
+os.environ["TRADING_BOT_CONFIG"] = CONFIG_FILE
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """ Runs a test from an empty folder (every relative data / model / log path lands there) with fresh shared instances """
+    import ai_core.model_registry as model_registry
+    import logs.trade_journal as trade_journal
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(model_registry, "_registry", None)
+    monkeypatch.setattr(trade_journal, "_journal", None)
+    yield tmp_path
+    if trade_journal._journal is not None:
+        trade_journal._journal.close()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from ai_core import ai_learning
+from ai_core.model_registry import read_manifest, latest_version, model_path
+from ai_core.scaler_store import GLOBAL_SYMBOL, STAGING_VERSION, load_scaler
+from logs.trade_journal import get_journal
+
+def make_trades(rng, count):
+    return [{"symbol": "EURUSDm", "action": "BUY", "lot_size": float(rng.uniform(0.01, 1)), "stop_loss": float(rng.uniform(10, 50)),
+             "take_profit": float(rng.uniform(20, 100)), "market_volatility": float(rng.uniform(0, 1)), "profit": float(rng.normal())}
+            for _ in range(count)]
+
+def test_incremental_training_warm_starts_on_new_trades_only(workspace, monkeypatch):
+    rng = np.random.default_rng(0)
+    journal = get_journal()
+    journal.append_many(make_trades(rng, 60))
+
+    ai_learning.train_ai(incremental=False)
+    assert latest_version(GLOBAL_SYMBOL, ai_learning.MODEL_KIND) == 1
+    assert ai_learning.load_training_state()["last_offset"] == 60
+    published = tf.keras.models.load_model(model_path(GLOBAL_SYMBOL, ai_learning.MODEL_KIND, 1))
+
+    journal.append_many(make_trades(rng, 12))
+    calls = []
+    train_incremental = ai_learning.train_ai_incremental
+
+    def spy(model, journal, consumed, new_trades, settings):
+        calls.append((consumed, [trade["offset"] for trade in new_trades]))
+        for warm, saved in zip(model.get_weights(), published.get_weights()):
+            np.testing.assert_array_equal(warm, saved)  # Fine-tunes the published model, not a fresh one
+        return train_incremental(model, journal, consumed, new_trades, settings)
+
+    monkeypatch.setattr(ai_learning, "train_ai_incremental", spy)
+    ai_learning.train_ai()
+    assert calls == [(60, list(range(61, 73)))]
+    assert read_manifest()["models"][f"{ai_learning.MODEL_KIND}/{GLOBAL_SYMBOL}"]["version"] == 2
+    assert ai_learning.load_training_state()["last_offset"] == 72
+
+    ai_learning.train_ai()  # Nothing new: no training round, no new version
+    assert len(calls) == 1
+    assert latest_version(GLOBAL_SYMBOL, ai_learning.MODEL_KIND) == 2
+
+def test_published_scalers_are_not_rewritten_by_later_runs(workspace):
+    rng = np.random.default_rng(1)
+    get_journal().append_many(make_trades(rng, 60))
+    ai_learning.train_ai(incremental=False)
+    v1 = load_scaler(GLOBAL_SYMBOL, ai_learning.SCALER_KIND, 1)
+    np.testing.assert_array_equal(v1[1], load_scaler(GLOBAL_SYMBOL, ai_learning.SCALER_KIND, STAGING_VERSION)[1])
+
+    trades = make_trades(rng, 40)
+    for trade in trades:
+        trade["lot_size"] *= 10  # A wider range -> a different fitted scale
+    ai_learning.prepare_data(trades)  # Next run refits the working (staging) scaler
+    staging = load_scaler(GLOBAL_SYMBOL, ai_learning.SCALER_KIND, STAGING_VERSION)
+    assert not np.array_equal(staging[1], v1[1])
+    np.testing.assert_array_equal(load_scaler(GLOBAL_SYMBOL, ai_learning.SCALER_KIND, 1)[1], v1[1])
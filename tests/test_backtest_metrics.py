@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from backtesting.metrics import (METRICS_DTYPE, compute_metrics, equity_from_trades, metrics_row, position_from_trades,
+                                 rank_runs)
+
+PERIODS = 252
+
+def reference_metrics(equity, position=None, periods=PERIODS):
+    """ One unpadded run, one bar at a time """
+    equity = [float(value) for value in equity]
+    returns = [equity[i + 1] / equity[i] - 1 for i in range(len(equity) - 1)]
+    mean = sum(returns) / len(returns) if returns else 0.0
+    std = (sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)) ** 0.5 if len(returns) > 1 else 0.0
+    downside = (sum(min(r, 0.0) ** 2 for r in returns) / len(returns)) ** 0.5 if returns else 0.0
+
+    peak, last_peak, max_drawdown, max_drawdown_bars = equity[0], 0, 0.0, 0
+    for index, value in enumerate(equity):
+        if value >= peak:
+            peak, last_peak = value, index
+        max_drawdown = max(max_drawdown, 1 - value / peak)
+        max_drawdown_bars = max(max_drawdown_bars, index - last_peak)
+
+    pnl = [equity[i + 1] - equity[i] for i in range(len(equity) - 1) if equity[i + 1] != equity[i]]
+    gains, losses = sum(p for p in pnl if p > 0), -sum(p for p in pnl if p < 0)
+    growth = equity[-1] / equity[0]
+    row = {
+        "total_return": growth - 1,
+        "annual_return": growth ** (periods / max(len(equity) - 1, 1)) - 1,
+        "volatility": std * periods ** 0.5,
+        "sharpe": mean / std * periods ** 0.5 if std > 0 else 0.0,
+        "sortino": mean / downside * periods ** 0.5 if downside > 0 else 0.0,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_bars": max_drawdown_bars,
+        "profit_factor": gains / losses if losses > 0 else (np.inf if gains > 0 else 0.0),
+        "win_rate": sum(p > 0 for p in pnl) / len(pnl) if pnl else 0.0,
+        "trades": len(pnl),
+        "avg_trade": (gains - losses) / len(pnl) if pnl else 0.0,
+        "exposure": 0.0,
+        "turnover": 0.0,
+    }
+    if position is not None:
+        position = [float(value) for value in position]
+        row["exposure"] = sum(value != 0 for value in position) / len(position)
+        row["turnover"] = sum(abs(b - a) for a, b in zip([0.0] + position[:-1], position)) / len(position) * periods
+    return row
+
+def assert_rows_match(metrics, expected):
+    for index, row in enumerate(expected):
+        for name in METRICS_DTYPE.names:
+            assert metrics[name][index] == pytest.approx(row[name], rel=1e-9, abs=1e-12), (index, name)
+
+def random_runs(runs=6, bars=120, seed=0):
+    rng = np.random.default_rng(seed)
+    position = (rng.random((runs, bars)) < 0.6).astype(np.float64)
+    returns = rng.normal(0.0005, 0.01, (runs, bars)) * position
+    returns[:, 0] = 0.0
+    return 10000 * np.cumprod(1 + returns, axis=1), position
+
+def test_stacked_runs_match_per_run_loops():
+    equity, position = random_runs()
+    metrics = compute_metrics(equity, position, periods=PERIODS)
+    assert_rows_match(metrics, [reference_metrics(run, held) for run, held in zip(equity, position)])
+
+def test_nan_padded_runs_match_their_unpadded_metrics():
+    equity, position = random_runs(runs=4)
+    lengths = [120, 80, 3, 1]
+    padded, padded_position = equity.copy(), position.copy()
+    for row, length in enumerate(lengths):
+        padded[row, length:] = np.nan
+        padded_position[row, length:] = np.nan
+    metrics = compute_metrics(padded, padded_position, periods=PERIODS)
+    assert_rows_match(metrics, [reference_metrics(equity[row, :length], position[row, :length])
+                                for row, length in enumerate(lengths)])
+    for row, length in enumerate(lengths):
+        alone = compute_metrics(equity[row, :length], position[row, :length], periods=PERIODS)
+        assert_rows_match(metrics[row:row + 1], [metrics_row(alone, 0)])
+
+def test_single_bar_run():
+    row = metrics_row(compute_metrics([10000.0]), 0)
+    assert row == {**{name: 0.0 for name in METRICS_DTYPE.names}, "max_drawdown_bars": 0, "trades": 0}
+
+def test_drawdown_depth_and_duration():
+    row = metrics_row(compute_metrics([100, 120, 90, 96, 110, 125, 100]), 0)
+    assert row["max_drawdown"] == pytest.approx(0.25)
+    assert row["max_drawdown_bars"] == 3  # Below the 120 peak for bars 2-4
+
+def test_trade_pnl_and_curves_from_trades():
+    pnl = np.array([[50.0, -25.0, 10.0], [-5.0, np.nan, np.nan]])
+    metrics = compute_metrics(np.array([[100, 150, 125, 135], [100, 95, np.nan, np.nan]]), trade_pnl=pnl)
+    assert list(metrics["trades"]) == [3, 1]
+    assert metrics["profit_factor"][0] == pytest.approx(60 / 25) and metrics["profit_factor"][1] == 0.0
+    assert metrics["win_rate"][0] == pytest.approx(2 / 3)
+
+    np.testing.assert_allclose(equity_from_trades(6, [2, 4], [10.0, -5.0], 100.0), [100, 100, 110, 110, 105, 105])
+    np.testing.assert_array_equal(position_from_trades(6, [0, 3], [2, 4], [1.0, 2.0]), [0, 1, 1, 0, 2, 0])
+
+def test_ranking_with_ascending_keys_and_nan():
+    metrics = np.zeros(5, METRICS_DTYPE)
+    metrics["sharpe"] = [1.0, np.nan, 2.0, 1.0, 0.5]
+    metrics["max_drawdown"] = [0.3, 0.1, 0.2, 0.1, np.nan]
+    assert list(rank_runs(metrics)) == [2, 0, 3, 4, 1]  # NaN last, ties keep their order
+    assert list(rank_runs(metrics, by=("sharpe", "max_drawdown"), ascending=("max_drawdown",))) == [2, 3, 0, 4, 1]
+    assert list(rank_runs(metrics, by="max_drawdown", ascending=("max_drawdown",), top=3)) == [1, 3, 2]
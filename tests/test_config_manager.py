@@ -0,0 +1,84 @@
+import json
+import pytest
+
+import config_manager
+from config_manager import DEFAULTS, ConfigError, freeze, parse_config, thaw
+from conftest import TEST_CONFIG
+
+def write_config(tmp_path, config):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config) if isinstance(config, (dict, list)) else config)
+    return str(path)
+
+def test_defaults_fill_missing_keys(tmp_path):
+    config = parse_config(write_config(tmp_path, {"trading_pairs": ["EURUSDm"], "risk_percentage": 2}))
+    assert config["risk_percentage"] == 2 and config["trading_pairs"] == ["EURUSDm"]
+    assert config["batch_size"] == DEFAULTS["batch_size"]
+
+@pytest.mark.parametrize("config, message", [
+    ("{not json", "Invalid or missing"),
+    ([1, 2], "must contain a JSON object"),
+    ({"account_balance": -5}, "'account_balance' must be a positive number"),
+    ({"risk_percentage": 150}, "'risk_percentage' must be between 0 and 100"),
+    ({"training_epochs": 2.5}, "'training_epochs' must be a positive integer"),
+    ({"batch_size": True}, "'batch_size' must be a positive integer"),
+    ({"trading_pairs": ["EURUSDm", ""]}, "'trading_pairs' must be a list of symbol names"),
+    ({"logging": "debug"}, "'logging' must be an object"),
+    ({"min_lot_size": 2, "max_lot_size": 1}, "'min_lot_size' must not be larger than 'max_lot_size'"),
+])
+def test_invalid_configs_are_rejected(tmp_path, config, message):
+    with pytest.raises(ConfigError, match=message):
+        parse_config(write_config(tmp_path, config))
+
+def test_every_error_is_reported_at_once(tmp_path):
+    with pytest.raises(ConfigError) as error:
+        parse_config(write_config(tmp_path, {"account_balance": 0, "batch_size": 0}))
+    assert "'account_balance'" in str(error.value) and "'batch_size'" in str(error.value)
+
+def test_missing_file(tmp_path):
+    with pytest.raises(ConfigError, match="Invalid or missing"):
+        parse_config(str(tmp_path / "missing.json"))
+
+def test_snapshots_are_read_only():
+    snapshot = freeze({"trading_pairs": ["EURUSDm"], "logging": {"level": "info"}})
+    with pytest.raises(TypeError):
+        snapshot["logging"]["level"] = "debug"
+    assert snapshot["trading_pairs"] == ("EURUSDm",)
+    assert thaw(snapshot) == {"trading_pairs": ["EURUSDm"], "logging": {"level": "info"}}
+
+def test_reload_keeps_previous_snapshot_on_error(monkeypatch):
+    previous = freeze({**TEST_CONFIG, "trading_pairs": ["EURUSDm"]})  # Keeps the quiet test logging settings
+    monkeypatch.setattr(config_manager, "_snapshot", previous)
+    monkeypatch.setattr(config_manager, "_mtime", config_manager._mtime)
+    monkeypatch.setattr(config_manager, "_subscribers", [])
+    calls = []
+    config_manager.subscribe(lambda new, old: calls.append((new["trading_pairs"], old["trading_pairs"])))
+    config_manager.subscribe(lambda new, old: 1 / 0)  # A failing subscriber does not stop the others
+
+    def broken(path=None):
+        raise ConfigError("'batch_size' must be a positive integer (got 0)")
+    monkeypatch.setattr(config_manager, "parse_config", broken)
+    assert config_manager.reload_config() is False
+    assert config_manager.get_config() is previous and calls == []
+
+    monkeypatch.setattr(config_manager, "parse_config", lambda path=None: {**TEST_CONFIG, "trading_pairs": ["GBPUSDm"]})
+    assert config_manager.reload_config() is True
+    assert calls == [(("GBPUSDm",), ("EURUSDm",))]
+    assert config_manager.get_config()["trading_pairs"] == ("GBPUSDm",)
+
+def test_rejected_reload_remembers_the_broken_file(tmp_path, monkeypatch):
+    path = write_config(tmp_path, {"batch_size": 0})
+    monkeypatch.setattr(config_manager, "CONFIG_FILE", path)
+    monkeypatch.setattr(config_manager, "_snapshot", freeze(TEST_CONFIG))
+    monkeypatch.setattr(config_manager, "_mtime", None)
+    monkeypatch.setattr(config_manager, "parse_config", lambda path=path: parse_config(path))
+
+    # The file was read but is invalid: its mtime is kept so the watcher does not retry it every tick
+    assert config_manager.reload_config() is False
+    assert config_manager._mtime == (tmp_path / "config.json").stat().st_mtime_ns
+
+    # The file could not even be stat'ed: the last known mtime stays
+    monkeypatch.setattr(config_manager, "CONFIG_FILE", str(tmp_path / "missing.json"))
+    monkeypatch.setattr(config_manager, "_mtime", 123)
+    assert config_manager.reload_config() is False
+    assert config_manager._mtime == 123
@@ -0,0 +1,101 @@
+import pytest
+
+from pipeline import coordinator
+from pipeline.coordinator import DEFAULT_SHARDING_SETTINGS, GlobalRiskGate, HashRing, ShardCoordinator
+
+SYMBOLS = [f"SYM{index:03d}" for index in range(300)]
+
+class FakeTransport:
+    def __init__(self):
+        self.sent, self.disconnected = [], []
+
+    def send(self, worker_id, message):
+        self.sent.append((worker_id, message))
+
+    def disconnect(self, worker_id):
+        self.disconnected.append(worker_id)
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(coordinator.time, "time", clock)
+    return clock
+
+def owners(ring):
+    return {symbol: ring.node_for(symbol) for symbol in SYMBOLS}
+
+# ✅ Hash Ring
+def test_hash_ring_assigns_every_symbol_deterministically():
+    assert HashRing().node_for("EURUSDm") is None
+    ring, again = HashRing(), HashRing()
+    for node in ("w1", "w2", "w3"):
+        ring.add_node(node)
+    for node in ("w3", "w1", "w2"):
+        again.add_node(node)
+    assignment = ring.assign(SYMBOLS)
+    assert sorted(symbol for owned in assignment.values() for symbol in owned) == SYMBOLS
+    assert all(len(owned) > 40 for owned in assignment.values())  # 64 virtual nodes keep the split reasonably even
+    assert owners(ring) == owners(again)
+
+def test_hash_ring_moves_only_the_new_nodes_share():
+    ring = HashRing()
+    for node in ("w1", "w2", "w3"):
+        ring.add_node(node)
+    before = owners(ring)
+    ring.add_node("w4")
+    after = owners(ring)
+    moved = [symbol for symbol in SYMBOLS if before[symbol] != after[symbol]]
+    assert moved and all(after[symbol] == "w4" for symbol in moved)
+    assert len(moved) < len(SYMBOLS) / 2
+
+    ring.remove_node("w4")
+    assert owners(ring) == before
+    ring.add_node("w1")  # Already a member: no duplicate points
+    assert len(ring._points) == 3 * ring.virtual_nodes
+
+# ✅ Global Risk Gate
+def decision(clock, symbol="EURUSDm", worker="w1", lot_size=0.1, age=0.0):
+    return {"symbol": symbol, "worker": worker, "lot_size": lot_size, "ts": clock.now - age, "action": "BUY", "confidence": 0.9}
+
+def test_risk_gate_rejections(clock):
+    gate = GlobalRiskGate({**DEFAULT_SHARDING_SETTINGS, "symbol_cooldown": 60, "max_orders_per_minute": 3, "max_lots_per_minute": 1.0})
+    assert gate.check(decision(clock, worker="w2"), "w1") == (False, "not_owner")
+    assert gate.check(decision(clock, age=31), "w1") == (False, "stale")
+    assert gate.check(decision(clock), "w1") == (True, "approved")
+    assert gate.check(decision(clock), "w1") == (False, "cooldown")
+    assert gate.check(decision(clock, symbol="GBPUSDm", lot_size=0.95), "w1") == (False, "lot_rate")
+    assert gate.check(decision(clock, symbol="GBPUSDm"), "w1") == (True, "approved")
+    assert gate.check(decision(clock, symbol="USDJPYm"), "w1") == (True, "approved")
+    assert gate.check(decision(clock, symbol="XAUUSDm"), "w1") == (False, "order_rate")
+
+    clock.now += 61  # The minute window and the cooldown have passed
+    assert gate.check(decision(clock, symbol="XAUUSDm", lot_size=0.9), "w1") == (True, "approved")
+    assert gate.check(decision(clock), "w1") == (True, "approved")
+
+# ✅ Coordinator
+def test_coordinator_routes_decisions_through_the_gate(clock):
+    transport, executed = FakeTransport(), []
+    settings = {**DEFAULT_SHARDING_SETTINGS, "symbol_cooldown": 0}
+    shards = ShardCoordinator(transport, SYMBOLS[:20], settings, execute=lambda *order: executed.append(order) or True)
+    shards.handle("w1", {"type": "join"})
+    shards.handle("w2", {"type": "join"})
+    assert {worker for worker, message in transport.sent if message["type"] == "assign"} == {"w1", "w2"}
+    assert sorted(shards.owner) == SYMBOLS[:20]
+
+    symbol = shards.assignment["w2"][0]
+    shards.handle("w2", {"type": "decision", **decision(clock, symbol=symbol, worker="w2")})
+    shards.handle("w1", {"type": "decision", **decision(clock, symbol=symbol, worker="w1")})
+    assert executed == [(symbol, "BUY", 0.1)]
+    assert shards.stats["approved"] == 1 and shards.stats["rejected"] == 1
+
+    clock.now += settings["heartbeat_timeout"] + 1
+    shards.last_seen["w1"] = clock.now
+    shards.check_heartbeats()
+    assert transport.disconnected == ["w2"] and shards.assignment == {"w1": SYMBOLS[:20]}
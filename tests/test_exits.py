@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from backtesting.exits import (EXIT_END, EXIT_REASONS, EXIT_STOP, EXIT_TARGET, EXIT_TIME, EXIT_TRAILING, find_exits,
+                               non_overlapping, simulate_exits)
+
+def reference_exits(open_, high, low, close, entry_index, direction, stop_loss, take_profit, trailing=None,
+                    max_holding_bars=None, same_bar_policy="stop"):
+    """ Per-bar loop with the semantics find_exits documents (the slow reference it must match) """
+    bars = len(close)
+    results = []
+    for position, entry in enumerate(entry_index):
+        sign = direction[position]
+        last_bar = bars - 1 if not max_holding_bars else min(bars - 1, entry + max_holding_bars)
+        result = (last_bar, close[last_bar], EXIT_TIME if last_bar < bars - 1 else EXIT_END)
+        peak = sign * close[entry]
+        base_stop, target = sign * stop_loss[position], sign * take_profit[position]
+        for bar in range(entry + 1, last_bar + 1):
+            up, down = (high[bar], low[bar]) if sign > 0 else (-low[bar], -high[bar])
+            bar_open = sign * open_[bar]
+            stop, trailed = base_stop, False
+            if trailing is not None:
+                trail_stop = peak - trailing[position]
+                trailed = trail_stop > base_stop
+                stop = max(base_stop, trail_stop)
+            stop_hit, target_hit = down <= stop, up >= target
+            if stop_hit or target_hit:
+                stopped = stop_hit and not (same_bar_policy == "target" and target_hit)
+                level = min(stop, bar_open) if stopped else max(target, bar_open)
+                reason = (EXIT_TRAILING if trailed else EXIT_STOP) if stopped else EXIT_TARGET
+                result = (bar, sign * level, reason)
+                break
+            peak = max(peak, up)
+        results.append(result)
+    return tuple(np.array(values) for values in zip(*results))
+
+def random_market(seed, bars=400):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.002, bars))
+    open_ = np.concatenate(([close[0]], close[:-1])) + rng.normal(0, 0.0005, bars)
+    high = np.maximum(open_, close) + rng.exponential(0.001, bars)
+    low = np.minimum(open_, close) - rng.exponential(0.001, bars)
+    return open_, high, low, close, rng
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"trailing": 0.003},
+    {"max_holding_bars": 7},
+    {"same_bar_policy": "target"},
+    {"trailing": 0.002, "max_holding_bars": 30, "scan_bars": 2, "chunk_positions": 5},
+])
+def test_matches_per_bar_reference(options):
+    open_, high, low, close, rng = random_market(7)
+    count = 60
+    entry_index = rng.integers(0, len(close), count)
+    direction = rng.choice([-1.0, 1.0], count)
+    distance = rng.uniform(0.001, 0.01, count)
+    stop_loss = close[entry_index] - direction * distance
+    take_profit = close[entry_index] + direction * 2 * distance
+    trailing = np.full(count, options["trailing"]) if "trailing" in options else None
+    policy = options.get("same_bar_policy", "stop")
+
+    expected = reference_exits(open_, high, low, close, entry_index, direction, stop_loss, take_profit, trailing,
+                               options.get("max_holding_bars"), policy)
+    actual = find_exits(open_, high, low, close, entry_index, direction, stop_loss, take_profit, trailing,
+                        options.get("max_holding_bars"), policy, options.get("scan_bars", 16), options.get("chunk_positions", 4096))
+    np.testing.assert_array_equal(actual[0], expected[0])
+    np.testing.assert_allclose(actual[1], expected[1])
+    np.testing.assert_array_equal(actual[2], expected[2])
+
+def test_gap_through_stop_fills_at_open():
+    open_ = np.array([1.0, 1.0, 0.90, 0.90])
+    high = np.array([1.0, 1.01, 0.91, 0.91])
+    low = np.array([1.0, 0.99, 0.89, 0.89])
+    close = np.array([1.0, 1.0, 0.90, 0.90])
+    exit_index, exit_price, reason = find_exits(open_, high, low, close, [0], 1.0, 0.95, 1.10)
+    assert (exit_index[0], exit_price[0], EXIT_REASONS[reason[0]]) == (2, 0.90, "stop_loss")
+
+def test_simulate_exits_uses_atr_levels():
+    pd = pytest.importorskip("pandas")
+    open_, high, low, close, _ = random_market(3, bars=120)
+    df = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close})
+    result = simulate_exits(df, [20, 40], [1.0, -1.0], {"stop_loss_factor": 1.0, "take_profit_factor": 2.0})
+    risk = np.abs(result["entry_price"] - result["stop_loss"])
+    np.testing.assert_allclose(np.abs(result["take_profit"] - result["entry_price"]), 2 * risk)
+    assert set(result["reason"]) <= {EXIT_END, EXIT_STOP, EXIT_TARGET}
+    np.testing.assert_allclose(result["return"], result["direction"] * (result["exit_price"] / result["entry_price"] - 1))
+
+def test_non_overlapping_positions():
+    taken = non_overlapping(np.array([0, 2, 5, 6, 9]), np.array([4, 3, 8, 7, 12]))
+    assert list(taken) == [0, 2, 4]
@@ -0,0 +1,143 @@
+import time
+import types
+import threading
+import pytest
+
+from data_feeds import feed_cache
+from data_feeds.feed_cache import DEFAULT_FEED_CACHE_SETTINGS, cache_stats, cached_feed, invalidate
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+class Fetcher:
+    """ Counting fake data feed; while gate is set, calls block until it is released """
+
+    def __init__(self, error=None):
+        self.calls, self.error = [], error
+        self.gate, self.entered = None, threading.Event()
+
+    def __call__(self, symbol):
+        self.calls.append(symbol)
+        if self.gate is not None:
+            self.entered.set()
+            assert self.gate.wait(10)
+        if self.error is not None:
+            raise self.error
+        return f"{symbol}#{len(self.calls)}"
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    settings = {**DEFAULT_FEED_CACHE_SETTINGS, "sources": {"quote": {"ttl": 1, "stale": 0}, "flow": {"ttl": 1, "stale": 10}}}
+    monkeypatch.setattr(feed_cache, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(feed_cache, "_settings", lambda: settings)
+    monkeypatch.setattr(feed_cache, "_entries", {})
+    monkeypatch.setattr(feed_cache, "_in_flight", {})
+    monkeypatch.setattr(feed_cache, "_stats", {})
+    return clock
+
+def in_threads(count, func):
+    results = [None] * count
+
+    def run(index):
+        results[index] = func()
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def test_values_are_served_until_their_ttl(clock):
+    fetcher = Fetcher()
+    quote = cached_feed("quote")(fetcher)
+    assert quote("EURUSDm") == "EURUSDm#1"
+    clock.now += 0.5
+    assert quote("EURUSDm") == "EURUSDm#1" and quote("GBPUSDm") == "GBPUSDm#2"  # Keys are cached separately
+    clock.now += 0.6
+    assert quote("EURUSDm") == "EURUSDm#3"
+    assert quote.uncached("EURUSDm") == "EURUSDm#4"
+    invalidate("quote")
+    assert quote("EURUSDm") == "EURUSDm#5"
+    assert {key: cache_stats()["quote"][key] for key in ("hits", "misses")} == {"hits": 1, "misses": 4}
+
+def test_stale_value_is_served_while_one_refresh_runs(clock):
+    fetcher = Fetcher()
+    flow = cached_feed("flow")(fetcher)
+    assert flow("EURUSDm") == "EURUSDm#1"
+
+    clock.now += 5  # Past the TTL, inside the stale window
+    fetcher.gate = threading.Event()
+    assert [flow("EURUSDm") for _ in range(5)] == ["EURUSDm#1"] * 5  # Returned without waiting for the refresh
+    assert fetcher.entered.wait(10)
+    refresh = feed_cache._in_flight[("flow", (("EURUSDm",), ()))]
+    fetcher.gate.set()
+    refresh.result(10)
+    assert fetcher.calls == ["EURUSDm", "EURUSDm"]  # Exactly one background refresh
+    assert flow("EURUSDm") == "EURUSDm#2"
+    assert cache_stats()["flow"]["stale"] == 5
+
+    clock.now += 20  # Past the stale window: callers wait for a fresh value
+    fetcher.gate = None
+    assert flow("EURUSDm") == "EURUSDm#3"
+
+def test_concurrent_misses_share_one_fetch(clock):
+    fetcher = Fetcher()
+    fetcher.gate = threading.Event()
+    quote = cached_feed("quote")(fetcher)
+    owner, _ = in_threads(1, lambda: quote("EURUSDm"))
+    assert fetcher.entered.wait(10)
+    waiters, results = in_threads(7, lambda: quote("EURUSDm"))
+    wait_until(lambda: cache_stats()["quote"]["coalesced"] == 7)
+    fetcher.gate.set()
+    for thread in owner + waiters:
+        thread.join(10)
+    assert fetcher.calls == ["EURUSDm"] and results == ["EURUSDm#1"] * 7
+    assert cache_stats()["quote"]["misses"] == 1
+
+def test_errors_reach_every_waiter_and_are_not_cached(clock):
+    fetcher = Fetcher(ConnectionError("feed down"))
+    fetcher.gate = threading.Event()
+    quote = cached_feed("quote")(fetcher)
+    errors = []
+
+    def call():
+        try:
+            quote("EURUSDm")
+        except ConnectionError as e:
+            errors.append(str(e))
+    threads, _ = in_threads(1, call)
+    assert fetcher.entered.wait(10)
+    more, _ = in_threads(3, call)
+    wait_until(lambda: cache_stats()["quote"]["coalesced"] == 3)
+    fetcher.gate.set()
+    for thread in threads + more:
+        thread.join(10)
+    assert errors == ["feed down"] * 4 and len(fetcher.calls) == 1
+
+    fetcher.error, fetcher.gate = None, None
+    assert quote("EURUSDm") == "EURUSDm#2"  # Retried on the next call
+
+def test_none_results_are_not_cached(clock):
+    calls = []
+    quote = cached_feed("quote")(lambda symbol: calls.append(symbol))
+    assert quote("EURUSDm") is None and quote("EURUSDm") is None
+    assert calls == ["EURUSDm", "EURUSDm"]
+
+def test_unhashable_arguments_bypass_the_cache(clock):
+    fetcher = Fetcher()
+    quote = cached_feed("quote")(fetcher)
+    assert quote(["EURUSDm"]) == "['EURUSDm']#1"
+    assert quote(["EURUSDm"]) == "['EURUSDm']#2"
+    assert cache_stats()["quote"]["bypass"] == 2
+
+    by_symbol = cached_feed("quote", key=lambda symbols: tuple(symbols))(fetcher)
+    assert by_symbol(["EURUSDm"]) == by_symbol(["EURUSDm"]) == "['EURUSDm']#3"
@@ -0,0 +1,87 @@
+import time
+import numpy as np
+
+from data_feeds.history_cache import (HISTORY_DTYPE, get_history, merge_bars, merge_ranges, missing_ranges, read_store,
+                                      update_history)
+
+DAY = 86400
+START = 1_700_006_400  # A day boundary
+END = START + 10 * DAY
+
+def daily_bars(start, end):
+    times = np.arange(start, end, DAY, dtype=np.int64)
+    bars = np.zeros(len(times), HISTORY_DTYPE)
+    bars["time"], bars["close"] = times, 1.0 + (times - START) / DAY / 100
+    return bars
+
+class Provider:
+    """ Records the requested ranges and serves daily bars (or nothing while empty is set) """
+
+    def __init__(self, empty=False):
+        self.calls, self.empty = [], empty
+
+    def __call__(self, symbol, interval, start, end):
+        self.calls.append((start, end))
+        return np.zeros(0, HISTORY_DTYPE) if self.empty else daily_bars(start, end)
+
+def settings(tmp_path, provider):
+    return {"directory": str(tmp_path / "history"), "provider": provider}
+
+def test_range_arithmetic():
+    assert merge_ranges([[5, 8], [0, 2], [2, 4], [7, 10]]) == [[0, 4], [5, 10]]
+    assert missing_ranges([[0, 4], [5, 10]], 0, 12) == [[4, 5], [10, 12]]
+    assert missing_ranges([[0, 4], [5, 10]], 0, 12, min_gap=2) == [[10, 12]]
+    assert missing_ranges([], 3, 7) == [[3, 7]]
+    assert missing_ranges([[0, 20]], 3, 7) == []
+
+def test_merge_bars_empty_and_overlap():
+    assert len(merge_bars(np.zeros(0, HISTORY_DTYPE), [np.zeros(0, HISTORY_DTYPE)])) == 0
+    stored = daily_bars(START, START + 3 * DAY)
+    update = daily_bars(START + 2 * DAY, START + 4 * DAY)
+    update["close"] = 9.0
+    merged = merge_bars(stored, [update])
+    assert list(merged["time"]) == list(range(START, START + 4 * DAY, DAY))
+    assert list(merged["close"][2:]) == [9.0, 9.0]
+
+def test_empty_download_of_past_range_is_covered(tmp_path):
+    provider = Provider(empty=True)
+    df = get_history("EURUSDm", interval="1d", start=START, end=END, settings=settings(tmp_path, provider))
+    assert df.empty and list(df.columns) == list(HISTORY_DTYPE.names)
+    assert read_store("EURUSDm", "1d", str(tmp_path / "history"))[1] == [[START, END]]
+    get_history("EURUSDm", interval="1d", start=START, end=END, settings=settings(tmp_path, provider))
+    assert provider.calls == [(START, END)]
+
+def test_forming_bar_is_requested_again(tmp_path):
+    today = int(time.time()) // DAY * DAY  # Open time of the still-forming daily bar
+    provider = Provider(empty=True)
+    update_history("EURUSDm", "1d", today - 5 * DAY, today + DAY, settings(tmp_path, provider))
+    assert read_store("EURUSDm", "1d", str(tmp_path / "history"))[1] == [[today - 5 * DAY, today]]
+
+    provider.empty = False
+    bars = update_history("EURUSDm", "1d", today - 5 * DAY, today + DAY, settings(tmp_path, provider))
+    assert provider.calls == [(today - 5 * DAY, today + DAY), (today, today + DAY)]
+    assert list(bars["time"]) == [today]
+
+def test_only_missing_ranges_are_downloaded(tmp_path):
+    provider = Provider()
+    update_history("EURUSDm", "1d", START + 3 * DAY, START + 6 * DAY, settings(tmp_path, provider))
+    bars = update_history("EURUSDm", "1d", START, END, settings(tmp_path, provider))
+    assert provider.calls == [(START + 3 * DAY, START + 6 * DAY), (START, START + 3 * DAY), (START + 6 * DAY, END)]
+    assert list(bars["time"]) == list(range(START, END, DAY))
+    assert read_store("EURUSDm", "1d", str(tmp_path / "history"))[1] == [[START, END]]
+
+    update_history("EURUSDm", "1d", START + DAY, END - DAY, settings(tmp_path, provider))
+    assert len(provider.calls) == 3
+
+def test_history_ending_before_the_range_stays_on_disk(tmp_path):
+    calls = []
+
+    def partial(symbol, interval, start, end):
+        calls.append((start, end))
+        return daily_bars(start, START + 10 * DAY)  # The provider's data ends at day 10
+
+    for _ in range(3):
+        bars = update_history("EURUSDm", "1d", START, START + 14 * DAY, settings(tmp_path, partial))
+    assert calls == [(START, START + 14 * DAY)]
+    assert len(bars) == 10
+    assert read_store("EURUSDm", "1d", str(tmp_path / "history"))[1] == [[START, START + 14 * DAY]]
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import threading
+import subprocess
+
+import logs.logger as logger
+from logs.logger import AsyncLogWriter, DEFAULT_LOG_SETTINGS
+from conftest import REPO_ROOT
+
+def test_debug_messages_are_dropped_before_the_first_batch(monkeypatch):
+    submitted = []
+
+    class Writer:
+        def __init__(self, settings):
+            pass
+
+        def submit(self, record):
+            submitted.append(record)
+
+        def close(self, timeout=5.0):
+            pass
+
+    monkeypatch.setattr(logger, "AsyncLogWriter", Writer)
+    monkeypatch.setattr(logger, "_writer", None)
+    monkeypatch.setattr(logger, "_min_level", logger.LEVELS["debug"])
+    logger.log_message("first call is a debug message", level="debug")  # enable_debug is false in the test config
+    logger.log_message("info", level="info")
+    assert [record[2] for record in submitted] == ["info"]
+
+def test_flush_marker_bypasses_the_drop_policy(tmp_path):
+    for policy in ("drop_newest", "drop_oldest"):
+        writer = AsyncLogWriter({**DEFAULT_LOG_SETTINGS, "console": False, "queue_size": 2, "drop_policy": policy,
+                                 "log_file": str(tmp_path / f"{policy}.txt"), "flush_interval": 0.0})
+        gate = threading.Event()
+        writer._write = lambda records, write=writer._write: (gate.wait(), write(records))
+        for index in range(5):
+            writer.submit((time.time(), "info", f"record {index}", {}))  # Queue fills up while the writer is blocked
+        threading.Timer(0.2, gate.set).start()
+        started = time.monotonic()
+        assert writer.flush(timeout=5.0) is True
+        assert time.monotonic() - started < 4.0
+        writer.close()
+
+def test_flush_reports_a_timeout(tmp_path, capsys):
+    writer = AsyncLogWriter({**DEFAULT_LOG_SETTINGS, "console": False, "log_file": str(tmp_path / "log.txt")})
+    gate = threading.Event()
+    writer._write = lambda records, write=writer._write: (gate.wait(), write(records))
+    writer.submit((time.time(), "info", "stuck", {}))
+    assert writer.flush(timeout=0.2) is False
+    assert "timed out" in capsys.readouterr().err
+    gate.set()
+    writer.close()
+
+def test_invalid_config_at_startup_exits_instead_of_hanging(tmp_path):
+    # get_config() logs the error while holding the config lock; the logger's first call subscribes to reloads
+    config = tmp_path / "config.json"
+    config.write_text('{"batch_size": 0}')
+    result = subprocess.run([sys.executable, "-c", "from config_manager import get_config; get_config()"],
+                            cwd=tmp_path, env={**os.environ, "TRADING_BOT_CONFIG": str(config), "PYTHONPATH": REPO_ROOT},
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 1
+    assert "'batch_size' must be a positive integer" in (tmp_path / "logs" / "ai_logs.txt").read_text(encoding="utf-8")
@@ -0,0 +1,44 @@
+import pytest
+
+from monitoring.memory import MemoryTracker
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = MemoryTracker({"warmup_iterations": 2, "window": 3, "traced_growth_mb": 0.5, "rss_growth_mb": 1024,
+                             "object_growth": 10 ** 9, "track_objects": False, "report_file": str(tmp_path / "memory.jsonl")})
+    yield tracker
+    tracker.stop()
+
+def run(tracker, iterations, leak=None):
+    """ Iteration numbers at which an alert was raised """
+    alerts = []
+    for _ in range(iterations):
+        if leak is not None:
+            leak.append([0] * 262144)  # ~2 MB that is never released
+        before = tracker.alerts
+        tracker.check()
+        if tracker.alerts > before:
+            alerts.append(tracker.iteration)
+    return alerts
+
+def test_a_leak_raises_one_alert_per_window_after_the_warmup(tracker, tmp_path):
+    leak = []
+    # Warm-up iterations 1-2 never count; each full window of 3 post-warm-up snapshots alerts once
+    assert run(tracker, 11, leak) == [5, 8, 11]
+    leak.append([0] * 262144)
+    sample = tracker.check()
+    assert sample["top_sites"] and sample["top_sites"][0]["site"].startswith(__file__)
+    assert len((tmp_path / "memory.jsonl").read_text().splitlines()) == 12
+
+def test_stable_memory_raises_no_alert(tracker):
+    kept = [[0] * 262144]  # Allocated once, before tracking matters
+    assert run(tracker, 12) == []
+    assert tracker.alerts == 0 and len(kept) == 1
+
+def test_interval_skips_iterations(tmp_path):
+    tracker = MemoryTracker({"interval": 3, "track_objects": False, "report_file": None})
+    try:
+        taken = [tracker.check() is not None for _ in range(7)]
+        assert taken == [True, False, False, True, False, False, True]
+    finally:
+        tracker.stop()
@@ -0,0 +1,91 @@
+import re
+import pytest
+
+from monitoring import metrics
+from monitoring.metrics import BUCKETS, LatencyHistogram, increment, observe, render_prometheus, span
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+
+def parse(text):
+    """ {metric name: {frozenset of labels: value}} and the # TYPE of every metric """
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE"):
+            _, _, name, kind = line.split()
+            types[name] = kind
+            continue
+        if line.startswith("#"):
+            continue
+        match = re.fullmatch(r'(\w+)\{(.*)\} (\S+)', line)
+        assert match, line
+        name, labels, value = match.groups()
+        labels = frozenset(re.findall(r'(\w+)="([^"]*)"', labels))
+        samples.setdefault(name, {})[labels] = float(value)
+    return samples, types
+
+def test_bucket_boundaries_are_inclusive_upper_bounds():
+    histogram = LatencyHistogram()
+    for seconds in (0.0, BUCKETS[0], BUCKETS[0] * 1.001, BUCKETS[5], BUCKETS[-1], BUCKETS[-1] * 1.001, 1e9):
+        histogram.observe(seconds)
+    assert histogram.counts[0] == 2               # 0 and exactly the first bound
+    assert histogram.counts[1] == 1               # Just above it
+    assert histogram.counts[5] == 1 and histogram.counts[len(BUCKETS) - 1] == 1
+    assert histogram.counts[-1] == 2              # Beyond the last bound: +Inf
+    assert histogram.count == 7 and histogram.max == 1e9
+
+def test_quantiles_interpolate_inside_the_bucket_and_never_exceed_the_max():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) == 0.0
+    for _ in range(100):
+        histogram.observe(BUCKETS[3] * 0.9)  # All inside (BUCKETS[2], BUCKETS[3]]
+    assert BUCKETS[2] <= histogram.quantile(0.5) <= BUCKETS[3] * 0.9
+    assert histogram.quantile(0.99) == pytest.approx(BUCKETS[3] * 0.9)
+    assert histogram.snapshot()["count"] == 100
+
+def test_prometheus_text_output(store):
+    for seconds in (BUCKETS[0], BUCKETS[2], BUCKETS[2], 1e6):
+        observe("model_predict", seconds, "EURUSDm")
+    observe("fetch", BUCKETS[1])
+    increment("decisions", "EURUSDm", "BUY")
+    increment("decisions", "EURUSDm", "BUY")
+    increment("decisions", "GBPUSDm")
+    with pytest.raises(ValueError):
+        with span("decision_total", "EURUSDm"):
+            raise ValueError("boom")
+
+    text = render_prometheus()
+    assert text.endswith("\n")
+    samples, types = parse(text)
+    name = "trading_bot_stage_latency_seconds"
+    assert types == {name: "histogram", f"{name}_quantile": "gauge", "trading_bot_decisions_total": "counter",
+                     "trading_bot_stage_errors_total": "counter"}
+
+    buckets = {dict(labels)["le"]: value for labels, value in samples[f"{name}_bucket"].items()
+               if ("stage", "model_predict") in labels}
+    assert len(buckets) == len(BUCKETS) + 1
+    assert buckets[f"{BUCKETS[0]:.6g}"] == 1 and buckets[f"{BUCKETS[1]:.6g}"] == 1 and buckets[f"{BUCKETS[2]:.6g}"] == 3
+    assert buckets[f"{BUCKETS[-1]:.6g}"] == 3 and buckets["+Inf"] == 4  # Cumulative
+    values = [buckets[f"{upper:.6g}"] for upper in BUCKETS] + [buckets["+Inf"]]
+    assert values == sorted(values)
+
+    predict = frozenset({("stage", "model_predict"), ("symbol", "EURUSDm")})
+    assert samples[f"{name}_count"][predict] == 4
+    assert samples[f"{name}_sum"][predict] == pytest.approx(BUCKETS[0] + 2 * BUCKETS[2] + 1e6)
+    assert samples[f"{name}_count"][frozenset({("stage", "fetch")})] == 1  # Empty symbol label left out
+    assert samples[f"{name}_quantile"][predict | {("quantile", "0.5")}] <= BUCKETS[2]
+
+    assert samples["trading_bot_decisions_total"] == {frozenset({("symbol", "EURUSDm"), ("outcome", "BUY")}): 2,
+                                                      frozenset({("symbol", "GBPUSDm")}): 1}
+    assert samples["trading_bot_stage_errors_total"] == {frozenset({("symbol", "EURUSDm"), ("outcome", "decision_total")}): 1}
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+    with span("decision_total", "EURUSDm"):
+        increment("decisions", "EURUSDm", "BUY")
+    assert metrics.snapshot()["stages"] == [] and metrics.snapshot()["counters"] == []
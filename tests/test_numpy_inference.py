@@ -0,0 +1,45 @@
+import sys
+import subprocess
+import numpy as np
+import pytest
+
+from ai_core.numpy_inference import NumpyModel, export_model_weights
+from conftest import REPO_ROOT
+
+@pytest.fixture(scope="module")
+def exported_model(tmp_path_factory):
+    tf = pytest.importorskip("tensorflow")
+    from ai_core.ai_learning import build_lstm_model
+
+    model = build_lstm_model()
+    path = str(tmp_path_factory.mktemp("models") / "model.npz")
+    export_model_weights(model, path)
+    return model, path
+
+def test_numpy_model_matches_keras(exported_model):
+    model, path = exported_model
+    X = np.random.default_rng(0).random((64, 1, 5), dtype=np.float32)
+    np.testing.assert_allclose(NumpyModel.from_file(path).predict(X), model.predict(X, verbose=0), atol=1e-5)
+
+def test_live_confidence_uses_either_backend(exported_model):
+    from ai_trading_bot import predict_confidence
+
+    model, path = exported_model
+    row = np.random.default_rng(1).random((1, 1, 5), dtype=np.float32)
+    keras_confidence = predict_confidence(model, row)
+    numpy_confidence = predict_confidence(NumpyModel.from_file(path), row)
+    assert isinstance(numpy_confidence, float)
+    assert numpy_confidence == pytest.approx(keras_confidence, abs=1e-5)
+
+def test_numpy_backend_never_imports_tensorflow(exported_model):
+    _, path = exported_model
+    script = (
+        "import sys, numpy as np\n"
+        "from ai_trading_bot import predict_confidence\n"
+        "from ai_core.numpy_inference import NumpyModel\n"
+        f"confidence = predict_confidence(NumpyModel.from_file({path!r}), np.zeros((1, 1, 5), np.float32))\n"
+        "assert 0.0 <= confidence <= 1.0\n"
+        "assert 'tensorflow' not in sys.modules, 'tensorflow was imported'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
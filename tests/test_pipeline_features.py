@@ -0,0 +1,47 @@
+import os
+import time
+import threading
+import numpy as np
+import pytest
+
+from ai_core.features import MODEL_FEATURES, model_input
+from benchmarks.fake_mt5 import uninstall
+from data_feeds.feed_cache import invalidate
+from pipeline.ring_buffer import RingBuffer, TICK_DTYPE
+from pipeline.workers import DEFAULT_PIPELINE_SETTINGS, ingest_worker
+
+def test_model_input_layout():
+    row = model_input(0.1, -0.2, 0.3, 0.0004, 1.5)
+    assert row.shape == (1, 1, len(MODEL_FEATURES)) and row.dtype == np.float32
+    np.testing.assert_allclose(row[0, 0], [0.1, -0.2, 0.3, 0.0004, 1.5], rtol=1e-6)
+
+def test_ingest_ticks_carry_the_live_volatility_feature():
+    pytest.importorskip("pandas")
+    from maths_engine.maths import symbol_volatility
+
+    symbols = ["EURUSDm", "USDJPYm"]
+    ring = RingBuffer.create(f"tbtest{os.getpid()}_ticks", TICK_DTYPE, 1024)
+    spec = {"settings": {**DEFAULT_PIPELINE_SETTINGS, "tick_source": "synthetic", "poll_interval": 0.01, "volatility_interval": 3600},
+            "symbols": symbols, "rings": {"ticks": (ring.shm.name, 1024)}}
+    stop = threading.Event()
+    invalidate()
+    worker = threading.Thread(target=ingest_worker, args=(spec, stop), daemon=True)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 30
+        ticks = ring.pop_many()
+        while time.monotonic() < deadline and not (len(ticks) and (ticks["market_volatility"] > 0).sum() >= len(symbols)):
+            time.sleep(0.05)
+            ticks = np.concatenate([ticks, ring.pop_many()])
+        stop.set()
+        worker.join(10)
+
+        for symbol in symbols:
+            latest = ticks[ticks["symbol"] == symbol.encode()][-1]
+            expected = symbol_volatility.uncached(symbol)  # Same FakeMT5 M1 history the worker used
+            assert expected and latest["market_volatility"] == pytest.approx(expected)
+    finally:
+        stop.set()
+        uninstall()
+        invalidate()
+        ring.close()
@@ -0,0 +1,78 @@
+import os
+import numpy as np
+
+from ai_core.prediction_cache import array_digest, cache_key, cached_predictions
+from ai_core.scaler_store import fit_minmax
+
+class SumModel:
+    """ Stand-in model: one output per row, the sum of its scaled features """
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_on_batch(self, batch):
+        self.batches.append(len(batch))
+        return batch.sum(axis=(1, 2))[:, None]
+
+def features(rows=50, seed=0):
+    return np.random.default_rng(seed).normal(1.1, 0.01, (rows, 5)).astype(np.float32)
+
+def write_model(path, payload, mtime):
+    path.write_bytes(payload)
+    os.utime(path, ns=(mtime, mtime))
+    return str(path)
+
+def test_cache_key_tracks_model_scaler_and_data(tmp_path):
+    X = features()
+    scaler = fit_minmax(X)
+    model_file = write_model(tmp_path / "model.keras", b"weights v1", 1_000_000_000)
+    key = cache_key(model_file, scaler, X)
+    assert key == cache_key(model_file, scaler, X.copy())
+
+    assert cache_key(model_file, scaler, X[:-1]) != key
+    changed = X.copy()
+    changed[10, 2] += 1e-3
+    assert cache_key(model_file, scaler, changed) != key
+    assert cache_key(model_file, scaler, X.astype(np.float64)) != key  # Same values, different dtype
+    assert cache_key(model_file, fit_minmax(X[:40]), X) != key
+
+    retrained = write_model(tmp_path / "model.keras", b"weights v2", 2_000_000_000)
+    assert cache_key(retrained, scaler, X) != key
+
+def test_array_digest_ignores_memory_layout():
+    X = np.asfortranarray(features())
+    assert array_digest(X) == array_digest(np.ascontiguousarray(X))
+    assert array_digest(X[::2]) == array_digest(X[::2].copy())
+    assert array_digest(X.reshape(-1)) != array_digest(X)  # Shape is part of the key
+
+def test_miss_then_memory_mapped_hit(tmp_path):
+    X = features(rows=50)
+    scaler = fit_minmax(X)
+    model_file = write_model(tmp_path / "model.keras", b"weights", 1_000_000_000)
+    settings = {"directory": str(tmp_path / "predictions"), "batch_size": 16}
+    model, loads = SumModel(), []
+
+    def load_model():
+        loads.append(1)
+        return model
+
+    first = cached_predictions("EURUSDm", "backtest", model_file, X, scaler, load_model, settings)
+    assert model.batches == [16, 16, 16, 2]
+    expected = ((X * scaler[1] + scaler[0]).astype(np.float32)).sum(axis=1)
+    np.testing.assert_allclose(first, expected, rtol=1e-5)
+
+    second = cached_predictions("EURUSDm", "backtest", model_file, X, scaler, load_model, settings)
+    assert len(loads) == 1 and isinstance(second, np.memmap)
+    np.testing.assert_array_equal(second, first)
+
+    uncached = cached_predictions("EURUSDm", "backtest", model_file, X, scaler, load_model, {**settings, "enabled": False})
+    np.testing.assert_array_equal(uncached, first)
+    assert cached_predictions("EURUSDm", "backtest", model_file, X[:3], scaler, lambda: None, settings) is None
+
+def test_old_files_are_pruned(tmp_path):
+    scaler = fit_minmax(features())
+    model_file = write_model(tmp_path / "model.keras", b"weights", 1_000_000_000)
+    settings = {"directory": str(tmp_path / "predictions"), "max_entries_per_symbol": 2}
+    for seed in range(4):
+        cached_predictions("EURUSDm", "backtest", model_file, features(seed=seed), scaler, SumModel, settings)
+    assert len(os.listdir(tmp_path / "predictions" / "backtest" / "EURUSDm")) == 2
@@ -0,0 +1,71 @@
+import pickle
+import numpy as np
+import pytest
+
+from monitoring.recorder import (RecordWriter, RecordedError, ReplayError, read_records, recorded, record_event,
+                                 start_recording, stop_recording, start_replay, stop_replay, LEGACY_MAGIC, MAGIC)
+
+def test_values_round_trip(tmp_path):
+    pd = pytest.importorskip("pandas")
+    rates = np.zeros(3, dtype=[("time", "<i8"), ("close", "<f8"), ("tick_volume", "<u8")])
+    rates["time"], rates["close"] = [60, 120, 180], [1.1, 1.2, 1.3]
+    frame = pd.DataFrame(rates)
+    values = [None, True, 3, 1.5, "EURUSDm", np.float64(0.25), [1, "a"], ("EURUSDm",), {"best_bid": 1.1, "buy_volume": 5.0},
+              {("EURUSDm", 1): 2}, np.arange(4, dtype=np.int32), rates, np.array(["2024-01-01"], dtype="datetime64[s]")]
+
+    writer = RecordWriter(str(tmp_path / "log.tbr"))
+    for index, value in enumerate(values):
+        writer.append((index, "source", (("EURUSDm",), ()), "value", value))
+    writer.append((99, "price_data", "EURUSDm", "value", frame))
+    writer.close()
+
+    records = list(read_records(str(tmp_path / "log.tbr")))
+    assert all(record[2] == (("EURUSDm",), ()) for record in records[:-1])
+    for value, record in zip(values, records):
+        if isinstance(value, np.ndarray):
+            assert record[4].dtype == value.dtype
+            np.testing.assert_array_equal(record[4], value)
+        elif isinstance(value, np.generic):
+            assert record[4] == value.item()
+        else:
+            assert record[4] == value and type(record[4]) is type(value)
+    pd.testing.assert_frame_equal(records[-1][4], frame)
+
+def test_replay_serves_recorded_inputs_and_errors(workspace):
+    path = start_recording("logs/recordings/test.tbr")
+    assert recorded("price", "EURUSDm", lambda: 1.2345) == 1.2345
+    with pytest.raises(ConnectionError):
+        recorded("news", "EURUSDm", lambda: (_ for _ in ()).throw(ConnectionError("offline")))
+
+    class FeedError(Exception):
+        pass
+    with pytest.raises(FeedError):
+        recorded("order_flow", "EURUSDm", lambda: (_ for _ in ()).throw(FeedError("bad book")))
+    record_event("decision", "EURUSDm", "BUY")
+    stop_recording()
+
+    events = start_replay(path)
+    try:
+        assert [event[1:] for event in events] == [("decision", "EURUSDm", "event", "BUY")]
+        assert recorded("price", "EURUSDm", lambda: pytest.fail("live call during replay")) == 1.2345
+        with pytest.raises(ConnectionError, match="offline"):
+            recorded("news", "EURUSDm", lambda: None)
+        with pytest.raises(RecordedError, match="FeedError: bad book"):
+            recorded("order_flow", "EURUSDm", lambda: None)
+        with pytest.raises(ReplayError):
+            recorded("price", "EURUSDm", lambda: None)
+    finally:
+        stop_replay()
+
+class Exploit:
+    def __reduce__(self):
+        return (pytest.fail, ("pickle payload was executed",))
+
+def test_legacy_pickle_logs_are_refused(tmp_path):
+    import struct, zlib
+    path = tmp_path / "old.tbr"
+    block = zlib.compress(pickle.dumps([(0, "price", "EURUSDm", "value", Exploit())]))
+    path.write_bytes(LEGACY_MAGIC + struct.pack("<I", len(block)) + block)
+    with pytest.raises(ValueError, match="pickle"):
+        list(read_records(str(path)))
+    assert MAGIC != LEGACY_MAGIC
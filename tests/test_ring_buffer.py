@@ -0,0 +1,62 @@
+import os
+import multiprocessing as mp
+import numpy as np
+import pytest
+
+from pipeline.ring_buffer import ORDER_DTYPE, TICK_DTYPE, RingBuffer
+
+@pytest.fixture
+def ring_name():
+    return f"tb-test-{os.getpid()}-{np.random.randint(1 << 30)}"
+
+def tick(seq):
+    record = np.zeros((), TICK_DTYPE)
+    record["seq"], record["symbol"], record["bid"] = seq, b"EURUSDm", 1.1 + seq / 1e4
+    return record
+
+def test_capacity_must_be_a_power_of_two(ring_name):
+    with pytest.raises(ValueError):
+        RingBuffer.create(ring_name, TICK_DTYPE, 6)
+
+def test_push_pop_and_full_buffer(ring_name):
+    ring = RingBuffer.create(ring_name, TICK_DTYPE, 4)
+    try:
+        assert ring.pop() is None and len(ring.pop_many()) == 0
+        assert all(ring.push(tick(seq)) for seq in range(4))
+        assert not ring.push(tick(4))  # Full: the producer decides what to drop
+        assert ring.pop()["seq"] == 0
+        assert ring.push(tick(4)) and ring.push(tick(5)) is False
+        assert list(ring.pop_many(2)["seq"]) == [1, 2]
+        assert ring.push(tick(5)) and ring.push(tick(6))
+        records = ring.pop_many()  # Wraps around the end of the slot array
+        assert list(records["seq"]) == [3, 4, 5, 6] and records["symbol"][0] == b"EURUSDm"
+        assert len(ring) == 0
+    finally:
+        ring.close()
+
+def _consume(name, count, results):
+    ring = RingBuffer.attach(name, ORDER_DTYPE, 8)
+    received = []
+    while len(received) < count:
+        received.extend(ring.pop_many()["seq"].tolist())
+    ring.close()
+    results.put(received)
+
+def test_records_cross_processes_in_order(ring_name):
+    ring = RingBuffer.create(ring_name, ORDER_DTYPE, 8)
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    consumer = ctx.Process(target=_consume, args=(ring_name, 500, results))
+    consumer.start()
+    try:
+        order = np.zeros((), ORDER_DTYPE)
+        for seq in range(500):
+            order["seq"] = seq
+            while not ring.push(order):
+                pass
+        assert results.get(timeout=30) == list(range(500))
+        consumer.join(10)
+    finally:
+        if consumer.is_alive():
+            consumer.terminate()
+        ring.close()
@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import pandas as pd
+
+from ai_core import backtest_ai
+from ai_core.model_registry import LEGACY_MODEL_FILES, model_path
+from ai_core.scaler_store import (GLOBAL_SYMBOL, STAGING_VERSION, fit_minmax, load_scaler, migrate_legacy_scalers,
+                                  save_scaler, scaler_path, transform)
+
+FEATURES = ["time", "open", "high", "low", "close", "volume", "rsi", "macd", "macd_signal", "boll_upper", "boll_lower"]
+
+def test_round_trip_matches_sklearn():
+    from sklearn.preprocessing import MinMaxScaler
+
+    X = np.random.default_rng(0).normal(size=(50, 4))
+    X[:, 2] = 3.0  # Constant column
+    min_, scale_ = fit_minmax(X)
+    np.testing.assert_allclose(transform(X, min_, scale_, np.float64), MinMaxScaler().fit_transform(X))
+    assert scaler_path("EURUSDm", "past_data", 3).endswith("past_data_EURUSDm_v3.scl")
+    assert scaler_path("EURUSDm", "past_data", STAGING_VERSION).endswith("past_data_EURUSDm_staging.scl")
+
+def test_legacy_past_data_scaler_serves_backtests_of_every_symbol(workspace):
+    from sklearn.preprocessing import MinMaxScaler
+
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.uniform(1, 2, (30, len(FEATURES))), columns=FEATURES)
+    legacy = MinMaxScaler().fit(df.to_numpy())
+    os.makedirs("ai_models")
+    np.save("ai_models/scaler_past.npy", legacy, allow_pickle=True)
+    open(LEGACY_MODEL_FILES[(GLOBAL_SYMBOL, "past_data")], "w").close()  # Legacy single-file model
+
+    written = migrate_legacy_scalers()
+    assert written == [scaler_path(GLOBAL_SYMBOL, "past_data", 1), scaler_path(GLOBAL_SYMBOL, "past_data", STAGING_VERSION)]
+    for version in (1, STAGING_VERSION):
+        np.testing.assert_array_equal(load_scaler(GLOBAL_SYMBOL, "past_data", version)[1], legacy.scale_)
+
+    # No model of its own yet: the symbol uses the shared model and its scaler
+    assert backtest_ai.model_symbol("EURUSDm") == GLOBAL_SYMBOL
+    X, (min_, scale_) = backtest_ai.backtest_features(df, GLOBAL_SYMBOL)
+    np.testing.assert_allclose(transform(X, min_, scale_, np.float64), legacy.transform(df.to_numpy()), atol=1e-6)
+    assert backtest_ai.preprocess_backtest_data(df, "EURUSDm").shape == (30, 1, len(FEATURES))
+
+    # Once the symbol publishes its own model, its own scaler is used
+    os.makedirs(os.path.dirname(model_path("EURUSDm", "past_data")))
+    open(model_path("EURUSDm", "past_data"), "w").close()
+    save_scaler("EURUSDm", "past_data", *fit_minmax(df.to_numpy() * 2))
+    assert backtest_ai.model_symbol("EURUSDm") == "EURUSDm"
+    assert backtest_ai.model_symbol("GBPUSDm") == GLOBAL_SYMBOL
@@ -0,0 +1,62 @@
+import time
+import threading
+import pytest
+
+from trade_execution.scheduler import BarScheduler, next_bar_close, timeframe_seconds
+
+def test_timeframes_and_bar_boundaries():
+    assert timeframe_seconds("m5") == 300
+    assert timeframe_seconds(0.5) == 0.5
+    with pytest.raises(ValueError):
+        timeframe_seconds("M7")
+    assert next_bar_close(599.0, 300) == 600
+    assert next_bar_close(600.0, 300) == 900
+    assert next_bar_close(600.5, 300, close_delay=1.0) == 601.0
+
+def test_first_tick_runs_jobs_and_hooks():
+    scheduler = BarScheduler(0.05, close_delay=0.0, max_workers=2)
+    seen = []
+    scheduler.run(lambda: {"EURUSDm": lambda: "BUY", "USDJPYm": lambda: None},
+                  on_tick=lambda: seen.append("tick"), after_tick=seen.append, max_ticks=1)
+    assert seen == ["tick", {"EURUSDm": "BUY", "USDJPYm": None}]
+    assert scheduler.stats["ticks"] == 1 and scheduler.stats["jobs_started"] == 2
+
+def test_failing_hooks_and_jobs_do_not_stop_the_loop():
+    scheduler = BarScheduler(0.05, close_delay=0.0, max_workers=2)
+    results = []
+
+    def on_tick():
+        raise RuntimeError("on_tick failed")
+
+    def after_tick(tick_results):
+        results.append(tick_results)
+        raise NameError("after_tick failed")
+
+    def failing_job():
+        raise ValueError("job failed")
+
+    scheduler.run(lambda: {"ok": lambda: 1, "bad": failing_job}, on_tick=on_tick, after_tick=after_tick, max_ticks=3)
+    assert scheduler.stats["ticks"] == 3
+    assert scheduler.stats["hook_errors"] == 6
+    assert scheduler.stats["job_errors"] == 3
+    assert results == [{"ok": 1}] * 3
+
+def test_stop_event_ends_the_loop():
+    scheduler = BarScheduler(0.05, close_delay=0.0)
+    stop = threading.Event()
+    scheduler.run(lambda: {"stop": stop.set}, stop_event=stop, max_ticks=100)
+    assert scheduler.stats["ticks"] == 1
+
+def test_job_runtime_excludes_the_wait_since_bar_close(monkeypatch):
+    from monitoring import metrics
+
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+    scheduler = BarScheduler(60, close_delay=0.0)
+    bar_close = time.time() - 5.0  # Job started 5 s after its bar closed (queueing, close_delay)
+    scheduler._run_job("EURUSDm", lambda: time.sleep(0.05), bar_close, bar_close + 60)
+    stages = {stage["stage"]: stage for stage in metrics.snapshot()["stages"]}
+    assert 0.05 <= stages["scheduler_job_runtime"]["max"] < 1.0
+    assert stages["scheduler_job_latency"]["max"] >= 5.0
+    scheduler.executor.shutdown()
@@ -0,0 +1,140 @@
+import sys
+import numpy as np
+import pytest
+
+import ai_trading_bot
+from backtesting.event_backtest import DEFAULT_SIMULATION_SETTINGS, run_simulation
+from backtesting.simulated_broker import CONTRACT_SIZE, DEFAULT_BROKER_SETTINGS, SimulatedBroker
+from data_feeds.synthetic_market import BAR_DTYPE
+
+def make_bars(rows, spread=0):
+    """ One-minute bars from (open, high, low, close) rows """
+    bars = np.zeros(len(rows), BAR_DTYPE)
+    bars["time"] = 1_700_000_000 + 60 * np.arange(len(rows))
+    for field, values in zip(("open", "high", "low", "close"), zip(*rows)):
+        bars[field] = values
+    bars["tick_volume"] = 100
+    bars["spread"] = spread
+    return bars
+
+def broker_at(rows, symbol="EURUSDm", spread=0, **settings):
+    broker = SimulatedBroker({symbol: make_bars(rows, spread)}, balance=10000.0, settings=settings)
+    broker.advance(symbol, 0)
+    return broker
+
+def open_position(broker, action="BUY", symbol="EURUSDm", lot=0.1, sl=0.0010, tp=0.0020, trail=0):
+    return broker.execute({"action": action, "symbol": symbol, "lot": lot, "sl": sl, "tp": tp, "trail": trail})
+
+def exits_at(broker, index, symbol="EURUSDm"):
+    broker.advance(symbol, index)
+    return broker.check_exits(symbol)
+
+# ✅ Stops & Targets
+def test_gaps_through_the_stop_or_target_fill_at_the_open():
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1000), (1.0980, 1.0985, 1.0970, 1.0975)])
+    position = open_position(broker)
+    assert position["stop_loss"] == pytest.approx(1.0990) and position["take_profit"] == pytest.approx(1.1020)
+    [closed] = exits_at(broker, 1)
+    assert closed["reason"] == "stop_loss" and closed["exit_price"] == pytest.approx(1.0980)  # Not the 1.0990 stop
+    assert closed["profit"] == pytest.approx(-0.0020 * 0.1 * CONTRACT_SIZE)
+
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1000), (1.0970, 1.0975, 1.0960, 1.0965)])
+    open_position(broker, "SELL")
+    [closed] = exits_at(broker, 1)
+    assert closed["reason"] == "take_profit" and closed["exit_price"] == pytest.approx(1.0970)  # Better than the 1.0980 target
+    assert closed["profit"] == pytest.approx(0.0030 * 0.1 * CONTRACT_SIZE)
+    assert broker.account["balance"] == pytest.approx(10000.0 + closed["profit"])
+
+@pytest.mark.parametrize("policy, reason, price", [("stop", "stop_loss", 1.0990), ("target", "take_profit", 1.1020)])
+def test_same_bar_policy_decides_when_stop_and_target_are_both_hit(policy, reason, price):
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1000), (1.1000, 1.1025, 1.0985, 1.1000)], same_bar_policy=policy)
+    open_position(broker)
+    [closed] = exits_at(broker, 1)
+    assert closed["reason"] == reason and closed["exit_price"] == pytest.approx(price)
+
+def test_trailing_stop_never_loosens():
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1000),
+                        (1.1010, 1.1030, 1.1005, 1.1025),   # New high: stop trails to 1.1020
+                        (1.1024, 1.1025, 1.1021, 1.1022),   # Lower high: stop stays
+                        (1.1022, 1.1023, 1.1015, 1.1016)])  # Trailed stop hit
+    position = open_position(broker, tp=0.0100, trail=1)
+    assert exits_at(broker, 1) == [] and position["stop_loss"] == pytest.approx(1.1020)
+    assert exits_at(broker, 2) == [] and position["stop_loss"] == pytest.approx(1.1020)
+    [closed] = exits_at(broker, 3)
+    assert closed["reason"] == "trailing_stop" and closed["exit_price"] == pytest.approx(1.1020)
+
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1000), (1.0995, 1.0996, 1.0992, 1.0993)])
+    position = open_position(broker, tp=0.0100, trail=1)
+    assert exits_at(broker, 1) == [] and position["stop_loss"] == pytest.approx(1.0990)  # Not below the initial stop
+
+# ✅ Instructions & Fills
+def test_instructions_are_parsed_and_filled_at_the_open_with_the_spread():
+    broker = broker_at([(1.1000, 1.1005, 1.0995, 1.1002), (1.1004, 1.1006, 1.1001, 1.1005)], spread=10)
+    for name, value in (("Trade_Action", "BUY"), ("Trade_Symbol", "EURUSDm"), ("Trade_Lot", 0.2), ("Trade_SL", 0),
+                        ("Trade_TP", 0), ("Trade_Trail", 0), ("Other", 1)):
+        broker.global_variable_set(name, value)
+    [instruction] = broker.take_instructions()
+    assert instruction == {"action": "BUY", "symbol": "EURUSDm", "lot": 0.2, "sl": 0, "tp": 0, "trail": 0}
+    assert broker.take_instructions() == []
+
+    position = broker.execute(instruction)
+    point = 0.00001
+    assert position["entry_price"] == pytest.approx(1.1000 + 5 * point)  # Ask at the open
+    stop_points = DEFAULT_BROKER_SETTINGS["stop_loss_points"] + DEFAULT_BROKER_SETTINGS["spread_adjustment_points"]
+    assert position["stop_loss"] == pytest.approx(position["entry_price"] - stop_points * point)
+    assert position["take_profit"] == pytest.approx(position["entry_price"] + DEFAULT_BROKER_SETTINGS["take_profit_points"] * point)
+    assert broker.positions_total() == 1 and broker.account["margin"] == pytest.approx(200.0)
+
+    assert open_position(broker) is None and open_position(broker, "SELL") is None  # One position per symbol
+    assert open_position(broker, symbol="GBPUSDm") is None  # No history
+    assert broker.positions_total() == 1
+
+    ticket = position["ticket"]
+    assert broker.execute({"action": "MODIFY", "ticket": ticket, "sl": 0.0005, "tp": 0})["stop_loss"] == \
+        pytest.approx(position["entry_price"] - 0.0005)
+    assert broker.execute({"action": "CLOSE", "ticket": 99}) is None
+    broker.advance("EURUSDm", 1)
+    closed = broker.execute({"action": "CLOSE", "ticket": ticket})
+    assert closed["reason"] == "close" and closed["exit_price"] == pytest.approx(1.1004 - 5 * point)  # Bid at the open
+    assert broker.positions_total() == 0 and list(broker.trades.to_array()["action"]) == [b"BUY", b"SELL"]
+
+def test_usd_base_pairs_convert_the_profit_into_account_currency():
+    broker = broker_at([(150.000, 150.100, 149.900, 150.000), (151.500, 151.600, 151.400, 151.500)], symbol="USDJPYm")
+    open_position(broker, symbol="USDJPYm", sl=1.0, tp=3.0)
+    broker.advance("USDJPYm", 1)
+    closed = broker.execute({"action": "CLOSE", "ticket": 1})
+    assert closed["profit"] == pytest.approx(1.5 * 0.1 * CONTRACT_SIZE / 151.5)  # Yen P&L at the exit rate
+    assert broker.account["balance"] == pytest.approx(10000.0 + 1.5 * 0.1 * CONTRACT_SIZE / 151.5)
+
+# ✅ Event Loop
+def test_event_loop_fills_decisions_at_the_next_open(monkeypatch):
+    bars = make_bars([(1.1000, 1.1005, 1.0995, 1.1000)] * 3 +
+                     [(1.1010, 1.1015, 1.1005, 1.1012),    # Order filled at this open
+                      (1.1020, 1.1040, 1.1015, 1.1035),    # Target hit
+                      (1.1035, 1.1040, 1.1030, 1.1035)])
+    seen = []
+
+    def decide(symbol):
+        mt5 = sys.modules["MetaTrader5"]
+        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 100)
+        seen.append(int(rates["time"][-1]))
+        if len(seen) == 1:
+            for name, value in (("Trade_Action", "BUY"), ("Trade_Symbol", symbol), ("Trade_Lot", 0.1),
+                                ("Trade_SL", 0.0010), ("Trade_TP", 0.0020), ("Trade_Trail", 0)):
+                mt5.global_variable_set(name, value)
+            return "BUY"
+        return None
+    monkeypatch.setattr(ai_trading_bot, "run_symbol_decision", decide)
+
+    settings = {**DEFAULT_SIMULATION_SETTINGS, "warmup_bars": 2, "initial_balance": 10000.0}
+    result = run_simulation("EURUSDm", bars, settings)
+    assert seen == list(bars["time"][2:])  # Every decision sees rates up to its own bar only
+    assert result["bars"] == 4 and result["decisions"] == {"BUY": 1, "NONE": 3}
+    assert (result["orders"], result["filled"], result["rejected"], result["closed_trades"]) == (1, 1, 0, 1)
+    assert result["exit_reasons"] == {"take_profit": 1} and result["open_positions"] == 0
+
+    trades = result["trades"]
+    assert list(trades["time"]) == [bars["time"][3], bars["time"][4]]
+    assert trades["market_price"][0] == pytest.approx(1.1010) and trades["profit"][1] == pytest.approx(20.0)
+    np.testing.assert_allclose(result["equity"], [10000.0, 10000.0 + 0.0002 * 0.1 * CONTRACT_SIZE, 10020.0, 10020.0])
+    assert "MetaTrader5" not in sys.modules or not isinstance(sys.modules["MetaTrader5"], SimulatedBroker)
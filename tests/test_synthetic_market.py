@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from ai_core import past_data_ai
+from data_feeds.synthetic_market import SyntheticMarket, write_csv
+
+SYMBOLS = ["EURUSDm", "USDJPYm", "GBPUSDm"]
+
+def test_same_seed_gives_the_same_bars_in_one_run_or_in_chunks():
+    whole = SyntheticMarket(SYMBOLS, seed=7).bars(1000)
+    chunked = SyntheticMarket(SYMBOLS, seed=7)
+    parts = [chunk for chunk in chunked.iter_bars(1000, chunk_bars=333)]
+    assert len(parts) == 4
+    for symbol in SYMBOLS:
+        joined = np.concatenate([part[symbol] for part in parts])
+        for field in ("time", "tick_volume", "spread"):
+            np.testing.assert_array_equal(joined[field], whole[symbol][field])
+        for field in ("open", "high", "low", "close"):
+            np.testing.assert_allclose(joined[field], whole[symbol][field], rtol=1e-12)  # Cumulative sums restart per chunk
+
+    # A symbol's path does not depend on the other symbols, and another seed gives another path
+    alone = SyntheticMarket(["USDJPYm"], seed=7).bars(1000)["USDJPYm"]
+    np.testing.assert_array_equal(alone, whole["USDJPYm"])
+    other = SyntheticMarket(["USDJPYm"], seed=8).bars(1000)["USDJPYm"]
+    assert not np.allclose(other["close"], alone["close"])
+
+def test_bars_are_consistent_ohlc():
+    market = SyntheticMarket(SYMBOLS, seed=1, timeframe="M5")
+    first, second = market.bars(500), market.bars(500)
+    for symbol in SYMBOLS:
+        bars = np.concatenate([first[symbol], second[symbol]])
+        assert np.all(bars["high"] >= np.maximum(bars["open"], bars["close"]))
+        assert np.all(bars["low"] <= np.minimum(bars["open"], bars["close"]))
+        assert np.all(bars["low"] > 0) and np.all(bars["spread"] >= 1)
+        np.testing.assert_allclose(bars["open"][1:], bars["close"][:-1])  # Each bar opens at the previous close
+        assert np.all(np.diff(bars["time"]) == 300)
+
+def test_ticks_are_merged_in_time_order_with_increasing_seq():
+    market = SyntheticMarket(SYMBOLS, seed=3, timeframe=1)
+    first, second = market.ticks(200), market.ticks(200)
+    ticks = np.concatenate([first, second])
+    assert len(ticks) == 2 * 200 * len(SYMBOLS)
+    assert np.all(np.diff(ticks["tick_ns"]) >= 0)
+    np.testing.assert_array_equal(ticks["seq"], np.arange(1, len(ticks) + 1))
+    assert np.all(ticks["ask"] > ticks["bid"])
+    assert sorted(set(ticks["symbol"].tolist())) == sorted(symbol.encode() for symbol in SYMBOLS)
+
+def test_write_csv_is_readable_by_the_past_data_loader(tmp_path, monkeypatch):
+    market = SyntheticMarket(SYMBOLS[:2], seed=5)
+    paths = write_csv(market, str(tmp_path), 250, chunk_bars=100)
+    assert sorted(paths) == sorted(str(tmp_path / f"{symbol}.csv") for symbol in SYMBOLS[:2])
+
+    expected = SyntheticMarket(SYMBOLS[:2], seed=5).bars(250)
+    monkeypatch.setattr(past_data_ai, "DATA_STORAGE", str(tmp_path))
+    for symbol in SYMBOLS[:2]:
+        df = past_data_ai.load_csv_data(symbol)
+        assert list(df.columns) == ["time", "open", "high", "low", "close", "volume"] and len(df) == 250
+        np.testing.assert_array_equal(df["time"].to_numpy(), expected[symbol]["time"])
+        np.testing.assert_allclose(df["close"].to_numpy(), expected[symbol]["close"], atol=5e-7)
+        np.testing.assert_array_equal(df["volume"].to_numpy(), expected[symbol]["tick_volume"])
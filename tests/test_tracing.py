@@ -0,0 +1,92 @@
+import json
+import random
+import types
+import threading
+import pytest
+
+from monitoring import tracing
+from monitoring.tracing import enable_tracing, trace_instant, trace_iteration, trace_span, traced, write_trace
+
+@pytest.fixture
+def tracer(monkeypatch, tmp_path):
+    for name, value in (("_enabled", False), ("_sampled", False), ("_sample_rate", 1.0), ("_events", []),
+                        ("_thread_names", {}), ("_trace_file", str(tmp_path / "trace.json"))):
+        monkeypatch.setattr(tracing, name, value)
+    monkeypatch.setattr(tracing, "atexit", types.SimpleNamespace(register=lambda func: func))
+    monkeypatch.setattr(tracing, "random", random.Random(0))
+    return tmp_path
+
+@traced()
+def decide(symbol):
+    with trace_span("model_predict", "ai_core", symbol=symbol):
+        trace_instant("model swapped in", "ai_core", version=2)
+    return "BUY"
+
+def test_chrome_trace_event_shape(tracer):
+    enable_tracing(str(tracer / "trace.json"))
+    with trace_iteration("decision_loop", bar=1):
+        assert decide("EURUSDm") == "BUY"
+        with pytest.raises(ValueError):
+            with trace_span("send_trade_action", "trade_execution"):
+                raise ValueError("rejected")
+        worker = threading.Thread(target=decide, args=("GBPUSDm",), name="worker")
+        worker.start()
+        worker.join()
+
+    with open(write_trace()) as file:
+        trace = json.load(file)
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    metadata = [event for event in events if event["ph"] == "M"]
+    assert metadata[0]["name"] == "process_name"
+    assert sorted(event["args"]["name"] for event in metadata[1:]) == ["MainThread", "worker"]
+
+    complete = [event for event in events if event["ph"] == "X"]
+    for event in complete:
+        assert set(event) >= {"name", "cat", "ph", "ts", "dur", "pid", "tid"} and event["dur"] >= 0
+    [root] = [event for event in complete if event["name"] == "decision_loop"]
+    spans = {(event["name"], event.get("args", {}).get("symbol")): event for event in complete if event["tid"] == root["tid"]}
+    assert root["cat"] == "iteration" and root["args"] == {"bar": 1}
+    function = spans[("decide", None)]
+    assert function["cat"] == __name__.split(".")[0]  # Top-level package of the decorated function
+    predict = spans[("model_predict", "EURUSDm")]
+    assert predict["cat"] == "ai_core"
+    assert root["ts"] <= function["ts"] <= predict["ts"] and predict["ts"] + predict["dur"] <= root["ts"] + root["dur"]
+    assert spans[("send_trade_action", None)]["args"] == {"error": "ValueError"}
+    [other] = [event for event in complete if event["tid"] != root["tid"] and event["name"] == "model_predict"]
+    assert other["args"] == {"symbol": "GBPUSDm"}
+
+    [instant, _] = [event for event in events if event["ph"] == "i"]
+    assert instant["s"] == "t" and instant["args"] == {"version": 2} and predict["ts"] <= instant["ts"]
+
+def test_iterations_are_sampled_at_the_configured_rate(tracer):
+    enable_tracing(str(tracer / "trace.json"), sample_rate=0.25)
+    for index in range(4000):
+        with trace_iteration(index=index):
+            decide("EURUSDm")
+    events = tracing._events
+    iterations = [event for event in events if event["name"] == "iteration"]
+    assert 900 <= len(iterations) <= 1100
+    # Nested spans exist only inside sampled iterations
+    assert sum(event["name"] == "model_predict" for event in events) == len(iterations)
+    assert not tracing._sampled
+    recorded = len(events)
+    decide("EURUSDm")  # Outside an iteration
+    assert len(tracing._events) == recorded
+
+@pytest.mark.parametrize("rate, expected", [(0.0, 0), (1.0, 50), (5.0, 50)])
+def test_sample_rate_extremes(tracer, rate, expected):
+    enable_tracing(str(tracer / "trace.json"), sample_rate=rate)
+    for _ in range(50):
+        with trace_iteration():
+            pass
+    assert len(tracing._events) == expected
+
+def test_disabled_tracer_and_always_on(tracer):
+    with trace_iteration():
+        decide("EURUSDm")
+    assert tracing._events == []
+
+    enable_tracing(str(tracer / "trace.json"), sample_rate=0.0, always_on=True)
+    decide("EURUSDm")  # Scripts without an iteration loop
+    assert [event["name"] for event in tracing._events] == ["model swapped in", "model_predict", "decide"]
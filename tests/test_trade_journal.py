@@ -0,0 +1,103 @@
+import json
+import time
+import threading
+
+from logs import trade_journal
+from logs.trade_journal import TradeJournal
+
+def trade(index, symbol="EURUSDm"):
+    return {"symbol": symbol, "time": 1_700_000_000 + index, "action": "BUY", "profit": float(index)}
+
+def test_migrates_legacy_history_once(tmp_path):
+    legacy = tmp_path / "trade_history.json"
+    legacy.write_text(json.dumps([trade(index, ("EURUSDm", "GBPUSDm")[index % 2]) for index in range(5)]))
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    try:
+        assert journal.migrate_legacy_history(str(legacy)) == 5
+        assert [row["offset"] for row in journal.iter_trades()] == [1, 2, 3, 4, 5]
+        assert [row["profit"] for row in journal.iter_trades(symbol="GBPUSDm")] == [1.0, 3.0]
+        assert legacy.exists()
+
+        # A second start (or another process) does not import again, even after new trades
+        journal.append(trade(5))
+        assert journal.migrate_legacy_history(str(legacy)) == 0
+        assert journal.count() == 6
+    finally:
+        journal.close()
+
+def test_missing_legacy_file_and_existing_journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    try:
+        assert journal.migrate_legacy_history(str(tmp_path / "missing.json")) == 0
+        journal.append(trade(0))
+        legacy = tmp_path / "trade_history.json"
+        legacy.write_text(json.dumps([trade(1)]))
+        assert journal.migrate_legacy_history(str(legacy)) == 0  # Never mixed into a journal that already has trades
+        assert journal.count() == 1
+    finally:
+        journal.close()
+
+def test_offsets_paging_and_reset(tmp_path):
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    try:
+        journal.append_many([trade(index) for index in range(25)])
+        assert journal.last_offset() == 25 and journal.count(since=20) == 5
+        assert [row["offset"] for row in journal.trades_since(22)] == [23, 24, 25]
+        assert len(list(journal.iter_trades(page_size=4))) == 25
+        assert [row["offset"] for row in journal.iter_trades(start=1_700_000_003, end=1_700_000_006)] == [4, 5, 6]
+        records = journal.load_records(since=10, page_size=4)
+        assert list(records["offset"]) == list(range(11, 26)) and records[0]["profit"] == 10.0
+
+        sample = journal.sample(5, before=10)
+        assert len(sample) == 5 and all(row["offset"] <= 10 for row in sample)
+        assert [row["offset"] for row in sample] == sorted(row["offset"] for row in sample)
+
+        journal.reset()
+        assert journal.generation() == 1 and journal.last_offset() == 0
+        assert journal.append(trade(0)) == 1
+    finally:
+        journal.close()
+
+def test_shared_journal_migrates_on_first_use(workspace):
+    (workspace / "logs").mkdir()
+    (workspace / "logs" / "trade_history.json").write_text(json.dumps([trade(0), trade(1)]))
+    journal = trade_journal.get_journal()
+    assert journal is trade_journal.get_journal()
+    assert journal.count() == 2
+
+def test_legacy_trades_without_time_keep_a_null_time(tmp_path):
+    legacy = tmp_path / "trade_history.json"
+    legacy.write_text(json.dumps([{"symbol": "EURUSDm", "profit": 1.0},
+                                  {"symbol": "EURUSDm", "time": "2024-01-02T00:00:00", "profit": 2.0}]))
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    try:
+        journal.migrate_legacy_history(str(legacy))
+        offset = journal.append({"symbol": "EURUSDm", "profit": 3.0})  # Live trade without a time: stamped now
+        times = [row[0] for row in journal._conn.execute("SELECT time FROM trades ORDER BY id")]
+        assert times[:2] == [None, 1_704_153_600.0] and times[2] > 1_704_153_600
+        assert [row["offset"] for row in journal.iter_trades(start=0)] == [2, offset]
+        assert [row["offset"] for row in journal.iter_trades(end=1_800_000_000)] == [2, offset]
+        assert [row["profit"] for row in journal.trades_since(0)] == [1.0, 2.0, 3.0]
+    finally:
+        journal.close()
+
+def test_concurrent_resets_each_bump_the_generation(tmp_path, monkeypatch):
+    meta = TradeJournal._meta
+
+    def slow_meta(self, key):  # Widens the window between reading and writing the generation
+        value = meta(self, key)
+        time.sleep(0.005)
+        return value
+    monkeypatch.setattr(TradeJournal, "_meta", slow_meta)
+    path = str(tmp_path / "journal.db")
+    journals = [TradeJournal(path) for _ in range(4)]
+    try:
+        threads = [threading.Thread(target=lambda journal=journal: [journal.reset() for _ in range(10)]) for journal in journals]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert journals[0].generation() == 40
+    finally:
+        for journal in journals:
+            journal.close()
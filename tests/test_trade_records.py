@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from logs.trade_records import RecordArray, SIGNAL_DTYPE, SYMBOL_DTYPE
+from pipeline.ring_buffer import ORDER_DTYPE, TICK_DTYPE
+
+def signals(count):
+    records = RecordArray(SIGNAL_DTYPE, capacity=2)
+    for index in range(count):
+        records.append(time=float(index), symbol=("EURUSDm", "GBPUSDm")[index % 2], action="BUY", confidence=0.5 + index / 100)
+    return records
+
+def test_ring_buffer_uses_shared_symbol_dtype():
+    assert TICK_DTYPE["symbol"] == np.dtype(SYMBOL_DTYPE)
+    assert ORDER_DTYPE["symbol"] == np.dtype(SYMBOL_DTYPE)
+
+def test_append_grows_and_decodes():
+    records = signals(5)
+    assert len(records) == 5 and records.capacity >= 5
+    assert records[3] == {"time": 3.0, "symbol": "GBPUSDm", "action": "BUY", "confidence": 0.53, "lot_size": 0.0}
+    assert records.categories("symbol") == ["EURUSDm", "GBPUSDm"]
+    assert list(records["symbol"][:2]) == ["EURUSDm", "GBPUSDm"]
+
+def test_frame_round_trip_without_copies():
+    pytest.importorskip("pandas")
+    records = signals(4)
+    frame = records.to_frame()
+    assert np.shares_memory(frame["confidence"].to_numpy(), records["confidence"])
+
+    wrapped = RecordArray.from_frame(SIGNAL_DTYPE, frame)
+    assert np.shares_memory(wrapped["confidence"], records["confidence"])
+    assert np.shares_memory(wrapped["time"], records["time"])
+    assert wrapped.to_dicts() == records.to_dicts()
+
+    # The first write copies the borrowed columns; the source is never modified
+    wrapped.append(time=9.0, symbol="USDJPYm", action="SELL", confidence=0.1)
+    assert not np.shares_memory(wrapped["confidence"], records["confidence"])
+    assert len(records) == 4 and wrapped[4]["symbol"] == "USDJPYm"
+    wrapped.clear()
+    wrapped.append(time=1.0, symbol="EURUSDm")
+    assert records[0]["time"] == 0.0
+
+def test_from_frame_converts_mismatched_columns():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"time": [1, 2], "symbol": ["EURUSDm", "EURUSDm"], "confidence": np.array([0.5, 0.7], np.float32)})
+    records = RecordArray.from_frame(SIGNAL_DTYPE, frame)
+    assert records["time"].dtype == np.float64 and records["confidence"].dtype == np.float64
+    assert records.to_dicts()[1] == {"time": 2.0, "symbol": "EURUSDm", "action": "", "confidence": pytest.approx(0.7), "lot_size": 0.0}
+
+def test_extend_from_frame_and_structured_array():
+    pd = pytest.importorskip("pandas")
+    records = signals(2)
+    records.extend(pd.DataFrame({"time": [5.0], "symbol": ["XAUUSDm"], "confidence": [0.9]}))
+    records.extend(signals(3).to_array())
+    assert len(records) == 6
+    assert list(records["symbol"]) == ["EURUSDm", "GBPUSDm", "XAUUSDm", "EURUSDm", "GBPUSDm", "EURUSDm"]
+    assert records[2]["action"] == "" and records[2]["lot_size"] == 0.0
@@ -0,0 +1,79 @@
+import sys
+import time
+import pytest
+
+from ai_core import training_worker
+from ai_core.training_worker import TrainingSupervisor, DEFAULT_WORKER_SETTINGS
+
+SETTINGS = {**DEFAULT_WORKER_SETTINGS, "nice": 0, "restart_backoff": 10, "max_restarts": 3, "restart_window": 100}
+
+class OneRound:
+    """ Stop event that lets the worker loop run exactly one training round """
+    def __init__(self):
+        self.checks = 0
+
+    def is_set(self):
+        self.checks += 1
+        return self.checks > 1
+
+    def wait(self, timeout=None):
+        return True
+
+class FakeProcess:
+    def __init__(self, alive=True):
+        self.alive, self.exitcode = alive, None if alive else 1
+
+    def is_alive(self):
+        return self.alive
+
+def test_worker_round_survives_a_broken_training_module(workspace, monkeypatch):
+    tf = pytest.importorskip("tensorflow")
+    # Process-wide settings meant for a fresh worker process; TensorFlow may already be running in this one
+    monkeypatch.setattr(training_worker, "limit_worker_resources", lambda settings: None)
+    monkeypatch.setattr(tf.config.threading, "set_intra_op_parallelism_threads", lambda threads: None)
+    monkeypatch.setattr(tf.config.threading, "set_inter_op_parallelism_threads", lambda threads: None)
+    monkeypatch.setitem(sys.modules, "ai_core.ai_learning", None)  # import raises ImportError
+    training_worker.training_worker_main(SETTINGS, OneRound())  # Logs the failed round instead of raising
+
+def test_worker_process_starts_and_finishes_a_round(workspace):
+    pytest.importorskip("tensorflow")
+    from conftest import TEST_CONFIG
+
+    worker = training_worker.start_training_worker({**SETTINGS, "interval": 3600})
+    try:
+        deadline = time.monotonic() + 180
+        finished = False
+        while time.monotonic() < deadline and worker[0].is_alive() and not finished:
+            time.sleep(0.5)
+            with open(TEST_CONFIG["logging"]["log_file"], "r", encoding="utf-8", errors="replace") as file:
+                finished = f"Training Round Finished" in file.read().split(f"PID {worker[0].pid}", 1)[-1]
+        assert worker[0].is_alive(), f"worker exited with code {worker[0].exitcode}"
+        assert finished
+    finally:
+        training_worker.stop_training_worker(worker)
+    assert not worker[0].is_alive()
+
+def test_supervisor_backs_off_and_gives_up(workspace):
+    started = []
+
+    def start(settings):
+        started.append(FakeProcess(alive=False))  # Every worker dies straight away
+        return started[-1], None
+
+    supervisor = TrainingSupervisor(SETTINGS, start=start, stop=lambda worker: None).start()
+    assert supervisor.check(now=0) is True       # First death: restarted at once
+    assert supervisor.check(now=1) is False      # Second death: waits restart_backoff
+    assert supervisor.check(now=10) is False
+    assert supervisor.check(now=11) is True
+    assert supervisor.check(now=12) is False     # Then twice as long
+    assert supervisor.check(now=31) is False
+    assert supervisor.check(now=32) is True
+    assert supervisor.check(now=33) is False     # max_restarts within restart_window reached
+    assert supervisor.gave_up
+    assert len(started) == 4
+    assert supervisor.check(now=1000) is False and len(started) == 4
+
+def test_supervisor_leaves_a_running_worker_alone(workspace):
+    supervisor = TrainingSupervisor(SETTINGS, start=lambda settings: (FakeProcess(), None), stop=lambda worker: None).start()
+    assert all(supervisor.check(now=t) for t in range(5))
+    assert supervisor.restarts == []
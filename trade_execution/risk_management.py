@@ -1,51 +1,32 @@
 import sys
 import os
-import pandas as pd
-import json
-import MetaTrader5 as mt5
-import numpy as np
 
 # ✅ Ensure modules are correctly loaded
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from maths_engine.maths import calculate_volatility, adaptive_risk_factor, fetch_price_data
+from config_manager import get_config
+from maths_engine.maths import symbol_volatility, adaptive_risk_factor
 from logs.logger import log_message, log_risk_evaluation  # Logs for risk calculations
-
-CONFIG_FILE = "config.json"
-
-# ✅ Load Configurations (Fixed: Ensure Default Values)
-def load_config():
-    """ Loads bot configurations from config.json with default values """
-    try:
-        with open(CONFIG_FILE, "r") as file:
-            config = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        log_message("❌ ERROR: Invalid or missing config.json!", level="error")
-        exit()
-
-    # ✅ Set default values if missing
-    config.setdefault("max_risk_per_trade", 2)  # Default risk: 2% per trade
-    config.setdefault("account_balance", 10000)  # Default balance if missing
-    config.setdefault("min_lot_size", 0.01)  # Min lot size
-    config.setdefault("max_lot_size", 5)  # Max lot size
-    config.setdefault("min_margin_level", 100)  # Minimum margin level % before rejecting trades
-
-    return config
-
-config = load_config()
+from monitoring.tracing import traced
 
 # ✅ AI-Based Lot Size Calculation
+@traced()
 def calculate_lot_size(account_balance, risk_per_trade):
     """
     AI-based lot sizing based on available balance & risk tolerance.
+    Reads the in-memory config snapshot only, no file access on this hot path.
     """
+    config = get_config()
     lot_size = (account_balance * risk_per_trade) / 100000  # Standard Forex Lot Calculation
     lot_size = max(min(lot_size, config["max_lot_size"]), config["min_lot_size"])  # Ensure lot limits
     return round(lot_size, 2)
 
 # ✅ Validate Trade Risk
+@traced()
 def validate_trade_risk(symbol, trade_type, lot_size):
     """ Ensures the trade meets risk management criteria before execution """
-    
+    import MetaTrader5 as mt5
+
+    config = get_config()
     account_info = mt5.account_info()
     if account_info is None:
         log_message("❌ ERROR: Unable to fetch account info!", level="error")
@@ -83,15 +64,14 @@ def adjust_sl_tp(symbol, trade_type):
     """
     AI-based SL/TP adjustment using volatility & market conditions.
     """
-    # ✅ Fetch price data
-    price_data = fetch_price_data(symbol)
+    # ✅ Volatility from the per-tick feed cache (computed once with ai_trade_confidence)
+    volatility = symbol_volatility(symbol)
 
-    if price_data is None or len(price_data) < 14:
+    if volatility is None:
         log_message(f"❌ ERROR: Not enough data to calculate volatility for {symbol}", level="error")
         return None, None  # Skip SL/TP adjustment
 
     # ✅ Proceed with calculations
-    volatility = calculate_volatility(price_data)
     risk_factor = adaptive_risk_factor(symbol)
 
     if trade_type == "BUY":
@@ -108,6 +88,7 @@ def apply_risk_filters(symbol, trade_type, lot_size):
     """
     Ensures trade follows proper risk management rules before execution.
     """
+    config = get_config()
     account_balance = config.get("account_balance", 10000)  # Use default if missing
     max_risk_per_trade = config.get("max_risk_per_trade", 2)
 
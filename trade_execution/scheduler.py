@@ -0,0 +1,189 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from logs.logger import log_message
+from monitoring.metrics import increment, metrics_enabled, observe
+from monitoring.tracing import trace_iteration
+
+# ✅ MT5 Timeframes in Seconds
+TIMEFRAMES = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400, "D1": 86400}
+
+DEFAULT_SCHEDULER_SETTINGS = {
+    "timeframe": "M5",
+    "close_delay": 1.0,         # Seconds after the bar close before jobs start (lets the broker finalize the bar)
+    "deadline_fraction": 0.8,   # A job must finish within this fraction of the bar
+    "max_workers": 4,
+    "overlap_policy": "skip",   # "skip" or "coalesce" when a job is still running at the next bar
+}
+
+def timeframe_seconds(timeframe):
+    """ "M5" -> 300; plain numbers are taken as seconds """
+    if isinstance(timeframe, str):
+        if timeframe.upper() not in TIMEFRAMES:
+            raise ValueError(f"❌ ERROR: Unknown timeframe '{timeframe}' (expected one of {', '.join(TIMEFRAMES)})")
+        return TIMEFRAMES[timeframe.upper()]
+    if timeframe <= 0:
+        raise ValueError(f"❌ ERROR: Timeframe must be positive (got {timeframe})")
+    return float(timeframe)
+
+def next_bar_close(now, period, close_delay=0.0):
+    """ First bar boundary (aligned to the epoch, like broker bars) strictly after now - close_delay """
+    return (int((now - close_delay) // period) + 1) * period + close_delay
+
+# ✅ Bar-Close Scheduler
+class BarScheduler:
+    """
+    Wakes up on timeframe boundaries (not "sleep after work"), so the cadence never drifts by the
+    time an iteration took. Every bar, the jobs returned by jobs() run concurrently on a thread pool
+    and are given deadline_fraction of the bar to finish. A job that is still running when the next
+    bar closes is not started a second time: it is skipped, or with overlap_policy="coalesce" run
+    once more as soon as the running call returns.
+    timeframe may be a callable (e.g. reading config["trading_interval"]) so hot reloads apply.
+    """
+
+    def __init__(self, timeframe, close_delay=1.0, deadline_fraction=0.8, max_workers=4, overlap_policy="skip", name="bar"):
+        if overlap_policy not in ("skip", "coalesce"):
+            raise ValueError(f"❌ ERROR: Unknown overlap policy '{overlap_policy}'")
+        self.timeframe = timeframe
+        self.close_delay = close_delay
+        self.deadline_fraction = deadline_fraction
+        self.overlap_policy = overlap_policy
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-job")
+        self._running = {}     # job name -> Future of the call in flight
+        self._coalesced = {}   # job name -> (func, bar time) queued while the previous call was running
+        self._lock = threading.RLock()  # Done-callbacks of already finished futures run inside _submit
+        self._stopped = False
+        self.stats = {"ticks": 0, "missed_ticks": 0, "jobs_started": 0, "jobs_skipped": 0,
+                      "jobs_coalesced": 0, "deadline_misses": 0, "job_errors": 0, "hook_errors": 0, "max_jitter": 0.0}
+
+    @classmethod
+    def from_config(cls, settings=None, **overrides):
+        settings = {**DEFAULT_SCHEDULER_SETTINGS, **(settings or {}), **overrides}
+        return cls(settings["timeframe"], settings["close_delay"], settings["deadline_fraction"],
+                   settings["max_workers"], settings["overlap_policy"], settings.get("name", "bar"))
+
+    def period(self):
+        return timeframe_seconds(self.timeframe() if callable(self.timeframe) else self.timeframe)
+
+    # ✅ Main Loop
+    def run(self, jobs, on_tick=None, after_tick=None, stop_event=None, max_ticks=None):
+        """
+        jobs() -> {job name: callable}, re-evaluated every bar (e.g. one job per trading pair).
+        on_tick() runs before the jobs are dispatched, after_tick(results) once they finished or hit the deadline.
+        An exception in a hook (or in jobs()) is logged and counted like a job error; the loop keeps running.
+        """
+        stop_event = stop_event or threading.Event()
+        ticks = 0
+        bar_close = next_bar_close(time.time(), self.period(), self.close_delay)
+        try:
+            while not stop_event.is_set() and (max_ticks is None or ticks < max_ticks):
+                if stop_event.wait(max(0.0, bar_close - time.time())):
+                    break
+
+                # Woke up after more than one boundary (suspend, overloaded host): run once for the latest bar
+                period = self.period()
+                now = time.time()
+                latest = next_bar_close(now, period, self.close_delay) - period
+                if latest > bar_close:
+                    skipped = int(round((latest - bar_close) / period))
+                    self.stats["missed_ticks"] += skipped
+                    self._count("scheduler_missed_ticks", value=skipped)
+                    bar_close = latest
+
+                self._record_jitter(now - bar_close)
+                with trace_iteration(f"{self.name}_tick", bar_close=bar_close):
+                    if on_tick:
+                        self._run_hook("on_tick", on_tick)
+                    results = self._dispatch(self._run_hook("jobs", jobs) or {}, bar_close, bar_close + period * self.deadline_fraction)
+                    if after_tick:
+                        self._run_hook("after_tick", after_tick, results)
+
+                ticks += 1
+                self.stats["ticks"] += 1
+                bar_close = next_bar_close(max(time.time(), bar_close), period, self.close_delay)
+        finally:
+            with self._lock:
+                self._stopped = True
+                self._coalesced.clear()
+            self.executor.shutdown(wait=False)
+
+    def _dispatch(self, jobs, bar_close, deadline):
+        futures = {}
+        for job_name, func in jobs.items():
+            with self._lock:
+                running = self._running.get(job_name)
+                if running is not None and not running.done():
+                    if self.overlap_policy == "coalesce":
+                        self._coalesced[job_name] = (func, bar_close)
+                        self.stats["jobs_coalesced"] += 1
+                        self._count("scheduler_jobs_coalesced", job_name)
+                    else:
+                        self.stats["jobs_skipped"] += 1
+                        self._count("scheduler_jobs_skipped", job_name)
+                        log_message(f"⏭ {job_name} still running from a previous bar. Skipped this bar.", level="warning")
+                    continue
+                futures[job_name] = self._submit(job_name, func, bar_close, deadline)
+
+        # Wait for this bar's jobs until the deadline; stragglers keep running in the pool
+        wait(futures.values(), timeout=max(0.0, deadline - time.time()))
+        results = {}
+        for job_name, future in futures.items():
+            if future.done() and future.exception() is None:
+                results[job_name] = future.result()
+        return results
+
+    def _submit(self, job_name, func, bar_close, deadline):
+        """ Must be called with self._lock held """
+        self.stats["jobs_started"] += 1
+        future = self.executor.submit(self._run_job, job_name, func, bar_close, deadline)
+        self._running[job_name] = future
+        future.add_done_callback(lambda _, job_name=job_name: self._on_job_done(job_name))
+        return future
+
+    def _run_job(self, job_name, func, bar_close, deadline):
+        started = time.time()
+        try:
+            return func()
+        except Exception as e:
+            with self._lock:
+                self.stats["job_errors"] += 1
+            self._count("scheduler_job_errors", job_name)
+            log_message(f"❌ ERROR: Scheduled job {job_name} failed - {str(e)}", level="error")
+            raise
+        finally:
+            finished = time.time()
+            if metrics_enabled():
+                observe("scheduler_job_runtime", finished - started, job_name)
+                observe("scheduler_job_latency", finished - bar_close, job_name)  # Bar close -> done (queueing included)
+            if finished > deadline:
+                with self._lock:
+                    self.stats["deadline_misses"] += 1
+                self._count("scheduler_deadline_misses", job_name)
+                log_message(f"⏰ {job_name} missed its deadline by {finished - deadline:.2f}s", level="warning")
+
+    def _run_hook(self, hook_name, hook, *args):
+        """ Runs a per-tick hook on the scheduler thread; returns None if it raised """
+        try:
+            return hook(*args)
+        except Exception as e:
+            self.stats["hook_errors"] += 1
+            self._count("scheduler_hook_errors", hook_name)
+            log_message(f"❌ ERROR: Scheduler hook {hook_name} failed - {type(e).__name__}: {e}", level="error")
+            return None
+
+    def _on_job_done(self, job_name):
+        with self._lock:
+            pending = self._coalesced.pop(job_name, None)
+            if pending is not None and not self._stopped:
+                func, bar_close = pending
+                self._submit(job_name, func, bar_close, bar_close + self.period() * self.deadline_fraction)
+
+    def _record_jitter(self, jitter):
+        self.stats["max_jitter"] = max(self.stats["max_jitter"], jitter)
+        if metrics_enabled():
+            observe("scheduler_jitter", jitter, self.name)
+
+    @staticmethod
+    def _count(name, job_name="", value=1):
+        increment(name, job_name, value=value)
@@ -1,27 +1,19 @@
 import json
-import MetaTrader5 as mt5
 import os
-import time
+import argparse
 from trade_execution.risk_management import validate_trade_risk, calculate_lot_size
 from logs.logger import log_message
 from trade_execution.mt5_bridge import send_trade_action
+from config_manager import get_config, start_watching
+from monitoring.metrics import span, increment
+from monitoring.tracing import traced, add_trace_arguments, configure_tracing
 
-CONFIG_FILE = "config.json"
-
-# ✅ Load Configurations
-def load_config():
-    try:
-        with open(CONFIG_FILE, "r") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        log_message("❌ ERROR: Invalid or missing config.json!", level="error")
-        exit()
-
-config = load_config()
 
 # ✅ Open Trade
+@traced()
 def open_trade(symbol, trade_type):
     """ Sends Open Trade request via MT5 Bridge """
+    config = get_config()
     lot_size = calculate_lot_size(config["account_balance"], config["risk_percentage"])
     
     if not validate_trade_risk(symbol, trade_type, lot_size):
@@ -31,6 +23,22 @@ def open_trade(symbol, trade_type):
     send_trade_action(action=trade_type, symbol=symbol, lot=lot_size)
     return True
 
+# ✅ Execute Trade with a Pre-Computed Lot Size (used by the AI decision loop)
+@traced()
+def execute_trade(symbol, trade_type, lot_size):
+    """ Validates risk for the given lot size and sends the trade via MT5 Bridge """
+    with span("validate_trade_risk", symbol):
+        approved = validate_trade_risk(symbol, trade_type, lot_size)
+    if not approved:
+        increment("trades_rejected", symbol, trade_type)
+        log_message(f"❌ Trade Risk Validation Failed for {symbol}. Skipping trade.", level="error")
+        return False
+
+    with span("send_trade_action", symbol):
+        sent = send_trade_action(action=trade_type, symbol=symbol, lot=lot_size)
+    increment("trades_sent" if sent else "trades_failed", symbol, trade_type)
+    return sent
+
 # ✅ Modify Trade (SL/TP Update)
 def modify_trade(ticket, sl, tp):
     """ Sends Modify Trade request via MT5 Bridge """
@@ -47,26 +55,36 @@ def manage_trade(ticket, action, sl=None, tp=None, trail=None):
     send_trade_action(action=action, symbol=None, sl=sl, tp=tp, trail=trail, ticket=ticket)
 
 # ✅ AI Trade Signal Monitoring
+SIGNALS_FILE = "ai_signals.json"
+
+def process_trade_signals():
+    """ One pass over ai_signals.json """
+    if not os.path.exists(SIGNALS_FILE):
+        return
+
+    with open(SIGNALS_FILE, "r") as file:
+        signals = json.load(file)
+
+    for signal in signals:
+        if "action" in signal and "symbol" in signal:
+            open_trade(signal["symbol"], signal["action"])
+
+        if "sl" in signal and "tp" in signal:
+            modify_trade(signal["ticket"], signal["sl"], signal["tp"])
+
+        if "trail" in signal and signal["trail"]:
+            manage_trade(signal["ticket"], "TRAIL", trail=True)
+
 def monitor_trade_signals():
     """ Monitors AI trading signals and executes trades """
-    signals_file = "ai_signals.json"
-    
-    while True:
-        if os.path.exists(signals_file):
-            with open(signals_file, "r") as file:
-                signals = json.load(file)
-            
-            for signal in signals:
-                if "action" in signal and "symbol" in signal:
-                    open_trade(signal["symbol"], signal["action"])
-                
-                if "sl" in signal and "tp" in signal:
-                    modify_trade(signal["ticket"], signal["sl"], signal["tp"])
-                
-                if "trail" in signal and signal["trail"]:
-                    manage_trade(signal["ticket"], "TRAIL", trail=True)
-
-        time.sleep(config["trading_interval"])  # Wait before checking again
+    from trade_execution.scheduler import BarScheduler
+
+    start_watching()  # ✅ Pick up config.json edits without a restart
+    # ✅ Runs on trading_interval boundaries (re-read every tick): no drift, no overlapping passes
+    scheduler = BarScheduler(lambda: get_config()["trading_interval"], close_delay=0.0, max_workers=1, name="trade_signals")
+    scheduler.run(lambda: {"trade_signals": process_trade_signals})
 
 if __name__ == "__main__":
+    parser = add_trace_arguments(argparse.ArgumentParser(description="Execute AI trading signals via MT5"))
+    configure_tracing(parser.parse_args())
     monitor_trade_signals()
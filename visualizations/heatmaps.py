@@ -1,11 +1,12 @@
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 def generate_heatmap(order_flow_data):
     """
     Market liquidity & institutional order flow को heatmap में visualize करेगा।
     """
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     data_matrix = np.array(order_flow_data).reshape((10, 10))  # ✅ Adjust based on order flow data
     plt.figure(figsize=(8,6))
     sns.heatmap(data_matrix, cmap="coolwarm", annot=True, fmt=".2f")
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 def detect_price_patterns(prices):
     """
@@ -18,6 +17,8 @@ def plot_patterns(prices):
     """
     Price chart के साथ detected patterns को plot करेगा।
     """
+    import matplotlib.pyplot as plt
+
     patterns = detect_price_patterns(prices)
     x = np.arange(len(prices))
     
@@ -1,8 +1,27 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+# ✅ Trades already read from the journal (each call only fetches rows after the last offset)
+_history = {"generation": None, "offset": 0, "records": None}
 
-def plot_trade_history(trade_history_file, mode="pnl"):
-    df = pd.read_json(trade_history_file)
+def load_trade_frame(journal=None):
+    from logs.trade_journal import get_journal
+    from logs.trade_records import RecordArray, TRADE_DTYPE
+
+    journal = journal or get_journal()
+    generation = journal.generation()
+    if generation != _history["generation"] or _history["records"] is None:  # Journal was reset
+        _history.update(generation=generation, offset=0, records=RecordArray(TRADE_DTYPE))
+
+    new_trades = journal.load_records(since=_history["offset"])
+    if len(new_trades):
+        _history["records"].extend(new_trades)
+        _history["offset"] = int(new_trades["offset"][-1])
+    return _history["records"].to_frame()
+
+def plot_trade_history(trade_history_file=None, mode="pnl"):
+    """ Plots the trade journal (or a legacy trade_history.json file if a path is given) """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    df = pd.read_json(trade_history_file) if trade_history_file else load_trade_frame()
     df["trade_index"] = range(len(df))
     
     plt.figure(figsize=(12, 6))
@@ -37,6 +56,5 @@ def plot_trade_history(trade_history_file, mode="pnl"):
 
 # Run the visualization
 if __name__ == "__main__":
-    trade_history_file = r"C:\Users\Lenovo\Desktop\Trading bot\logs\trade_history.json"
     mode = "pnl"  # Change to "market" for market trend
-    plot_trade_history(trade_history_file, mode)
+    plot_trade_history(mode=mode)